@@ -0,0 +1,52 @@
+"""
+Time Dataflow ordering and execution for assemblies with a large number of
+unconnected components. Time per component should stay roughly constant
+as the number of components grows.
+"""
+
+from time import time
+
+from openmdao.main.api import Assembly, Component, set_as_top
+from openmdao.main.datatypes.api import Float
+
+
+class Comp(Component):
+
+    x = Float(iotype='in')
+    y = Float(iotype='out')
+
+    def execute(self):
+        self.y = self.x
+
+
+def build(ncomps):
+    """ Return top assembly with `ncomps` unconnected components. """
+    top = set_as_top(Assembly())
+    names = ['comp%d' % i for i in range(ncomps)]
+    for name in names:
+        top.add(name, Comp())
+    top.driver.workflow.add(names)
+    return top
+
+
+if __name__ == "__main__":
+
+    import sys
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 2500, 5000, 10000]
+
+    print '%8s %10s %10s %14s' % ('comps', 'sort', 'run', 'usec/comp')
+    for ncomps in sizes:
+        top = build(ncomps)
+        workflow = top.driver.workflow
+
+        t0 = time()
+        workflow._get_topsort()
+        sort_time = time() - t0
+
+        t0 = time()
+        top.run()
+        run_time = time() - t0
+
+        print '%8d %10.3f %10.3f %14.1f' \
+              % (ncomps, sort_time, run_time,
+                 (sort_time + run_time) / ncomps * 1e6)
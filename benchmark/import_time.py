@@ -0,0 +1,48 @@
+"""
+Time importing the OpenMDAO API in fresh interpreters and check it against
+a budget. Exits with status 1 if the best time exceeds the budget.
+
+Usage: python import_time.py [budget_seconds [statement]]
+"""
+
+import subprocess
+import sys
+
+BUDGET = 0.6  # seconds, for 'from openmdao.main.api import *'
+TRIALS = 5
+
+_SCRIPT = """\
+import time
+start = time.time()
+%s
+print time.time() - start
+"""
+
+
+def time_import(statement):
+    """ Return best time to execute `statement` in a new interpreter. """
+    best = None
+    for i in range(TRIALS):
+        out = subprocess.check_output([sys.executable, '-c',
+                                       _SCRIPT % statement])
+        elapsed = float(out.split()[-1])
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+if __name__ == "__main__":
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET
+    statement = sys.argv[2] if len(sys.argv) > 2 \
+                            else 'from openmdao.main.api import *'
+
+    for stmt in ('import openmdao.main.api',
+                 'from openmdao.main.api import Component',
+                 statement):
+        elapsed = time_import(stmt)
+        print '%8.3f  %s' % (elapsed, stmt)
+
+    if elapsed > budget:
+        print 'FAIL: %.3f exceeds budget of %.3f' % (elapsed, budget)
+        sys.exit(1)
+    print 'OK: %.3f within budget of %.3f' % (elapsed, budget)
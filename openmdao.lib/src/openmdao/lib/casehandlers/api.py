@@ -3,22 +3,25 @@
 .. _`openmdao.lib.casehandler.api.py`:
 
 A central place to access all of the OpenMDAO case recorders, case
-iterators, and case filters in the standard library.
+iterators, and case filters in the standard library. They are imported
+on first access.
 """
 
-from openmdao.lib.casehandlers.caseset import CaseArray, CaseSet, caseiter_to_caseset
-
-from openmdao.lib.casehandlers.csvcase import CSVCaseIterator, CSVCaseRecorder
-from openmdao.lib.casehandlers.dbcase import DBCaseIterator, DBCaseRecorder, \
-                                             case_db_to_dict
-from openmdao.lib.casehandlers.dumpcase import DumpCaseRecorder
-from openmdao.lib.casehandlers.listcase import ListCaseRecorder, \
-                                               ListCaseIterator
-
-from openmdao.lib.casehandlers.caseset import CaseArray, CaseSet, \
-                                              caseiter_to_caseset
-
-from openmdao.lib.casehandlers.filters import SequenceCaseFilter, \
-                                              SliceCaseFilter, ExprCaseFilter
-
-
+from openmdao.util.lazyimport import lazy_module
+
+lazy_module(__name__, {
+    'CaseArray': 'openmdao.lib.casehandlers.caseset',
+    'CaseSet': 'openmdao.lib.casehandlers.caseset',
+    'caseiter_to_caseset': 'openmdao.lib.casehandlers.caseset',
+    'CSVCaseIterator': 'openmdao.lib.casehandlers.csvcase',
+    'CSVCaseRecorder': 'openmdao.lib.casehandlers.csvcase',
+    'DBCaseIterator': 'openmdao.lib.casehandlers.dbcase',
+    'DBCaseRecorder': 'openmdao.lib.casehandlers.dbcase',
+    'case_db_to_dict': 'openmdao.lib.casehandlers.dbcase',
+    'DumpCaseRecorder': 'openmdao.lib.casehandlers.dumpcase',
+    'ListCaseRecorder': 'openmdao.lib.casehandlers.listcase',
+    'ListCaseIterator': 'openmdao.lib.casehandlers.listcase',
+    'SequenceCaseFilter': 'openmdao.lib.casehandlers.filters',
+    'SliceCaseFilter': 'openmdao.lib.casehandlers.filters',
+    'ExprCaseFilter': 'openmdao.lib.casehandlers.filters',
+})
@@ -1,14 +1,25 @@
 """Pseudo package providing a central place to access all of the
-OpenMDAO components in the standard library."""
+OpenMDAO components in the standard library. Components are imported on
+first access."""
 
-from openmdao.lib.components.external_code import ExternalCode
-from openmdao.lib.components.metamodel import MetaModel, ConnectableMetaModel
-from openmdao.lib.components.pareto_filter import ParetoFilter, ConnectableParetoFilter
-from openmdao.lib.components.expected_improvement import ExpectedImprovement, ConnectableExpectedImprovement
-from openmdao.lib.components.expected_improvement_multiobj import MultiObjExpectedImprovement, ConnectableMultiObjExpectedImprovement
-from openmdao.lib.components.mux import Mux, DeMux
-from openmdao.lib.components.broadcaster import Broadcaster
-from openmdao.lib.components.linear_distribution import LinearDistribution
-from openmdao.test.execcomp import ExecComp, ExecCompWithDerivatives
-from openmdao.lib.components.lazy_comp import LazyComponent
-from openmdao.lib.components.geomcomp import GeomComponent
+from openmdao.util.lazyimport import lazy_module
+
+lazy_module(__name__, {
+    'ExternalCode': 'openmdao.lib.components.external_code',
+    'MetaModel': 'openmdao.lib.components.metamodel',
+    'ConnectableMetaModel': 'openmdao.lib.components.metamodel',
+    'ParetoFilter': 'openmdao.lib.components.pareto_filter',
+    'ConnectableParetoFilter': 'openmdao.lib.components.pareto_filter',
+    'ExpectedImprovement': 'openmdao.lib.components.expected_improvement',
+    'ConnectableExpectedImprovement': 'openmdao.lib.components.expected_improvement',
+    'MultiObjExpectedImprovement': 'openmdao.lib.components.expected_improvement_multiobj',
+    'ConnectableMultiObjExpectedImprovement': 'openmdao.lib.components.expected_improvement_multiobj',
+    'Mux': 'openmdao.lib.components.mux',
+    'DeMux': 'openmdao.lib.components.mux',
+    'Broadcaster': 'openmdao.lib.components.broadcaster',
+    'LinearDistribution': 'openmdao.lib.components.linear_distribution',
+    'ExecComp': 'openmdao.test.execcomp',
+    'ExecCompWithDerivatives': 'openmdao.test.execcomp',
+    'LazyComponent': 'openmdao.lib.components.lazy_comp',
+    'GeomComponent': 'openmdao.lib.components.geomcomp',
+})
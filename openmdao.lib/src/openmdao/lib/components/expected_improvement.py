@@ -1,28 +1,44 @@
 """Expected Improvement calculation for one or more objectives."""
 
 import logging
+import imp
 try:
-    from numpy import exp, abs, pi
+    from numpy import exp, abs, pi, asarray, errstate, isfinite, vectorize
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 _check = ['numpy']
 try:
-    from math import erf   # py27 and later has erf in the math module
+    from math import erf as _math_erf   # py27 and later has erf in the math module
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
+    _math_erf = None
     try:
-        from scipy.special import erf
+        imp.find_module('scipy')
     except ImportError as err:
         logging.warn("In %s: %r" % (__file__, err))
         _check.append('scipy')
 
-from openmdao.main.datatypes.api import Slot, Str, Float, Instance
+_erf = None
+
+def erf(x):
+    """Error function of each element of `x`. Uses scipy.special, imported
+    on the first call, or else :func:`math.erf` elementwise."""
+    global _erf
+    if _erf is None:
+        try:
+            from scipy.special import erf as _erf
+        except ImportError:
+            _erf = vectorize(_math_erf)
+    return _erf(x)
+
+from openmdao.main.datatypes.api import Array, Slot, Str, Float, Instance
 from openmdao.lib.casehandlers.api import CaseSet
 
 from openmdao.main.api import Component
 from openmdao.util.decorators import stub_if_missing_deps
 
-from openmdao.main.uncertain_distributions import NormalDistribution
+from openmdao.main.uncertain_distributions import NormalDistribution, \
+                                                 NormalDistributionArray
 
 @stub_if_missing_deps(*_check)
 class ExpectedImprovementBase(Component):
@@ -31,18 +47,47 @@ class ExpectedImprovementBase(Component):
                         "improvement around. Must be a NormalDistrubtion type.")
 
 
+    predicted_mu = Array(iotype="in",
+                         desc="Predicted means of a batch of candidate points. "
+                              "If not empty, EI_values and PI_values are "
+                              "calculated instead of EI and PI. A "
+                              "NormalDistributionArray predicted_value is "
+                              "also calculated as a batch.")
+
+    predicted_sigma = Array(iotype="in",
+                            desc="Predicted standard deviations of a batch of "
+                                 "candidate points.")
+
     EI = Float(0.0, iotype="out",
                desc="The expected improvement of the predicted_value.")
 
     PI = Float(0.0, iotype="out",
                desc="The probability of improvement of the predicted_value.")
 
-    def execute(self):
-        """ Calculates the expected improvement of the model at a given point.
+    EI_values = Array(iotype="out",
+                      desc="The expected improvement of each candidate in "
+                           "predicted_mu.")
+
+    PI_values = Array(iotype="out",
+                      desc="The probability of improvement of each candidate "
+                           "in predicted_mu.")
+
+    def get_improvement(self, mu, sigma):
+        """ Returns ``(PI, EI)``, arrays of the probability of improvement
+        and the expected improvement for a batch of candidate points.
+
+        mu: array
+            Predicted mean at each point.
+
+        sigma: array
+            Predicted standard deviation at each point.
         """
+        mu = asarray(mu, dtype=float)
+        sigma = asarray(sigma, dtype=float)
+        if mu.shape != sigma.shape:
+            self.raise_exception("mu shape %s does not match sigma shape %s"
+                                 % (mu.shape, sigma.shape), ValueError)
 
-        mu = self.predicted_value.mu
-        sigma = self.predicted_value.sigma
         best_case = self.best_case[0]
         try:
             target = best_case[self.criteria]
@@ -50,18 +95,37 @@ class ExpectedImprovementBase(Component):
             self.raise_exception("best_case did not have an output which "
                                  "matched the criteria, '%s'"%self.criteria,
                                  ValueError)
-        try:
 
-            self.PI = 0.5+0.5*erf((1/2**.5)*(target-mu/sigma))
+        with errstate(divide='ignore', invalid='ignore', over='ignore'):
+            PI = 0.5+0.5*erf((1/2**.5)*(target-mu/sigma))
 
             T1 = (target-mu)*.5*(1.+erf((target-mu)/(sigma*2.**.5)))
             T2 = sigma*((1./((2.*pi)**.05))*exp(-0.5*((target-mu)/sigma)**2.))
-            self.EI = abs(T1+T2)
+            EI = abs(T1+T2)
 
-        except (ValueError,ZeroDivisionError):
-            self.EI = 0
-            self.PI = 0
+        # Zero sigma has no improvement.
+        invalid = (sigma == 0) | ~isfinite(PI) | ~isfinite(EI)
+        PI[invalid] = 0
+        EI[invalid] = 0
+        return PI, EI
 
+    def execute(self):
+        """ Calculates the expected improvement of the model at a given point,
+        or at each point of a batch if `predicted_mu` is not empty or
+        `predicted_value` is a NormalDistributionArray.
+        """
+        if len(self.predicted_mu):
+            self.PI_values, self.EI_values = \
+                self.get_improvement(self.predicted_mu, self.predicted_sigma)
+        elif isinstance(self.predicted_value, NormalDistributionArray):
+            self.PI_values, self.EI_values = \
+                self.get_improvement(self.predicted_value.mu,
+                                     self.predicted_value.sigma)
+        else:
+            PI, EI = self.get_improvement([self.predicted_value.mu],
+                                          [self.predicted_value.sigma])
+            self.PI = PI[0]
+            self.EI = EI[0]
 
 
 class ConnectableExpectedImprovement(ExpectedImprovementBase):
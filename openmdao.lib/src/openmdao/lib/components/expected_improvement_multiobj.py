@@ -3,19 +3,11 @@
 import logging
 
 try:
-    from numpy import exp, pi, array, isnan, diag, random
+    from numpy import exp, pi, array, asarray, atleast_2d, column_stack, \
+                      empty, errstate, isnan, random, sqrt
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 _check=['numpy']
-try:
-    from math import erf
-except ImportError as err:
-    logging.warn("In %s: %r" % (__file__, err))
-    try:
-        from scipy.special import erf
-    except ImportError as err:
-        logging.warn("In %s: %r" % (__file__, err))
-        _check.append('scipy')
 
 from openmdao.main.datatypes.api import Slot, Enum, Float, Array, Event, Int, Instance
 
@@ -23,7 +15,13 @@ from openmdao.main.component import Component
 from openmdao.util.decorators import stub_if_missing_deps
 
 from openmdao.lib.casehandlers.api import CaseSet
-from openmdao.main.uncertain_distributions import NormalDistribution
+from openmdao.lib.components.expected_improvement import erf
+from openmdao.main.uncertain_distributions import NormalDistribution, \
+                                                 NormalDistributionArray
+
+# Largest number of sample/Pareto point comparisons made at once by the
+# Monte Carlo estimate.
+_CHUNK_SIZE = 1 << 22
 
 
 @stub_if_missing_deps(*_check)
@@ -46,6 +44,12 @@ class MultiObjExpectedImprovementBase(Component):
 
     EI = Float(0.0, iotype="out", desc="The expected improvement of the next_case.")
 
+    PI_values = Array(iotype="out", desc="The probability of improvement of each \
+                        point when predicted_values are NormalDistributionArrays.")
+
+    EI_values = Array(iotype="out", desc="The expected improvement of each \
+                        point when predicted_values are NormalDistributionArrays.")
+
     reset_y_star = Event(desc='Reset Y* on next execution')
 
     def __init__(self):
@@ -72,118 +76,126 @@ class MultiObjExpectedImprovementBase(Component):
 
     def _2obj_PI(self, mu, sigma):
         """Calculates the multi-objective probability of improvement
-        for a new point with two responses. Takes as input a
-        pareto frontier, mean and sigma of new point."""
+        for new points with two responses. Takes as input the mean and
+        sigma of each new point, as arrays of shape (points, 2)."""
 
         y_star = self.y_star
+        cdf0 = _cdf(y_star[:, 0], mu[:, 0:1], sigma[:, 0:1])
+        cdf1 = _cdf(y_star[:, 1], mu[:, 1:2], sigma[:, 1:2])
 
-        PI1 = (0.5+0.5*erf((1/(2**0.5))*((y_star[0][0]-mu[0])/sigma[0])))
-        PI3 = (1-(0.5+0.5*erf((1/(2**0.5))*((y_star[-1][0]-mu[0])/sigma[0]))))\
-        *(0.5+0.5*erf((1/(2**0.5))*((y_star[-1][1]-mu[1])/sigma[1])))
+        PI1 = cdf0[:, 0]
+        PI2 = ((cdf0[:, 1:] - cdf0[:, :-1]) * cdf1[:, 1:]).sum(axis=1)
+        PI3 = (1 - cdf0[:, -1]) * cdf1[:, -1]
+        return PI1 + PI2 + PI3
 
-        PI2 = 0
-        if len(y_star)>1:
-            for i in range(len(y_star) - 1):
-                PI2=PI2+((0.5+0.5*erf((1/(2**0.5))*((y_star[i+1][0]-mu[0])/sigma[0])))\
-                -(0.5+0.5*erf((1/(2**0.5))*((y_star[i][0]-mu[0])/sigma[0]))))\
-                *(0.5+0.5*erf((1/(2**0.5))*((y_star[i+1][1]-mu[1])/sigma[1])))
-        mcpi = PI1 + PI2 + PI3
-        return mcpi
-
-    def _2obj_EI(self, mu, sigma):
+    def _2obj_EI(self, mu, sigma, PI):
         """Calculates the multi-criteria expected improvement
-        for a new point with two responses. Takes as input a
-        pareto frontier, mean and sigma of new point."""
+        for new points with two responses. Takes as input the mean and
+        sigma of each new point, as arrays of shape (points, 2), and
+        their probability of improvement."""
 
         y_star = self.y_star
-        ybar11 = mu[0]*(0.5+0.5*erf((1/(2**0.5))*((y_star[0][0]-mu[0])/sigma[0])))\
-        -sigma[0]*(1/((2*pi)**0.5))*exp(-0.5*((y_star[0][0]-mu[0])**2/sigma[0]**2))
-        ybar13 = (mu[0]*(0.5+0.5*erf((1/(2**0.5))*((y_star[-1][0]-mu[0])/sigma[0])))\
-        -sigma[0]*(1/((2*pi)**0.5))*exp(-0.5*((y_star[-1][0]-mu[0])**2/sigma[0]**2)))\
-        *(0.5+0.5*erf((1/(2**0.5))*((y_star[-1][1]-mu[1])/sigma[1])))
-
-        ybar12 = 0
-        if len(y_star) > 1:
-            for i in range(len(y_star) - 1):
-                ybar12 = ybar12+((mu[0]*(0.5+0.5*erf((1/(2**0.5))*((y_star[i+1][0]-mu[0])/sigma[0])))\
-                -sigma[0]*(1/((2*pi)**0.5))*exp(-0.5*((y_star[i+1][0]-mu[0])**2/sigma[0]**2)))\
-                -(mu[0]*(0.5+0.5*erf((1/(2**0.5))*((y_star[i][0]-mu[0])/sigma[0])))\
-                -sigma[0]*(1/((2*pi)**0.5))*exp(-0.5*((y_star[i][0]-mu[0])**2/sigma[0]**2))))\
-                *(0.5+0.5*erf((1/(2**0.5))*((y_star[i+1][1]-mu[1])/sigma[1])))
-
-        ybar1 = (ybar11+ybar12+ybar13)/self.PI
-
-        ybar21 = mu[1]*(0.5+0.5*erf((1/(2**0.5))*((y_star[0][1]-mu[1])/sigma[1])))\
-        -sigma[1]*(1/((2*pi)**0.5))*exp(-0.5*((y_star[0][1]-mu[1])**2/sigma[1]**2))
-        ybar23 = (mu[1]*(0.5+0.5*erf((1/(2**0.5))*((y_star[-1][1]-mu[1])/sigma[1])))\
-        -sigma[1]*(1/((2*pi)**0.5))*exp(-0.5*((y_star[-1][1]-mu[1])**2/sigma[1]**2)))\
-        *(0.5+0.5*erf((1/(2**0.5))*((y_star[-1][0]-mu[0])/sigma[0])))
-
-        ybar22 = 0
-        if len(y_star)>1:
-            for i in range(len(y_star) - 1):
-                ybar22 = ybar22+((mu[1]*(0.5+0.5*erf((1/(2**0.5))*((y_star[i+1][1]-mu[1])/sigma[1])))\
-                -sigma[1]*(1/((2*pi)**0.5))*exp(-0.5*((y_star[i+1][1]-mu[1])**2/sigma[1]**2)))\
-                -(mu[1]*(0.5+0.5*erf((1/(2**0.5))*((y_star[i][1]-mu[1])/sigma[1])))\
-                -sigma[1]*(1/((2*pi)**0.5))*exp(-0.5*((y_star[i][1]-mu[1])**2/sigma[1]**2))))\
-                *(0.5+0.5*erf((1/(2**0.5))*((y_star[i+1][0]-mu[0])/sigma[0])))
-
-        ybar2 = (ybar21+ybar22+ybar23)/self.PI
-        dists = [((ybar1-point[0])**2+(ybar2-point[1])**2)**0.5 for point in y_star]
-        mcei = self.PI*min(dists)
-        if isnan(mcei):
-            mcei = 0
+        cdf0 = _cdf(y_star[:, 0], mu[:, 0:1], sigma[:, 0:1])
+        cdf1 = _cdf(y_star[:, 1], mu[:, 1:2], sigma[:, 1:2])
+        moment0 = _moment(y_star[:, 0], mu[:, 0:1], sigma[:, 0:1], cdf0)
+        moment1 = _moment(y_star[:, 1], mu[:, 1:2], sigma[:, 1:2], cdf1)
+
+        ybar1 = (moment0[:, 0]
+                 + ((moment0[:, 1:] - moment0[:, :-1]) * cdf1[:, 1:]).sum(axis=1)
+                 + moment0[:, -1] * cdf1[:, -1]) / PI
+        ybar2 = (moment1[:, 0]
+                 + ((moment1[:, 1:] - moment1[:, :-1]) * cdf0[:, 1:]).sum(axis=1)
+                 + moment1[:, -1] * cdf0[:, -1]) / PI
+
+        dists = sqrt((ybar1[:, None] - y_star[:, 0])**2 +
+                     (ybar2[:, None] - y_star[:, 1])**2)
+        mcei = PI * dists.min(axis=1)
+        mcei[isnan(mcei)] = 0
         return mcei
 
-    def _dom(self, a, b):
-        """determines if a completely dominates b
-       returns True is if does
-    """
-        comp = [c1 < c2 for c1, c2 in zip(a, b)]
-        if sum(comp) == len(self.criteria):
-            return True
-        return False
-
-    def _nobj_PI(self, mu, sigma):
-        cov = diag(array(sigma)**2)
-        rands = random.multivariate_normal(mu, cov, self.n)
-        num = 0  # number of cases that dominate the current Pareto set
-
-        for random_sample in rands:
-            for par_point in self.y_star:
-                #par_point = [p[2] for p in par_point.outputs]
-                if self._dom(par_point, random_sample):
-                    num = num + 1
-                    break
-        pi = (self.n-num)/float(self.n)
-        return pi
+    def _nobj_improvement(self, mu, sigma):
+        """Monte Carlo estimate of the probability of improvement and the
+        expected improvement of new points with any number of responses.
+        Takes as input the mean and sigma of each new point, as arrays of
+        shape (points, responses). The expected improvement is the
+        probability of improvement times the distance from the centroid of
+        the improving samples to the nearest point of the Pareto frontier."""
+
+        y_star = self.y_star
+        points, objectives = mu.shape
+        PI = empty(points)
+        EI = empty(points)
+        step = max(1, _CHUNK_SIZE // (self.n * len(y_star) * objectives))
+        for start in range(0, points, step):
+            end = min(start + step, points)
+            samples = mu[start:end, None, :] + sigma[start:end, None, :] * \
+                      random.standard_normal((end - start, self.n, objectives))
+            # A sample doesn't improve if some Pareto point dominates it.
+            dominated = (y_star < samples[:, :, None, :]).all(axis=3)
+            improving = ~dominated.any(axis=2)
+            count = improving.sum(axis=1)
+            ybar = (samples * improving[:, :, None]).sum(axis=1) / count[:, None]
+            dists = sqrt(((ybar[:, None, :] - y_star)**2).sum(axis=2))
+            PI[start:end] = count / float(self.n)
+            EI[start:end] = PI[start:end] * dists.min(axis=1)
+        EI[PI == 0] = 0
+        return PI, EI
+
+    def get_improvement(self, mu, sigma):
+        """Returns ``(PI, EI)``, arrays of the probability of improvement and
+        the expected improvement for a batch of candidate points.
+
+        mu: array
+            Predicted mean of each response at each point,
+            shape (points, responses).
+
+        sigma: array
+            Predicted standard deviation of each response at each point,
+            shape (points, responses).
+        """
+        mu = atleast_2d(asarray(mu, dtype=float))
+        sigma = atleast_2d(asarray(sigma, dtype=float))
+
+        if self.y_star is None:
+            self.y_star = self.get_y_star()
+
+        with errstate(divide='ignore', invalid='ignore'):
+            if len(self.criteria) == 2:
+                PI = self._2obj_PI(mu, sigma)
+                return PI, self._2obj_EI(mu, sigma, PI)
+            return self._nobj_improvement(mu, sigma)
 
     def execute(self):
         """ Calculates the expected improvement or
         probability of improvement of a candidate
-        point given by a normal distribution.
+        point given by a normal distribution, or of each
+        point of a batch given by NormalDistributionArrays.
         """
         mu = [objective.mu for objective in self.predicted_values]
         sig = [objective.sigma for objective in self.predicted_values]
 
-        if self.y_star == None:
-            self.y_star = self.get_y_star()
+        if isinstance(self.predicted_values[0], NormalDistributionArray):
+            self.PI_values, EI = self.get_improvement(column_stack(mu),
+                                                      column_stack(sig))
+            if self.calc_switch == 'EI':
+                self.EI_values = EI
+            return
 
-        n_objs = len(self.criteria)
+        PI, EI = self.get_improvement([mu], [sig])
+        self.PI = PI[0]
+        if self.calc_switch == 'EI':
+            self.EI = EI[0]
+
+
+def _cdf(y, mu, sigma):
+    """Normal cumulative distribution of `y` given `mu` and `sigma`."""
+    return 0.5 + 0.5 * erf((y - mu) / (sigma * 2**0.5))
+
+
+def _moment(y, mu, sigma, cdf):
+    """Partial first moment of the normal distribution below `y`."""
+    return mu * cdf - sigma * (1 / (2 * pi)**0.5) * exp(-0.5 * ((y - mu) / sigma)**2)
 
-        if n_objs == 2:
-            """biobjective optimization"""
-            self.PI = self._2obj_PI(mu, sig)
-            if self.calc_switch == 'EI':
-                """execute EI calculations"""
-                self.EI = self._2obj_EI(mu, sig)
-        if n_objs > 2:
-            """n objective optimization"""
-            self.PI = self._nobj_PI(mu, sig)
-            if self.calc_switch == 'EI':
-                """execute EI calculations"""
-                self.raise_exception("EI calculations not supported"
-                                        " for more than 2 objectives", ValueError)
 
 class ConnectableMultiObjExpectedImprovement(MultiObjExpectedImprovementBase):
     best_cases = Instance(CaseSet, iotype="in",
@@ -5,20 +5,26 @@
 import glob
 import logging
 import os.path
+import Queue
 import shutil
 import stat
 import sys
+import threading
 import time
 
+from multiprocessing.managers import RemoteError
+
 # pylint: disable-msg=E0611,F0401
 from openmdao.main.datatypes.api import Bool, Dict, Str, FileRef, Float, Int, List
 
 from openmdao.main.api import Component
 from openmdao.main.exceptions import RunInterrupted, RunStopped
-from openmdao.main.rbac import AccessController, RoleError, rbac, remote_access
+from openmdao.main.rbac import AccessController, RoleError, rbac, \
+                               remote_access, get_credentials, set_credentials
 from openmdao.main.resource import ResourceAllocationManager as RAM
 
-from openmdao.util.filexfer import filexfer, pack_zipfile, unpack_zipfile
+from openmdao.util.filexfer import filexfer, pack_zipfile, unpack_zipfile, \
+                                   file_digest, ZIP_SYSTEM
 from openmdao.util import shellproc
 
 
@@ -29,6 +35,14 @@ class ExternalCode(Component):
 
     Default stdin is the 'null' device, default stdout is the console, and
     default stderr is ``error.out``.
+
+    Relative file paths are relative to the component's `directory`, in which
+    the command is run. ExternalCode doesn't need to change the current
+    directory for this, so it can run concurrently with other components.
+    Subclasses which override :meth:`execute` may access files by relative
+    path there, so they change directory while running (which serializes
+    them in a concurrent :class:`Dataflow`) unless they set
+    `run_in_directory` False.
     """
 
     PIPE     = shellproc.PIPE
@@ -54,6 +68,8 @@ class ExternalCode(Component):
     def __init__(self):
         super(ExternalCode, self).__init__()
         self.check_external_outputs=True
+        self.run_in_directory = \
+            type(self).execute.im_func is not ExternalCode.execute.im_func
 
         self.stdin  = self.DEV_NULL
         self.stdout = None
@@ -160,8 +176,8 @@ class ExternalCode(Component):
 
             elif return_code:
                 if isinstance(self.stderr, str):
-                    if os.path.exists(self.stderr):
-                        stderrfile = open(self.stderr, 'r')
+                    if os.path.exists(self._abspath(self.stderr)):
+                        stderrfile = open(self._abspath(self.stderr), 'r')
                         error_desc = stderrfile.read()
                         stderrfile.close()
                         err_fragment = "\nError Output:\n%s" % error_desc
@@ -199,18 +215,18 @@ class ExternalCode(Component):
                 else:
                     if not metadata.get('output', False):
                         continue
-                if not os.path.exists(path):
+                if not os.path.exists(self._abspath(path)):
                     iotype = 'input' if inputs else 'output'
                     self.raise_exception('missing %s file %r' % (iotype, path),
                                          RuntimeError)
         # Stdin, stdout, stderr.
         if inputs and self.stdin and self.stdin != self.DEV_NULL:
-            if not os.path.exists(self.stdin):
+            if not os.path.exists(self._abspath(self.stdin)):
                 self.raise_exception('missing stdin file %r' % self.stdin,
                                      RuntimeError)
 
         if not inputs and self.stdout and self.stdout != self.DEV_NULL:
-            if not os.path.exists(self.stdout):
+            if not os.path.exists(self._abspath(self.stdout)):
                 self.raise_exception('missing stdout file %r' % self.stdout,
                                      RuntimeError)
 
@@ -219,7 +235,7 @@ class ExternalCode(Component):
                       and self.stderr != self.STDOUT \
                       and (not self.resources or \
                            not self.resources.get('join_files')):
-            if not os.path.exists(self.stderr):
+            if not os.path.exists(self._abspath(self.stderr)):
                 self.raise_exception('missing stderr file %r' % self.stderr,
                                      RuntimeError)
         # File variables.
@@ -227,16 +243,27 @@ class ExternalCode(Component):
             for pathname, obj in self.items(iotype='in', recurse=True):
                 if isinstance(obj, FileRef):
                     path = self.get_metadata(pathname, 'local_path')
-                    if path and not os.path.exists(path):
+                    if path and not os.path.exists(self._abspath(path)):
                         self.raise_exception("missing 'in' file %r" % path,
                                              RuntimeError)
         else:
             for pathname, obj in self.items(iotype='out', recurse=True):
                 if isinstance(obj, FileRef):
-                    if not os.path.exists(obj.path):
+                    if not os.path.exists(self._abspath(obj.path)):
                         self.raise_exception("missing 'out' file %r" % obj.path,
                                              RuntimeError)
 
+    def _work_dir(self):
+        """
+        Return directory relative paths are relative to, None if the current
+        directory.
+        """
+        return self.get_abs_directory() if self.directory else None
+
+    def _abspath(self, path):
+        """ Return `path` relative to :meth:`_work_dir`. """
+        return os.path.join(self._work_dir() or '', path)
+
     def _execute_local(self):
         """ Run command. """
         self._logger.info('executing %s...', self.command)
@@ -244,7 +271,8 @@ class ExternalCode(Component):
 
         self._process = \
             shellproc.ShellProc(self.command, self.stdin,
-                                self.stdout, self.stderr, self.env_vars)
+                                self.stdout, self.stderr, self.env_vars,
+                                cwd=self._work_dir())
         self._logger.debug('PID = %d', self._process.pid)
 
         try:
@@ -367,7 +395,7 @@ class ExternalCode(Component):
 
             # Echo stdout if not redirected.
             if not self.stdout:
-                name = rdesc['output_path']
+                name = self._abspath(rdesc['output_path'])
                 if os.path.exists(name):
                     with open(name, 'rU') as inp:
                         sys.stdout.write(inp.read())
@@ -377,7 +405,7 @@ class ExternalCode(Component):
 
             # Echo stderr if not redirected.
             if not self.stderr:
-                name = rdesc['error_path']
+                name = self._abspath(rdesc['error_path'])
                 if os.path.exists(name):
                     with open(name, 'rU') as inp:
                         sys.stderr.write(inp.read())
@@ -391,19 +419,54 @@ class ExternalCode(Component):
         return (return_code, error_msg)
 
     def _send_inputs(self, patterns, textfiles):
-        """ Sends input files matching `patterns`. """
+        """
+        Sends input files matching `patterns`.
+        Files already in the server's cache are restored from there
+        rather than transferred. Servers without a cache are sent all files.
+        """
         self._logger.info('sending inputs...')
         start_time = time.time()
 
+        directory = self._work_dir()
+        files = []
+        for pattern in patterns:
+            if not os.path.isabs(pattern):
+                for path in glob.glob(self._abspath(pattern)):
+                    name = os.path.relpath(path, directory) if directory \
+                                                            else path
+                    files.append((name, file_digest(path)))
+        try:
+            restored = self._server.restore_cached(files, ZIP_SYSTEM)
+        except (AttributeError, RemoteError) as exc:
+            self._logger.debug('    restore_cached failed: %s', exc)
+            restored = None  # Older server, no cache support.
+        if restored:
+            self._logger.debug('    %d files restored from cache',
+                               len(restored))
+
         filename = 'inputs.zip'
-        pfiles, pbytes = pack_zipfile(patterns, filename, self._logger)
+        pfiles, pbytes = pack_zipfile(patterns, filename, self._logger,
+                                      exclude=restored, directory=directory)
         try:
-            filexfer(None, filename, self._server, filename, 'b')
-            ufiles, ubytes = self._server.unpack_zipfile(filename,
-                                                         textfiles=textfiles)
+            if pfiles:
+                filexfer(None, self._abspath(filename), self._server,
+                         filename, 'b')
+                try:
+                    if restored is None:
+                        ufiles, ubytes = \
+                            self._server.unpack_zipfile(filename,
+                                                        textfiles=textfiles)
+                    else:
+                        ufiles, ubytes = \
+                            self._server.unpack_zipfile(filename,
+                                                        textfiles=textfiles,
+                                                        cache=True)
+                finally:
+                    self._server.remove(filename)
+            else:
+                ufiles, ubytes = 0, 0
         finally:
-            os.remove(filename)
-            self._server.remove(filename)
+            os.remove(self._abspath(filename))
 
         # Difficult to force file transfer error.
         if ufiles != pfiles or ubytes != pbytes:  #pragma no cover
@@ -416,24 +479,61 @@ class ExternalCode(Component):
             self._logger.info('elapsed time: %f sec.', et)
 
     def _retrieve_results(self, patterns, textfiles):
-        """ Retrieves result files matching `patterns`. """
+        """
+        Retrieves result files matching `patterns`.
+        Each pattern is packed into a separate archive by a background
+        thread, so packing on the server overlaps transfer of the
+        previous archive.
+        """
         self._logger.info('retrieving results...')
         start_time = time.time()
 
-        filename = 'outputs.zip'
-        pfiles, pbytes = self._server.pack_zipfile(patterns, filename)
-        filexfer(self._server, filename, None, filename, 'b')
-
-        # Valid, but empty, file causes unpack_zipfile() problems.
+        directory = self._work_dir()
+        packed = Queue.Queue()
+        credentials = get_credentials()
+
+        def _packer():
+            """ Pack each pattern on the server, queueing results. """
+            set_credentials(credentials)
+            try:
+                for i, pattern in enumerate(patterns):
+                    filename = 'outputs-%d.zip' % i
+                    packed.put((filename,
+                                self._server.pack_zipfile([pattern], filename)))
+            except Exception as exc:
+                packed.put(exc)
+
+        packer = threading.Thread(target=_packer, name='results-packer')
+        packer.daemon = True
+        packer.start()
+
+        pfiles = pbytes = ufiles = ubytes = 0
         try:
-            if os.path.getsize(filename) > 0:
-                ufiles, ubytes = unpack_zipfile(filename, logger=self._logger,
-                                                textfiles=textfiles)
-            else:
-                ufiles, ubytes = 0, 0
+            for i in range(len(patterns)):
+                result = packed.get()
+                if isinstance(result, Exception):
+                    raise result
+                filename, (nfiles, nbytes) = result
+                pfiles += nfiles
+                pbytes += nbytes
+                local = self._abspath(filename)
+                try:
+                    filexfer(self._server, filename, None, local, 'b')
+
+                    # Valid, but empty, file causes unpack_zipfile() problems.
+                    if os.path.getsize(local) > 0:
+                        nfiles, nbytes = unpack_zipfile(local,
+                                                        logger=self._logger,
+                                                        textfiles=textfiles,
+                                                        directory=directory)
+                        ufiles += nfiles
+                        ubytes += nbytes
+                finally:
+                    if os.path.exists(local):
+                        os.remove(local)
+                    self._server.remove(filename)
         finally:
-            os.remove(filename)
-            self._server.remove(filename)
+            packer.join()
 
         # Difficult to force file transfer error.
         if ufiles != pfiles or ubytes != pbytes:  #pragma no cover
@@ -20,6 +20,12 @@
 
 from copy import deepcopy, copy
 
+try:
+    from numpy import array, atleast_2d
+except ImportError as err:
+    import logging
+    logging.warn("In %s: %r" % (__file__, err))
+
 from traits.trait_base import not_none
 from traits.has_traits import _clone_trait
 
@@ -29,6 +35,8 @@ from openmdao.main.datatypes.uncertaindist import UncertainDistVar
 from openmdao.main.interfaces import IComponent, ISurrogate, ICaseRecorder, \
      ICaseIterator, IUncertainVariable
 from openmdao.main.mp_support import has_interface
+from openmdao.main.uncertain_distributions import NormalDistribution, \
+                                                 NormalDistributionArray
 
 from openmdao.main.datatypes.api import Instance, Slot, List, Str, Float, Int, Event, \
      Dict, Bool
@@ -256,40 +264,7 @@ class MetaModelBase(Component):
                 self.update_outputs_from_model()
                 return
 
-            if self._new_train_data:
-                if len(self._training_input_history) < 2:
-                    self.raise_exception("ERROR: need at least 2 training points!",
-                                         RuntimeError)
-
-                # figure out if we have any constant training inputs
-                tcases = self._training_input_history
-                in_hist = tcases[0][:]
-                # start off assuming every input is constant
-                idxlist = range(len(in_hist))
-                self._const_inputs = dict(zip(idxlist, in_hist))
-                for i in idxlist:
-                    val = in_hist[i]
-                    for case in range(1, len(tcases)):
-                        if val != tcases[case][i]:
-                            del self._const_inputs[i]
-                            break
-
-                if len(self._const_inputs) == len(in_hist):
-                    self.raise_exception("ERROR: all training inputs are constant.")
-                elif len(self._const_inputs) > 0:
-                    # some inputs are constant, so we have to remove them from the training set
-                    training_input_history = []
-                    for inputs in self._training_input_history:
-                        training_input_history.append([val for i, val in enumerate(inputs)
-                                                       if i not in self._const_inputs])
-                else:
-                    training_input_history = self._training_input_history
-                for name, output_history in self._training_data.items():
-                    surrogate = self._get_surrogate(name)
-                    if surrogate is not None:
-                        surrogate.train(training_input_history, output_history)
-
-                self._new_train_data = False
+            self._train_surrogates()
 
             inputs = []
             for i, name in enumerate(self.surrogate_input_names()):
@@ -312,6 +287,88 @@ class MetaModelBase(Component):
                 else:
                     self._set_output(name, surrogate.predict(inputs))
 
+    def _train_surrogates(self):
+        """Train the surrogates if there is new training data."""
+        if self._new_train_data:
+            if len(self._training_input_history) < 2:
+                self.raise_exception("ERROR: need at least 2 training points!",
+                                     RuntimeError)
+
+            # figure out if we have any constant training inputs
+            tcases = self._training_input_history
+            in_hist = tcases[0][:]
+            # start off assuming every input is constant
+            idxlist = range(len(in_hist))
+            self._const_inputs = dict(zip(idxlist, in_hist))
+            for i in idxlist:
+                val = in_hist[i]
+                for case in range(1, len(tcases)):
+                    if val != tcases[case][i]:
+                        del self._const_inputs[i]
+                        break
+
+            if len(self._const_inputs) == len(in_hist):
+                self.raise_exception("ERROR: all training inputs are constant.")
+            elif len(self._const_inputs) > 0:
+                # some inputs are constant, so we have to remove them from the training set
+                training_input_history = []
+                for inputs in self._training_input_history:
+                    training_input_history.append([val for i, val in enumerate(inputs)
+                                                   if i not in self._const_inputs])
+            else:
+                training_input_history = self._training_input_history
+            for name, output_history in self._training_data.items():
+                surrogate = self._get_surrogate(name)
+                if surrogate is not None:
+                    surrogate.train(training_input_history, output_history)
+
+            self._new_train_data = False
+
+    def predict_batch(self, inputs):
+        """Returns a dictionary mapping the name of each output having a
+        surrogate to its predictions at a batch of points. This component's
+        outputs are not changed. Surrogates with a *predict_batch* method are
+        called once for the whole batch, others once per point. Uncertain
+        predictions are returned as a NormalDistributionArray, others as an
+        array.
+
+        inputs: 2D array
+            Input values, one row per point, with columns in the order of
+            :meth:`surrogate_input_names`.
+        """
+        if self.default_surrogate is None and not self._surrogate_overrides:
+            self.raise_exception("no surrogates are defined", RuntimeError)
+
+        self._train_surrogates()
+
+        inputs = atleast_2d(array(inputs, dtype=float))
+        names = self.surrogate_input_names()
+        for i, cval in self._const_inputs.items():
+            if (inputs[:, i] != cval).any():
+                self.raise_exception("ERROR: training input '%s' was a"
+                                     " constant value of (%s) but the values"
+                                     " have changed." % (names[i], cval),
+                                     ValueError)
+        columns = [i for i in range(len(names)) if i not in self._const_inputs]
+        inputs = inputs[:, columns]
+
+        predictions = {}
+        for name in self._training_data:
+            surrogate = self._get_surrogate(name)
+            if surrogate is None:
+                continue
+            if hasattr(surrogate, 'predict_batch'):
+                predictions[name] = surrogate.predict_batch(inputs)
+            else:
+                values = [surrogate.predict(row) for row in inputs]
+                if values and isinstance(values[0], NormalDistribution):
+                    predictions[name] = NormalDistributionArray(
+                                            [value.mu for value in values],
+                                            [value.sigma for value in values])
+                else:
+                    predictions[name] = array(values)
+        return predictions
+
     def _set_output(self, path, value):
         """
         Since the set method of container does not allow setting
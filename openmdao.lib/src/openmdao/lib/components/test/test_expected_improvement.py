@@ -2,9 +2,12 @@
 
 import unittest
 
+from numpy import array, linspace
+
 from openmdao.lib.components.expected_improvement import ExpectedImprovement
 from openmdao.lib.casehandlers.api import CaseSet, ListCaseIterator
-from openmdao.main.uncertain_distributions import NormalDistribution
+from openmdao.main.uncertain_distributions import NormalDistribution, \
+                                                 NormalDistributionArray
 from openmdao.main.case import Case
 
 class ExpectedImprovementTests(unittest.TestCase):
@@ -37,7 +40,44 @@ class ExpectedImprovementTests(unittest.TestCase):
         ei.execute()
         self.assertEqual(0,ei.EI)
         self.assertEqual(0,ei.PI)
-        
+
+    def test_ei_batch(self):
+        ei = ExpectedImprovement()
+        ei.best_case = CaseSet(Case(outputs=[("y",1)]))
+        ei.criteria = "y"
+        mu = linspace(-2., 3., 1000)
+        sigma = linspace(0., 2., 1000)
+        ei.predicted_mu = mu
+        ei.predicted_sigma = sigma
+        ei.execute()
+        self.assertEqual(ei.EI_values.shape, (1000,))
+        self.assertEqual(ei.PI_values.shape, (1000,))
+        self.assertEqual(0, ei.EI_values[0])
+        self.assertEqual(0, ei.PI_values[0])
+        for i in (1, 500, 999):
+            ei.predicted_value = NormalDistribution(mu=mu[i], sigma=sigma[i])
+            ei.predicted_mu = array([])
+            ei.execute()
+            self.assertAlmostEqual(ei.EI, ei.EI_values[i], 10)
+            self.assertAlmostEqual(ei.PI, ei.PI_values[i], 10)
+
+        PI, EI = ei.get_improvement(mu, sigma)
+        self.assertTrue(all(PI == ei.PI_values))
+        self.assertTrue(all(EI == ei.EI_values))
+
+        ei.predicted_value = NormalDistributionArray(mu[:10], sigma[:10])
+        ei.execute()
+        self.assertTrue(all(PI[:10] == ei.PI_values))
+        self.assertTrue(all(EI[:10] == ei.EI_values))
+
+        try:
+            ei.get_improvement(mu, sigma[:10])
+        except ValueError, err:
+            self.assertEqual(str(err), ": mu shape (1000,) does not match"
+                                       " sigma shape (10,)")
+        else:
+            self.fail('ValueError expected')
+
 if __name__ == "__main__":
     unittest.main()
 
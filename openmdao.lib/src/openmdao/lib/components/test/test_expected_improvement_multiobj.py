@@ -1,10 +1,12 @@
 # pylint: disable-msg=C0111,C0103
 
 import unittest
-from numpy import array
+from numpy import array, random
+from openmdao.lib.components import expected_improvement_multiobj
 from openmdao.lib.components.expected_improvement_multiobj import MultiObjExpectedImprovement
 from openmdao.lib.casehandlers.api import CaseSet, ListCaseIterator
-from openmdao.main.uncertain_distributions import NormalDistribution
+from openmdao.main.uncertain_distributions import NormalDistribution, \
+                                                 NormalDistributionArray
 from openmdao.main.case import Case
 
 class MultiObjExpectedImprovementTests(unittest.TestCase):
@@ -49,12 +51,72 @@ class MultiObjExpectedImprovementTests(unittest.TestCase):
         ei.predicted_values = [NormalDistribution(mu=1,sigma=1),
                                NormalDistribution(mu=1,sigma=1),
                                NormalDistribution(mu=1,sigma=1)]
+        ei.calc_switch = 'PI'
+        ei.execute()
+        self.assertEqual(0.0, ei.EI)
         ei.calc_switch = 'EI'
-        try:
+        ei.execute()
+        self.assertAlmostEqual(0.875, ei.PI, 1)
+        self.assertTrue(ei.EI > 0.)
+
+    def test_batch(self):
+        ei = MultiObjExpectedImprovement()
+        bests = CaseSet()
+        list_of_cases = [Case(outputs=[("y1",0),("y2",3)]),
+                         Case(outputs=[("y1",1),("y2",1)]),
+                         Case(outputs=[("y1",3),("y2",0)])]
+        for case in list_of_cases:
+            bests.record(case)
+        ei.best_cases = bests
+        ei.criteria = ["y1","y2"]
+        ei.calc_switch = "EI"
+
+        mu = array([[1., 0.], [2., 2.], [0.5, 0.5], [4., 4.]])
+        sigma = array([[1., 1.], [0.5, 2.], [0.1, 0.1], [0.2, 0.2]])
+        PI, EI = ei.get_improvement(mu, sigma)
+        self.assertEqual(PI.shape, (4,))
+        self.assertEqual(EI.shape, (4,))
+        for i in range(4):
+            ei.predicted_values = [NormalDistribution(mu=mu[i][0],sigma=sigma[i][0]),
+                                   NormalDistribution(mu=mu[i][1],sigma=sigma[i][1])]
             ei.execute()
-        except ValueError,err:
-            self.assertEqual(str(err),': EI calculations not supported'
-                                            ' for more than 2 objectives')
+            self.assertAlmostEqual(ei.PI, PI[i], 10)
+            self.assertAlmostEqual(ei.EI, EI[i], 10)
+        self.assertAlmostEqual(PI[2], 1.0, 5)
+        self.assertTrue(PI[3] < 1e-6)
+
+        ei.predicted_values = [NormalDistributionArray(mu[:, 0], sigma[:, 0]),
+                               NormalDistributionArray(mu[:, 1], sigma[:, 1])]
+        ei.execute()
+        self.assertTrue(all(PI == ei.PI_values))
+        self.assertTrue(all(EI == ei.EI_values))
+
+        # More than two objectives uses Monte Carlo sampling.
+        ei = MultiObjExpectedImprovement()
+        bests = CaseSet()
+        bests.record(Case(outputs=[("y1",1),("y2",1),("y3",1)]))
+        ei.best_cases = bests
+        ei.criteria = ['y1','y2','y3']
+        PI, EI = ei.get_improvement([[1., 1., 1.], [-10., -10., -10.]],
+                                    [[1., 1., 1.], [1., 1., 1.]])
+        self.assertAlmostEqual(0.875, PI[0], 1)
+        self.assertEqual(1.0, PI[1])
+        self.assertAlmostEqual(EI[1], 11*3**0.5, 0)
+
+        # Sampling in chunks draws the same samples.
+        mu = random.uniform(-1, 3, (7, 3))
+        sigma = random.uniform(0.1, 1, (7, 3))
+        random.seed(10)
+        PI, EI = ei.get_improvement(mu, sigma)
+        chunk_size = expected_improvement_multiobj._CHUNK_SIZE
+        expected_improvement_multiobj._CHUNK_SIZE = 2 * ei.n * 3
+        try:
+            random.seed(10)
+            PI2, EI2 = ei.get_improvement(mu, sigma)
+        finally:
+            expected_improvement_multiobj._CHUNK_SIZE = chunk_size
+        self.assertTrue(all(PI == PI2))
+        self.assertTrue(all(abs(EI - EI2) < 1e-12))
 
     def test_reset_y_star_event(self):
         ei = MultiObjExpectedImprovement()
@@ -85,6 +85,19 @@ class Model(Assembly):
         self.connect('b.outfile', 'outfile')
 
 
+class Parallel(Assembly):
+    """ Run independent `Unique` component instances. """
+
+    infile = File(iotype='in', local_path='input')
+
+    def configure(self):
+        self.add('a', Unique())
+        self.add('b', Unique())
+        self.driver.workflow.add(['a', 'b'])
+        self.connect('infile', 'a.infile')
+        self.connect('infile', 'b.infile')
+
+
 class TestCase(unittest.TestCase):
     """ Test the ExternalCode component. """
 
@@ -97,7 +110,8 @@ class TestCase(unittest.TestCase):
         dum = Assembly()  # create this here to prevent any Assemblies in tests to be 'first'
 
     def tearDown(self):
-        for directory in ('a', 'b'):
+        # xfer_cache is the local allocator's cache of transferred files.
+        for directory in ('a', 'b', 'xfer_cache'):
             if os.path.exists(directory):
                 shutil.rmtree(directory, onerror=onerror)
         for name in (ENV_FILE, INP_FILE, 'input', 'output',
@@ -382,6 +396,41 @@ class TestCase(unittest.TestCase):
             result = inp.read()
         self.assertEqual(result, INP_DATA)
 
+    def test_concurrent(self):
+        logging.debug('')
+        logging.debug('test_concurrent')
+
+        model = set_as_top(Parallel())
+        model.infile = FileRef(INP_FILE, model, input=True)
+        model.driver.max_workers = 2
+        model.force_execute = True
+        for comp in (model.a, model.b):
+            comp.force_execute = True
+
+        # Sleeper overrides execute(), so it changes directory by default,
+        # and components with a directory are run one at a time.
+        start = time.time()
+        model.run()
+        self.assertTrue(time.time() - start > 2.)
+
+        # Sleeper's execute() only sets the command, so it needn't change
+        # directory, and can run concurrently.
+        for comp in (model.a, model.b):
+            self.assertEqual(comp.run_in_directory, True)
+            comp.run_in_directory = False
+        cwd = os.getcwd()
+        start = time.time()
+        model.run()
+        self.assertTrue(time.time() - start < 1.9)
+        self.assertEqual(os.getcwd(), cwd)
+        for comp in (model.a, model.b):
+            self.assertEqual(comp.return_code, 0)
+            with comp.outfile.open() as inp:
+                self.assertEqual(inp.read(), INP_DATA)
+
+        # A plain ExternalCode doesn't change directory.
+        self.assertEqual(ExternalCode().run_in_directory, False)
+
     def test_rsh(self):
         logging.debug('')
         logging.debug('test_rsh')
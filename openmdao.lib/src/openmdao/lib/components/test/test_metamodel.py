@@ -28,7 +28,8 @@ from traits.api import HasTraits
 from openmdao.main.api import Component, Assembly, VariableTree, set_as_top, Case
 from openmdao.main.interfaces import implements, ICaseRecorder
 
-from openmdao.main.uncertain_distributions import NormalDistribution, UncertainDistribution
+from openmdao.main.uncertain_distributions import NormalDistribution, UncertainDistribution, \
+                                                 NormalDistributionArray
 
 from openmdao.main.datatypes.api import Float, VarTree
 from openmdao.lib.casehandlers.api import ListCaseIterator
@@ -388,6 +389,39 @@ class MetaModelTestCase(unittest.TestCase):
             self.fail("Exception expected")
 
 
+    def test_predict_batch(self):
+        avals = [1.1, 1.2, 1.5, 1.9, 2.4]
+        bvals = [2.2]*5
+        asm = self._trained_asm(avals, bvals)
+        asm.metamodel.surrogates['d'] = FloatKrigingSurrogate()
+        asm.metamodel.train_next = 1
+        asm.metamodel.a = 2.
+        asm.metamodel.b = 2.2
+        asm.metamodel.run()
+
+        points = [[1.3, 2.2], [1.7, 2.2], [2.2, 2.2]]
+        predictions = asm.metamodel.predict_batch(points)
+        self.assertEqual(sorted(predictions.keys()), ['c', 'd'])
+        self.assertTrue(isinstance(predictions['c'], NormalDistributionArray))
+        self.assertEqual(predictions['d'].shape, (3,))
+        for i, (a, b) in enumerate(points):
+            asm.metamodel.a = a
+            asm.metamodel.run()
+            assert_rel_error(self, predictions['c'].mu[i],
+                             asm.metamodel.c.mu, 1e-10)
+            assert_rel_error(self, predictions['c'].sigma[i],
+                             asm.metamodel.c.sigma, 1e-6)
+            assert_rel_error(self, predictions['d'][i], asm.metamodel.d, 1e-10)
+
+        try:
+            asm.metamodel.predict_batch([[1.3, 2.2], [1.7, 2.5]])
+        except ValueError as err:
+            self.assertEqual(str(err),
+                             "metamodel: ERROR: training input 'b' was a constant"
+                             " value of (2.2) but the values have changed.")
+        else:
+            self.fail("ValueError expected")
+
     def test_warm_start(self):
         metamodel = MetaModel()
         metamodel.name = 'meta'
@@ -10,7 +10,8 @@ be used with polar (2D) or cylindrical (3D) coordinates. :meth:`calculate`
 should be prepared for this.
 """
 
-from math import sqrt
+import numpy
+from numpy import sqrt
 
 from openmdao.units.units import PhysicalQuantity
 
@@ -40,6 +41,10 @@ def register_metric(name, cls, integrate, geometry='any'):
         either the cell volume, a non-dimensional vector normal
         to the cell face with magnitude equal to its area, or the edge length,
         depending upon the type of region (volume, surface, or curve).
+        If `cls` has a true `vectorized` attribute, `loc` will be a tuple
+        of slices selecting a block of the zone arrays and `geom` will
+        contain arrays of the same shape, so :meth:`calculate` should
+        return an array of values for the whole block.
         :meth:`dimensionalize` is called with the accumulated value.
         It should return a :class:`PhysicalQuantity` for the dimensionalized
         value.
@@ -65,6 +70,14 @@ def list_metrics():
     return sorted(_METRICS.keys())
 
 
+def _values(arr, loc):
+    """
+    Return `arr` values at `loc` in double precision, since zone data
+    is often single precision.
+    """
+    return numpy.asarray(arr[loc], dtype=float)
+
+
 def create_scalar_metric(var_name):
     """
     Creates a minimal metric calculation class for `var_name` and registers it.
@@ -77,12 +90,14 @@ def create_scalar_metric(var_name):
 class %(cls_name)s(object):
     """ Computes %(var_name)s. """
 
+    vectorized = True
+
     def __init__(self, zone, zone_name, reference_state):
-        self.%(var_name)s = zone.flow_solution.%(var_name)s.item
+        self.%(var_name)s = zone.flow_solution.%(var_name)s
 
     def calculate(self, loc, length):
         """ Return metric value. """
-        return self.%(var_name)s(*loc)
+        return _values(self.%(var_name)s, loc)
 
     def dimensionalize(self, value):
         """ Return dimensional `value`. """
@@ -95,6 +110,8 @@ register_metric('%(var_name)s', %(cls_name)s, False, 'any')
 class Area(object):
     """ Computes area of mesh surface. """
 
+    vectorized = True
+
     def __init__(self, zone, zone_name, reference_state):
         if reference_state is None:
             self.aref = 1.
@@ -111,9 +128,9 @@ class Area(object):
     def calculate(self, loc, normal):
         """ Return metric value. """
         sc1, sc2, sc3 = normal
-        sc1 *= self.aref
-        sc2 *= self.aref
-        sc3 *= self.aref
+        sc1 = sc1 * self.aref
+        sc2 = sc2 * self.aref
+        sc3 = sc3 * self.aref
         return sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3)
 
     def dimensionalize(self, value):
@@ -126,6 +143,8 @@ register_metric('area', Area, True, 'surface')
 class Length(object):
     """ Computes length of mesh curve. """
 
+    vectorized = True
+
     def __init__(self, zone, zone_name, reference_state):
         if reference_state is None:
             self.units = None
@@ -152,6 +171,8 @@ register_metric('length', Length, True, 'curve')
 class MassFlow(object):
     """ Computes mass flow across a mesh surface. """
 
+    vectorized = True
+
     def __init__(self, zone, zone_name, reference_state):
         flow = zone.flow_solution
         cylindrical = zone.coordinate_system == CYLINDRICAL
@@ -186,23 +207,23 @@ class MassFlow(object):
             self.momref = momref.value
 
         if cylindrical:
-            self.mom_c1 = None if momentum.z is None else momentum.z.item
-            self.mom_c2 = momentum.r.item
-            self.mom_c3 = momentum.t.item
+            self.mom_c1 = momentum.z
+            self.mom_c2 = momentum.r
+            self.mom_c3 = momentum.t
         else:
-            self.mom_c1 = momentum.x.item
-            self.mom_c2 = None if momentum.y is None else momentum.y.item
-            self.mom_c3 = None if momentum.z is None else momentum.z.item
+            self.mom_c1 = momentum.x
+            self.mom_c2 = momentum.y
+            self.mom_c3 = momentum.z
 
     def calculate(self, loc, normal):
         """ Return metric value. """
-        rvu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref
-        rvv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref
-        rvw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref
+        rvu = 0. if self.mom_c1 is None else _values(self.mom_c1, loc) * self.momref
+        rvv = 0. if self.mom_c2 is None else _values(self.mom_c2, loc) * self.momref
+        rvw = 0. if self.mom_c3 is None else _values(self.mom_c3, loc) * self.momref
         sc1, sc2, sc3 = normal
-        sc1 *= self.aref
-        sc2 *= self.aref
-        sc3 *= self.aref
+        sc1 = sc1 * self.aref
+        sc2 = sc2 * self.aref
+        sc3 = sc3 * self.aref
         return rvu*sc1 + rvv*sc2 + rvw*sc3
 
     def dimensionalize(self, value):
@@ -215,6 +236,8 @@ register_metric('mass_flow', MassFlow, True, 'surface')
 class CorrectedMassFlow(object):
     """ Computes corrected mass flow across a mesh surface. """
 
+    vectorized = True
+
     def __init__(self, zone, zone_name, reference_state):
         flow = zone.flow_solution
         cylindrical = zone.coordinate_system == CYLINDRICAL
@@ -222,15 +245,15 @@ class CorrectedMassFlow(object):
         # 'pressure' required until we can determine dimensionalized
         # static pressure from 'Q' variables.
         try:
-            self.density = flow.density.item
+            self.density = flow.density
             momentum = flow.momentum
-            self.pressure = flow.pressure.item
+            self.pressure = flow.pressure
         except AttributeError:
             vnames = ('density', 'momentum', 'pressure')
             raise AttributeError('For corrected_mass_flow, zone %s is missing'
                                  ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.gam = flow.gamma.item
+            self.gam = flow.gamma
         except AttributeError:
             self.gam = None  # Use passed-in scalar gamma.
 
@@ -271,29 +294,29 @@ class CorrectedMassFlow(object):
         self.tstd = tstd.value
 
         if cylindrical:
-            self.mom_c1 = None if momentum.z is None else momentum.z.item
-            self.mom_c2 = momentum.r.item
-            self.mom_c3 = momentum.t.item
+            self.mom_c1 = momentum.z
+            self.mom_c2 = momentum.r
+            self.mom_c3 = momentum.t
         else:
-            self.mom_c1 = momentum.x.item
-            self.mom_c2 = None if momentum.y is None else momentum.y.item
-            self.mom_c3 = None if momentum.z is None else momentum.z.item
+            self.mom_c1 = momentum.x
+            self.mom_c2 = momentum.y
+            self.mom_c3 = momentum.z
 
     def calculate(self, loc, normal):
         """ Return metric value. """
-        rho = self.density(*loc) * self.rhoref
-        rvu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref
-        rvv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref
-        rvw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref
-        ps = self.pressure(*loc) * self.pref
+        rho = _values(self.density, loc) * self.rhoref
+        rvu = 0. if self.mom_c1 is None else _values(self.mom_c1, loc) * self.momref
+        rvv = 0. if self.mom_c2 is None else _values(self.mom_c2, loc) * self.momref
+        rvw = 0. if self.mom_c3 is None else _values(self.mom_c3, loc) * self.momref
+        ps = _values(self.pressure, loc) * self.pref
         if self.gam is not None:
-            gamma = self.gam(*loc)
+            gamma = _values(self.gam, loc)
         else:
             gamma = self.gamma
         sc1, sc2, sc3 = normal
-        sc1 *= self.aref
-        sc2 *= self.aref
-        sc3 *= self.aref
+        sc1 = sc1 * self.aref
+        sc2 = sc2 * self.aref
+        sc3 = sc3 * self.aref
         w = rvu*sc1 + rvv*sc2 + rvw*sc3
 
         u2 = (rvu*rvu + rvv*rvv + rvw*rvw) / (rho*rho)
@@ -316,25 +339,27 @@ register_metric('corrected_mass_flow', CorrectedMassFlow, True, 'surface')
 class StaticPressure(object):
     """ Computes weighted static pressure for a mesh region. """
 
+    vectorized = True
+
     def __init__(self, zone, zone_name, reference_state):
         flow = zone.flow_solution
         cylindrical = zone.coordinate_system == CYLINDRICAL
 
         try:  # Some codes have this directly available.
-            self.pressure = flow.pressure.item
+            self.pressure = flow.pressure
         except AttributeError:
             self.pressure = None
             try:  # Look for typical Q variables.
-                self.density = flow.density.item
+                self.density = flow.density
                 momentum = flow.momentum
-                self.energy = flow.energy_stagnation_density.item
+                self.energy = flow.energy_stagnation_density
             except AttributeError:
                 vnames = ('pressure', 'density', 'momentum',
                           'energy_stagnation_density')
                 raise AttributeError('For pressure, zone %s is missing'
                                      ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.gam = flow.gamma.item
+            self.gam = flow.gamma
         except AttributeError:
             self.gam = None  # Use passed-in scalar gamma.
 
@@ -376,26 +401,26 @@ class StaticPressure(object):
 
         if self.pressure is None:
             if cylindrical:
-                self.mom_c1 = None if momentum.z is None else momentum.z.item
-                self.mom_c2 = momentum.r.item
-                self.mom_c3 = momentum.t.item
+                self.mom_c1 = momentum.z
+                self.mom_c2 = momentum.r
+                self.mom_c3 = momentum.t
             else:
-                self.mom_c1 = momentum.x.item
-                self.mom_c2 = None if momentum.y is None else momentum.y.item
-                self.mom_c3 = None if momentum.z is None else momentum.z.item
+                self.mom_c1 = momentum.x
+                self.mom_c2 = momentum.y
+                self.mom_c3 = momentum.z
 
     def calculate(self, loc, geom):
         """ Return metric value. """
         if self.pressure is not None:
-            return self.pressure(*loc) * self.pref
+            return _values(self.pressure, loc) * self.pref
         else:
-            rho = self.density(*loc) * self.rhoref
-            vu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref / rho
-            vv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref / rho
-            vw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref / rho
-            e0 = self.energy(*loc) * self.e0ref / rho
+            rho = _values(self.density, loc) * self.rhoref
+            vu = 0. if self.mom_c1 is None else _values(self.mom_c1, loc) * self.momref / rho
+            vv = 0. if self.mom_c2 is None else _values(self.mom_c2, loc) * self.momref / rho
+            vw = 0. if self.mom_c3 is None else _values(self.mom_c3, loc) * self.momref / rho
+            e0 = _values(self.energy, loc) * self.e0ref / rho
             if self.gam is not None:
-                gamma = self.gam(*loc)
+                gamma = _values(self.gam, loc)
             else:
                 gamma = self.gamma
 
@@ -411,29 +436,31 @@ register_metric('pressure', StaticPressure, False)
 class TotalPressure(object):
     """ Computes weighted total pressure for a mesh region. """
 
+    vectorized = True
+
     def __init__(self, zone, zone_name, reference_state):
         flow = zone.flow_solution
         cylindrical = zone.coordinate_system == CYLINDRICAL
 
         try:
-            self.density = flow.density.item
+            self.density = flow.density
             momentum = flow.momentum
         except AttributeError:
             vnames = ('density', 'momentum')
             raise AttributeError('For pressure_stagnation, zone %s is missing'
                              ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.pressure = flow.pressure.item
+            self.pressure = flow.pressure
         except AttributeError:
             self.pressure = None
             try:
-                self.energy = flow.energy_stagnation_density.item
+                self.energy = flow.energy_stagnation_density
             except AttributeError:
                 vnames = ('pressure', 'energy_stagnation_density')
                 raise AttributeError('For pressure_stagnation, zone %s is missing'
                                      ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.gam = flow.gamma.item
+            self.gam = flow.gamma
         except AttributeError:
             self.gam = None  # Use passed-in scalar gamma.
 
@@ -468,30 +495,30 @@ class TotalPressure(object):
             self.pref = pref.value
 
         if cylindrical:
-            self.mom_c1 = None if momentum.z is None else momentum.z.item
-            self.mom_c2 = momentum.r.item
-            self.mom_c3 = momentum.t.item
+            self.mom_c1 = momentum.z
+            self.mom_c2 = momentum.r
+            self.mom_c3 = momentum.t
         else:
-            self.mom_c1 = momentum.x.item
-            self.mom_c2 = None if momentum.y is None else momentum.y.item
-            self.mom_c3 = None if momentum.z is None else momentum.z.item
+            self.mom_c1 = momentum.x
+            self.mom_c2 = momentum.y
+            self.mom_c3 = momentum.z
 
     def calculate(self, loc, geom):
         """ Return metric value. """
-        rho = self.density(*loc) * self.rhoref
-        vu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref / rho
-        vv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref / rho
-        vw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref / rho
+        rho = _values(self.density, loc) * self.rhoref
+        vu = 0. if self.mom_c1 is None else _values(self.mom_c1, loc) * self.momref / rho
+        vv = 0. if self.mom_c2 is None else _values(self.mom_c2, loc) * self.momref / rho
+        vw = 0. if self.mom_c3 is None else _values(self.mom_c3, loc) * self.momref / rho
         if self.gam is not None:
-            gamma = self.gam(*loc)
+            gamma = _values(self.gam, loc)
         else:
             gamma = self.gamma
 
         u2 = vu*vu + vv*vv + vw*vw
         if self.pressure is not None:
-            ps = self.pressure(*loc) * self.pref
+            ps = _values(self.pressure, loc) * self.pref
         else:
-            e0 = self.energy(*loc) * self.e0ref / rho
+            e0 = _values(self.energy, loc) * self.e0ref / rho
             ps = (gamma-1.) * rho * (e0 - 0.5*u2)
         a2 = (gamma * ps) / rho
         mach2 = u2 / a2
@@ -507,28 +534,30 @@ register_metric('pressure_stagnation', TotalPressure, False)
 class StaticTemperature(object):
     """ Computes weighted static temperature for a mesh region. """
 
+    vectorized = True
+
     def __init__(self, zone, zone_name, reference_state):
         flow = zone.flow_solution
         cylindrical = zone.coordinate_system == CYLINDRICAL
 
         try:
-            self.density = flow.density.item
+            self.density = flow.density
         except AttributeError:
             raise AttributeError('For temperature, zone %s is missing'
                                  ' density.' % zone_name)
         try:
-            self.pressure = flow.pressure.item
+            self.pressure = flow.pressure
         except AttributeError:
             self.pressure = None
             try:  # Look for typical Q variables.
                 momentum = flow.momentum
-                self.energy = flow.energy_stagnation_density.item
+                self.energy = flow.energy_stagnation_density
             except AttributeError:
                 vnames = ('pressure', 'momentum', 'energy_stagnation_density')
                 raise AttributeError('For temperature, zone %s is missing'
                                      ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.gam = flow.gamma.item
+            self.gam = flow.gamma
         except AttributeError:
             self.gam = None  # Use passed-in scalar gamma.
 
@@ -569,26 +598,26 @@ class StaticTemperature(object):
 
         if self.pressure is None:
             if cylindrical:
-                self.mom_c1 = None if momentum.z is None else momentum.z.item
-                self.mom_c2 = momentum.r.item
-                self.mom_c3 = momentum.t.item
+                self.mom_c1 = momentum.z
+                self.mom_c2 = momentum.r
+                self.mom_c3 = momentum.t
             else:
-                self.mom_c1 = momentum.x.item
-                self.mom_c2 = None if momentum.y is None else momentum.y.item
-                self.mom_c3 = None if momentum.z is None else momentum.z.item
+                self.mom_c1 = momentum.x
+                self.mom_c2 = momentum.y
+                self.mom_c3 = momentum.z
 
     def calculate(self, loc, geom):
         """ Return metric value. """
-        rho = self.density(*loc) * self.rhoref
+        rho = _values(self.density, loc) * self.rhoref
         if self.pressure is not None:
-            ps = self.pressure(*loc) * self.pref
+            ps = _values(self.pressure, loc) * self.pref
         else:
-            vu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref / rho
-            vv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref / rho
-            vw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref / rho
-            e0 = self.energy(*loc) * self.e0ref / rho
+            vu = 0. if self.mom_c1 is None else _values(self.mom_c1, loc) * self.momref / rho
+            vv = 0. if self.mom_c2 is None else _values(self.mom_c2, loc) * self.momref / rho
+            vw = 0. if self.mom_c3 is None else _values(self.mom_c3, loc) * self.momref / rho
+            e0 = _values(self.energy, loc) * self.e0ref / rho
             if self.gam is not None:
-                gamma = self.gam(*loc)
+                gamma = _values(self.gam, loc)
             else:
                 gamma = self.gamma
             ps = (gamma-1.) * rho * (e0 - 0.5*(vu*vu + vv*vv + vw*vw))
@@ -604,29 +633,31 @@ register_metric('temperature', StaticTemperature, False)
 class TotalTemperature(object):
     """ Computes weighted total temperature for a mesh region. """
 
+    vectorized = True
+
     def __init__(self, zone, zone_name, reference_state):
         flow = zone.flow_solution
         cylindrical = zone.coordinate_system == CYLINDRICAL
 
         try:
-            self.density = flow.density.item
+            self.density = flow.density
             momentum = flow.momentum
         except AttributeError:
             vnames = ('density', 'momentum')
             raise AttributeError('For temperature_stagnation, zone %s is missing'
                                  ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.pressure = flow.pressure.item
+            self.pressure = flow.pressure
         except AttributeError:
             self.pressure = None
             try:
-                self.energy = flow.energy_stagnation_density.item
+                self.energy = flow.energy_stagnation_density
             except AttributeError:
                 vnames = ('pressure', 'energy_stagnation_density')
                 raise AttributeError('For temperature_stagnation, zone %s is'
                                      ' one or more of %s.' % (zone_name, vnames))
         try:
-            self.gam = flow.gamma.item
+            self.gam = flow.gamma
         except AttributeError:
             self.gam = None  # Use passed-in scalar gamma.
 
@@ -662,30 +693,30 @@ class TotalTemperature(object):
             self.tref = tref
 
         if cylindrical:
-            self.mom_c1 = None if momentum.z is None else momentum.z.item
-            self.mom_c2 = momentum.r.item
-            self.mom_c3 = momentum.t.item
+            self.mom_c1 = momentum.z
+            self.mom_c2 = momentum.r
+            self.mom_c3 = momentum.t
         else:
-            self.mom_c1 = momentum.x.item
-            self.mom_c2 = None if momentum.y is None else momentum.y.item
-            self.mom_c3 = None if momentum.z is None else momentum.z.item
+            self.mom_c1 = momentum.x
+            self.mom_c2 = momentum.y
+            self.mom_c3 = momentum.z
 
     def calculate(self, loc, geom):
         """ Return metric value. """
-        rho = self.density(*loc) * self.rhoref
-        vu = 0. if self.mom_c1 is None else self.mom_c1(*loc) * self.momref / rho
-        vv = 0. if self.mom_c2 is None else self.mom_c2(*loc) * self.momref / rho
-        vw = 0. if self.mom_c3 is None else self.mom_c3(*loc) * self.momref / rho
+        rho = _values(self.density, loc) * self.rhoref
+        vu = 0. if self.mom_c1 is None else _values(self.mom_c1, loc) * self.momref / rho
+        vv = 0. if self.mom_c2 is None else _values(self.mom_c2, loc) * self.momref / rho
+        vw = 0. if self.mom_c3 is None else _values(self.mom_c3, loc) * self.momref / rho
         if self.gam is not None:
-            gamma = self.gam(*loc)
+            gamma = _values(self.gam, loc)
         else:
             gamma = self.gamma
 
         u2 = vu*vu + vv*vv + vw*vw
         if self.pressure is not None:
-            ps = self.pressure(*loc) * self.pref
+            ps = _values(self.pressure, loc) * self.pref
         else:
-            e0 = self.energy(*loc) * self.e0ref / rho
+            e0 = _values(self.energy, loc) * self.e0ref / rho
             ps = (gamma-1.) * rho * (e0 - 0.5*u2)
         a2 = (gamma * ps) / rho
         mach2 = u2 / a2
@@ -702,6 +733,8 @@ register_metric('temperature_stagnation', TotalTemperature, False)
 class Volume(object):
     """ Computes volume of mesh volume. """
 
+    vectorized = True
+
     def __init__(self, zone, zone_name, reference_state):
         if reference_state is None:
             self.units = None
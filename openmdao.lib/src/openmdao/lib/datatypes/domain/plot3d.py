@@ -32,11 +32,22 @@ unformatted: bool
 logger: Logger or None
     Used to record progress.
 
+lazy: bool
+    If True, zone arrays are backed by a memory map of the file rather than
+    read into memory, and data is only paged in as it is accessed.
+    Changes to the arrays are not written back to the file.
+    Only meaningful if `binary`.
+
 Default argument values are set for a typical 3D multiblock single-precision
 Fortran unformatted file.  When writing, zones are assumed in Cartesian
 coordinates with data located at the vertices.
 """
 
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
 import numpy
 
 from openmdao.util.log import NullLogger
@@ -49,7 +60,8 @@ from openmdao.lib.datatypes.domain.vector import Vector
 
 def read_plot3d_q(grid_file, q_file, multiblock=True, dim=3, blanking=False,
                   planes=False, binary=True, big_endian=False,
-                  single_precision=True, unformatted=True, logger=None):
+                  single_precision=True, unformatted=True, logger=None,
+                  lazy=False):
     """
     Returns a :class:`DomainObj` initialized from Plot3D `grid_file` and
     `q_file`.  Q variables are assigned to 'density', 'momentum', and
@@ -66,7 +78,7 @@ def read_plot3d_q(grid_file, q_file, multiblock=True, dim=3, blanking=False,
 
     domain = read_plot3d_grid(grid_file, multiblock, dim, blanking, planes,
                               binary, big_endian, single_precision,
-                              unformatted, logger)
+                              unformatted, logger, lazy)
 
     mode = 'rb' if binary else 'r'
     with open(q_file, mode) as inp:
@@ -116,14 +128,15 @@ def read_plot3d_q(grid_file, q_file, multiblock=True, dim=3, blanking=False,
             name = domain.zone_name(zone)
             logger.debug('reading data for %s', name)
             _read_plot3d_qscalars(zone, stream, logger)
-            _read_plot3d_qvars(zone, stream, planes, logger)
+            _read_plot3d_qvars(zone, stream, planes, logger, lazy)
 
     return domain
 
 
 def read_plot3d_f(grid_file, f_file, varnames=None, multiblock=True, dim=3,
                   blanking=False, planes=False, binary=True, big_endian=False,
-                  single_precision=True, unformatted=True, logger=None):
+                  single_precision=True, unformatted=True, logger=None,
+                  lazy=False):
     """
     Returns a :class:`DomainObj` initialized from Plot3D `grid_file` and
     `f_file`.  Variables are assigned to names of the form `f_N`.
@@ -138,7 +151,7 @@ def read_plot3d_f(grid_file, f_file, varnames=None, multiblock=True, dim=3,
 
     domain = read_plot3d_grid(grid_file, multiblock, dim, blanking, planes,
                               binary, big_endian, single_precision,
-                              unformatted, logger)
+                              unformatted, logger, lazy)
 
     mode = 'rb' if binary else 'r'
     with open(f_file, mode) as inp:
@@ -189,13 +202,14 @@ def read_plot3d_f(grid_file, f_file, varnames=None, multiblock=True, dim=3,
             name = domain.zone_name(zone)
             logger.debug('reading data for %s', name)
             _read_plot3d_fvars(zone, stream, dim, nvars, varnames, planes,
-                               logger)
+                               logger, lazy)
     return domain
 
 
 def read_plot3d_grid(grid_file, multiblock=True, dim=3, blanking=False,
                      planes=False, binary=True, big_endian=False,
-                     single_precision=True, unformatted=True, logger=None):
+                     single_precision=True, unformatted=True, logger=None,
+                     lazy=False):
     """
     Returns a :class:`DomainObj` initialized from Plot3D `grid_file`.
 
@@ -220,7 +234,7 @@ def read_plot3d_grid(grid_file, multiblock=True, dim=3, blanking=False,
             name = domain.zone_name(zone)
             logger.debug('reading coordinates for %s', name)
             _read_plot3d_coords(zone, stream, shape[i], blanking, planes,
-                                logger)
+                                logger, lazy)
     return domain
 
 
@@ -311,7 +325,7 @@ def _read_plot3d_dims(stream, dim, f_file=False):
         return (imax, jmax, kmax)
 
 
-def _read_plot3d_coords(zone, stream, shape, blanking, planes, logger):
+def _read_plot3d_coords(zone, stream, shape, blanking, planes, logger, lazy):
     """ Reads coordinates (& blanking) from given Plot3D stream. """
     if blanking:
         raise NotImplementedError('blanking not supported yet')
@@ -332,18 +346,17 @@ def _read_plot3d_coords(zone, stream, shape, blanking, planes, logger):
             logger.warning('unexpected coords recordlength'
                            ' %d vs. %d', reclen, expected)
 
-    zone.grid_coordinates.x = stream.read_floats(shape, order='Fortran')
-    logger.debug('    x min %g, max %g',
-                 zone.grid_coordinates.x.min(), zone.grid_coordinates.x.max())
+    read_floats = stream.map_floats if lazy else stream.read_floats
 
-    zone.grid_coordinates.y = stream.read_floats(shape, order='Fortran')
-    logger.debug('    y min %g, max %g',
-                 zone.grid_coordinates.y.min(), zone.grid_coordinates.y.max())
+    zone.grid_coordinates.x = read_floats(shape, order='Fortran')
+    _log_range(logger, 'x', zone.grid_coordinates.x, lazy)
+
+    zone.grid_coordinates.y = read_floats(shape, order='Fortran')
+    _log_range(logger, 'y', zone.grid_coordinates.y, lazy)
 
     if dim > 2:
-        zone.grid_coordinates.z = stream.read_floats(shape, order='Fortran')
-        logger.debug('    z min %g, max %g',
-                     zone.grid_coordinates.z.min(), zone.grid_coordinates.z.max())
+        zone.grid_coordinates.z = read_floats(shape, order='Fortran')
+        _log_range(logger, 'z', zone.grid_coordinates.z, lazy)
 
     if stream.unformatted:
         reclen2 = stream.read_recordmark()
@@ -363,7 +376,7 @@ def _read_plot3d_qscalars(zone, stream, logger):
     zone.flow_solution.time = time
 
 
-def _read_plot3d_qvars(zone, stream, planes, logger):
+def _read_plot3d_qvars(zone, stream, planes, logger, lazy):
     """ Reads 'density', 'momentum' and 'energy_stagnation_density'. """
     if planes:
         raise NotImplementedError('planar format not supported yet')
@@ -383,28 +396,30 @@ def _read_plot3d_qvars(zone, stream, planes, logger):
         if reclen != expected:
             logger.warning('unexpected Q variables recordlength'
                            ' %d vs. %d', reclen, expected)
+    read_floats = stream.map_floats if lazy else stream.read_floats
+
     name = 'density'
-    arr = stream.read_floats(shape, order='Fortran')
-    logger.debug('    %s min %g, max %g', name, arr.min(), arr.max())
+    arr = read_floats(shape, order='Fortran')
+    _log_range(logger, name, arr, lazy)
     zone.flow_solution.add_array(name, arr)
 
     vec = Vector()
 
-    vec.x = stream.read_floats(shape, order='Fortran')
-    logger.debug('    momentum.x min %g, max %g', vec.x.min(), vec.x.max())
+    vec.x = read_floats(shape, order='Fortran')
+    _log_range(logger, 'momentum.x', vec.x, lazy)
 
-    vec.y = stream.read_floats(shape, order='Fortran')
-    logger.debug('    momentum.y min %g, max %g', vec.y.min(), vec.y.max())
+    vec.y = read_floats(shape, order='Fortran')
+    _log_range(logger, 'momentum.y', vec.y, lazy)
 
     if dim > 2:
-        vec.z = stream.read_floats(shape, order='Fortran')
-        logger.debug('    momentum.z min %g, max %g', vec.z.min(), vec.z.max())
+        vec.z = read_floats(shape, order='Fortran')
+        _log_range(logger, 'momentum.z', vec.z, lazy)
 
     zone.flow_solution.add_vector('momentum', vec)
 
     name = 'energy_stagnation_density'
-    arr = stream.read_floats(shape, order='Fortran')
-    logger.debug('    %s min %g, max %g', name, arr.min(), arr.max())
+    arr = read_floats(shape, order='Fortran')
+    _log_range(logger, name, arr, lazy)
     zone.flow_solution.add_array(name, arr)
 
     if stream.unformatted:
@@ -414,7 +429,8 @@ def _read_plot3d_qvars(zone, stream, planes, logger):
                            ' %d vs. %d', reclen2, reclen)
 
 
-def _read_plot3d_fvars(zone, stream, dim, nvars, varnames, planes, logger):
+def _read_plot3d_fvars(zone, stream, dim, nvars, varnames, planes, logger,
+                       lazy):
     """ Reads 'function' variables. """
     if planes:
         raise NotImplementedError('planar format not supported yet')
@@ -434,14 +450,16 @@ def _read_plot3d_fvars(zone, stream, dim, nvars, varnames, planes, logger):
         if reclen != expected:
             logger.warning('unexpected F variables recordlength'
                            ' %d vs. %d', reclen, expected)
+    read_floats = stream.map_floats if lazy else stream.read_floats
+
     for i in range(nvars):
         if varnames and i < len(varnames):
             name = varnames[i]
         else:
             name = 'f_%d' % (i+1)
-        arr = stream.read_floats(shape, order='Fortran')
+        arr = read_floats(shape, order='Fortran')
         zone.flow_solution.add_array(name, arr)
-        logger.debug('    %s min %g, max %g', name, arr.min(), arr.max())
+        _log_range(logger, name, arr, lazy)
 
     if stream.unformatted:
         reclen2 = stream.read_recordmark()
@@ -450,6 +468,17 @@ def _read_plot3d_fvars(zone, stream, dim, nvars, varnames, planes, logger):
                            ' %d vs. %d', reclen2, reclen)
 
 
+def _log_range(logger, name, arr, lazy):
+    """
+    Log range of values in `arr`. Skipped for `lazy` arrays since finding
+    the range would page in all of the data.
+    """
+    if lazy:
+        logger.debug('    %s mapped', name)
+    else:
+        logger.debug('    %s min %g, max %g', name, arr.min(), arr.max())
+
+
 def write_plot3d_q(domain, grid_file, q_file, planes=False, binary=True,
                    big_endian=False, single_precision=True, unformatted=True,
                    logger=None):
@@ -499,7 +528,7 @@ def write_plot3d_q(domain, grid_file, q_file, planes=False, binary=True,
                       single_precision, unformatted, logger)
     # Write Q file.
     mode = 'wb' if binary else 'w'
-    with open(q_file, mode) as out:
+    with _open_output(q_file, mode) as out:
         logger.info('writing Q file %r', q_file)
         stream = Stream(out, binary, big_endian, single_precision, False,
                         unformatted, False)
@@ -574,7 +603,7 @@ def write_plot3d_f(domain, grid_file, f_file, varnames=None, planes=False,
                       single_precision, unformatted, logger)
     # Write F file.
     mode = 'wb' if binary else 'w'
-    with open(f_file, mode) as out:
+    with _open_output(f_file, mode) as out:
         logger.info('writing F file %r', f_file)
         stream = Stream(out, binary, big_endian, single_precision, False,
                         unformatted, False)
@@ -620,7 +649,7 @@ def write_plot3d_grid(domain, grid_file, planes=False, binary=True,
         raise TypeError("'domain' argument must be a DomainObj or Zone")
 
     mode = 'wb' if binary else 'w'
-    with open(grid_file, mode) as out:
+    with _open_output(grid_file, mode) as out:
         logger.info('writing grid file %r', grid_file)
         stream = Stream(out, binary, big_endian, single_precision, False,
                         unformatted, False)
@@ -641,6 +670,27 @@ def write_plot3d_grid(domain, grid_file, planes=False, binary=True,
             _write_plot3d_coords(zone, stream, planes, logger)
 
 
+@contextmanager
+def _open_output(filename, mode):
+    """
+    Opens a temporary file which replaces `filename` once it has been
+    written. Arrays read with `lazy` may map `filename`, which must not be
+    truncated while they are in use.
+    """
+    tmp = '%s.%d.%d' % (filename, os.getpid(),
+                        threading.current_thread().ident)
+    try:
+        with open(tmp, mode) as out:
+            yield out
+        if sys.platform == 'win32' and os.path.exists(filename):
+            os.remove(filename)  # Rename won't replace an existing file.
+        os.rename(tmp, filename)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
 def _write_plot3d_dims(domain, stream, logger, varnames=None):
     """ Write dimensions of each zone to Plot3D stream. """
     if isinstance(domain, DomainObj):
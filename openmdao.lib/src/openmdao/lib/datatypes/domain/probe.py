@@ -3,18 +3,25 @@ Support for calculating one or more scalar averages across one or more
 regions in a domain.
 """
 
-from math import cos, sin, sqrt
+import multiprocessing
+import os
+
+from itertools import product
+
+import numpy
+from numpy import cos, sin, sqrt
 
 from openmdao.lib.datatypes.domain.flow import CELL_CENTER
 from openmdao.lib.datatypes.domain.zone import CYLINDRICAL
 from openmdao.lib.datatypes.domain.metrics import get_metric, list_metrics, \
-                                                  create_scalar_metric
+                                                  create_scalar_metric, _values
 _SCHEMES = ('area', 'mass')
 
 # TODO: account for ghost cells in index calculations.
 
 
-def mesh_probe(domain, regions, variables, weighting_scheme='area'):
+def mesh_probe(domain, regions, variables, weighting_scheme='area',
+               weights_cache=None, processes=1, pool=None):
     """
     Calculate metrics on mesh regions.
     Currently only supports structured grids.
@@ -39,6 +46,24 @@ def mesh_probe(domain, regions, variables, weighting_scheme='area'):
         Specifies how individual values are weighted. Legal values are
         'area' for area averaging and 'mass' for mass averaging.
 
+    weights_cache: dict
+        If not None, weights are saved here keyed by region and weighting
+        scheme, and reused by later calls passing the same dictionary for
+        the same zone object. Clear it if the grid (or for mass averaging,
+        the flow solution) of a zone is modified in place.
+
+    processes: int
+        Number of worker processes used to probe regions concurrently.
+        If None, :meth:`multiprocessing.cpu_count` is used. Workers are
+        forked, so zone arrays are shared rather than copied. On platforms
+        without :meth:`os.fork` regions are always probed serially.
+
+    pool: :class:`multiprocessing.Pool`
+        If not None, regions are probed by this pool's workers rather than
+        by a pool created for this call, and `processes` is ignored. This
+        avoids starting new processes for repeated calls, but each region's
+        zone is pickled and sent to the worker.
+
     Returns a list of metric values in the order of the `variables` list.
 
     .. note::
@@ -75,37 +100,34 @@ def mesh_probe(domain, regions, variables, weighting_scheme='area'):
         raise ValueError('Unknown/unsupported weighting scheme %r'
                          % weighting_scheme)
 
-    # Collect weights.
     if need_weights:
-        weights, weight_total = _calc_weights(weighting_scheme, domain, _regions)
-    else:
-        weights, weight_total = {}, 0.
-
-    # Collect metric values.
-    metrics = []
-    for name, units in variables:
-        # Compute total for each region.
-        total = None
+        zone_names = set()
         for region in _regions:
             zone_name = region[0]
-            zone = getattr(domain, zone_name)
+            if zone_name in zone_names:
+                raise RuntimeError('Zone %r used more than once' % zone_name)
+            zone_names.add(zone_name)
 
-            if units is None:
-                ref = None
-            else:  # Check for a reference_state dictionary.
-                ref = zone.reference_state or domain.reference_state
-                if not ref:
-                    raise ValueError('No zone or domain reference_state'
-                                     ' dictionary supplied for zone %s.'
-                                     % zone_name)
-
-            value = _calc_metric(name, domain, region, weights, ref)
-            value *= zone.symmetry_instances  # Adjust for symmetry.
-            if total is None:
-                total = value  # Set initial PhysicalQuantity (or float).
+    # Collect weights and metric values for each region.
+    results = _probe_regions(domain, _regions, variables, weighting_scheme,
+                             need_weights, weights_cache, processes, pool)
+
+    # Reduce in region order so results don't depend on `processes`.
+    weight_total = 0.
+    totals = [None] * len(variables)
+    for region, (new_weights, region_weight, values) in zip(_regions, results):
+        if new_weights is not None:
+            zone = getattr(domain, region[0])
+            weights_cache[(region, weighting_scheme)] = (zone, new_weights)
+        weight_total += region_weight
+        for i, value in enumerate(values):
+            if totals[i] is None:
+                totals[i] = value  # Set initial PhysicalQuantity (or float).
             else:
-                total += value
+                totals[i] += value
 
+    metrics = []
+    for (name, units), total in zip(variables, totals):
         # If not integrating adjust for overall weighting.
         cls, integrate, geometry = get_metric(name)
         if not integrate:
@@ -226,298 +248,171 @@ def _get_dimension(region):
     return dim
 
 
-def _calc_weights(scheme, domain, regions):
+# Arguments for probe worker processes, set by :meth:`_init_worker`.
+_WORKER_ARGS = None
+
+
+def _probe_regions(domain, regions, variables, scheme, need_weights, cache,
+                   processes, pool):
     """
-    Calculate averaging weights, updating `weights` and returning total value.
+    Return list of :meth:`_probe_region` results for `regions`, using `pool`
+    if not None, or else a pool of `processes` forked workers if more than
+    one.
     """
-    weights = {}
-    weight_total = 0.
+    tasks = []
     for region in regions:
-        dim = _get_dimension(region)
-
-        if dim == 3:
-            zone_weights = _volume_weights(scheme, domain, region)
-        elif dim == 2:
-            if len(region) == 7:
-                zone_weights = _surface_weights_3d(scheme, domain, region)
-            else:
-                zone_weights = _surface_weights_2d(scheme, domain, region)
-        elif dim == 1:
-            if len(region) == 7:
-                zone_weights = _curve_weights_3d(scheme, domain, region)
-            elif len(region) == 5:
-                zone_weights = _curve_weights_2d(scheme, domain, region)
-            else:
-                zone_weights = _curve_weights_1d(scheme, domain, region)
-        else:
-            zone_weights = [1.]
-
-        zone_name = region[0]
-        zone = getattr(domain, zone_name)
-        zone_weights *= zone.symmetry_instances  # Adjust for symmetry.
-        if zone_name in weights:
-            raise RuntimeError('Zone %r used more than once' % zone_name)
-        else:
-            weights[zone_name] = zone_weights
-        weight_total += sum(zone_weights)
+        zone = getattr(domain, region[0])
+        weights = None
+        if need_weights and cache is not None:
+            cached = cache.get((region, scheme))
+            if cached is not None and cached[0] is zone:
+                weights = cached[1]
+        tasks.append((zone, domain.reference_state, region, weights))
+    args = (variables, scheme, need_weights, cache is not None)
+
+    if pool is not None:
+        return pool.map(_probe_task, [task+args for task in tasks], 1)
+
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    processes = min(processes, len(regions))
+
+    if processes <= 1 or not hasattr(os, 'fork'):
+        return [_probe_region(*(task+args)) for task in tasks]
+
+    # Forked workers inherit the arguments, so zones aren't pickled.
+    pool = multiprocessing.Pool(processes, _init_worker, ((tasks, args),))
+    try:
+        results = pool.map(_probe_worker, range(len(tasks)), 1)
+        pool.close()
+    except Exception:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+    return results
+
+
+def _init_worker(worker_args):
+    """ Save the arguments for this worker process. """
+    global _WORKER_ARGS
+    _WORKER_ARGS = worker_args
+
+
+def _probe_worker(index):
+    """ Probe task `index` using arguments saved by :meth:`_init_worker`. """
+    tasks, args = _WORKER_ARGS
+    return _probe_region(*(tasks[index]+args))
+
+
+def _probe_task(task):
+    """ Probe the region specified by `task`, sent by the parent. """
+    # The pool may predate scalar metrics created by the parent.
+    for name, units in task[4]:
+        if name not in list_metrics():
+            create_scalar_metric(name)
+    return _probe_region(*task)
 
-    return (weights, weight_total)
 
+def _probe_region(zone, domain_ref, region, weights, variables, scheme,
+                  need_weights, keep_weights):
+    """
+    Calculate weights (unless `weights` is supplied) and metric values for
+    `region` of `zone`.
+    Returns ``(new_weights, weight_total, values)``, where `new_weights` is
+    None unless weights were calculated and `keep_weights` is True.
+    """
+    zone_name = region[0]
+    new_weights = None
+    weight_total = 0.
+    if need_weights:
+        if weights is None:
+            weights = _calc_weights(scheme, zone, region)
+            if keep_weights:
+                new_weights = weights
+        # Adjust for symmetry.
+        weight_total = weights.sum() * zone.symmetry_instances
+
+    values = []
+    for name, units in variables:
+        if units is None:
+            ref = None
+        else:  # Check for a reference_state dictionary.
+            ref = zone.reference_state or domain_ref
+            if not ref:
+                raise ValueError('No zone or domain reference_state'
+                                 ' dictionary supplied for zone %s.'
+                                 % zone_name)
 
-def _volume_weights(scheme, domain, region):
-    """ Returns weights for a mesh volume. """
-    raise NotImplementedError('_volume_weights')
+        value = _calc_metric(name, zone, region, weights, ref)
+        value *= zone.symmetry_instances  # Adjust for symmetry.
+        values.append(value)
 
+    return (new_weights, weight_total, values)
 
-def _surface_weights_3d(scheme, domain, region):
-    """ Returns 3D (index space) weights for a mesh surface. """
-    zone_name, imin, imax, jmin, jmax, kmin, kmax = region
-    zone = getattr(domain, zone_name)
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
 
-    if cylindrical:
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+def _calc_weights(scheme, zone, region):
+    """ Return averaging weights for `region`. """
+    dim = _get_dimension(region)
+    if dim == 3:
+        return _volume_weights(scheme, zone, region)
+    elif dim == 2:
+        return _surface_weights(scheme, zone, region)
+    elif dim == 1:
+        return _curve_weights(scheme, zone, region)
     else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
+        return numpy.ones(1)
 
-    if scheme == 'mass':
-        try:
-            if cylindrical:
-                mom_c1 = flow.momentum.z.item
-                mom_c2 = flow.momentum.r.item
-                mom_c3 = flow.momentum.t.item
-            else:
-                mom_c1 = flow.momentum.x.item
-                mom_c2 = flow.momentum.y.item
-                mom_c3 = flow.momentum.z.item
-        except AttributeError:
-            raise AttributeError("For mass averaging zone %s is missing"
-                                 " 'momentum'." % zone_name)
-    if imin == imax:
-        imax += 1
-        face_normal = _iface_normal
-        face_value = _iface_cell_value if cell_center else _iface_node_value
-    elif jmin == jmax:
-        jmax += 1
-        face_normal = _jface_normal
-        face_value = _jface_cell_value if cell_center else _jface_node_value
-    else:
-        kmax += 1
-        face_normal = _kface_normal
-        face_value = _kface_cell_value if cell_center else _kface_node_value
-
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-                sc1, sc2, sc3 = face_normal(c1, c2, c3, i, j, k, cylindrical)
-                if scheme == 'mass':
-                    loc = (i, j, k)
-                    rvu = face_value(mom_c1, loc)
-                    rvv = face_value(mom_c2, loc)
-                    rvw = face_value(mom_c3, loc)
-                    weights.append(rvu*sc1 + rvv*sc2 + rvw*sc3)
-                else:
-                    weights.append(sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3))
-    return weights
 
+def _volume_weights(scheme, zone, region):
+    """ Returns weights for a mesh volume. """
+    raise NotImplementedError('_volume_weights')
 
-def _surface_weights_2d(scheme, domain, region):
-    """ Returns 2D (index space) weights for a mesh surface. """
-    zone_name, imin, imax, jmin, jmax = region
-    zone = getattr(domain, zone_name)
-    grid = zone.grid_coordinates
+
+def _surface_weights(scheme, zone, region):
+    """ Returns weights for each face of a mesh surface. """
     flow = zone.flow_solution
     cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical:
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
 
     if scheme == 'mass':
         try:
-            if cylindrical:
-                mom_c1 = None if flow.momentum.z is None else flow.momentum.z.item
-                mom_c2 = flow.momentum.r.item
-                mom_c3 = flow.momentum.t.item
-            else:
-                mom_c1 = flow.momentum.x.item
-                mom_c2 = flow.momentum.y.item
-                mom_c3 = None if flow.momentum.z is None else flow.momentum.z.item
+            momentum = flow.momentum
         except AttributeError:
             raise AttributeError("For mass averaging zone %s is missing"
-                                 " 'momentum'." % zone_name)
-
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-                sc1, sc2, sc3 = _cell_normal(c1, c2, c3, i, j, cylindrical)
-                if scheme == 'mass':
-                    ip1 = i + 1
-                    jp1 = j + 1
-                    if cell_center:
-                        # Cell value is value.
-# FIXME: built-in ghosts
-                        rvu = 0. if mom_c1 is None else mom_c1(ip1, jp1)
-                        rvv = mom_c2(ip1, jp1)
-                        rvw = 0. if mom_c1 is None else mom_c3(ip1, jp1)
-                    else:
-                        # Average across vertices.
-                        if mom_c1 is None:
-                            rvu = 0.
-                        else:
-                            rvu = 0.25 * (mom_c1(i, j) + mom_c1(ip1, j) + \
-                                          mom_c1(i, jp1) + mom_c1(ip1, jp1))
-                        rvv = 0.25 * (mom_c2(i, j) + mom_c2(ip1, j) + \
-                                      mom_c2(i, jp1) + mom_c2(ip1, jp1))
-                        if mom_c3 is None:
-                            rvw = 0.
-                        else:
-                            rvw = 0.25 * (mom_c3(i, j) + mom_c3(ip1, j) + \
-                                          mom_c3(i, jp1) + mom_c3(ip1, jp1))
-                    weights.append(rvu*sc1 + rvv*sc2 + rvw*sc3)
-                else:
-                    weights.append(sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3))
-    return weights
-
-
-def _curve_weights_3d(scheme, domain, region):
-    """ Returns 3D (index space) weights for a mesh curve. """
-    zone_name, imin, imax, jmin, jmax, kmin, kmax = region
-    zone = getattr(domain, zone_name)
-    grid = zone.grid_coordinates
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-
-    if cylindrical:
-        raise NotImplementedError('curve weights for cylindrical coordinates')
-    else:
-        x = grid.x.item
-        y = grid.y.item
-        z = grid.z.item
-
-    if scheme == 'mass':
-        raise NotImplementedError('curve mass averaging')
-
-    along_i, along_j = False, False
-    if imin != imax:
-        along_i = True
-        jmax += 1
-        kmax += 1
-    elif jmin != jmax:
-        along_j = True
-        imax += 1
-        kmax += 1
-    else:
-        imax += 1
-        jmax += 1
-
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-                if along_i:
-                    dx = x(i+1, j, k) - x(i, j, k)
-                    dy = y(i+1, j, k) - y(i, j, k)
-                    dz = z(i+1, j, k) - z(i, j, k)
-                elif along_j:
-                    dx = x(i, j+1, k) - x(i, j, k)
-                    dy = y(i, j+1, k) - y(i, j, k)
-                    dz = z(i, j+1, k) - z(i, j, k)
-                else:
-                    dx = x(i, j, k+1) - x(i, j, k)
-                    dy = y(i, j, k+1) - y(i, j, k)
-                    dz = z(i, j, k+1) - z(i, j, k)
-                weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
-
-
-def _curve_weights_2d(scheme, domain, region):
-    """ Returns 2D (index space) weights for a mesh curve. """
-    zone_name, imin, imax, jmin, jmax = region
-    zone = getattr(domain, zone_name)
-    grid = zone.grid_coordinates
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-
-    if cylindrical:
-        raise NotImplementedError('curve weights for cylindrical coordinates')
-    else:
-        x = grid.x.item
-        y = grid.y.item
-        z = None if grid.z is None else grid.z.item
+                                 " 'momentum'." % region[0])
+        if cylindrical:
+            mom = (momentum.z, momentum.r, momentum.t)
+        else:
+            mom = (momentum.x, momentum.y, momentum.z)
 
+    sc1, sc2, sc3 = _region_geometry(zone, region)
     if scheme == 'mass':
-        raise NotImplementedError('curve mass averaging')
-
-    if imin != imax:
-        along_i = True
-        jmax += 1
+        locs = _region_locs(zone, region)
+        rvu, rvv, rvw = [0. if arr is None else _average(arr, locs)
+                         for arr in mom]
+        return rvu*sc1 + rvv*sc2 + rvw*sc3
     else:
-        along_i = False
-        imax += 1
-
-    weights = []
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-                if along_i:
-                    dx = x(i+1, j) - x(i, j)
-                    dy = y(i+1, j) - y(i, j)
-                    dz = 0. if z is None else z(i+1, j) - z(i, j)
-                else:
-                    dx = x(i, j+1) - x(i, j)
-                    dy = y(i, j+1) - y(i, j)
-                    dz = 0. if z is None else z(i, j+1) - z(i, j)
-                weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
+        return sqrt(sc1*sc1 + sc2*sc2 + sc3*sc3)
 
 
-def _curve_weights_1d(scheme, domain, region):
-    """ Returns 1D (index space) weights for a mesh curve. """
-    zone_name, imin, imax = region
-    zone = getattr(domain, zone_name)
-    grid = zone.grid_coordinates
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-
-    if cylindrical:
+def _curve_weights(scheme, zone, region):
+    """ Returns weights for each edge of a mesh curve. """
+    if zone.coordinate_system == CYLINDRICAL:
         raise NotImplementedError('curve weights for cylindrical coordinates')
-    else:
-        x = grid.x.item
-        y = None if grid.y is None else grid.y.item
-        z = None if grid.z is None else grid.z.item
 
     if scheme == 'mass':
         raise NotImplementedError('curve mass averaging')
 
-    weights = []
-    for i in range(imin, imax):
-        dx = x(i+1) - x(i)
-        dy = 0. if y is None else y(i+1) - y(i)
-        dz = 0. if z is None else z(i+1) - z(i)
-        weights.append(sqrt(dx*dx + dy*dy + dz*dz))
-    return weights
+    return _region_geometry(zone, region)
 
 
-def _calc_metric(name, domain, region, weights, reference_state):
+def _calc_metric(name, zone, region, weights, reference_state):
     """
     Calculate metric `name` on `region` using `weights` and `reference_state`.
     """
     zone_name = region[0]
-    zone = getattr(domain, zone_name)
     cls, integrate, geometry = get_metric(name)
     metric = cls(zone, zone_name, reference_state)
-    weights = weights.get(zone_name)
 
     # Could be volume, surface, curve, or point.
     dim = _get_dimension(region)
@@ -528,19 +423,11 @@ def _calc_metric(name, domain, region, weights, reference_state):
     elif dim == 2:
         if geometry not in ('surface', 'any'):
             raise RuntimeError('metric %r not applicable to surfaces')
-        if len(region) == 7:
-            total = _surface_3d(metric, integrate, zone, region, weights)
-        else:
-            total = _surface_2d(metric, integrate, zone, region, weights)
+        total = _integrate(metric, integrate, zone, region, weights)
     elif dim == 1:
         if geometry not in ('curve', 'any'):
             raise RuntimeError('metric %r not applicable to curves')
-        if len(region) == 7:
-            total = _curve_3d(metric, integrate, zone, region, weights)
-        elif len(region) == 5:
-            total = _curve_2d(metric, integrate, zone, region, weights)
-        else:
-            total = _curve_1d(metric, integrate, zone, region, weights)
+        total = _integrate(metric, integrate, zone, region, weights)
     else:
         if geometry != 'any':
             raise RuntimeError('metric %r not applicable to points')
@@ -555,367 +442,49 @@ def _calc_metric(name, domain, region, weights, reference_state):
 def _volume(metric, integrate, zone, region, weights):
     """ Calculate metric on a volume. """
     raise NotImplementedError('metric calculation on volume')
-''' Not implemented yet
-    zone_name, imin, imax, jmin, jmax, kmin, kmax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical: 
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
 
-    vol = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-
-# TODO: calculate volume for integrating.
-
-                if cell_center:
-# FIXME: built-in ghosts
-                    # Cell value is value.
-                    val = metric.calculate((i+1, j+1, k+1), vol)
-                else:
-                    # Average across vertices.
-                    val  = metric.calculate((i, j, k), vol)
-                    val += metric.calculate((i, j+1, k), vol)
-                    val += metric.calculate((i, j+1, k+1), vol)
-                    val += metric.calculate((i, j, k+1), vol)
-                    val += metric.calculate((i+1, j, k), vol)
-                    val += metric.calculate((i+1, j+1, k), vol)
-                    val += metric.calculate((i+1, j+1, k+1), vol)
-                    val += metric.calculate((i+1, j, k+1), vol)
-                    val *= 0.125
-
-                if integrate:
-                    total += val
-                else:
-                    weight = weights[weight_index]
-                    weight_index += 1
-                    total += val * weight
-    return total
-'''
-
-
-def _surface_3d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 3D (index space) surface. """
-    zone_name, imin, imax, jmin, jmax, kmin, kmax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical: 
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
-
-    if imin == imax: 
-        face = 'i'
-        imax += 1
-        get_normal = _iface_normal
-    elif jmin == jmax:
-        face = 'j'
-        jmax += 1 
-        get_normal = _jface_normal
-    else:
-        face = 'k'
-        kmax += 1
-        get_normal = _kface_normal
-
-    normal = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-
-                if integrate:
-                    normal = get_normal(c1, c2, c3, i, j, k, cylindrical)
-    
-                if cell_center:
-# FIXME: built-in ghosts
-                    # Average across cells sharing surface.
-                    val = metric.calculate((i+1, j+1, k+1), normal)
-                    if face == 'i':
-                        val += metric.calculate((i, j+1, k+1), normal)
-                    elif face == 'j':
-                        val += metric.calculate((i+1, j, k+1), normal)
-                    else:
-                        val += metric.calculate((i+1, j+1, k), normal)
-                    val *= 0.5
-                else:
-                    # Average across vertices.
-                    val = metric.calculate((i, j, k), normal)
-                    if face == 'i':
-                        val += metric.calculate((i, j+1, k), normal)
-                        val += metric.calculate((i, j+1, k+1), normal)
-                        val += metric.calculate((i, j, k+1), normal)
-                    elif face == 'j':
-                        val += metric.calculate((i+1, j, k), normal)
-                        val += metric.calculate((i+1, j, k+1), normal)
-                        val += metric.calculate((i, j, k+1), normal)
-                    else:
-                        val += metric.calculate((i+1, j, k), normal)
-                        val += metric.calculate((i+1, j+1, k), normal)
-                        val += metric.calculate((i, j+1, k), normal)
-                    val *= 0.25
-
-                if integrate:
-                    total += val
-                else:
-                    weight = weights[weight_index]
-                    weight_index += 1
-                    total += val * weight
-    return total
-
-
-def _surface_2d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 2D (index space) surface. """
-    zone_name, imin, imax, jmin, jmax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical: 
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
-
-    normal = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-
-            if integrate:
-                normal = _cell_normal(c1, c2, c3, i, j, cylindrical)
-    
-            if cell_center:
-# FIXME: built-in ghosts
-                # Cell value is value.
-                val = metric.calculate((i+1, j+1), normal)
-            else:
-                # Average across vertices.
-                val  = metric.calculate((i, j), normal)
-                val += metric.calculate((i, j+1), normal)
-                val += metric.calculate((i+1, j+1), normal)
-                val += metric.calculate((i+1, j), normal)
-                val *= 0.25
-
-            if integrate:
-                total += val
-            else:
-                weight = weights[weight_index]
-                weight_index += 1
-                total += val * weight
-    return total
-
-
-def _curve_3d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 3D (index space) curve. """
-    zone_name, imin, imax, jmin, jmax, kmin, kmax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical: 
-        c1 = grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = grid.z.item
-
-    if imin != imax:
-        edge = 'i'
-        jmax += 1
-        kmax += 1
-        get_length = _iedge_length
-    elif jmin != jmax:
-        edge = 'j'
-        imax += 1
-        kmax += 1
-        get_length = _jedge_length
-    else:
-        edge = 'k'
-        imax += 1
-        jmax += 1
-        get_length = _kedge_length
-
-    length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-            for k in range(kmin, kmax):
-
-                if integrate:
-                    length = get_length(c1, c2, c3, (i, j, k), cylindrical)
-
-                if cell_center:
-# FIXME: built-in ghosts
-                    # Average across cells sharing edge.
-                    val = metric.calculate((i+1, j+1, k+1), length)
-                    if edge == 'i':
-                        val += metric.calculate((i+1, j, k+1), length)
-                        val += metric.calculate((i+1, j+1, k), length)
-                        val += metric.calculate((i+1, j, k), length)
-                    elif edge == 'j':
-                        val += metric.calculate((i, j+1, k+1), length)
-                        val += metric.calculate((i+1, j+1, k), length)
-                        val += metric.calculate((i, j+1, k), length)
-                    else:
-                        val += metric.calculate((i, j+1, k+1), length)
-                        val += metric.calculate((i+1, j, k+1), length)
-                        val += metric.calculate((i, j, k+1), length)
-                    val *= 0.25
-                else:
-                    # Average across vertices.
-                    val = metric.calculate((i, j, k), length)
-                    if edge == 'i':
-                        val += metric.calculate((i+1, j, k), length)
-                    elif edge == 'j':
-                         val +=metric.calculate((i, j+1, k), length)
-                    else:
-                         val +=metric.calculate((i, j, k+1), length)
-                    val *= 0.5
-
-                if integrate:
-                    total += val
-                else:
-                    weight = weights[weight_index]
-                    weight_index += 1
-                    total += val * weight
-    return total
-
-
-def _curve_2d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 2D (index space) curve. """
-    zone_name, imin, imax, jmin, jmax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
-
-    if cylindrical: 
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
-    else:
-        c1 = grid.x.item
-        c2 = grid.y.item
-        c3 = None if grid.z is None else grid.z.item
-
-    if imin != imax:
-        edge = 'i'
-        jmax += 1
-        get_length = _iedge_length
-    else:
-        edge = 'j'
-        imax += 1
-        get_length = _jedge_length
-
-    length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
-        for j in range(jmin, jmax):
-
-            if integrate:
-                length = get_length(c1, c2, c3, (i, j), cylindrical)
-
-            if cell_center:
-# FIXME: built-in ghosts
-                # Average across cells sharing edge.
-                val = metric.calculate((i+1, j+1), length)
-                if edge == 'i':
-                    val += metric.calculate((i+1, j), length)
-                else:
-                    val += metric.calculate((i, j+1), length)
-                val *= 0.5
-            else:
-                # Average across vertices.
-                val = metric.calculate((i, j), length)
-                if edge == 'i':
-                    val += metric.calculate((i+1, j), length)
-                else:
-                    val += metric.calculate((i, j+1), length)
-                val *= 0.5
-
-            if integrate:
-                total += val
-            else:
-                weight = weights[weight_index]
-                weight_index += 1
-                total += val * weight
-    return total
 
+def _integrate(metric, integrate, zone, region, weights):
+    """
+    Calculate metric on a surface or curve. Values for each face or edge
+    are averaged from the cells sharing it (or its vertices), then summed
+    directly if integrating, otherwise summed using `weights`.
+    """
+    geom = _region_geometry(zone, region) if integrate else None
+    locs = _region_locs(zone, region)
 
-def _curve_1d(metric, integrate, zone, region, weights):
-    """ Calculate metric on a 1D (index space) curve. """
-    zone_name, imin, imax = region
-    grid = zone.grid_coordinates
-    flow = zone.flow_solution
-    cylindrical = zone.coordinate_system == CYLINDRICAL
-    cell_center = flow.grid_location == CELL_CENTER
+    val = _evaluate(metric, locs[0], geom)
+    for loc in locs[1:]:
+        val = val + _evaluate(metric, loc, geom)
+    if len(locs) > 1:
+        val = val * (1. / len(locs))
 
-    if cylindrical:
-        c1 = None if grid.z is None else grid.z.item
-        c2 = grid.r.item
-        c3 = grid.t.item
+    if integrate:
+        return numpy.sum(val)
     else:
-        c1 = grid.x.item
-        c2 = None if grid.y is None else grid.y.item
-        c3 = None if grid.z is None else grid.z.item
-
-    get_length = _iedge_length
+        return numpy.sum(val * weights)
 
-    length = None
-    weight_index = 0
-    total = 0.
-    for i in range(imin, imax):
 
-        if integrate:
-            length = get_length(c1, c2, c3, (i,), cylindrical)
-
-        if cell_center:
-# FIXME: built-in ghosts
-            # Cell value is value.
-            val = metric.calculate((i+1,), length)
-        else:
-            # Average across vertices.
-            val  = metric.calculate((i,), length)
-            val += metric.calculate((i+1,), length)
-            val *= 0.5
-
-        if integrate:
-            total += val
+def _evaluate(metric, loc, geom):
+    """
+    Return `metric` values for the block of indices `loc` (a tuple of slices).
+    Metrics not flagged as `vectorized` are called once per index.
+    """
+    if getattr(metric, 'vectorized', False):
+        return metric.calculate(loc, geom)
+
+    shape = tuple(sl.stop - sl.start for sl in loc)
+    vals = numpy.empty(shape)
+    for index in numpy.ndindex(*shape):
+        point = tuple(sl.start + i for sl, i in zip(loc, index))
+        if geom is None:
+            item_geom = None
+        elif isinstance(geom, tuple):
+            item_geom = tuple(float(arr[index]) for arr in geom)
         else:
-            weight = weights[weight_index]
-            weight_index += 1
-            total += val * weight
-    return total
+            item_geom = float(geom[index])
+        vals[index] = metric.calculate(point, item_geom)
+    return vals
 
 
 def _point(metric, zone, region):
@@ -963,268 +532,174 @@ def _point(metric, zone, region):
             return metric.calculate((imin,), None)
 
 
-def _iface_normal(c1, c2, c3, i, j, k, cylindrical):
+# Corner offsets (upper-left, lower-right, upper-right) relative to the
+# lower-left vertex of a face, and the scale factor orienting its normal.
+_IFACE = ((0, 1, 0), (0, 0, 1), (0, 1, 1), -0.5)
+_JFACE = ((1, 0, 0), (0, 0, 1), (1, 0, 1), 0.5)
+_KFACE = ((1, 0, 0), (0, 1, 0), (1, 1, 0), -0.5)
+_CELL  = ((0, 1), (1, 0), (1, 1), 0.5)
+
+
+def _region_block(region):
     """
-    Return non-dimensional vector normal to I face with magnitude equal to area.
+    Return ``(block, collapsed)`` for a surface or curve `region`.
+    `block` is a tuple of slices selecting the lower-left vertex of each
+    face or the first vertex of each edge, and `collapsed` flags those
+    index dimensions which `region` does not span.
     """
-# FIXME: built-in ghosts
-    jp1 = j + 1
-    kp1 = k + 1
-
-    # upper-left - lower-right.
-    diag_c11 = c1(i, jp1, k) - c1(i, j, kp1)
-    diag_c21 = c2(i, jp1, k) - c2(i, j, kp1)
-    diag_c31 = c3(i, jp1, k) - c3(i, j, kp1)
+    indices = region[1:]
+    block = []
+    collapsed = []
+    for lo, hi in zip(indices[0::2], indices[1::2]):
+        if lo == hi:
+            block.append(slice(lo, lo+1))
+            collapsed.append(True)
+        else:
+            block.append(slice(lo, hi))
+            collapsed.append(False)
+    return (tuple(block), collapsed)
 
-    # upper-right - lower-left.
-    diag_c12 = c1(i, jp1, kp1) - c1(i, j, k)
-    diag_c22 = c2(i, jp1, kp1) - c2(i, j, k)
-    diag_c32 = c3(i, jp1, kp1) - c3(i, j, k)
 
-    if cylindrical:
-        r1 = (c2(i, j, kp1) + c2(i, jp1, k  )) / 2.
-        r2 = (c2(i, j, k  ) + c2(i, jp1, kp1)) / 2.
-    else:
-        r1 = 1.
-        r2 = 1.
+def _offset(block, delta):
+    """ Return `block` shifted by index offsets `delta`. """
+    return tuple(slice(sl.start+offset, sl.stop+offset)
+                 for sl, offset in zip(block, delta))
 
-    sc1 = -0.5 * ( r2 * diag_c21 * diag_c32 - r1 * diag_c22 * diag_c31)
-    sc2 = -0.5 * (-r2 * diag_c11 * diag_c32 + r1 * diag_c12 * diag_c31)
-    sc3 = -0.5 * (      diag_c11 * diag_c22 -      diag_c12 * diag_c21)
 
-    return (sc1, sc2, sc3)
+def _face_corners(collapsed):
+    """ Return corner offsets and normal scale factor for a surface. """
+    if len(collapsed) == 3:
+        return (_IFACE, _JFACE, _KFACE)[collapsed.index(True)]
+    return _CELL
 
 
-def _jface_normal(c1, c2, c3, i, j, k, cylindrical):
+def _region_geometry(zone, region):
     """
-    Return non-dimensional vector normal to J face with magnitude equal to area.
+    Return non-dimensional face normals ``(sc1, sc2, sc3)`` with magnitude
+    equal to face area for a surface `region`, or edge lengths for a curve.
+    Arrays are shaped as the region's block of faces or edges.
     """
-# FIXME: built-in ghosts
-    ip1 = i + 1
-    kp1 = k + 1
-
-    # upper-left - lower-right.
-    diag_c11 = c1(ip1, j, k) - c1(i, j, kp1)
-    diag_c21 = c2(ip1, j, k) - c2(i, j, kp1)
-    diag_c31 = c3(ip1, j, k) - c3(i, j, kp1)
-
-    # upper-right - lower-left.
-    diag_c12 = c1(ip1, j, kp1) - c1(i, j, k)
-    diag_c22 = c2(ip1, j, kp1) - c2(i, j, k)
-    diag_c32 = c3(ip1, j, kp1) - c3(i, j, k)
-
+    block, collapsed = _region_block(region)
+    grid = zone.grid_coordinates
+    cylindrical = zone.coordinate_system == CYLINDRICAL
     if cylindrical:
-        r1 = (c2(i, j, kp1) + c2(ip1, j, k  )) / 2.
-        r2 = (c2(i, j, k  ) + c2(ip1, j, kp1)) / 2.
+        coords = (grid.z, grid.r, grid.t)
     else:
-        r1 = 1.
-        r2 = 1.
-
-    sc1 = 0.5 * ( r2 * diag_c21 * diag_c32 - r1 * diag_c22 * diag_c31)
-    sc2 = 0.5 * (-r2 * diag_c11 * diag_c32 + r1 * diag_c12 * diag_c31)
-    sc3 = 0.5 * (      diag_c11 * diag_c22 -      diag_c12 * diag_c21)
+        coords = (grid.x, grid.y, grid.z)
 
-    return (sc1, sc2, sc3)
+    if collapsed.count(False) == 2:
+        upper_left, lower_right, upper_right, scale = _face_corners(collapsed)
+        return _face_normal(coords, block, upper_left, lower_right,
+                            upper_right, scale, cylindrical)
+    else:
+        delta = [int(not flag) for flag in collapsed]
+        return _edge_length(coords, block, _offset(block, delta), cylindrical)
 
 
-def _kface_normal(c1, c2, c3, i, j, k, cylindrical):
+def _region_locs(zone, region):
     """
-    Return non-dimensional vector normal to K face with magnitude equal to area.
+    Return list of index blocks whose values are averaged to obtain the
+    value for each face or edge of `region`.
     """
-# FIXME: built-in ghosts
-    ip1 = i + 1
-    jp1 = j + 1
-
-    # upper-left - lower-right.
-    diag_c11 = c1(i, jp1, k) - c1(ip1, j, k)
-    diag_c21 = c2(i, jp1, k) - c2(ip1, j, k)
-    diag_c31 = c3(i, jp1, k) - c3(ip1, j, k)
+    block, collapsed = _region_block(region)
+    ndim = len(block)
+    cell_center = zone.flow_solution.grid_location == CELL_CENTER
 
-    # upper-right - lower-left.
-    diag_c12 = c1(ip1, jp1, k) - c1(i, j, k)
-    diag_c22 = c2(ip1, jp1, k) - c2(i, j, k)
-    diag_c32 = c3(ip1, jp1, k) - c3(i, j, k)
-
-    if cylindrical:
-        r1 = (c2(i, jp1, k) + c2(ip1, j,   k)) / 2.
-        r2 = (c2(i, j,   k) + c2(ip1, jp1, k)) / 2.
+    if collapsed.count(False) == 2:
+        if cell_center:
+# FIXME: built-in ghosts
+            if ndim == 3:
+                # Average across cells sharing surface.
+                deltas = [(1, 1, 1), [int(not flag) for flag in collapsed]]
+            else:
+                # Cell value is value.
+                deltas = [(1, 1)]
+        else:
+            # Average across vertices.
+            upper_left, lower_right, upper_right, scale = \
+                _face_corners(collapsed)
+            deltas = [(0,)*ndim, upper_left, upper_right, lower_right]
     else:
-        r1 = 1.
-        r2 = 1.
+        along = collapsed.index(False)
+        if cell_center:
+# FIXME: built-in ghosts
+            # Average across cells sharing edge.
+            deltas = []
+            for across in product((1, 0), repeat=ndim-1):
+                delta = list(reversed(across))
+                delta.insert(along, 1)
+                deltas.append(delta)
+        else:
+            # Average across vertices.
+            delta = [0] * ndim
+            delta[along] = 1
+            deltas = [(0,)*ndim, delta]
 
-    sc1 = 0.5 * ( r2 * diag_c21 * diag_c32 - r1 * diag_c22 * diag_c31)
-    sc2 = 0.5 * (-r2 * diag_c11 * diag_c32 + r1 * diag_c12 * diag_c31)
-    sc3 = 0.5 * (      diag_c11 * diag_c22 -      diag_c12 * diag_c21)
+    return [_offset(block, delta) for delta in deltas]
 
-    return (sc1, sc2, sc3)
+
+def _average(arr, locs):
+    """ Return average of `arr` over the index blocks in `locs`. """
+    val = _values(arr, locs[0])
+    for loc in locs[1:]:
+        val = val + _values(arr, loc)
+    if len(locs) > 1:
+        val = val * (1. / len(locs))
+    return val
 
 
-def _cell_normal(c1, c2, c3, i, j, cylindrical):
+def _face_normal(coords, block, upper_left, lower_right, upper_right, scale,
+                 cylindrical):
     """
-    Return non-dimensional vector normal with magnitude equal to area.
-    If there is no 'z' coordinate, `c1` will be None in cylindrical
-    coordinates, otherwise `c3` will be None.
+    Return non-dimensional vectors normal to faces with magnitude equal to
+    area. Corners are index offsets relative to `block`. If there is no 'z'
+    coordinate, `c1` will be None in cylindrical coordinates, otherwise `c3`
+    will be None.
     """
 # FIXME: built-in ghosts
-    ip1 = i + 1
-    jp1 = j + 1
-
-    # upper-left - lower-right.
-    diag_c11 = 0. if c1 is None else c1(i, jp1) - c1(ip1, j)
-    diag_c21 = c2(i, jp1) - c2(ip1, j)
-    diag_c31 = 0. if c3 is None else c3(i, jp1) - c3(ip1, j)
-
-    # upper-right - lower-left.
-    diag_c12 = 0. if c1 is None else c1(ip1, jp1) - c1(i, j)
-    diag_c22 = c2(ip1, jp1) - c2(i, j)
-    diag_c32 = 0. if c3 is None else c3(ip1, jp1) - c3(i, j)
+    upper_left = _offset(block, upper_left)
+    lower_right = _offset(block, lower_right)
+    upper_right = _offset(block, upper_right)
+    lower_left = block
+
+    # upper-left - lower-right, upper-right - lower-left.
+    diags = []
+    for arr in coords:
+        if arr is None:
+            diags.append((0., 0.))
+        else:
+            diags.append((_values(arr, upper_left) - _values(arr, lower_right),
+                          _values(arr, upper_right) - _values(arr, lower_left)))
+    (diag_c11, diag_c12), (diag_c21, diag_c22), (diag_c31, diag_c32) = diags
 
     if cylindrical:
-        r1 = (c2(i, jp1) + c2(ip1, j)) / 2.
-        r2 = (c2(i, j) + c2(ip1, jp1)) / 2.
+        c2 = coords[1]
+        r1 = (_values(c2, lower_right) + _values(c2, upper_left)) / 2.
+        r2 = (_values(c2, lower_left) + _values(c2, upper_right)) / 2.
     else:
         r1 = 1.
         r2 = 1.
 
-    sc1 = 0.5 * ( r2 * diag_c21 * diag_c32 - r1 * diag_c22 * diag_c31)
-    sc2 = 0.5 * (-r2 * diag_c11 * diag_c32 + r1 * diag_c12 * diag_c31)
-    sc3 = 0.5 * (      diag_c11 * diag_c22 -      diag_c12 * diag_c21)
+    sc1 = scale * ( r2 * diag_c21 * diag_c32 - r1 * diag_c22 * diag_c31)
+    sc2 = scale * (-r2 * diag_c11 * diag_c32 + r1 * diag_c12 * diag_c31)
+    sc3 = scale * (      diag_c11 * diag_c22 -      diag_c12 * diag_c21)
 
     return (sc1, sc2, sc3)
 
 
-def _iedge_length(c1, c2, c3, loc, cylindrical):
-    """ Return length of edge along 'i'. """
-    if cylindrical:
-        if len(loc) > 2:
-            i, j, k = loc
-            ip1 = i + 1
-            theta = c3(ip1, j, k) - c3(i, j, k)
-            dx = c2(ip1, j, k) * cos(theta) - c2(i, j, k)
-            dy = c2(ip1, j, k) * sin(theta)
-            dz = c1(ip1, j, k) - c1(i, j, k)
-        elif len(loc) > 1:
-            i, j = loc
-            ip1 = i + 1
-            theta = c3(ip1, j) - c3(i, j)
-            dx = c2(ip1, j) * cos(theta) - c2(i, j)
-            dy = c2(ip1, j) * sin(theta)
-            dz = 0. if c1 is None else c1(ip1, j) - c1(i, j)
-        else:
-            i, = loc
-            ip1 = i + 1
-            theta = c3(ip1) - c3(i)
-            dx = c2(ip1) * cos(theta) - c2(i)
-            dy = c2(ip1) * sin(theta)
-            dz = 0. if c1 is None else c1(ip1) - c1(i)
-    else:
-        if len(loc) > 2:
-            i, j, k = loc
-            ip1 = i + 1
-            dx = c1(ip1, j, k) - c1(i, j, k)
-            dy = c2(ip1, j, k) - c2(i, j, k)
-            dz = c3(ip1, j, k) - c3(i, j, k)
-        elif len(loc) > 1:
-            i, j = loc
-            ip1 = i + 1
-            dx = c1(ip1, j) - c1(i, j)
-            dy = c2(ip1, j) - c2(i, j)
-            dz = 0. if c3 is None else c3(ip1, j) - c3(i, j)
-        else:
-            i, = loc
-            ip1 = i + 1
-            dx = c1(ip1) - c1(i)
-            dy = 0. if c2 is None else c2(ip1) - c2(i)
-            dz = 0. if c3 is None else c3(ip1) - c3(i)
-
-    return sqrt(dx*dx + dy*dy + dz*dz)
-
-
-def _jedge_length(c1, c2, c3, loc, cylindrical):
-    """ Return length of edge along 'j'. """
+def _edge_length(coords, first, second, cylindrical):
+    """ Return length of edges from `first` to `second` vertex blocks. """
+    c1, c2, c3 = coords
     if cylindrical:
-        if len(loc) > 2:
-            i, j, k = loc
-            jp1 = j + 1
-            theta = c3(i, jp1, k) - c3(i, j, k)
-            dx = c2(i, jp1, k) * cos(theta) - c2(i, j, k)
-            dy = c2(i, jp1, k) * sin(theta)
-            dz = c1(i, jp1, k) - c1(i, j, k)
-        else:
-            i, j = loc
-            jp1 = j + 1
-            theta = c3(i, jp1) - c3(i, j)
-            dx = c2(i, jp1) * cos(theta) - c2(i, j)
-            dy = c2(i, jp1) * sin(theta)
-            dz = 0. if c1 is None else c1(i, jp1) - c1(i, j)
+        r1 = _values(c2, first)
+        r2 = _values(c2, second)
+        theta = _values(c3, second) - _values(c3, first)
+        dx = r2 * cos(theta) - r1
+        dy = r2 * sin(theta)
+        dz = 0. if c1 is None else _values(c1, second) - _values(c1, first)
     else:
-        if len(loc) > 2:
-            i, j, k = loc
-            jp1 = j + 1
-            dx = c1(i, jp1, k) - c1(i, j, k)
-            dy = c2(i, jp1, k) - c2(i, j, k)
-            dz = c3(i, jp1, k) - c3(i, j, k)
-        else:
-            i, j = loc
-            jp1 = j + 1
-            dx = c1(i, jp1) - c1(i, j)
-            dy = c2(i, jp1) - c2(i, j)
-            dz = 0. if c3 is None else c3(i, jp1) - c3(i, j)
+        dx = _values(c1, second) - _values(c1, first)
+        dy = 0. if c2 is None else _values(c2, second) - _values(c2, first)
+        dz = 0. if c3 is None else _values(c3, second) - _values(c3, first)
 
     return sqrt(dx*dx + dy*dy + dz*dz)
-
-
-def _kedge_length(c1, c2, c3, loc, cylindrical):
-    """ Return length of edge along 'k'. """
-    i, j, k = loc
-    kp1 = k + 1
-    if cylindrical:
-        theta = c3(i, j, kp1) - c3(i, j, k)
-        dx = c2(i, j, kp1) * cos(theta) - c2(i, j, k)
-        dy = c2(i, j, kp1) * sin(theta)
-        dz = c1(i, j, kp1) - c1(i, j, k)
-    else:
-        dx = c1(i, j, kp1) - c1(i, j, k)
-        dy = c2(i, j, kp1) - c2(i, j, k)
-        dz = c3(i, j, kp1) - c3(i, j, k)
-
-    return sqrt(dx*dx + dy*dy + dz*dz)
-
-
-def _iface_cell_value(arr, loc):
-    """ Returns I face value for cell-centered data. """
-    i, j, k = loc
-# FIXME: built-in ghosts
-    return 0.5 * (arr(i+1, j+1, k+1) + arr(i, j+1, k+1))
-
-def _jface_cell_value(arr, loc):
-    """ Returns J face value for cell-centered data. """
-    i, j, k = loc
-# FIXME: built-in ghosts
-    return 0.5 * (arr(i+1, j+1, k+1) + arr(i+1, j, k+1))
-
-def _kface_cell_value(arr, loc):
-    """ Returns K face value for cell-centered data. """
-    i, j, k = loc
-# FIXME: built-in ghosts
-    return 0.5 * (arr(i+1, j+1, k+1) + arr(i+1, j+1, k))
-
-
-def _iface_node_value(arr, loc):
-    """ Returns I face value for vertex data. """
-    i, j, k = loc
-    return 0.25 * (arr(i, j+1, k+1) + arr(i, j, k+1) +
-                   arr(i, j+1, k) + arr(i, j, k))
-
-def _jface_node_value(arr, loc):
-    """ Returns J face value for vertex data. """
-    i, j, k = loc
-    return 0.25 * (arr(i+1, j, k+1) + arr(i, j, k+1) +
-                   arr(i+1, j, k) + arr(i, j, k))
-
-def _kface_node_value(arr, loc):
-    """ Returns K face value for vertex data. """
-    i, j, k = loc
-    return 0.25 * (arr(i+1, j+1, k) + arr(i, j+1, k) +
-                   arr(i+1, j, k) + arr(i, j, k))
-
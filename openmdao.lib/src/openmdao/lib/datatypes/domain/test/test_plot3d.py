@@ -3,12 +3,16 @@ Test Plot3D operations on :class:`DomainObj` objects.
 """
 
 import logging
+import mmap
 import os.path
 import unittest
 
+import numpy
+
 from openmdao.lib.datatypes.domain import read_plot3d_q, write_plot3d_q, \
                                           read_plot3d_f, write_plot3d_f, \
-                                          read_plot3d_shape, write_plot3d_grid
+                                          read_plot3d_grid, read_plot3d_shape, \
+                                          write_plot3d_grid
 
 from openmdao.lib.datatypes.domain.test.wedge import create_wedge_2d, \
                                                      create_wedge_3d
@@ -129,6 +133,60 @@ class TestCase(unittest.TestCase):
         self.assertTrue(domain.is_equivalent(wedge, logger=logger))
 
 
+    def test_lazy(self):
+        logging.debug('')
+        logging.debug('test_lazy')
+
+        logger = logging.getLogger()
+        wedge = create_wedge_3d((30, 20, 10), 5., 0.5, 2., 30.)
+        wedge2 = create_wedge_3d((29, 19, 9), 5., 2.5, 4., 30.)
+        wedge.add_domain(wedge2)
+
+        # Big-endian binary.
+        write_plot3d_q(wedge, 'be-binary.xyz', 'be-binary.q', logger=logger,
+                       big_endian=True, unformatted=False)
+        domain = read_plot3d_q('be-binary.xyz', 'be-binary.q', logger=logger,
+                               big_endian=True, unformatted=False, lazy=True)
+        domain.rename_zone('xyzzy', domain.zone_1)
+        self.assertTrue(domain.is_equivalent(wedge, logger=logger))
+        self.assertTrue(isinstance(domain.xyzzy.grid_coordinates.x.base,
+                                   mmap.mmap))
+
+        # Little-endian unformatted, double precision.
+        write_plot3d_f(wedge, 'unformatted.xyz', 'unformatted.f',
+                       single_precision=False, logger=logger)
+        domain = read_plot3d_f('unformatted.xyz', 'unformatted.f',
+                               single_precision=False, logger=logger,
+                               lazy=True)
+        zone = domain.zone_2
+        test_flow = zone.flow_solution
+        wedge_flow = wedge2.xyzzy.flow_solution
+        self.assertEqual(test_flow.f_1.dtype, numpy.dtype('<f8'))
+        self.assertTrue((test_flow.f_1 == wedge_flow.density).all())
+        self.assertTrue((test_flow.f_5 == wedge_flow.momentum.z).all())
+        self.assertTrue((zone.grid_coordinates.z ==
+                         wedge2.xyzzy.grid_coordinates.z).all())
+
+        # Writing from mapped arrays.
+        write_plot3d_grid(domain, 'be-binary.xyz', big_endian=True,
+                          logger=logger)
+        shape = read_plot3d_shape('be-binary.xyz', big_endian=True,
+                                  logger=logger)
+        self.assertEqual(shape, [(30, 20, 10), (29, 19, 9)])
+
+        # Writing back to the mapped file.
+        domain = read_plot3d_grid('be-binary.xyz', big_endian=True,
+                                  logger=logger, lazy=True)
+        self.assertTrue(isinstance(domain.zone_1.grid_coordinates.x.base,
+                                   mmap.mmap))
+        write_plot3d_grid(domain, 'be-binary.xyz', big_endian=True,
+                          logger=logger)
+        self.assertTrue((domain.zone_1.grid_coordinates.x ==
+                         wedge.xyzzy.grid_coordinates.x).all())
+        domain2 = read_plot3d_grid('be-binary.xyz', big_endian=True,
+                                   logger=logger)
+        self.assertTrue(domain2.is_equivalent(domain, logger=logger))
+
     def test_f_3d(self):
         logging.debug('')
         logging.debug('test_f_3d')
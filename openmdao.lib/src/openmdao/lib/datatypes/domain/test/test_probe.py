@@ -3,13 +3,16 @@ Test :class:`DomainObj` mesh_probe() operations.
 """
 
 import logging
+import multiprocessing
 import os.path
+import threading
 import pkg_resources
 import unittest
 
 from math import pi
 
 from openmdao.lib.datatypes.domain import mesh_probe
+from openmdao.lib.datatypes.domain.metrics import register_metric, _METRICS
 from openmdao.lib.datatypes.domain.test import restart, overflow
 from openmdao.lib.datatypes.domain.test.cube import create_cube
 from openmdao.lib.datatypes.domain.test.wedge import create_wedge_3d
@@ -237,6 +240,115 @@ class TestCase(unittest.TestCase):
         assert_rel_error(self, metrics[5], -149.525, 0.00001)
         assert_rel_error(self, metrics[6], -262.976, 0.00001)
 
+    def test_weights_cache(self):
+        logging.debug('')
+        logging.debug('test_weights_cache')
+
+        cube = create_cube((41, 17, 9), 5., 4., 3.)
+        regions = (('xyzzy', 2, 2, 0, -1, 0, -1),)
+        variables = (('density', None),)
+        cache = {}
+        density, = mesh_probe(cube, regions, variables, weights_cache=cache)
+        self.assertEqual(density, 0.25)
+        self.assertEqual(cache.keys(), [(('xyzzy', 2, 2, 0, 16, 0, 8), 'area')])
+        zone, weights = cache.values()[0]
+        self.assertTrue(zone is cube.xyzzy)
+        self.assertEqual(weights.shape, (1, 16, 8))
+
+        # Cached weights are reused.
+        weights *= 2.
+        density, = mesh_probe(cube, regions, variables, weights_cache=cache)
+        self.assertEqual(density, 0.25)
+        self.assertTrue(cache.values()[0][1] is weights)
+
+        # But not for a different zone object.
+        other = create_cube((41, 17, 9), 5., 4., 3.)
+        density, = mesh_probe(other, regions, variables, weights_cache=cache)
+        self.assertEqual(density, 0.25)
+        self.assertTrue(cache.values()[0][0] is other.xyzzy)
+
+    def test_processes(self):
+        logging.debug('')
+        logging.debug('test_processes')
+
+        domain = restart.read('lpc-test', logging.getLogger())
+        regions = [('zone_1', 2, 2, 0, -1, 0, -1),
+                   ('zone_2', 2, 2, 0, -1, 0, -1)]
+        variables = [('area', 'inch**2'),
+                     ('pressure_stagnation', 'psi'),
+                     ('mass_flow', 'lbm/s')]
+        serial = mesh_probe(domain, regions, variables, 'mass')
+        cache = {}
+        parallel = mesh_probe(domain, regions, variables, 'mass',
+                              weights_cache=cache, processes=2)
+        self.assertEqual(parallel, serial)
+        self.assertEqual(sorted(key[0][0] for key in cache),
+                         ['zone_1', 'zone_2'])
+        parallel = mesh_probe(domain, regions, variables, 'mass',
+                              weights_cache=cache, processes=2)
+        self.assertEqual(parallel, serial)
+
+        # Concurrent calls don't share worker arguments.
+        area_only = mesh_probe(domain, regions[:1], variables[:1])
+        results = {}
+        def probe(key, regs, variables):
+            results[key] = mesh_probe(domain, regs, variables, 'mass',
+                                      processes=2)
+        threads = [threading.Thread(target=probe,
+                                    args=(i, regions, variables)
+                                         if i % 2 else
+                                         (i, regions[:1], variables[:1]))
+                   for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for i in range(4):
+            self.assertEqual(results[i], serial if i % 2 else area_only)
+
+        # Caller-supplied pool, reused across calls.
+        pool = multiprocessing.Pool(2)
+        try:
+            for i in range(2):
+                parallel = mesh_probe(domain, regions, variables, 'mass',
+                                      weights_cache=cache, pool=pool)
+                self.assertEqual(parallel, serial)
+        finally:
+            pool.terminate()
+            pool.join()
+
+        domain.zone_1.reference_state = domain.reference_state
+        domain.reference_state = None
+        assert_raises(self, "mesh_probe(domain, regions, variables, 'mass',"
+                            " processes=2)",
+                      globals(), locals(), ValueError,
+                      'No zone or domain reference_state dictionary supplied'
+                      ' for zone zone_2.')
+
+    def test_scalar_metric(self):
+        logging.debug('')
+        logging.debug('test_scalar_metric')
+
+        # Metrics not flagged as vectorized are called per index.
+        class Density(object):
+            def __init__(self, zone, zone_name, reference_state):
+                self.density = zone.flow_solution.density.item
+            def calculate(self, loc, geom):
+                return self.density(*loc)
+            def dimensionalize(self, value):
+                raise NotImplementedError('Dimensional density')
+
+        register_metric('scalar_density', Density, False)
+        try:
+            wedge = create_wedge_3d((30, 20, 100), 5., 0.5, 2., 30.)
+            for regions in ((('xyzzy', 2, 2, 0, -1, 0, -1),),
+                            (('xyzzy', 0, -1, 5, 5, 5, 5),)):
+                variables = (('scalar_density', None), ('density', None))
+                scalar, vector = mesh_probe(wedge, regions, variables)
+                assert_rel_error(self, scalar, vector, 0.0000000001)
+        finally:
+            del _METRICS['scalar_density']
+
     def test_errors(self):
         logging.debug('')
         logging.debug('test_errors')
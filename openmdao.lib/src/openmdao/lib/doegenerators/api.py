@@ -2,10 +2,16 @@
 .. _`openmdao.lib.doegenerators.api`:
 
 Pseudo package providing a central place to access all of the
-OpenMDAO doegenerators in the standard library."""
+OpenMDAO doegenerators in the standard library. Generators are imported
+on first access."""
 
-from openmdao.lib.doegenerators.full_factorial import FullFactorial
-from openmdao.lib.doegenerators.optlh import OptLatinHypercube, LatinHypercube
-from openmdao.lib.doegenerators.uniform import Uniform
-from openmdao.lib.doegenerators.central_composite import CentralComposite
-from openmdao.lib.doegenerators.csvfile import CSVFile
+from openmdao.util.lazyimport import lazy_module
+
+lazy_module(__name__, {
+    'FullFactorial': 'openmdao.lib.doegenerators.full_factorial',
+    'OptLatinHypercube': 'openmdao.lib.doegenerators.optlh',
+    'LatinHypercube': 'openmdao.lib.doegenerators.optlh',
+    'Uniform': 'openmdao.lib.doegenerators.uniform',
+    'CentralComposite': 'openmdao.lib.doegenerators.central_composite',
+    'CSVFile': 'openmdao.lib.doegenerators.csvfile',
+})
@@ -1,25 +1,31 @@
 """
 .. _`drivers`:
 
+Pseudo package providing a central place to access all of the
+OpenMDAO drivers in the standard library. Drivers are imported on first
+access.
 """
 
-"""Pseudo package providing a central place to access all of the
-OpenMDAO drivers in the standard library."""
-
-# Drivers
-from openmdao.lib.drivers.cobyladriver import COBYLAdriver
-from openmdao.lib.drivers.conmindriver import CONMINdriver
-from openmdao.lib.drivers.newsumtdriver import NEWSUMTdriver
-from openmdao.lib.drivers.slsqpdriver import SLSQPdriver
-from openmdao.lib.drivers.caseiterdriver import CaseIteratorDriver, ConnectableCaseIteratorDriver
-from openmdao.lib.drivers.genetic import Genetic
-from openmdao.lib.drivers.iterate import FixedPointIterator, IterateUntil
-from openmdao.lib.drivers.broydensolver import BroydenSolver
-from openmdao.lib.drivers.doedriver import DOEdriver, NeighborhoodDOEdriver
-from openmdao.lib.drivers.doedriver import ConnectableDOEdriver, ConnectableNeighborhoodDOEdriver
-from openmdao.lib.drivers.sensitivity import SensitivityDriver
-from openmdao.lib.drivers.distributioncasedriver import DistributionCaseDriver
-from openmdao.lib.drivers.simplecid import SimpleCaseIterDriver
-from openmdao.lib.drivers.newton_solver import NewtonSolver
-from openmdao.lib.drivers.brent import Brent
+from openmdao.util.lazyimport import lazy_module
 
+lazy_module(__name__, {
+    'COBYLAdriver': 'openmdao.lib.drivers.cobyladriver',
+    'CONMINdriver': 'openmdao.lib.drivers.conmindriver',
+    'NEWSUMTdriver': 'openmdao.lib.drivers.newsumtdriver',
+    'SLSQPdriver': 'openmdao.lib.drivers.slsqpdriver',
+    'CaseIteratorDriver': 'openmdao.lib.drivers.caseiterdriver',
+    'ConnectableCaseIteratorDriver': 'openmdao.lib.drivers.caseiterdriver',
+    'Genetic': 'openmdao.lib.drivers.genetic',
+    'FixedPointIterator': 'openmdao.lib.drivers.iterate',
+    'IterateUntil': 'openmdao.lib.drivers.iterate',
+    'BroydenSolver': 'openmdao.lib.drivers.broydensolver',
+    'DOEdriver': 'openmdao.lib.drivers.doedriver',
+    'NeighborhoodDOEdriver': 'openmdao.lib.drivers.doedriver',
+    'ConnectableDOEdriver': 'openmdao.lib.drivers.doedriver',
+    'ConnectableNeighborhoodDOEdriver': 'openmdao.lib.drivers.doedriver',
+    'SensitivityDriver': 'openmdao.lib.drivers.sensitivity',
+    'DistributionCaseDriver': 'openmdao.lib.drivers.distributioncasedriver',
+    'SimpleCaseIterDriver': 'openmdao.lib.drivers.simplecid',
+    'NewtonSolver': 'openmdao.lib.drivers.newton_solver',
+    'Brent': 'openmdao.lib.drivers.brent',
+})
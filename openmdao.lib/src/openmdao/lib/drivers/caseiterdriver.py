@@ -3,20 +3,26 @@
 
 """
 
+import cPickle
+import hashlib
 import logging
+import multiprocessing
 import os.path
 import Queue
+import select
 import sys
 import thread
 import threading
+import time
 import traceback
 
 from openmdao.main.datatypes.api import Bool, Dict, Enum, Instance, Int, Slot
 
-from openmdao.main.api import Driver
+from openmdao.main.api import Case, Component, Driver
 from openmdao.main.exceptions import RunStopped, TracedError, traceback_str
 from openmdao.main.expreval import ExprEvaluator
 from openmdao.main.interfaces import ICaseIterator, ICaseFilter
+from openmdao.main.mp_support import is_instance
 from openmdao.main.rbac import get_credentials, set_credentials
 from openmdao.main.resource import ResourceAllocationManager as RAM
 from openmdao.main.resource import LocalAllocator
@@ -47,6 +53,31 @@ class CaseIterDriverBase(Driver):
     reload_model = Bool(True, iotype='in',
                         desc='If True, reload the model between executions.')
 
+    replication = Enum('egg', ('egg', 'fork'), iotype='in',
+                       desc="How the model is replicated for concurrent"
+                            " evaluation. 'egg' saves it to an egg file which"
+                            " is loaded by servers from the"
+                            " ResourceAllocationManager. 'fork' evaluates"
+                            " cases in local processes forked from this one,"
+                            " sharing the loaded model (not on Windows)."
+                            " Workers share the working directory, so 'fork'"
+                            " can't be used with file-based components. Only"
+                            " the calling thread is forked, so 'fork' can't"
+                            " be used once other threads have been started.")
+
+    max_forks = Int(0, low=0, iotype='in',
+                    desc="Maximum number of worker processes for replication"
+                         " 'fork'. If zero, the number of servers the"
+                         " ResourceAllocationManager allows on the local"
+                         " host is used.")
+
+    keep_replicas = Bool(False, iotype='in',
+                         desc='If True, servers used for concurrent evaluation'
+                              ' keep their loaded model from one run to the'
+                              ' next. The model is replicated again if its'
+                              ' configuration or any of its inputs change.'
+                              ' Requires reload_model to be False.')
+
     error_policy = Enum(values=('ABORT', 'RETRY'), iotype='in',
                         desc='If ABORT, any error stops the evaluation of the'
                              ' whole set of cases.')
@@ -86,7 +117,13 @@ class CaseIterDriverBase(Driver):
         self._server_cases = {}
         self._exceptions = {}
         self._load_failures = {}
- 
+
+        # Servers kept loaded if keep_replicas, and a digest of the model
+        # inputs they were replicated with.
+        self._replicas = []
+        self._replicas_digest = None
+        self._replicas_stale = True
+
         self._todo = []   # Cases grabbed during server startup.
         self._rerun = []  # Cases that failed and should be retried.
         self._generation = 0  # Used to keep worker names unique.
@@ -125,6 +162,9 @@ class CaseIterDriverBase(Driver):
                         self.step()
                     except StopIteration:
                         break
+            elif self._use_fork():
+                self._logger.info('Start forked evaluation.')
+                self._start_forked()
             else:
                 self._logger.info('Start concurrent evaluation.')
                 self._start()
@@ -176,9 +216,31 @@ class CaseIterDriverBase(Driver):
              If True, then replicate the model and save to an egg file
              first (for concurrent evaluation).
         """
+        keep = self.keep_replicas and not self.sequential and \
+               not self._use_fork()
+        if keep:
+            if self.reload_model:
+                self.raise_exception('keep_replicas requires reload_model'
+                                     ' to be False', ValueError)
+            digest = self._inputs_digest()
+            if digest is None or digest != self._replicas_digest:
+                self._replicas_stale = True
+
         self._cleanup(remove_egg=replicate)
 
-        if not self.sequential:
+        if self.replication == 'fork' and not hasattr(os, 'fork'):
+            self._logger.warning("replication 'fork' is not supported on"
+                                 " this platform, using 'egg'")
+
+        if not self.sequential and self._use_fork():
+            comp = self._file_based_component()
+            if comp is not None:
+                self.raise_exception("replication 'fork' can't be used with"
+                                     " file-based component %s, use 'egg'"
+                                     % comp.get_pathname(), ValueError)
+
+        if not self.sequential and not self._use_fork() and \
+           not self._replicas_valid():
             if replicate or self._egg_file is None:
                 # Save model to egg.
                 # Must do this before creating any locks or queues.
@@ -206,13 +268,68 @@ class CaseIterDriverBase(Driver):
                 finally:
                     self.parent.add('driver', driver) # need to do add here in order to update parent depgraph
 
+                if keep:
+                    self._replicas_digest = digest
+                    self._replicas_stale = False
                 self._egg_file = egg_info[0]
                 self._egg_required_distributions = egg_info[1]
                 self._egg_orphan_modules = [name for name, path in egg_info[2]]
 
         self._iter = self.get_case_iterator()
         self._seqno = 0
-        
+
+    def config_changed(self, update_parent=True):
+        """ Note that any kept replicas of the model are out of date. """
+        super(CaseIterDriverBase, self).config_changed(update_parent)
+        self._replicas_stale = True
+
+    def pre_delete(self):
+        """ Release any kept servers and their egg file. """
+        super(CaseIterDriverBase, self).pre_delete()
+        self._release_replicas()
+
+    def _use_fork(self):
+        """ Return True if cases are to be run in forked processes. """
+        return self.replication == 'fork' and hasattr(os, 'fork')
+
+    def _replicas_valid(self):
+        """ Return True if kept replicas may be used for the next run. """
+        return self.keep_replicas and not self.sequential and \
+               not self._replicas_stale and bool(self._replicas)
+
+    def _file_based_component(self):
+        """
+        Return a component of the model which reads or writes files, or
+        None. Forked workers would overwrite each other's files.
+        """
+        from openmdao.lib.components.external_code import ExternalCode
+        comps = [self.parent]
+        comps.extend([obj for name, obj in self.parent.items(recurse=True)
+                                        if is_instance(obj, Component)])
+        for comp in comps:
+            if isinstance(comp, ExternalCode) or comp.external_files:
+                return comp
+            for name, fvar, ftrait in comp.get_file_vars():
+                if fvar.owner is comp:
+                    return comp
+        return None
+
+    def _inputs_digest(self):
+        """
+        Return a digest of the input values of the model being replicated,
+        excluding this driver's own, or None if they can't be pickled.
+        """
+        prefix = self.name + '.'
+        inputs = sorted((name, value) for name, value
+                        in self.parent.items(recurse=True, iotype='in')
+                        if not name.startswith(prefix))
+        try:
+            data = cPickle.dumps(inputs, cPickle.HIGHEST_PROTOCOL)
+        except Exception as exc:
+            self._logger.debug("can't pickle model inputs: %s", exc)
+            return None
+        return hashlib.sha1(data).hexdigest()
+
     def get_case_iterator(self):
         """Returns a new iterator over the Case set."""
         raise NotImplementedError('get_case_iterator')
@@ -236,10 +353,26 @@ class CaseIterDriverBase(Driver):
             self.raise_exception(msg, RuntimeError)
 
         # Kick off initial wave of cases.
-        self._server_lock = threading.Lock()
-        self._reply_q = Queue.Queue()
+        if self._reply_q is None:
+            self._server_lock = threading.Lock()
+            self._reply_q = Queue.Queue()
         self._generation += 1
         n_servers = 0
+        started = []
+
+        # Kept servers already have the model loaded.
+        for name in self._replicas:
+            if not self._more_to_go():
+                break
+            n_servers += 1
+            self._logger.debug('reusing worker for %r', name)
+            self._in_use[name] = True
+            self._server_cases[name] = None
+            self._server_states[name] = _LOADING
+            self._exceptions[name] = None
+            self._load_failures[name] = 0
+            self._in_use[name] = self._server_ready(name)
+
         while n_servers < max_servers:
             if not self._more_to_go():
                 break
@@ -259,6 +392,7 @@ class CaseIterDriverBase(Driver):
             # Start server worker thread.
             n_servers += 1
             name = '%s_%d_%d' % (self.name, self._generation, n_servers)
+            started.append(name)
             self._logger.debug('starting worker for %r', name)
             self._servers[name] = None
             self._in_use[name] = True
@@ -296,14 +430,14 @@ class CaseIterDriverBase(Driver):
         if sys.platform == 'win32':  #pragma no cover
             # Don't start server processing until all servers are started,
             # otherwise we have egg removal issues.
-            for name in self._in_use.keys():
+            for i in range(len(started)):
                 name, result, exc = self._reply_q.get()
                 if self._servers[name] is None:
                     self._logger.debug('server startup failed for %r', name)
                     self._in_use[name] = False
 
             # Kick-off started servers.
-            for name in self._in_use.keys():
+            for name in started:
                 if self._in_use[name]:
                     self._in_use[name] = self._server_ready(name)
 
@@ -343,11 +477,21 @@ class CaseIterDriverBase(Driver):
             else:
                 self._in_use[name] = self._server_ready(name)
 
-        # Shut-down (started) servers.
+        # Shut-down (started) servers, except replicas to be kept.
+        if self.keep_replicas:
+            self._replicas = [name for name in sorted(self._queues.keys())
+                              if self._top_levels.get(name) is not None]
+        else:
+            self._replicas = []
+        self._shutdown_workers([name for name in self._queues.keys()
+                                if name not in self._replicas])
+
+    def _shutdown_workers(self, names):
+        """ Shut-down the worker threads (and their servers) for `names`. """
         self._logger.debug('Shut-down (started) servers')
-        for queue in self._queues.values():
-            queue.put(None)
-        for i in range(len(self._queues)):
+        for name in names:
+            self._queues[name].put(None)
+        for i in range(len(names)):
             try:
                 name, status, exc = self._reply_q.get(True, 60)
             # Hard to force worker to hang, which is handled here.
@@ -357,8 +501,215 @@ class CaseIterDriverBase(Driver):
                 if name in self._queues:  # 'Stale' worker can reply *late*.
                     del self._queues[name]
         # Hard to force worker to hang, which is handled here.
-        for name in self._queues.keys():  #pragma no cover
-            self._logger.warning('Timeout waiting for %r to shut-down.', name)
+        for name in names:  #pragma no cover
+            if name in self._queues:
+                self._logger.warning('Timeout waiting for %r to shut-down.',
+                                     name)
+                del self._queues[name]
+
+    def _release_replicas(self):
+        """ Shut-down any kept servers and remove their egg file. """
+        if self._replicas:
+            self._shutdown_workers(self._replicas)
+            self._replicas = []
+            if self._egg_file and os.path.exists(self._egg_file):
+                os.remove(self._egg_file)
+                self._egg_file = None
+
+    def _start_forked(self):
+        """
+        Evaluate cases in local worker processes forked from this one.
+        Workers share the loaded model copy-on-write, so only case inputs
+        and results are transferred. Cases sent to a worker which exits
+        are failed.
+
+        :func:`os.fork` only copies the calling thread. Locks held by any
+        other thread at that time, such as a worker thread of a concurrent
+        :class:`Dataflow` or of an :class:`OpenMDAO_Proxy` connection, are
+        never released in the workers, which may then hang. So forking with
+        other threads running is an error.
+        """
+        # The remote logging listener is left out. It only handles log
+        # records sent by remote servers.
+        others = [thread for thread in threading.enumerate()
+                  if thread is not threading.current_thread() and
+                     not thread.name.endswith('-log-listener')]
+        if others:
+            self.raise_exception("replication 'fork' can't be used with %d"
+                                 " other threads running, use 'egg'"
+                                 % len(others), RuntimeError)
+
+        n_workers = self.max_forks or RAM.max_servers(dict(localhost=True))
+        workers = []
+        for i in range(max(n_workers, 1)):
+            request_q = multiprocessing.Queue()
+            reader, writer = multiprocessing.Pipe(duplex=False)
+            worker = multiprocessing.Process(target=self._fork_service,
+                                             args=(request_q, writer))
+            worker.daemon = True
+            worker.start()
+            writer.close()
+            workers.append((worker, request_q, reader))
+        self._logger.debug('%d forked workers', len(workers))
+
+        # Each worker is sent one case at a time, so if it exits only the
+        # case it was evaluating is lost.
+        pending = {}
+        assigned = dict((reader, None) for worker, request_q, reader
+                                       in workers)
+        live = list(workers)
+        try:
+            while True:
+                for worker, request_q, reader in live:
+                    if assigned[reader] is None:
+                        case, seqno = self._next_forked_case()
+                        if case is None:
+                            break
+                        pending[seqno] = case
+                        assigned[reader] = seqno
+                        request_q.put((seqno, case.uuid,
+                                       case.items(iotype='in'),
+                                       case.keys(iotype='out')))
+                if not pending:
+                    break
+
+                readers = [reader for worker, request_q, reader in live]
+                ready = select.select(readers, [], [], 1.)[0]
+                for reader in ready:
+                    self._forked_reply(reader, pending, assigned)
+
+                # Fail the cases of any worker which has exited.
+                for entry in list(live):
+                    worker, request_q, reader = entry
+                    if worker.is_alive():
+                        continue
+                    live.remove(entry)
+                    while reader.poll() and \
+                          self._forked_reply(reader, pending, assigned):
+                        pass
+                    seqno = assigned[reader]
+                    if seqno is not None:
+                        msg = 'Forked worker exited, exitcode %s' \
+                              % worker.exitcode
+                        self._forked_done(pending.pop(seqno), seqno,
+                                          [], msg, None)
+                if not live and not self._stop and \
+                   (self._rerun or self._iter is not None):
+                    self.raise_exception('All forked workers exited',
+                                         RuntimeError)
+        finally:
+            for worker, request_q, reader in workers:
+                request_q.put(None)
+                request_q.cancel_join_thread()
+            # Workers block sending replies until they are read.
+            deadline = time.time() + 10.
+            for worker, request_q, reader in workers:
+                while worker.is_alive() and time.time() < deadline:
+                    try:
+                        while reader.poll():
+                            reader.recv_bytes()
+                    except EOFError:
+                        pass
+                    worker.join(0.1)
+                if worker.is_alive():
+                    worker.terminate()
+                    worker.join()
+                reader.close()
+
+    def _forked_reply(self, reader, pending, assigned):
+        """
+        Process a case reply from the forked worker using `reader`.
+        Returns False if the worker has exited.
+        """
+        try:
+            reply = reader.recv_bytes()
+        except EOFError:
+            return False
+        seqno, results, msg, exc = cPickle.loads(reply)
+        assigned[reader] = None
+        self._forked_done(pending.pop(seqno), seqno, results, msg, exc)
+        return True
+
+    def _forked_done(self, case, seqno, results, msg, exc):
+        """ Update `case` with the results from a forked worker and record. """
+        for name, value in results:
+            case[name] = value
+        if exc is not None:
+            exc = TracedError(*exc)
+            self._logger.debug('    exception while executing: %r', exc)
+            case.exc = exc
+        case.msg = msg
+
+        if case.msg is not None and self.error_policy == 'ABORT':
+            if self._abort_exc is None:
+                self._abort_exc = exc or RuntimeError(msg)
+            self._stop = True
+
+        self._record_case(case, seqno)
+
+    def _next_forked_case(self):
+        """ Return the next ``(case, seqno)`` to evaluate, or (None, None). """
+        if self._stop:
+            return (None, None)
+        if self._rerun:
+            case, seqno = self._rerun.pop(0)
+            self._prepare_case(case, rerun=True)
+            return (case, seqno)
+        if self._iter is None:
+            return (None, None)
+        try:
+            case = self._iter.next()
+        except StopIteration:
+            self._iter = None
+            self._seqno = 0
+            return (None, None)
+        self._seqno += 1
+        self._prepare_case(case)
+        return (case, self._seqno)
+
+    def _fork_service(self, request_q, reply_conn):
+        """ Each forked worker process executes this. """
+        while True:
+            request = request_q.get()
+            if request is None:
+                break
+            seqno, case_uuid, inputs, outputs = request
+            case = Case(inputs, outputs, case_uuid=case_uuid)
+            results = []
+            exc = None
+            try:
+                for event in self.get_events():
+                    self._model_set(None, event, None, True)
+                case.apply_inputs(self.parent)
+                self.workflow._parent.update_parameters()
+                # Iteration coordinates as if all cases ran here.
+                self.workflow.set_initial_count(seqno)
+                self.workflow.reset()
+                self.workflow.run(case_id=case_uuid)
+            except Exception as err:
+                msg = str(err)
+                exc = (err, traceback.format_exc())
+            else:
+                try:
+                    case.update_outputs(self.parent)
+                except Exception as err:
+                    msg = '%s: Exception getting case outputs: %s' \
+                          % (self.get_pathname(), err)
+                else:
+                    msg = None
+                    results = case.items(iotype='out')
+
+            try:
+                reply = cPickle.dumps((seqno, results, msg, exc), -1)
+            except Exception:
+                if exc is not None:  # Exception may not be picklable.
+                    exc = (RuntimeError(msg), exc[1])
+                try:
+                    reply = cPickle.dumps((seqno, results, msg, exc), -1)
+                except Exception as err:
+                    msg = 'Exception returning case results: %s' % err
+                    reply = cPickle.dumps((seqno, [], msg, exc), -1)
+            reply_conn.send_bytes(reply)
 
     def _busy(self):
         """ Return True while at least one server is in use. """
@@ -369,14 +720,20 @@ class CaseIterDriverBase(Driver):
         Cleanup internal state, and egg file if necessary.
         Note: this happens unconditionally, so it will cause issues
               for workers which haven't shut down by now.
+        Kept replicas (and their egg file) are retained while still valid.
         """
-        self._reply_q = None
-        self._server_lock = None
+        keep = self._replicas_valid()
+        if not keep:
+            self._release_replicas()
+
+            self._reply_q = None
+            self._server_lock = None
+
+            self._servers = {}
+            self._top_levels = {}
+            self._server_info = {}
+            self._queues = {}
 
-        self._servers = {}
-        self._top_levels = {}
-        self._server_info = {}
-        self._queues = {}
         self._in_use = {}
         self._server_states = {}
         self._server_cases = {}
@@ -386,7 +743,7 @@ class CaseIterDriverBase(Driver):
         self._todo = []
         self._rerun = []
 
-        if self._egg_file and os.path.exists(self._egg_file):
+        if not keep and self._egg_file and os.path.exists(self._egg_file):
             os.remove(self._egg_file)
             self._egg_file = None
 
@@ -542,8 +899,8 @@ class CaseIterDriverBase(Driver):
                 
         return in_use
 
-    def _run_case(self, case, seqno, server, rerun=False):
-        """ Setup and start a case. Returns True if started. """
+    def _prepare_case(self, case, rerun=False):
+        """ Initialize `case` for (re)evaluation. """
         if not rerun:
             if not case.max_retries:
                 case.max_retries = self.max_retries
@@ -565,6 +922,10 @@ class CaseIterDriverBase(Driver):
                 val = ExprEvaluator(var, scope=self.parent).evaluate()
                 case.add_output(var, val)
 
+    def _run_case(self, case, seqno, server, rerun=False):
+        """ Setup and start a case. Returns True if started. """
+        self._prepare_case(case, rerun)
+
         try:
             for event in self.get_events(): 
                 try: 
@@ -574,8 +935,10 @@ class CaseIterDriverBase(Driver):
                     self._logger.debug('    %s', msg)
                     self.raise_exception(msg, _ServerError)
             try:
-                scope = self.parent if server is None else self._top_levels[server]
-                case.apply_inputs(scope)
+                if server is None:
+                    case.apply_inputs(self.parent)
+                else:
+                    case.apply_inputs(self._top_levels[server])
             except Exception as exc:
                 msg = 'Exception setting case inputs: %s' % exc
                 self._logger.debug('    %s', msg)
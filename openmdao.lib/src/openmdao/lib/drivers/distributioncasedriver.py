@@ -11,9 +11,10 @@ from zope.interface import Interface
 # E0611 - name cannot be found in a module
 # F0401 - Unable to import module
 # E1101 - Used when a variable is accessed for an unexistent member
-from openmdao.main.numpy_fallback import zeros
+from numpy import arange, array, empty, nan, tile, vstack
 
-from openmdao.main.datatypes.api import List, Str, Slot, Int, Enum, Bool
+from openmdao.main.datatypes.api import Array, List, Str, Slot, Int, Enum, \
+                                        Bool
 from openmdao.lib.drivers.caseiterdriver import CaseIterDriverBase
 from openmdao.main.api import Container
 from openmdao.main.case import Case
@@ -54,51 +55,39 @@ class FiniteDifferenceGenerator(Container):
 
     def __iter__(self):
         """Return an iterator over our sets of input values."""
-        return self._get_input_values()
-
-    def _get_input_values(self):
-        '''Generator for the values'''
+        return iter(self.get_input_values())
 
+    def get_input_values(self):
+        """
+        Return all sets of input values as a 2-D array with one row per
+        case, in the order: baseline (if run), then the stencil points
+        for each parameter in turn.
+        """
         baseline = self.driver.eval_parameters()
         delta = self.driver.get_fd_steps()
-        mask = zeros(baseline.size, 'd')
-
-        # baseline case
-        if not self.skip_baseline:
-            if not (self.form == "CENTRAL" and self.order % 2 == 1):
-                yield baseline
+        nparams = baseline.size
 
         if self.form == "FORWARD":
-            offset = 1
+            offsets = range(1, self.order + 1)
         elif self.form == "BACKWARD":
-            offset = - self.order
-        elif self.form == "CENTRAL":
-            if self.order % 2 == 1:
-                offset = (0.5 - self.order)
-            else:
-                offset = 1 - self.order
-
-        # non-baseline cases for forward and backward
-        if self.form in ["BACKWARD", "FORWARD"]:
-            for iparam in range(len(mask)):
-                mask[iparam] = 1.0
-                for i in range(self.order):
-                    var_val = baseline + (offset + i) * delta * mask
-                    yield var_val
-                mask[iparam] = 0.0
-        else:  # for central form
-            for iparam in range(len(mask)):
-                mask[iparam] = 1.0
-                if self.order % 2 == 1:
-                    for i in range(self.order + 1):
-                        var_val = baseline + (offset + i) * delta * mask
-                        yield var_val
-                else:
-                    for i in range(self.order + 1):
-                        if (offset + i) != 0:
-                            var_val = baseline + (offset + i) * delta * mask
-                            yield var_val
-                mask[iparam] = 0.0
+            offsets = range(-self.order, 0)
+        elif self.order % 2 == 1:
+            offsets = [0.5 - self.order + i for i in range(self.order + 1)]
+        else:
+            offsets = [i for i in range(1 - self.order, 2) if i != 0]
+        offsets = array(offsets, 'd')
+        npoints = len(offsets)
+
+        # Each parameter in turn is perturbed by each offset.
+        rows = tile(baseline, (nparams * npoints, 1))
+        iparam = arange(nparams).repeat(npoints)
+        rows[arange(len(rows)), iparam] += tile(offsets, nparams) \
+                                           * delta[iparam]
+
+        if not self.skip_baseline and \
+           not (self.form == "CENTRAL" and self.order % 2 == 1):
+            rows = vstack((baseline, rows))
+        return rows
 
 
 @add_delegate(HasParameters)
@@ -114,15 +103,49 @@ class DistributionCaseDriver(CaseIterDriverBase):
     case_outputs = List(Str, iotype='in',
                         desc='A list of outputs to be saved with each case.')
 
+    evaluated = Array(iotype='out',
+                      desc='Values of `case_outputs` for each case, one row'
+                           ' per case in generator order. Failed cases and'
+                           ' non-scalar outputs are NaN.')
+
+    def __init__(self, *args, **kwargs):
+        super(DistributionCaseDriver, self).__init__(*args, **kwargs)
+        self._case_rows = {}  # Maps case uuid to row in `evaluated`.
+
     def get_case_iterator(self):
         """Returns a new iterator over the Case set."""
         return self._get_cases()
 
     def _get_cases(self):
         """Iterator over the cases"""
-
-        for row in self.distribution_generator:
+        generator = self.distribution_generator
+        if hasattr(generator, 'get_input_values'):
+            rows = generator.get_input_values()
+        else:
+            rows = list(generator)
+
+        evaluated = empty((len(rows), len(self.case_outputs)))
+        evaluated.fill(nan)
+        self.evaluated = evaluated
+        self._case_rows = {}
+
+        for i, row in enumerate(rows):
             case = self.set_parameters(row, Case(parent_uuid=self._case_id))
             case.add_outputs(self.case_outputs)
+            self._case_rows[case.uuid] = i
 
             yield case
+
+    def _record_case(self, case, seqno):
+        """ Record the case and save its outputs in `evaluated`. """
+        retry = case.msg and case.retries < case.max_retries
+        super(DistributionCaseDriver, self)._record_case(case, seqno)
+        if retry or case.msg:
+            return
+
+        row = self.evaluated[self._case_rows.pop(case.uuid)]
+        for i, name in enumerate(self.case_outputs):
+            try:
+                row[i] = case[name]
+            except (TypeError, ValueError):
+                pass
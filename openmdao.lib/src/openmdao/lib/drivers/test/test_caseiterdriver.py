@@ -8,6 +8,7 @@ import pkg_resources
 import re
 import subprocess
 import sys
+import threading
 import time
 import unittest
 import nose
@@ -26,6 +27,7 @@ from openmdao.main.datatypes.api import Float, Bool, Array, Instance, Int, Slot,
 from openmdao.lib.drivers.caseiterdriver import CaseIteratorDriver, ConnectableCaseIteratorDriver
 from openmdao.lib.casehandlers.api import ListCaseRecorder, ListCaseIterator, \
                                           SequenceCaseFilter
+from openmdao.lib.components.external_code import ExternalCode
 
 from openmdao.test.cluster import init_cluster
 
@@ -56,6 +58,7 @@ class DrivenComponent(Component):
     raise_error = Bool(False, iotype='in')
     stop_exec = Bool(False, iotype='in')
     sleep = Float(0., iotype='in')
+    exit_code = Int(0, iotype='in')
 
     rosen_suzuki = Float(0., iotype='out')
     sum_y = Float(0., iotype='out')
@@ -77,6 +80,8 @@ class DrivenComponent(Component):
             self.raise_exception('Forced error', RuntimeError)
         if self.stop_exec:
             self.parent.driver.stop()  # Only valid if sequential!
+        if self.exit_code:
+            os._exit(self.exit_code)  # Only valid if forked!
 
 
 def _get_driver():
@@ -261,12 +266,135 @@ class TestCase(unittest.TestCase):
         self.model.driver.extra_resources = {'allocator': name}
         self.run_cases(sequential=False)
 
-    def run_cases(self, sequential, forced_errors=False, retry=True):
+    def test_forked(self):
+        logging.debug('')
+        logging.debug('test_forked')
+        self.model.driver.replication = 'fork'
+        self.run_cases(sequential=False)
+        self.assertEqual(self.model.driver._egg_file, None)
+
+    def test_forked_errors(self):
+        logging.debug('')
+        logging.debug('test_forked_errors')
+        self.model.driver.replication = 'fork'
+        self.generate_cases(force_errors=True)
+        self.run_cases(sequential=False, forced_errors=True, retry=False)
+        self.run_cases(sequential=False, forced_errors=True, retry=True)
+
+    def test_forked_exit(self):
+        logging.debug('')
+        logging.debug('test_forked_exit')
+        self.model.driver.replication = 'fork'
+        self.model.driver.sequential = False
+        self.model.driver.max_forks = 2
+        self.model.driver.max_retries = 0
+        self.cases[3].add_input('driven.exit_code', 3)
+
+        # The lost case is failed and the rest run on the other worker.
+        self.model.driver.iterator = ListCaseIterator(self.cases)
+        results = ListCaseRecorder()
+        self.model.driver.recorders = [results]
+        self.model.driver.error_policy = 'RETRY'
+        self.model.run()
+        self.assertEqual(len(results), len(self.cases))
+        msg = 'Forked worker exited, exitcode 3'
+        for case in results.cases:
+            if case.label == '3':
+                self.assertEqual(case.msg, msg)
+            else:
+                self.assertEqual(case.msg, None)
+                self.assertEqual(case['driven.rosen_suzuki'],
+                                 rosen_suzuki(case['driven.x']))
+
+        self.model.driver.iterator = ListCaseIterator(self.cases)
+        self.model.driver.error_policy = 'ABORT'
+        try:
+            self.model.run()
+        except RuntimeError as exc:
+            self.assertEqual(str(exc), 'driver: Run aborted: ' + msg)
+        else:
+            self.fail('RuntimeError expected')
+
+    def test_forked_refused(self):
+        logging.debug('')
+        logging.debug('test_forked_refused')
+        self.model.driver.replication = 'fork'
+        self.model.driver.sequential = False
+        self.model.driver.iterator = ListCaseIterator(self.cases)
+
+        # Workers would share other threads' locks.
+        event = threading.Event()
+        thread = threading.Thread(target=event.wait)
+        thread.start()
+        try:
+            assert_raises(self, 'self.model.run()', globals(), locals(),
+                          RuntimeError, "driver: replication 'fork' can't be"
+                          " used with 1 other threads running, use 'egg'")
+        finally:
+            event.set()
+            thread.join()
+
+        # Workers would overwrite each other's files.
+        self.model.add('wrapper', ExternalCode())
+        assert_raises(self, 'self.model.run()', globals(), locals(),
+                      ValueError, "driver: replication 'fork' can't be used"
+                      " with file-based component wrapper, use 'egg'")
+
+    def test_keep_replicas(self):
+        logging.debug('')
+        logging.debug('test_keep_replicas')
+        init_cluster(encrypted=True, allow_shell=True)
+        self.model.driver.keep_replicas = True
+
+        # Kept replicas aren't reloaded, so reload_model must be False.
+        try:
+            self.run_cases(sequential=False)
+        except ValueError as exc:
+            self.assertEqual(str(exc), 'driver: keep_replicas requires'
+                                       ' reload_model to be False')
+        else:
+            self.fail('ValueError expected')
+
+        self.model.driver.reload_model = False
+        self.run_cases(sequential=False)
+        replicas = list(self.model.driver._replicas)
+        egg_file = self.model.driver._egg_file
+        self.assertTrue(replicas)
+        self.assertTrue(os.path.exists(egg_file))
+
+        # Kept servers and egg are reused by the next run.
+        self.run_cases(sequential=False)
+        self.assertTrue(set(replicas) <= set(self.model.driver._replicas))
+        self.assertEqual(self.model.driver._egg_file, egg_file)
+
+        # A change to a model input not set by the cases causes the model
+        # to be replicated again.
+        self.run_cases(sequential=False, sleep=0.25)
+        self.assertFalse(set(replicas) & set(self.model.driver._replicas))
+        self.assertFalse(os.path.exists(egg_file))
+        replicas = list(self.model.driver._replicas)
+        egg_file = self.model.driver._egg_file
+
+        # As does a configuration change.
+        self.model.config_changed()
+        self.run_cases(sequential=False, sleep=0.25)
+        self.assertFalse(set(replicas) & set(self.model.driver._replicas))
+        self.assertFalse(os.path.exists(egg_file))
+
+        # Releasing the replicas removes their egg.
+        egg_file = self.model.driver._egg_file
+        self.assertTrue(os.path.exists(egg_file))
+        self.model.driver.pre_delete()
+        self.assertEqual(self.model.driver._replicas, [])
+        self.assertFalse(os.path.exists(egg_file))
+
+    def run_cases(self, sequential, forced_errors=False, retry=True,
+                  sleep=0.2):
         """ Evaluate cases, either sequentially or across multiple servers. """
         self.model.driver.sequential = sequential
         if not sequential:
             # Try to ensure more than one worker is used.
-            self.model.driven.sleep = 0.2
+            self.model.driven.sleep = sleep
         self.model.driver.iterator = ListCaseIterator(self.cases)
         results = ListCaseRecorder()
         self.model.driver.recorders = [results]
@@ -282,8 +410,8 @@ class TestCase(unittest.TestCase):
                 self.model.run()
             except Exception as err:
                 err = replace_uuid(str(err))
-                if not sequential: # RemoteError has different format.
-                    err = err[:-76]
+                if not sequential and self.model.driver.replication == 'egg':
+                    err = err[:-76]  # RemoteError has different format.
                 startmsg = 'driver: Run aborted: Traceback '
                 endmsg = 'driven (UUID.4-1): Forced error'
                 self.assertEqual(err[:len(startmsg)], startmsg)
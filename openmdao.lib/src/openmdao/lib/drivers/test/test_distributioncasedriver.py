@@ -225,6 +225,58 @@ class TestCase(unittest.TestCase):
             self.assertEqual(case['driven.rosen_suzuki'],
                              rosen_suzuki(*[case['driven.x%s'%i] for i in range(4)]))
 
+    def test_input_values(self):
+        # Batch of stencil points matches the per-parameter offsets.
+        generator = self.model.driver.distribution_generator
+        baseline = self.model.driver.eval_parameters()
+        delta = self.model.driver.get_fd_steps()
+        for form, order, offsets in (("FORWARD", 2, [1, 2]),
+                                     ("BACKWARD", 2, [-2, -1]),
+                                     ("CENTRAL", 2, [-1, 1]),
+                                     ("CENTRAL", 3, [-2.5, -1.5, -.5, .5])):
+            generator.form = form
+            generator.order = order
+            expected = []
+            if len(offsets) == order:
+                expected.append(baseline)
+            for iparam in range(len(baseline)):
+                for offset in offsets:
+                    row = baseline.copy()
+                    row[iparam] += offset * delta[iparam]
+                    expected.append(row)
+
+            rows = generator.get_input_values()
+            self.assertEqual(rows.shape, (len(expected), len(baseline)))
+            self.assertEqual(rows.tolist(), [list(row) for row in expected])
+            self.assertEqual([list(row) for row in generator], rows.tolist())
+
+    def test_evaluated(self):
+        driver = self.model.driver
+        driver.distribution_generator.form = "CENTRAL"
+        driver.distribution_generator.order = 2
+        rows = driver.distribution_generator.get_input_values()
+        self.model.run()
+        self.assertEqual(driver.evaluated.shape, (len(rows), 1))
+        for row, value in zip(rows, driver.evaluated[:, 0]):
+            self.assertEqual(value, rosen_suzuki(*row))
+
+    def test_forked(self):
+        # Evaluate the stencil concurrently in local worker processes.
+        driver = self.model.driver
+        driver.sequential = False
+        driver.replication = 'fork'
+        self.results = ListCaseRecorder()
+        driver.recorders = [self.results]
+        self.order = 2
+        driver.distribution_generator.form = "CENTRAL"
+        driver.distribution_generator.order = self.order
+        self.model.run()
+        self.verify_results()
+
+        rows = driver.distribution_generator.get_input_values()
+        for row, value in zip(rows, driver.evaluated[:, 0]):
+            self.assertEqual(value, rosen_suzuki(*row))
+
     def test_invalid_input(self):
 
         model = Assembly()
@@ -1,6 +1,12 @@
 """Pseudo package providing a central place to access all of the
-OpenMDAO surrogatemodels in the standard library."""
+OpenMDAO surrogatemodels in the standard library. Surrogate models are
+imported on first access."""
 
-from openmdao.lib.surrogatemodels.kriging_surrogate import FloatKrigingSurrogate,KrigingSurrogate
-from openmdao.lib.surrogatemodels.logistic_regression import LogisticRegression
-from openmdao.lib.surrogatemodels.response_surface import ResponseSurface
+from openmdao.util.lazyimport import lazy_module
+
+lazy_module(__name__, {
+    'FloatKrigingSurrogate': 'openmdao.lib.surrogatemodels.kriging_surrogate',
+    'KrigingSurrogate': 'openmdao.lib.surrogatemodels.kriging_surrogate',
+    'LogisticRegression': 'openmdao.lib.surrogatemodels.logistic_regression',
+    'ResponseSurface': 'openmdao.lib.surrogatemodels.response_surface',
+})
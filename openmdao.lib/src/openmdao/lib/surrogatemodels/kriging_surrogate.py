@@ -1,12 +1,12 @@
 """ Surrogate model based on Kriging. """
 
-from math import log, e, sqrt
+from math import log, e
 import logging
 
 # pylint: disable-msg=E0611,F0401
 try:
     from numpy import array, zeros, dot, ones, arange, eye, abs, vstack, exp, \
-         sum
+         sum, sqrt, atleast_2d, column_stack
     from numpy.linalg import det, linalg, lstsq
     from scipy.linalg import cho_factor, cho_solve
     from scipy.optimize import fmin
@@ -15,13 +15,15 @@ except ImportError as err:
 
 from openmdao.main.api import Container
 from openmdao.main.interfaces import implements, ISurrogate
-from openmdao.main.uncertain_distributions import NormalDistribution
+from openmdao.main.uncertain_distributions import NormalDistribution, \
+                                                 NormalDistributionArray
 from openmdao.util.decorators import stub_if_missing_deps
 
 @stub_if_missing_deps('numpy', 'scipy')
 class KrigingSurrogate(Container):
     """Surrogate Modeling method based on the simple Kriging interpolation.
-    Predictions are returned as a NormalDistribution instance."""
+    Predictions are returned as a NormalDistribution instance, or as a
+    NormalDistributionArray for a batch of points."""
 
     implements(ISurrogate)
 
@@ -48,56 +50,42 @@ class KrigingSurrogate(Container):
         """Calculates a predicted value of the response based on the current
         trained model for the supplied list of inputs.
         """
+        dist = KrigingSurrogate.predict_batch(self, [new_x])
+        return NormalDistribution(dist.mu[0], dist.sigma[0])
+
+    def predict_batch(self, new_x):
+        """Calculates predicted values of the response based on the current
+        trained model for each row of the supplied array of inputs, returning
+        a NormalDistributionArray.
+        """
         if self.m == None: #untrained surrogate
             raise RuntimeError("KrigingSurrogate has not been trained, so no "
                                "prediction can be made")
-        r = zeros(self.n)
         X, Y = self.X, self.Y
         thetas = 10.**self.thetas
         XX = array(X)
-        new_x = array(new_x)
-        for i in range(self.n):
-            r[i] = sum(thetas*(XX[i] - new_x)**2.)
-        r = exp(-r)
+        new_x = atleast_2d(array(new_x, dtype=float))
+        # Correlation of each new point (row) with each training point.
+        r = exp(-sum(thetas*(XX[None, :, :] - new_x[:, None, :])**2., 2))
 
         one = ones(self.n)
+        rhs = column_stack([(Y-dot(one, self.mu)), one, r.T])
         if self.R_fact is not None:
             #---CHOLESKY DECOMPOSTION ---
-            #f = self.mu+dot(r,cho_solve(self.R_fact,Y-dot(one,self.mu)))
-            #term1 = dot(r,cho_solve(self.R_fact,r))
-            #term2 = (1.0-dot(one,cho_solve(self.R_fact,r)))**2./dot(one,cho_solve(self.R_fact,one))
-
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
             R_fact = (self.R_fact[0].T, not self.R_fact[1])
-            cho = cho_solve(R_fact, rhs).T
-
-            f = self.mu + dot(r, cho[0])
-            term1 = dot(r, cho[1])
-            term2 = (1.0 - dot(one, cho[1]))**2./dot(one, cho[2])
-
+            sol = cho_solve(R_fact, rhs).T
         else:
             #-----LSTSQ-------
-            rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-            lsq = lstsq(self.R.T, rhs)[0].T
+            sol = lstsq(self.R.T, rhs)[0].T
+
+        f = self.mu + dot(r, sol[0])
+        term1 = sum(r*sol[2:], 1)
+        term2 = (1.0 - dot(sol[2:], one))**2./dot(one, sol[1])
 
-            f = self.mu + dot(r, lsq[0])
-            term1 = dot(r, lsq[1])
-            term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-            """
-      #-----LSTSQ-------
-      rhs = vstack([(Y-dot(one, self.mu)), r, one]).T
-      lsq = lstsq(self.R.T, rhs)[0].T
-
-      f = self.mu + dot(r, lsq[0])
-      term1 = dot(r, lsq[1])
-      term2 = (1.0 - dot(one, lsq[1]))**2./dot(one, lsq[2])
-      """
         MSE = self.sig2*(1.0 - term1 + term2)
         RMSE = sqrt(abs(MSE))
 
-        dist = NormalDistribution(f, RMSE)
-        return dist
-
+        return NormalDistributionArray(f, RMSE)
 
     def train(self, X, Y):
         """Train the surrogate model with the given set of inputs and outputs."""
@@ -180,6 +168,11 @@ class FloatKrigingSurrogate(KrigingSurrogate):
         dist = super(FloatKrigingSurrogate, self).predict(new_x)
         return dist.mu
 
+    def predict_batch(self, new_x):
+        """Returns an array of the predicted means for each row of `new_x`."""
+        dist = super(FloatKrigingSurrogate, self).predict_batch(new_x)
+        return dist.mu
+
     def get_uncertain_value(self, value):
         """Returns a float"""
         return float(value)
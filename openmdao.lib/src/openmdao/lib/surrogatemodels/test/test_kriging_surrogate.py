@@ -8,7 +8,8 @@ import numpy.random as numpy_random
 
 from openmdao.lib.surrogatemodels.kriging_surrogate import KrigingSurrogate
 from openmdao.lib.casehandlers.api import ListCaseIterator
-from openmdao.main.uncertain_distributions import NormalDistribution
+from openmdao.main.uncertain_distributions import NormalDistribution, \
+                                                 NormalDistributionArray
 
 class KrigingSurrogateTests(unittest.TestCase):
     
@@ -76,6 +77,28 @@ class KrigingSurrogateTests(unittest.TestCase):
         self.assertAlmostEqual(14.513550,pred.sigma,places=2)
         self.assertAlmostEqual(18.759264,pred.mu,places=2)
         
+    def test_2d_kriging_batch(self):
+        def bran(x):
+            y = (x[1]-(5.1/(4.*pi**2.))*x[0]**2.+5.*x[0]/pi-6.)**2.+10.*(1.-1./(8.*pi))*cos(x[0])+10.
+            return y
+
+        x = array([[-2.,0.],[-0.5,1.5],[1.,3.],[8.5,4.5],[-3.5,6.],[4.,7.5],[-5.,9.],[5.5,10.5],
+                   [10.,12.],[7.,13.5],[2.5,15.]])
+        y = array([bran(case) for case in x])
+
+        krig1 = KrigingSurrogate()
+        krig1.train(x,y)
+        new_x = array([[-2.,0.],[5.,5.],[0.,10.]])
+        pred = krig1.predict_batch(new_x)
+        self.assertTrue(isinstance(pred,NormalDistributionArray))
+        self.assertEqual(pred.mu.shape, (3,))
+        for i, point in enumerate(new_x):
+            single = krig1.predict(point)
+            self.assertAlmostEqual(single.mu,pred.mu[i],places=10)
+            self.assertAlmostEqual(single.sigma,pred.sigma[i],places=10)
+        self.assertAlmostEqual(14.513550,pred.sigma[1],places=2)
+        self.assertAlmostEqual(18.759264,pred.mu[1],places=2)
+
     def test_get_uncertain_value(self): 
         x = array([[0.05], [.25], [0.61], [0.95]])
         y = array([0.738513784857542,-0.210367746201974,-0.489015457891476,12.3033138316612])
@@ -1,47 +1,64 @@
-""" 
-Pseudo package containing all of the main classes/objects in the 
+"""
+Pseudo package containing all of the main classes/objects in the
 openmdao.main API.
 
+Names are imported from their defining modules on first access, so that
+importing this module only loads the parts of the framework actually used.
 """
 
-from openmdao.util.log import logger, enable_console
-from openmdao.main.expreval import ExprEvaluator
+from openmdao.util.lazyimport import lazy_module
+
+lazy_module(__name__, {
+    'logger': 'openmdao.util.log',
+    'enable_console': 'openmdao.util.log',
+    'ExprEvaluator': 'openmdao.main.expreval',
 
-from openmdao.main.factory import Factory
-from openmdao.main.factorymanager import create, get_available_types
+    'Factory': 'openmdao.main.factory',
+    'create': 'openmdao.main.factorymanager',
+    'get_available_types': 'openmdao.main.factorymanager',
 
-from openmdao.main.container import Container, get_default_name, \
-                                    create_io_traits
-from openmdao.main.vartree import VariableTree
-from openmdao.main.component import Component, SimulationRoot
-from openmdao.main.implicitcomp import ImplicitComponent
-from openmdao.main.component_with_derivatives import ComponentWithDerivatives
-from openmdao.main.driver_uses_derivatives import DriverUsesDerivatives
-from openmdao.main.assembly import Assembly, set_as_top, dump_iteration_tree
-from openmdao.main.driver import Driver, Run_Once
-from openmdao.main.workflow import Workflow
-from openmdao.main.dataflow import Dataflow
-from openmdao.main.sequentialflow import SequentialWorkflow
-from openmdao.main.cyclicflow import CyclicWorkflow
-from openmdao.main.variable import Variable
+    'Container': 'openmdao.main.container',
+    'get_default_name': 'openmdao.main.container',
+    'create_io_traits': 'openmdao.main.container',
+    'VariableTree': 'openmdao.main.vartree',
+    'Component': 'openmdao.main.component',
+    'SimulationRoot': 'openmdao.main.component',
+    'ImplicitComponent': 'openmdao.main.implicitcomp',
+    'ComponentWithDerivatives': 'openmdao.main.component_with_derivatives',
+    'DriverUsesDerivatives': 'openmdao.main.driver_uses_derivatives',
+    'Assembly': 'openmdao.main.assembly',
+    'set_as_top': 'openmdao.main.assembly',
+    'dump_iteration_tree': 'openmdao.main.assembly',
+    'Driver': 'openmdao.main.driver',
+    'Run_Once': 'openmdao.main.driver',
+    'Workflow': 'openmdao.main.workflow',
+    'Dataflow': 'openmdao.main.dataflow',
+    'SequentialWorkflow': 'openmdao.main.sequentialflow',
+    'CyclicWorkflow': 'openmdao.main.cyclicflow',
+    'Variable': 'openmdao.main.variable',
 
-from openmdao.main.exceptions import ConstraintError
+    'ConstraintError': 'openmdao.main.exceptions',
 
-from openmdao.main.interfaces import implements, Attribute, Interface
+    'implements': 'openmdao.main.interfaces',
+    'Attribute': 'openmdao.main.interfaces',
+    'Interface': 'openmdao.main.interfaces',
 
-from openmdao.main.file_supp import FileMetadata
+    'FileMetadata': 'openmdao.main.file_supp',
 
-from openmdao.main.case import Case
+    'Case': 'openmdao.main.case',
 
-from openmdao.main.arch import Architecture
-from openmdao.main.problem_formulation import ArchitectureAssembly, OptProblem
+    'Architecture': 'openmdao.main.arch',
+    'ArchitectureAssembly': 'openmdao.main.problem_formulation',
+    'OptProblem': 'openmdao.main.problem_formulation',
 
-from openmdao.util.eggsaver import SAVE_PICKLE, SAVE_CPICKLE #, SAVE_YAML, SAVE_LIBYAML
+    'SAVE_PICKLE': 'openmdao.util.eggsaver',
+    'SAVE_CPICKLE': 'openmdao.util.eggsaver',
 
-from openmdao.units import convert_units
+    'convert_units': 'openmdao.units',
 
-from openmdao.main.project import load_project
+    'load_project': 'openmdao.main.project',
 
-# TODO: This probably shouldn't be here. Removing it will require edits to some
-# of our plugins
-from openmdao.main.datatypes.slot import Slot
+    # TODO: This probably shouldn't be here. Removing it will require edits
+    # to some of our plugins
+    'Slot': 'openmdao.main.datatypes.slot',
+})
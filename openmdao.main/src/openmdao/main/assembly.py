@@ -5,6 +5,7 @@
 __all__ = ['Assembly', 'set_as_top']
 
 import cStringIO
+from contextlib import contextmanager
 import threading
 import re
 
@@ -35,6 +36,7 @@ from openmdao.main.array_helpers import is_differentiable_var
 from openmdao.main.depgraph import is_comp_node, is_boundary_node
 from openmdao.util.nameutil import partition_names_by_comp
 from openmdao.util.log import logger
+import openmdao.main.profiler as profiling
 
 _iodict = {'out': 'output', 'in': 'input'}
 
@@ -43,6 +45,18 @@ __has_top__ = False
 __toplock__ = threading.RLock()
 
 
+class _NoLock(object):
+    """ Stands in for an assembly's graph lock outside concurrent runs. """
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *args):
+        pass
+
+_NO_LOCK = _NoLock()
+
+
 def set_as_top(cont, first_only=False):
     """Specifies that the given Container is the top of a Container hierarchy.
     If first_only is True, then only set it as a top if a global
@@ -110,6 +124,10 @@ class Assembly(Component):
                     desc="The top level Driver that manages execution of "
                     "this Assembly.")
 
+    # Serializes dependency graph and validity updates while components
+    # run concurrently, see _serialize_updates().
+    _graph_lock = _NO_LOCK
+
     def __init__(self):
 
         super(Assembly, self).__init__()
@@ -652,8 +670,9 @@ class Assembly(Component):
         component variables relative to the component, e.g., 'abc[3][1]' rather
         than 'comp1.abc[3][1]'.
         """
-        invalid_ins = self._depgraph.list_inputs(compname,
-                                                 invalid=True)
+        with self._graph_lock:
+            invalid_ins = self._depgraph.list_inputs(compname,
+                                                     invalid=True)
         if invalid_ins:
             self._update_invalid_dests(compname, invalid_ins)
 
@@ -662,23 +681,26 @@ class Assembly(Component):
         components in order to make the specified output
         variables valid.
         """
-        data = self._depgraph.node
-        invalid_dests = [n for n in outnames
-                           if data[n]['valid'] is False]
+        with self._graph_lock:
+            data = self._depgraph.node
+            invalid_dests = [n for n in outnames
+                               if data[n]['valid'] is False]
         if invalid_dests:
             self._update_invalid_dests(None, invalid_dests)
 
     def _update_invalid_dests(self, startcomp, invalid_dests):
         graph = self._depgraph
-        invalids = set()
-        for inv_dest in invalid_dests:
-            invalids.update([s for s in graph.get_sources(inv_dest)
-                                if not graph.node[s]['valid']])
+        with self._graph_lock:
+            invalids = set()
+            for inv_dest in invalid_dests:
+                invalids.update([s for s in graph.get_sources(inv_dest)
+                                    if not graph.node[s]['valid']])
+            if invalids:
+                loops = graph.get_loops()
 
-        # if source vars are invalid, request an update
+        # if source vars are invalid, request an update. This may run
+        # components, so the graph lock isn't held.
         if invalids:
-            loops = graph.get_loops()
-
             for cname, vnames in partition_names_by_comp(invalids).items():
                 if cname is None or not is_comp_node(graph, cname): # boundary var
                     if self.parent:
@@ -697,12 +719,24 @@ class Assembly(Component):
                 else:
                     getattr(self, cname).update_outputs(vnames)
 
+        profiler = profiling.PROFILER
+        if profiler is not None:
+            start = profiler.start()
+
         try:
-            for inv_dest in invalid_dests:
-                self._depgraph.update_destvar(self, inv_dest)
+            with self._graph_lock:
+                for inv_dest in invalid_dests:
+                    self._depgraph.update_destvar(self, inv_dest)
         except Exception as err:
             self.raise_exception(str(err), type(err))
 
+        if profiler is not None:
+            if startcomp is None:
+                path = self.get_pathname()
+            else:
+                path = getattr(self, startcomp).get_pathname()
+            profiler.stop(path, 'transfer', start)
+
     def _input_updated(self, name, fullpath=None):
         outs = self.invalidate_deps([name])
         if outs and self.parent:
@@ -713,27 +747,29 @@ class Assembly(Component):
         """Invalidate all variables that depend on the variable
         provided by the child that has been invalidated.
         """
-        if childname not in self._depgraph:
-            return []
-
-        if vnames is None:
-            vnames = [childname]
-        elif childname:
-            vnames = ['.'.join([childname, n]) for n in vnames]
-            if iotype == 'in':
-                for name in vnames[:]:
-                    vnames.extend(self._depgraph._all_child_vars(name,
-                                                                 direction='in'))
-
-        bouts = self.invalidate_deps(vnames)
-        if bouts and self.parent:
-            self.parent.child_invalidated(self.name, bouts)
-        return bouts
+        with self._graph_lock:
+            if childname not in self._depgraph:
+                return []
+
+            if vnames is None:
+                vnames = [childname]
+            elif childname:
+                vnames = ['.'.join([childname, n]) for n in vnames]
+                if iotype == 'in':
+                    for name in vnames[:]:
+                        vnames.extend(self._depgraph._all_child_vars(name,
+                                                                direction='in'))
+
+            bouts = self.invalidate_deps(vnames)
+            if bouts and self.parent:
+                self.parent.child_invalidated(self.name, bouts)
+            return bouts
 
     @rbac(('owner', 'user'))
     def child_run_finished(self, childname, outs=None):
         """Called by a child when it completes its run() function."""
-        self._depgraph.child_run_finished(childname, outs)
+        with self._graph_lock:
+            self._depgraph.child_run_finished(childname, outs)
 
     @rbac(('owner', 'user'))
     def get_valid(self, names):
@@ -770,14 +806,43 @@ class Assembly(Component):
         # If varnames is None, we're being called from a parent Assembly
         # as part of a higher level invalidation, so we only need to look
         # at our connected inputs
-        if varnames is None:
-            names = self._depgraph.get_extern_srcs()
-        else:
-            names = varnames
+        with self._graph_lock:
+            if varnames is None:
+                names = self._depgraph.get_extern_srcs()
+            else:
+                names = varnames
+
+            self._set_exec_state('INVALID')
 
-        self._set_exec_state('INVALID')
+            return self._depgraph.invalidate_deps(self, names)
 
-        return self._depgraph.invalidate_deps(self, names)
+    @contextmanager
+    def _serialize_updates(self):
+        """Serialize dependency graph and validity updates for the duration,
+        while components of this assembly run concurrently (see
+        :class:`Dataflow`). Otherwise no lock is taken. A nested concurrent
+        run shares the lock of the closest one above it, so updates passing
+        between parent and child assemblies can't deadlock on lock order.
+        """
+        if self._graph_lock is not _NO_LOCK:  # Already serialized.
+            yield
+            return
+
+        lock = None
+        obj = self.parent
+        while obj is not None:
+            lock = getattr(obj, '_graph_lock', _NO_LOCK)
+            if lock is not _NO_LOCK:
+                break
+            obj = getattr(obj, 'parent', None)
+        else:
+            lock = threading.RLock()
+
+        self._graph_lock = lock
+        try:
+            yield
+        finally:
+            del self._graph_lock
 
     def exec_counts(self, compnames):
         return [getattr(self, c).exec_count for c in compnames]
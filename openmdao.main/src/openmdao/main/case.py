@@ -257,57 +257,69 @@ class Case(object):
 
     def apply_inputs(self, scope):
         """Take the values of all of the inputs in this case and apply them
-        to the specified scope.
+        to the specified scope. Inputs which aren't expressions are set in
+        one :meth:`set_values` call, which is a single batch if `scope` is
+        a proxy to a remote object.
         """
         scope._case_id = self.uuid
-        if self._exprs:
-            for name,value in self._inputs.items():
-                expr = self._exprs.get(name)
-                if expr:
-                    expr.set(value, scope)
-                else:
-                    scope.set(name, value)
-        else:
-            for name,value in self._inputs.items():
-                scope.set(name, value)
+        items = []
+        for name, value in self._inputs.items():
+            expr = self._exprs.get(name) if self._exprs else None
+            if expr:
+                expr.set(value, scope)
+            else:
+                items.append((name, value))
+        if items:
+            scope.set_values(items)
 
     def update_outputs(self, scope, msg=None):
         """Update the value of all outputs in this Case, using the given scope.
+        Outputs which aren't expressions are retrieved in one
+        :meth:`get_values` call, which is a single batch if `scope` is a
+        proxy to a remote object.
         """
         self.msg = msg
         last_excpt = None
         if self._outputs is not None:
-            if self._exprs:
-                for name in self._outputs.keys():
-                    expr = self._exprs.get(name)
-                    try:
-                        if expr:
-                            self._outputs[name] = expr.evaluate(scope)
-                        else:
-                            self._outputs[name] = scope.get(name)
-                    except Exception as err:
-                        last_excpt = TracedError(err, traceback.format_exc())
-                        self._outputs[name] = _Missing
-                        if self.msg is None:
-                            self.msg = str(err)
-                        else:
-                            self.msg = self.msg + " %s" % err
-            else:
-                for name in self._outputs.keys():
+            names = []
+            for name in self._outputs.keys():
+                expr = self._exprs.get(name) if self._exprs else None
+                if expr:
                     try:
-                        self._outputs[name] = scope.get(name)
+                        self._outputs[name] = expr.evaluate(scope)
                     except Exception as err:
-                        last_excpt = TracedError(err, traceback.format_exc())
-                        self._outputs[name] = _Missing
-                        if self.msg is None:
-                            self.msg = str(err)
-                        else:
-                            self.msg = self.msg + " %s" % err
+                        last_excpt = self._output_failed(name, err)
+                else:
+                    names.append(name)
+            if names:
+                try:
+                    values = scope.get_values(names)
+                except Exception:
+                    # Retry individually to find which outputs failed.
+                    for name in names:
+                        try:
+                            self._outputs[name] = scope.get(name)
+                        except Exception as err:
+                            last_excpt = self._output_failed(name, err)
+                else:
+                    for name, value in zip(names, values):
+                        self._outputs[name] = value
 
         self.timestamp = time.time()
 
         if last_excpt is not None:
             raise last_excpt
+
+    def _output_failed(self, name, err):
+        """Record failure to update output `name` and return the
+        :class:`TracedError` to be raised.
+        """
+        self._outputs[name] = _Missing
+        if self.msg is None:
+            self.msg = str(err)
+        else:
+            self.msg = self.msg + " %s" % err
+        return TracedError(err, traceback.format_exc())
             
     def add_input(self, name, value):
         """Adds an input and its value to this case.
@@ -9,7 +9,6 @@ import glob
 import logging
 import os.path
 from os.path import isabs, isdir, dirname, exists, join, normpath, relpath
-import pkg_resources
 import sys
 import weakref
 import re
@@ -37,6 +36,7 @@ from openmdao.main.rbac import rbac
 from openmdao.main.mp_support import has_interface, is_instance
 from openmdao.main.datatypes.api import Bool, List, Str, Int, Slot, Dict, \
                                         FileRef, Enum
+from openmdao.main.datatypes.array import Array
 from openmdao.main.publisher import Publisher
 from openmdao.main.vartree import VariableTree
 
@@ -46,6 +46,7 @@ from openmdao.util.eggobserver import EggObserver
 from openmdao.main.numpy_fallback import ndarray
 
 import openmdao.util.log as tracing
+import openmdao.main.profiler as profiling
 
 __missing__ = object()
 
@@ -160,6 +161,14 @@ class Component(Container):
 
     create_instance_dir = Bool(False)
 
+    run_in_directory = Bool(True,
+                            desc='If True, change to `directory` (if'
+                                 ' non-blank) while running. Components'
+                                 ' which resolve their paths against'
+                                 ' get_abs_directory() can set this False,'
+                                 ' allowing them to run concurrently with'
+                                 ' others in a Dataflow.')
+
     def __init__(self):
         super(Component, self).__init__()
 
@@ -264,6 +273,32 @@ class Component(Container):
             else:
                 inval(self.name, vnames=[name], iotype='in')
 
+    def _set_array_input(self, name, value):
+        """Set array input `name` to `value` without going through trait
+        validation, returning False if that isn't safe. The current value
+        must already be an array of the same shape and dtype, and the only
+        change handler on the trait must be our own, so validation and
+        notification would have no effect other than invalidating our
+        outputs. As with a normal assignment, the array is not copied.
+        """
+        trait = self._trait(name, 0)
+        if trait is None or type(trait.handler) is not Array or \
+           trait.post_setattr is not None or self._notifiers(0):
+            return False
+        notifiers = trait._notifiers(0)
+        if not notifiers or len(notifiers) != 1 or \
+           not notifiers[0].equals(self._input_trait_modified):
+            return False
+        old = self.__dict__.get(name)
+        if not isinstance(old, ndarray) or not isinstance(value, ndarray) or \
+           old.shape != value.shape or old.dtype != value.dtype:
+            return False
+
+        self.__dict__[name] = value
+        if old is not value or self._call_execute:
+            self._input_updated(name)
+        return True
+
     def __deepcopy__(self, memo):
         """ For some reason, deepcopying does not set the trait callback
         functions. We need to do this manually. """
@@ -469,7 +504,7 @@ class Component(Container):
             input_keys = (input_keys,)
         if isinstance(output_keys, basestring):
             output_keys = (output_keys,)
-        J = self.provideJ()
+        J = self._timed_provideJ()
 
         if ffd_order == 1:
             for j, out_name in enumerate(output_keys):
@@ -479,6 +514,16 @@ class Component(Container):
 
                 self.set(out_name, y, force=True)
 
+    def _timed_provideJ(self, **kwargs):
+        """Return the result of *provideJ*, timing it if profiling."""
+        profiler = profiling.PROFILER
+        if profiler is None:
+            return self.provideJ(**kwargs)
+        start = profiler.start()
+        J = self.provideJ(**kwargs)
+        profiler.stop(self.get_pathname(), 'provideJ', start)
+        return J
+
     def calc_derivatives(self, first=False, second=False, savebase=False,
                          required_inputs=None, required_outputs=None):
         """Prepare for Fake Finite Difference runs by calculating all needed
@@ -524,10 +569,10 @@ class Component(Container):
                                                  required_inputs, required_outputs)
                     return
 
-                J = self.provideJ(required_inputs=required_inputs,
-                                  required_outputs=required_outputs)
+                J = self._timed_provideJ(required_inputs=required_inputs,
+                                         required_outputs=required_outputs)
             else:
-                J = self.provideJ()
+                J = self._timed_provideJ()
 
             self.derivative_exec_count += 1
         else:
@@ -589,7 +634,8 @@ class Component(Container):
             prepended to all iteration coordinates.
         """
 
-        if self.directory:
+        chdir = self.directory and self.run_in_directory
+        if chdir:
             self.push_dir()
 
         if self.force_execute:
@@ -599,6 +645,10 @@ class Component(Container):
         self.ffd_order = ffd_order
         self._case_id = case_id
 
+        profiler = profiling.PROFILER
+        if profiler is not None:
+            run_start = profiler.start()
+
         try:
             self._pre_execute(force)
             self._set_exec_state('RUNNING')
@@ -633,7 +683,12 @@ class Component(Container):
                         tracing.TRACER.debug(self.get_itername())
                         #tracing.TRACER.debug(self.get_itername() + '  ' + self.name)
 
-                    self.execute()
+                    if profiler is None:
+                        self.execute()
+                    else:
+                        start = profiler.start()
+                        self.execute()
+                        profiler.stop(self.get_pathname(), 'execute', start)
 
                 self._post_execute()
             #else:
@@ -646,8 +701,10 @@ class Component(Container):
             # If this is the top-level component, perform run termination.
             if self.parent is None:
                 self._run_terminated()
-            if self.directory:
+            if chdir:
                 self.pop_dir()
+            if profiler is not None:
+                profiler.stop(self.get_pathname(), 'run', run_start)
 
     def _run_terminated(self):
         """ Executed at end of top-level run. """
@@ -1446,6 +1503,8 @@ class Component(Container):
     def _list_files(self, pattern, package, rel_path, is_input, const, binary,
                     file_list, from_egg):
         """List files from installed egg or config dir matching pattern."""
+        import pkg_resources
+
         symlink = const and sys.platform != 'win32'
         sep = '/' if from_egg else os.sep
 
@@ -1500,6 +1559,8 @@ class Component(Container):
 
     def _copy_files(self, package, file_list, observer, from_egg):
         """Copy/symlink files in `file_list`."""
+        import pkg_resources
+
         total_files = float(len(file_list))
         total_bytes = 0.
         for i, info in enumerate(file_list):
@@ -35,7 +35,8 @@ from openmdao.main.datatypes.file import FileRef
 from openmdao.main.datatypes.list import List
 from openmdao.main.datatypes.slot import Slot
 from openmdao.main.datatypes.vtree import VarTree
-from openmdao.main.expreval import ExprEvaluator, ConnectedExprEvaluator
+from openmdao.main.expreval import ExprEvaluator, ConnectedExprEvaluator, \
+                                  structure_changed
 from openmdao.main.interfaces import ICaseIterator, IResourceAllocator, \
                                      IContainer, IParametricGeometry, IComponent
 from openmdao.main.index import get_indexed_value, deep_hasattr, \
@@ -232,6 +233,7 @@ class Container(SafeHasTraits):
             self._parent = value
             self._logger.rename(self.get_pathname().replace('.', ','))
             self._branch_moved()
+            structure_changed()
 
     def _branch_moved(self):
         self._call_cpath_updated = True
@@ -607,6 +609,7 @@ class Container(SafeHasTraits):
         super(Container, self).add_trait(name, trait)
         if self._cached_traits_ is not None:
             self._cached_traits_[name] = self.trait(name)
+        structure_changed()
 
         if refresh:
             getattr(self, name)  # For VariableTree subtree/leaf update in GUI.
@@ -625,6 +628,7 @@ class Container(SafeHasTraits):
             pass
 
         super(Container, self).remove_trait(name)
+        structure_changed()
 
     @rbac(('owner', 'user'))
     def get_attr(self, path, index=None):
@@ -812,6 +816,7 @@ class Container(SafeHasTraits):
             else:
                 self.remove_trait(name)
 
+        structure_changed()
         return obj
 
     @rbac(('owner', 'user'))
@@ -1228,6 +1233,29 @@ class Container(SafeHasTraits):
             else:
                 setattr(self, path, value)
 
+    def get_values(self, paths):
+        """Return a list of the values of the given paths, as if by calling
+        :meth:`get` for each path. A proxy to a remote Container provides
+        the same method, which retrieves all the values in about one
+        network round-trip.
+
+        paths: list
+            Paths of the values to return.
+        """
+        return [self.get(path) for path in paths]
+
+    def set_values(self, items):
+        """Set several values, as if by calling :meth:`set` for each
+        ``(path, value)`` in `items`. A proxy to a remote Container provides
+        the same method, which sets all the values in about one network
+        round-trip.
+
+        items: list
+            List of ``(path, value)``.
+        """
+        for path, value in items:
+            self.set(path, value)
+
     def _index_set(self, name, value, index):
         if len(index) == 1:
             obj = getattr(self, name)
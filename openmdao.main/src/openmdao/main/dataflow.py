@@ -1,21 +1,43 @@
 """ A workflow where the execution order is automatically inferred from the
 data connections."""
 
-import networkx as nx
+import heapq
+import Queue
+
 from networkx.algorithms.components import strongly_connected_components
 from networkx.algorithms.dag import is_directed_acyclic_graph
 
+from openmdao.main.exceptions import RunStopped
 from openmdao.main.sequentialflow import SequentialWorkflow
 from openmdao.main.interfaces import IDriver
 from openmdao.main.mp_support import has_interface
+from openmdao.main.pseudocomp import PseudoComponent
+from openmdao.main.rbac import get_credentials, set_credentials
+from openmdao.util.wrkpool import WorkerPool
 
 __all__ = ['Dataflow']
 
 
+def _run_comp(comp, credentials, ffd_order, case_id):
+    """ Run `comp` in a worker thread with the dispatcher's `credentials`. """
+    set_credentials(credentials)
+    comp.run(ffd_order=ffd_order, case_id=case_id)
+
+
 class Dataflow(SequentialWorkflow):
     """
     A Dataflow consists of a collection of Components which are executed in
     data flow order.
+
+    If the owning driver's `max_workers` is greater than 1, up to that many
+    Components are run concurrently in separate threads, each starting as
+    soon as all the Components it depends on have completed. Updates to
+    the parent's dependency graph are serialized for the duration of the run.
+    Components which change to their `directory` while running (see
+    `run_in_directory`) are run while no others are running, since changing
+    the current directory affects every thread. Otherwise, concurrently
+    running Components must not depend on or change shared state, such as
+    files in a common directory.
     """
     def __init__(self, parent=None, scope=None, members=None):
         """ Create an empty flow. """
@@ -29,6 +51,82 @@ class Dataflow(SequentialWorkflow):
         scope = self.scope
         return [getattr(scope, n) for n in self._get_topsort()].__iter__()
 
+    def run(self, ffd_order=0, case_id=''):
+        """ Run the Components in this Workflow. """
+        topsort = self._get_topsort()
+        max_workers = getattr(self._parent, 'max_workers', 1)
+        if max_workers > 1 and not self._duplicates:
+            with self.scope._serialize_updates():
+                self._run_concurrent(topsort, max_workers, ffd_order, case_id)
+        else:
+            super(Dataflow, self).run(ffd_order, case_id)
+
+    def _run_concurrent(self, topsort, max_workers, ffd_order, case_id):
+        """ Run Components in threads as their predecessors complete. """
+        self._stop = False
+        self._exec_count += 1
+        self._comp_count = 0
+        iterbase = self._iterbase(case_id)
+
+        # Resolve and name everything up front, in the same order
+        # as a sequential run.
+        scope = self.scope
+        graph = self._get_collapsed_graph()
+        comps = {}
+        npreds = {}
+        ready = []
+        for i, name in enumerate(topsort):
+            comp = getattr(scope, name)
+            if not isinstance(comp, PseudoComponent):
+                self._comp_count += 1
+                comp.set_itername('%s-%d' % (iterbase, self._comp_count))
+            comps[name] = (i, comp)
+            npreds[name] = len(graph.pred[name])
+            if not npreds[name]:
+                ready.append((i, name))
+
+        credentials = get_credentials()
+        replies = Queue.Queue()
+        running = {}  # Maps worker queue to component name.
+        exclusive = False
+        error = None
+        while ready or running:
+            while ready and not exclusive and error is None and \
+                  not self._stop and len(running) < max_workers:
+                comp = comps[ready[0][1]][1]
+                if getattr(comp, 'directory', None) and \
+                   getattr(comp, 'run_in_directory', True):
+                    if running:
+                        break
+                    exclusive = True
+                name = heapq.heappop(ready)[1]
+                worker = WorkerPool.get()
+                running[worker] = name
+                worker.put((_run_comp, (comp, credentials),
+                            dict(ffd_order=ffd_order, case_id=case_id),
+                            replies))
+            if not running:
+                break
+
+            worker, retval, exc, trace = replies.get()
+            WorkerPool.release(worker)
+            name = running.pop(worker)
+            exclusive = False
+            if exc is not None:
+                if error is None:
+                    scope._logger.debug('%s failed: %s', name, trace)
+                    error = exc
+                continue
+            for succ in graph.succ[name]:
+                npreds[succ] -= 1
+                if not npreds[succ]:
+                    heapq.heappush(ready, (comps[succ][0], succ))
+
+        if error is not None:
+            raise error
+        if self._stop:
+            raise RunStopped('Stop requested')
+
     def check_config(self):
         """Check for cyclic graph."""
 
@@ -55,9 +153,8 @@ class Dataflow(SequentialWorkflow):
     def _get_topsort(self):
         if self._topsort is None:
             graph = self._get_collapsed_graph()
-            try:
-                self._topsort = nx.topological_sort(graph)
-            except nx.NetworkXUnfeasible:
+            self._topsort = self._sequenced_topsort(graph)
+            if self._topsort is None:
                 # do a little extra work here to give more info to the user
                 # in the error message
                 strcon = strongly_connected_components(graph)
@@ -68,6 +165,40 @@ class Dataflow(SequentialWorkflow):
                 self._insert_duplicates()
         return self._topsort
 
+    def _sequenced_topsort(self, graph):
+        """Return a topological sort of `graph` in which, of the components
+        whose predecessors have all been placed, the earliest in sequence
+        order is always placed next. This keeps unconnected components in
+        sequence order relative to everything else without adding edges.
+        Hidden pseudo-components are placed as soon as they are ready.
+        Returns None if `graph` has a cycle.
+        """
+        order = {}
+        for i, name in enumerate(self.get_names()):
+            order.setdefault(name, i)
+        hidden = -1
+
+        npreds = {}
+        ready = []
+        for name, preds in graph.pred.items():
+            npreds[name] = len(preds)
+            if not preds:
+                ready.append((order.get(name, hidden), name))
+        heapq.heapify(ready)
+
+        topsort = []
+        while ready:
+            name = heapq.heappop(ready)[1]
+            topsort.append(name)
+            for succ in graph.succ[name]:
+                npreds[succ] -= 1
+                if not npreds[succ]:
+                    heapq.heappush(ready, (order.get(succ, hidden), succ))
+
+        if len(topsort) < len(npreds):
+            return None
+        return topsort
+
     def _get_collapsed_graph(self):
         """Get a dependency graph with only our workflow components
         in it, with additional edges added to it from sub-workflows
@@ -119,28 +250,17 @@ class Dataflow(SequentialWorkflow):
 
         collapsed_graph = collapsed_graph.subgraph(cnames-removes)
 
-        # now add some fake dependencies for degree 0 nodes in an attempt to
-        # mimic a SequentialWorkflow in cases where nodes aren't connected.
-        # Edges are added from each degree 0 node to all nodes after it in
-        # sequence order.
+        # Unconnected components are kept in sequence order by
+        # _sequenced_topsort(), except for duplicates which are handled by
+        # _insert_duplicates().
         self._duplicates = set()
-        last = len(self._names)-1
-        if last > 0:
-            to_add = []
-            for i, cname in enumerate(self._names):
-                if collapsed_graph.degree(cname) == 0:
-                    if self._names.count(cname) > 1:
-                        # Don't introduce circular dependencies.
-                        self._duplicates.add(cname)
-                    else:
-                        if i < last:
-                            for n in self._names[i+1:]:
-                                to_add.append((cname, n))
-                        else:
-                            for n in self._names[0:i]:
-                                to_add.append((n, cname))
-            collapsed_graph.add_edges_from([(u,v) for u,v in to_add
-                                            if u in collapsed_graph and v in collapsed_graph])
+        if len(self._names) > 1:
+            counts = {}
+            for cname in self._names:
+                counts[cname] = counts.get(cname, 0) + 1
+            for cname, count in counts.items():
+                if count > 1 and collapsed_graph.degree(cname) == 0:
+                    self._duplicates.add(cname)
 
         self._collapsed_graph = collapsed_graph
 
@@ -8,7 +8,7 @@ __all__ = ["Array"]
 import logging
 
 # pylint: disable-msg=E0611,F0401
-from openmdao.units import PhysicalQuantity
+from openmdao.units import PhysicalQuantity, get_conversion_tuple
 
 from openmdao.main.attrwrapper import AttrWrapper, UnitsAttrWrapper
 from openmdao.main.index import get_indexed_value
@@ -186,23 +186,21 @@ class Array(TraitArray):
         dst_units = self.units
 
         try:
-            pq = PhysicalQuantity(1.0, src_units)
+            factor, offset = get_conversion_tuple(src_units, dst_units)
         except NameError:
-            raise NameError("while setting value of %s: undefined unit '%s'" %
-                            (src_units, name))
-
-        try:
-            pq.convert_to_unit(dst_units)
-        except NameError:
-            raise NameError("undefined unit '%s' for variable '%s'" %
-                            (dst_units, name))
+            raise NameError("undefined unit '%s' or '%s' for variable '%s'" %
+                            (src_units, dst_units, name))
         except TypeError:
             msg = "%s: units '%s' are incompatible " % (name, src_units) + \
                    "with assigning units of '%s'" % (dst_units)
             raise TypeError(msg)
 
         try:
-            value *= pq.value
+            if offset:
+                value = value + offset
+                value *= factor
+            else:
+                value = value * factor
             return super(Array, self).validate(obj, name, value)
         except Exception:
             self.error(obj, name, value)
@@ -11,7 +11,7 @@ from sys import float_info
 # pylint: disable-msg=E0611,F0401
 from traits.api import Range
 from traits.api import Float as TraitFloat
-from openmdao.units import PhysicalQuantity
+from openmdao.units import PhysicalQuantity, get_conversion_tuple
 
 from openmdao.main.variable import Variable
 from openmdao.main.attrwrapper import AttrWrapper, UnitsAttrWrapper
@@ -198,25 +198,20 @@ class Float(Variable):
                 self.error(obj, name, value)
 
         try:
-            pq = PhysicalQuantity(value, src_units)
+            factor, offset = get_conversion_tuple(src_units, dst_units)
         except NameError:
-            raise NameError("while setting value of %s: undefined unit '%s'" %
-                             (src_units, name))
-        
-        try:
-            pq.convert_to_unit(dst_units)
-        except NameError:
-            raise NameError("undefined unit '%s' for variable '%s'" %
-                             (dst_units, name))
+            raise NameError("undefined unit '%s' or '%s' for variable '%s'" %
+                             (src_units, dst_units, name))
         except TypeError:
             msg = "%s: units '%s' are incompatible " % (name, src_units) + \
                    "with assigning units of '%s'" % (dst_units)
             raise TypeError(msg)
-        
+
+        value = (value + offset) * factor
         try:
-            return self._validator.validate(obj, name, pq.value)
+            return self._validator.validate(obj, name, value)
         except Exception:
-            self.error(obj, name, pq.value)
+            self.error(obj, name, value)
 
     def get_attribute(self, name, value, trait, meta):
         """Return the attribute dictionary for this variable. This dict is
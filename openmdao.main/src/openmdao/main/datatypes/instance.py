@@ -26,6 +26,7 @@ import zope.interface
 from openmdao.main.variable import Variable, gui_excludes
 from openmdao.main.mp_support import has_interface
 from openmdao.main.interfaces import IContainer
+from openmdao.main.expreval import structure_changed
 
 class Base(Variable):
 
@@ -105,9 +106,10 @@ class Base(Variable):
         '''Containers must know their place within the hierarchy, so set their
         parent here.  This keeps side effects out of validate()'''
 
-        if self._is_container and value is not None:
-            if value.parent is not obj:
+        if self._is_container:
+            if value is not None and value.parent is not obj:
                 value.parent = obj
+            structure_changed()
 
     def _iface_error(self, obj, name, iface_name):
         obj.raise_exception("%s must provide interface '%s'" %
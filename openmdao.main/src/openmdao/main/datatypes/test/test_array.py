@@ -6,6 +6,7 @@ from openmdao.main.numpy_fallback import array
 
 from openmdao.main.api import Component
 from openmdao.main.datatypes.array import Array
+from openmdao.main.attrwrapper import UnitsAttrWrapper
 from openmdao.units import convert_units
 from openmdao.main.case import flatten_obj
 
@@ -54,7 +55,29 @@ class ArrayTestCase(unittest.TestCase):
         self.assertAlmostEqual(12., self.hobj.arr2[0], 5)
         self.assertAlmostEqual(24., self.hobj.arr2[1], 5)
         self.assertAlmostEqual(36., self.hobj.arr2[2], 5)
-        
+
+    def test_wrapped_assignment(self):
+        # values carrying units metadata are converted on assignment
+        self.hobj.add('temp', Array(array([0.]), iotype='in', units='degC'))
+        val = array([32., 212.])
+        self.hobj.temp = UnitsAttrWrapper(val, units='degF')
+        self.assertAlmostEqual(0., self.hobj.temp[0], 5)
+        self.assertAlmostEqual(100., self.hobj.temp[1], 5)
+        # the source array is left alone
+        self.assertEqual(32., val[0])
+
+        self.hobj.arr1 = UnitsAttrWrapper(array([12., 24.]), units='inch')
+        self.assertAlmostEqual(1., self.hobj.arr1[0], 5)
+        self.assertAlmostEqual(2., self.hobj.arr1[1], 5)
+
+        try:
+            self.hobj.arr1 = UnitsAttrWrapper(array([1.]), units='kg')
+        except TypeError, err:
+            self.assertEqual(str(err), "arr1: units 'kg' are incompatible "
+                                       "with assigning units of 'ft'")
+        else:
+            self.fail('TypeError expected')
+
     def test_bogus_units(self):
         try:
             uf = Array([0.], iotype='in', units='bogus')
@@ -7,6 +7,7 @@ __all__ = ["VarTree"]
 
 from traits.api import Instance
 
+from openmdao.main.expreval import structure_changed
 from openmdao.main.variable import Variable, gui_excludes
 
 
@@ -54,6 +55,7 @@ class VarTree(Variable):
         if value.parent is not obj:
             value.parent = obj
         value._iotype = self.iotype
+        structure_changed()
 
     def get_attribute(self, name, value, trait, meta):
         """Return the attribute dictionary for this variable. This dict is
@@ -9,6 +9,7 @@ from openmdao.main.interfaces import IDriver, IVariableTree, \
                                      IImplicitComponent, ISolver, \
                                      IAssembly, IComponent
 from openmdao.main.expreval import ConnectedExprEvaluator
+from openmdao.main.numpy_fallback import ndarray
 from openmdao.main.array_helpers import is_differentiable_var
 from openmdao.main.pseudoassembly import PseudoAssembly, from_PA_var, to_PA_var
 from openmdao.util.nameutil import partition_names_by_comp
@@ -27,6 +28,16 @@ def _is_expr(node):
     """
     return len(_exprchars.intersection(node)) > 0
 
+def _direct_dest(text):
+    """Returns a (compname, varname) tuple if the destination expression
+    `text` is an unindexed input variable of a child component, else None.
+    """
+    parts = text.split('.')
+    if len(parts) != 2 or parts[0] == 'parent' or '[' in text or \
+       _is_expr(text):
+        return None
+    return tuple(parts)
+
 def _sub_or_super(s1, s2):
     """Returns True if s1 is a subvar or supervar of s2."""
     if s2.startswith(s1 + '.'):
@@ -185,6 +196,80 @@ def is_connection(graph, src, dest):
         return False
 
 
+# Node flags used by _Adjacency.
+_COMP = 1          # Component or PseudoComponent node.
+_INVALIDATABLE = 2 # extern node or node with a source.
+_BOUNDARY_OUT = 4  # boundary output node.
+
+# Number of traversals after a structural change before building a snapshot.
+_ADJACENCY_THRESHOLD = 3
+
+
+class _Adjacency(object):
+    """An integer-indexed snapshot of the structure of a DependencyGraph,
+    with per-node successor and predecessor index tuples and flags, for
+    fast traversal. Node data dicts are shared with the graph, so validity
+    is always current, but a snapshot must be discarded whenever nodes or
+    edges change.
+    """
+
+    def __init__(self, graph):
+        self.names = names = graph.nodes()
+        self.index = index = dict((name, i) for i, name in enumerate(names))
+        self.data = [graph.node[name] for name in names]
+        self.succs = [tuple(index[s] for s in graph.succ[name])
+                      for name in names]
+        self.preds = [tuple(index[p] for p in graph.pred[name])
+                      for name in names]
+        self.flags = bytearray(_node_flags(graph, name) for name in names)
+
+
+class _AdjacencyView(object):
+    """Provides the :class:`_Adjacency` interface directly on top of a
+    DependencyGraph, indexed by node name. Used while the graph is still
+    changing, when building a snapshot wouldn't pay for itself.
+    """
+
+    def __init__(self, graph):
+        self.names = self.index = _Identity()
+        self.data = graph.node
+        self.succs = graph.succ
+        self.preds = graph.pred
+        self.flags = _FlagMap(graph)
+
+
+class _Identity(object):
+    """Maps every key to itself."""
+
+    def __getitem__(self, key):
+        return key
+
+
+class _FlagMap(dict):
+    """Computes node flags on demand."""
+
+    def __init__(self, graph):
+        super(_FlagMap, self).__init__()
+        self._graph = graph
+
+    def __missing__(self, name):
+        flags = self[name] = _node_flags(self._graph, name)
+        return flags
+
+
+def _node_flags(graph, name):
+    """Return the _Adjacency flags for node `name` in `graph`."""
+    data = graph.node[name]
+    flags = 0
+    if 'comp' in data:
+        flags |= _COMP
+    if name.startswith('parent.') or graph.pred[name]:
+        flags |= _INVALIDATABLE
+    if 'boundary' in data and data.get('iotype') == 'out':
+        flags |= _BOUNDARY_OUT
+    return flags
+
+
 def _break_loop(graph, loop):
     src = loop[0]
     for dest in loop[1:]:
@@ -269,6 +354,8 @@ class DependencyGraph(nx.DiGraph):
         self._component_graph = self._saved_comp_graph
 
     def config_changed(self):
+        self._adjacency = None
+        self._adjacency_uses = 0
         if self._allow_config_changed:
             self._component_graph = None
             self._loops = None
@@ -281,7 +368,6 @@ class DependencyGraph(nx.DiGraph):
             self._extrndsts = None
             self._srcs = {}
             self._conns = {}
-            self._indegs = {}
             self._dstvars = {}
 
     def child_config_changed(self, child, adding=True, removing=True):
@@ -762,9 +848,17 @@ class DependencyGraph(nx.DiGraph):
 
         outset = set()  # set of changed boundary outputs
 
-        ndata = self.node
-        stack = [(n, self.successors_iter(n), not is_comp_node(self, n))
-                        for n in vnames]
+        adj = self._get_adjacency()
+        names = adj.names
+        index = adj.index
+        ndata = adj.data
+        succs = adj.succs
+        flags = adj.flags
+
+        stack = []
+        for n in vnames:
+            i = index[n]
+            stack.append((i, succs[i], not flags[i] & _COMP))
 
         visited = set()
         while(stack):
@@ -774,38 +868,45 @@ class DependencyGraph(nx.DiGraph):
             else:
                 visited.add(src)
             sdata = ndata[src]
-            oldvalid = sdata['valid']
-            if oldvalid is True:
-                if src.startswith('parent.'):
-                    ndata[src]['valid'] = False
-                else:
-                    indeg = self._indegs.get(src)
-                    if indeg is None:
-                        indeg = self.in_degree(src)
-                        self._indegs[src] = indeg
-                    if indeg:  # don't invalidate unconnected inputs
-                        ndata[src]['valid'] = False
-                if 'boundary' in sdata and sdata.get('iotype') == 'out':
-                    outset.add(src)
+            if sdata['valid'] is True:
+                # don't invalidate unconnected inputs
+                if flags[src] & _INVALIDATABLE:
+                    sdata['valid'] = False
+                if flags[src] & _BOUNDARY_OUT:
+                    outset.add(names[src])
 
             parsources = None
             for node in neighbors:
                 ddata = ndata[node]
-                if 'comp' in ddata:
+                if flags[node] & _COMP:
                     if ddata['valid'] or ddata.get('invalidation')=='partial':
                         if parsources is None:
-                            parsources = self.get_sources(src)
-                        outs = getattr(scope, node).invalidate_deps(['.'.join(('parent', n))
-                                                                      for n in parsources])
+                            parsources = ['.'.join(('parent', n)) for n in
+                                          self.get_sources(names[src])]
+                        outs = getattr(scope, names[node]).invalidate_deps(parsources[:])
                         if outs is None:
-                            stack.append((node, self.successors_iter(node), True))
+                            stack.append((node, succs[node], True))
                         elif outs: # partial invalidation
-                            stack.append((node, ['.'.join((node,n)) for n in outs], False))
+                            cname = names[node]
+                            stack.append((node, [index['.'.join((cname, n))]
+                                                 for n in outs], False))
                 else:
-                    stack.append((node, self.successors_iter(node), True))
+                    stack.append((node, succs[node], True))
 
         return outset
 
+    def _get_adjacency(self):
+        """Return an :class:`_Adjacency` snapshot of this graph, or an
+        :class:`_AdjacencyView` if the graph has changed too recently for
+        a snapshot to be worthwhile.
+        """
+        if self._adjacency is None:
+            self._adjacency_uses += 1
+            if self._adjacency_uses < _ADJACENCY_THRESHOLD:
+                return _AdjacencyView(self)
+            self._adjacency = _Adjacency(self)
+        return self._adjacency
+
     def get_boundary_inputs(self, connected=False):
         """Returns inputs that are on the component boundary.
         If connected is True, return a list of only those nodes
@@ -880,8 +981,11 @@ class DependencyGraph(nx.DiGraph):
                 return [n for n in self.pred[cname]
                                             if self.in_degree(n)]
         elif invalid:
-            data = self.node
-            return [n for n in self.pred[cname] if data[n]['valid'] is False]
+            adj = self._get_adjacency()
+            names = adj.names
+            data = adj.data
+            return [names[i] for i in adj.preds[adj.index[cname]]
+                             if data[i]['valid'] is False]
         else:
             return self.pred[cname].keys()
 
@@ -1075,19 +1179,28 @@ class DependencyGraph(nx.DiGraph):
                             dexprs.append(ddata['dexpr'])
                             sexprs.append(ddata['sexpr'])
                             valid_set.add(vv)
-            self._dstvars[vname] = (sexprs, dexprs, valid_set)
+            valid_data = [self.node[node] for node in valid_set]
+            directs = [_direct_dest(dexpr.text) for dexpr in dexprs]
+            self._dstvars[vname] = (sexprs, dexprs, directs, valid_data)
         else:
-            sexprs, dexprs, valid_set = tup
+            sexprs, dexprs, directs, valid_data = tup
 
         try:
-            for sexpr, dexpr in zip(sexprs, dexprs):
-                dexpr.set(sexpr.evaluate(scope=scope), src=sexpr.text, scope=scope)
+            for sexpr, dexpr, direct in zip(sexprs, dexprs, directs):
+                val = sexpr.evaluate(scope=scope)
+                if direct is not None and isinstance(val, ndarray):
+                    # array to array connection, skip validation if we can
+                    setter = getattr(getattr(scope, direct[0], None),
+                                     '_set_array_input', None)
+                    if setter is not None and setter(direct[1], val):
+                        continue
+                dexpr.set(val, src=sexpr.text, scope=scope)
         except Exception as err:
             raise err.__class__("cannot set '%s' from '%s': %s" %
                                  (dexpr.text, sexpr.text, str(err)))
         
-        for node in valid_set:
-            self.node[node]['valid'] = True
+        for data in valid_data:
+            data['valid'] = True
 
     def validate_boundary_vars(self):
         """Mark extern and boundary vars and their
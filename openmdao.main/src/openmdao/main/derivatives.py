@@ -11,21 +11,30 @@ from openmdao.util.log import logger
 
 try:
     from numpy import ndarray, zeros, ones, unravel_index, vstack, hstack
-    # Can't solve derivatives without these
-    from scipy.sparse.linalg import gmres, LinearOperator
 
 except ImportError as err:
     logger.warn("In %s: %r", __file__, err)
     from openmdao.main.numpy_fallback import ndarray, zeros, \
                                     ones, unravel_index, vstack, hstack
 
+# Can't solve derivatives without these. scipy.sparse.linalg is imported on
+# first use since it is slow to load.
+def gmres(*args, **kwargs):
+    """Calls :func:`scipy.sparse.linalg.gmres`."""
+    from scipy.sparse.linalg import gmres as _gmres
+    return _gmres(*args, **kwargs)
+
+def LinearOperator(*args, **kwargs):
+    """Calls :class:`scipy.sparse.linalg.LinearOperator`."""
+    from scipy.sparse.linalg import LinearOperator as _LinearOperator
+    return _LinearOperator(*args, **kwargs)
+
 # pylint: disable-msg=C0103
 
 def calc_gradient(wflow, inputs, outputs, n_edge, shape):
     """Returns the gradient of the passed outputs with respect to
     all passed inputs.
     """
-
     # Size the problem
     A = LinearOperator((n_edge, n_edge),
                        matvec=wflow.matvecFWD,
@@ -89,7 +98,6 @@ def calc_gradient_adjoint(wflow, inputs, outputs, n_edge, shape):
     """Returns the gradient of the passed outputs with respect to
     all passed inputs. Calculation is done in adjoint mode.
     """
-
     # Size the problem
     A = LinearOperator((n_edge, n_edge),
                        matvec=wflow.matvecREV,
@@ -29,6 +29,7 @@ from openmdao.main.rbac import rbac
 from openmdao.main.vartree import VariableTree
 from openmdao.main.workflow import Workflow
 from openmdao.util.decorators import add_delegate
+import openmdao.main.profiler as profiling
 
 
 class GradientOptions(VariableTree):
@@ -67,6 +68,10 @@ class Driver(Component):
     printvars = List(Str, iotype='in', framework_var=True,
                      desc='List of extra variables to output in the recorders.')
 
+    max_workers = Int(1, low=1, iotype='in', framework_var=True,
+                      desc='Maximum number of components in a Dataflow'
+                           ' workflow run concurrently in separate threads.')
+
     # set factory here so we see a default value in the docs, even
     # though we replace it with a new Dataflow in __init__
     workflow = Slot(Workflow, allow_none=True, required=True,
@@ -331,9 +336,14 @@ class Driver(Component):
         self._iter = None
         self.start_iteration()
         while self.continue_iteration():
+            profiler = profiling.PROFILER
+            if profiler is not None:
+                start = profiler.start()
             self.pre_iteration()
             self.run_iteration()
             self.post_iteration()
+            if profiler is not None:
+                profiler.stop(self.get_pathname(), 'iteration', start)
 
     def step(self):
         """Similar to the 'execute' function, but this one only
@@ -439,6 +449,10 @@ class Driver(Component):
         if not self.recorders:
             return
 
+        profiler = profiling.PROFILER
+        if profiler is not None:
+            start = profiler.start()
+
         case_input = []
         case_output = []
         iotypes = {}
@@ -503,6 +517,9 @@ class Driver(Component):
         for recorder in self.recorders:
             recorder.record(case)
 
+        if profiler is not None:
+            profiler.stop(self.get_pathname(), 'record', start)
+
     def _get_all_varpaths(self, pattern, header=''):
         ''' Return a list of all varpaths in the driver's workflow that
         match the specified pattern.
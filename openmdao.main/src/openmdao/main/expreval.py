@@ -6,14 +6,15 @@ __all__ = ["ExprEvaluator"]
 import weakref
 import math
 import ast
+import imp
 import __builtin__
+from functools import partial
 
 from openmdao.main.printexpr import _get_attr_node, _get_long_name, \
                                     transform_expression, ExprPrinter, \
                                     print_node
-from openmdao.main.index import INDEX, ATTR, CALL, SLICE, EXTSLICE
-
-from openmdao.main.sym import SymGrad, SymbolicDerivativeError
+from openmdao.main.index import INDEX, ATTR, CALL, SLICE, EXTSLICE, \
+                               get_indexed_value
 
 def _import_functs(mod, dct, names=None):
     if names is None:
@@ -39,13 +40,24 @@ else:
     _expr_dict['numpy'] = numpy
     #_import_functs(numpy, _expr_dict, names=[])
 
-# if scipy is available, add some functions
+# if scipy is available, add some functions. scipy.special is only imported
+# when one of them is first called.
+def _scipy_special(name):
+    def _funct(*args, **kwargs):
+        import scipy.special
+        funct = getattr(scipy.special, name)
+        _expr_dict[name] = funct
+        return funct(*args, **kwargs)
+    _funct.__name__ = name
+    return _funct
+
 try:
-    import scipy.special
+    imp.find_module('scipy')
 except ImportError:
     pass
 else:
-    _import_functs(scipy.special, _expr_dict, names=['gamma', 'polygamma'])
+    for _name in ('gamma', 'polygamma'):
+        _expr_dict[_name] = _scipy_special(_name)
 
 
 from numpy import ndarray, ndindex, zeros, identity
@@ -53,6 +65,46 @@ from numpy import ndarray, ndindex, zeros, identity
 
 _Missing = object()
 
+# Incremented whenever the container hierarchy changes, which invalidates
+# the direct accessors of every ExprEvaluator.
+_structure_version = 0
+
+def structure_changed():
+    """Note that a container has been added, removed, or replaced somewhere,
+    so that any accessors holding direct references into the container
+    hierarchy must be rebuilt.
+    """
+    global _structure_version
+    _structure_version += 1
+
+def _scope_get(scope, path, index=None):
+    """Accessor used when `path` can't be resolved directly."""
+    return scope.get(path, index)
+
+def _make_accessor(scope, path, indexed):
+    """Return a callable returning the value of `path` in `scope`
+    (taking an index list if `indexed`). If every container along `path` is
+    local, the callable references the parent of the final attribute
+    directly rather than repeating the lookup of `path` on each call.
+    Only weak references are held.
+    """
+    from openmdao.main.container import Container  # Circular import.
+
+    obj = scope
+    names = path.split('.')
+    for name in names[:-1]:
+        if not isinstance(obj, Container):
+            break
+        obj = getattr(obj, name, _Missing)
+    else:
+        if isinstance(obj, Container) and \
+           getattr(obj, names[-1], _Missing) is not _Missing:
+            if indexed:
+                return partial(get_indexed_value, weakref.proxy(obj),
+                               names[-1])
+            return partial(getattr, weakref.proxy(obj), names[-1])
+    return partial(_scope_get, weakref.proxy(scope), path)
+
 def is_in_process(scope, vname):
     """Return True if the object referenced by vname is accessible
     within scope via getattr from this process.
@@ -124,10 +176,16 @@ class ExprTransformer(ast.NodeTransformer):
     accesses into a form that can be passed to a downstream object and
     executed there. For example, abc.d[xyz](1, pdq-10).value would translate
     to, e.g., scope.get('abc.d', [(0,xyz), (0,[1,pdq-10]), (1,'value')]).
+
+    If `accessors` is a dict, references are instead translated to calls of
+    local accessor functions, e.g., _acc0_() or _acc1_([(0,xyz)]), and
+    `accessors` is updated to map from each accessor's name to a tuple of
+    the form (varpath, indexed).
     """
-    def __init__(self, expreval, rhs=None, getter='get'):
+    def __init__(self, expreval, rhs=None, getter='get', accessors=None):
         self.expreval = expreval
         self.rhs = rhs
+        self.accessors = accessors
         self._stack = []  # use this to see if we're inside of parens or
                           # brackets so that we always translate to 'get'
                           # even if we're on the lhs
@@ -169,6 +227,8 @@ class ExprTransformer(ast.NodeTransformer):
                                                       col_offset=1,
                                                       ctx=ast.Load()))]
         else:
+            if self.accessors is not None:
+                return self._accessor_node(node, name, subs)
             fname = self.getter
             keywords = []
         names.append(fname)
@@ -180,6 +240,21 @@ class ExprTransformer(ast.NodeTransformer):
         return ast.copy_location(ast.Call(func=called_obj, args=args,
                                           ctx=node.ctx, keywords=keywords), node)
 
+    def _accessor_node(self, node, name, subs):
+        """Return a call to the local accessor function for `name`."""
+        key = (name, bool(subs))
+        for accname, acckey in self.accessors.items():
+            if acckey == key:
+                break
+        else:
+            accname = '_acc%d_' % len(self.accessors)
+            self.accessors[accname] = key
+
+        args = [ast.List(elts=subs, ctx=ast.Load())] if subs else []
+        return ast.copy_location(ast.Call(func=ast.Name(id=accname,
+                                                        ctx=ast.Load()),
+                                          args=args, keywords=[]), node)
+
     def visit_Name(self, node, subs=None):
         return self._name_to_node(node, node.id, subs)
 
@@ -295,7 +370,8 @@ class ExprTransformer(ast.NodeTransformer):
             raise RuntimeError("only one expression is allowed on left hand"
                                " side of assignment")
         rhs = self.visit(node.value)
-        lhs = ExprTransformer(self.expreval, rhs=rhs).visit(node.targets[0])
+        lhs = ExprTransformer(self.expreval, rhs=rhs,
+                              accessors=self.accessors).visit(node.targets[0])
         if isinstance(lhs, (ast.Name, ast.Subscript, ast.Attribute)):
             lhs.ctx = ast.Store()
             return ast.Assign(targets=[lhs], value=rhs)
@@ -452,6 +528,12 @@ class ExprEvaluator(object):
     For a description of the format of the 'index' arg of set/get that is
     generated by ExprEvaluator, see the doc string for the
     ``openmdao.main.index.process_index_entry`` function.
+
+    When the getter is 'get', :meth:`evaluate` uses a second compiled form of
+    the expression in which each variable reference calls an accessor
+    holding a direct reference to the variable's parent container. The
+    accessors are rebuilt only when the scope or the container hierarchy
+    changes (see :func:`structure_changed`).
     """
 
     def __init__(self, text, scope=None, getter='get'):
@@ -470,6 +552,7 @@ class ExprEvaluator(object):
     def text(self, value):
         self._code = self._assignment_code = None
         self._examiner = self.cached_grad_eq = None
+        self._direct = self._accessors = None
         self._text = value
 
     @property
@@ -488,6 +571,7 @@ class ExprEvaluator(object):
         if value is not self.scope:
             self._code = self._assignment_code = None
             self._examiner = self.cached_grad_eq = None
+            self._direct = self._accessors = None
             if value is not None:
                 self._scope = weakref.ref(value)
             else:
@@ -524,10 +608,13 @@ class ExprEvaluator(object):
         state['_code'] = None  # <type 'code'> won't pickle either.
         if state.get('_assignment_code'):
             state['_assignment_code'] = None # more unpicklable <type 'code'>
+        state['_direct'] = state['_accessors'] = None  # code and weakrefs
         return state
 
     def __setstate__(self, state):
         """Restore this component's state."""
+        # Evaluators pickled by older versions lack these.
+        self._direct = self._accessors = None
         self.__dict__.update(state)
         if self._scope is not None:
             self._scope = weakref.ref(self._scope)
@@ -569,6 +656,30 @@ class ExprEvaluator(object):
         code = compile(assign_ast, '<string>', 'exec')
         return (assign_ast, code)
 
+    def _parse_direct(self):
+        """Return ``(code, accessors)`` for the form of our expression which
+        uses local accessor functions rather than 'get' calls on the scope.
+        """
+        accessors = {}
+        new_ast = ExprTransformer(self, getter=self.getter,
+                                  accessors=accessors).visit(self._pre_parse())
+        ast.fix_missing_locations(new_ast)
+        mode = 'exec' if isinstance(new_ast, ast.Module) else 'eval'
+        return (compile(new_ast, '<string>', mode), accessors)
+
+    def _get_accessors(self, scope):
+        """Return the locals dict for evaluating our direct code,
+        rebuilding the accessors if the container hierarchy has changed.
+        """
+        if self._accessors is None or \
+           self._accessors_version != _structure_version:
+            self._accessors_version = _structure_version
+            accessors = {'scope': weakref.proxy(scope)}
+            for accname, (path, indexed) in self._direct[1].items():
+                accessors[accname] = _make_accessor(scope, path, indexed)
+            self._accessors = accessors
+        return self._accessors
+
     def _parse(self, root=None):
         self.var_names = set()
         if root is not None:
@@ -594,6 +705,11 @@ class ExprEvaluator(object):
         try:
             if self._code is None:
                 self._parse()
+            if self.getter == 'get' and scope is not None:
+                if self._direct is None:
+                    self._direct = self._parse_direct()
+                return eval(self._direct[0], _expr_dict,
+                            self._get_accessors(scope))
             return eval(self._code, _expr_dict, locals())
         except Exception, err:
             raise type(err)("can't evaluate expression "
@@ -654,6 +770,7 @@ class ExprEvaluator(object):
             if (var not in self.cached_grad_eq) or self._code is None:
 
                 #Take symbolic gradient of all inputs using sympy
+                from openmdao.main.sym import SymGrad, SymbolicDerivativeError
                 try:
                     for varname, expression in zip(inputs,
                                                    SymGrad(self.text, inputs)):
@@ -763,8 +880,10 @@ class ExprEvaluator(object):
         """Set the value of the referenced object to the specified value."""
         scope = self._get_updated_scope(scope)
 
-        if self._code is None:
+        if self._assignment_code is None:
             self._pre_parse()
+            if self._allow_set:
+                _, self._assignment_code = self._parse_set()
 
         if self._allow_set:
             # self.assignment_code is a compiled version of an assignment
@@ -777,8 +896,6 @@ class ExprEvaluator(object):
             _local_setter_ = val
             _local_src_ = src
             _local_force_ = force
-            if self._assignment_code is None:
-                _, self._assignment_code = self._parse_set()
             exec(self._assignment_code, _expr_dict, locals())
         else:
             raise ValueError("expression '%s' can't be set to a value"
@@ -10,8 +10,6 @@ __all__ = ["create", "register_class_factory", "get_available_types"]
 
 import threading
 
-from pkg_resources import parse_version
-
 from openmdao.main.importfactory import ImportFactory
 from openmdao.main.pkg_res_factory import PkgResourcesFactory
 from openmdao.util.log import logger
@@ -77,6 +75,7 @@ def _cmp(tup1, tup2):
     elif s1 > s2:
         return 1
     else:  # s1 == s2
+        from pkg_resources import parse_version
         return cmp(parse_version(tup1[1].get('version', '')),
                    parse_version(tup2[1].get('version', '')))
 
@@ -1,13 +1,12 @@
 """ Class definition for an Implicit Component. """
 
-from scipy.optimize import fsolve
-from scipy.sparse.linalg import gmres, LinearOperator
 import numpy as np
 
 from openmdao.main.array_helpers import flattened_value
 from openmdao.main.component import Component
-from openmdao.main.datatypes.api import Bool
-from openmdao.main.derivatives import applyJ
+from openmdao.main.datatypes.api import Bool, Enum, Float, Int
+from openmdao.main.derivatives import applyJ, gmres, LinearOperator, \
+                                      get_bounds
 from openmdao.main.interfaces import IImplicitComponent, IVariableTree, implements
 from openmdao.main.mp_support import has_interface
 from openmdao.main.rbac import rbac
@@ -24,11 +23,35 @@ class ImplicitComponent(Component):
                      desc='Set to True to have this comp perform a single '
                            'evaluate when execute() is called.')
 
+    solve_method = Enum('fsolve', ['fsolve', 'newton'], iotype='in',
+                        framework_var=True,
+                        desc='Internal solver: scipy fsolve, or a Newton '
+                             'solve that reuses its Jacobian and starts '
+                             'from the current state.')
+
+    solve_tolerance = Float(1.0e-8, iotype='in', framework_var=True,
+                            desc='Residual norm for convergence of the '
+                                 'newton solve_method.')
+
+    solve_max_iteration = Int(50, iotype='in', framework_var=True,
+                              desc='Maximum number of iterations of the '
+                                   'newton solve_method.')
+
+    jacobian_reuse = Bool(False, iotype='in', framework_var=True,
+                          desc='If True, the newton solve_method keeps its '
+                               'factored Jacobian while it converges well, '
+                               'including across executions. This saves '
+                               'Jacobian evaluations at the cost of extra '
+                               'residual evaluations.')
+
     def __init__(self):
         super(ImplicitComponent, self).__init__()
         self._state_names = None
         self._resid_names = None
         self._shape_cache = {}
+        self._vec_bounds = None
+        self._newton_lu = None
+        self._newton_splu = None
 
         # register callbacks for all of our 'state' traits
         for name, trait in self.class_traits().items():
@@ -74,6 +97,23 @@ class ImplicitComponent(Component):
         self._state_names = None
         self._resid_names = None
         self._shape_cache = {}
+        self._vec_bounds = None
+        self._newton_lu = None
+        self._newton_splu = None
+
+    def __getstate__(self):
+        """Return dict representing this component's state."""
+        state = super(ImplicitComponent, self).__getstate__()
+        state['_newton_splu'] = None  # SuperLU objects can't be pickled.
+        return state
+
+    def __setstate__(self, state):
+        super(ImplicitComponent, self).__setstate__(state)
+
+        # Component only restores callbacks for inputs.
+        for name, trait in self.class_traits().items():
+            if trait.iotype == 'state':
+                self._set_input_callback(name)
 
     def check_config(self):
         """
@@ -137,9 +177,16 @@ class ImplicitComponent(Component):
                                  ValueError)
 
     def solve(self):
-        """Calculates the states that satisfy residuals using scipy.fsolve.
+        """Calculates the states that satisfy residuals using scipy.fsolve
+        or a Newton solve, depending on `solve_method`.
         You can override this function to provide your own internal solve."""
 
+        if self.solve_method == 'newton':
+            self._newton_solve()
+            return
+
+        from scipy.optimize import fsolve
+
         x0 = self.get_state()
 
         # If our comp doesn't have derivatives, let the
@@ -159,10 +206,121 @@ class ImplicitComponent(Component):
 
         return self.get_residuals()
 
+    def _newton_solve(self):
+        """Newton solve with a backtracking line search, starting from the
+        current state. If `jacobian_reuse` is set, the factored Jacobian is
+        kept while each step reduces the residual norm tenfold, including
+        into later executions."""
+
+        X = self.get_state()
+        R = self._solve_callback(X)
+        norm = np.linalg.norm(R)
+        evaluated = True  # Component outputs correspond to X.
+
+        if not self.jacobian_reuse:
+            self._newton_lu = None
+
+        for i in range(self.solve_max_iteration):
+            if norm < self.solve_tolerance:
+                break
+
+            fresh = self._newton_lu is None
+            if fresh:
+                self._newton_lu = self._factor_jacobian(X)
+
+            dX = -self._newton_step(R)
+
+            # Backtrack until the residual norm decreases sufficiently.
+            alpha = 1.0
+            for j in range(10):
+                X_new = X + alpha*dX
+                R_new = self._solve_callback(X_new)
+                norm_new = np.linalg.norm(R_new)
+                if norm_new <= (1.0 - 1.0e-4*alpha)*norm:
+                    break
+                alpha *= 0.5
+
+            if norm_new > 0.1*norm or not self.jacobian_reuse:
+                self._newton_lu = None
+                if norm_new >= norm and not fresh:
+                    # Stale Jacobian, retry from X with a new one.
+                    self.set_state(X)
+                    evaluated = False
+                    continue
+
+            X, R, norm = X_new, R_new, norm_new
+            evaluated = True
+        else:
+            if norm >= self.solve_tolerance:
+                self._logger.warning('newton solve failed to converge after '
+                                     '%d iterations, residual norm %g'
+                                     % (self.solve_max_iteration, norm))
+
+        if not evaluated:
+            self._solve_callback(X)
+
+    def _factor_jacobian(self, X):
+        """Return the factored state-to-residual Jacobian at `X`: the
+        (lu, piv) pair from :func:`scipy.linalg.lu_factor`, or if provideJ
+        returned a sparse matrix, that matrix in CSC form, which is
+        factored when it is first used by :meth:`_newton_step`."""
+
+        if hasattr(self, 'provideJ'):
+            J = self._calc_state_jacobian(X)
+        else:
+            J = self._fd_jacobian(X)
+
+        self._newton_splu = None
+        if isinstance(J, np.ndarray):
+            from scipy.linalg import lu_factor
+            return lu_factor(J)
+
+        return J.tocsc()
+
+    def _newton_step(self, R):
+        """Solve with the factored Jacobian for residual `R`."""
+
+        if isinstance(self._newton_lu, tuple):
+            from scipy.linalg import lu_solve
+            return lu_solve(self._newton_lu, R)
+
+        if self._newton_splu is None:
+            from scipy.sparse.linalg import splu
+            self._newton_splu = splu(self._newton_lu)
+        return self._newton_splu.solve(R)
+
+    def _fd_jacobian(self, X):
+        """Return the state-to-residual Jacobian at `X` by forward
+        finite difference."""
+
+        R = self._solve_callback(X)
+        J = np.zeros((len(R), len(X)))
+        for i in range(len(X)):
+            step = 1.0e-6*max(1.0, abs(X[i]))
+            Xp = X.copy()
+            Xp[i] += step
+            J[:, i] = (self._solve_callback(Xp) - R)/step
+        self.set_state(X)
+        return J
+
     def _jacobian_callback(self, X):
         """This function is passed to the internal solver to return the
         jacobian of the states with respect to the residuals."""
 
+        J = self._calc_state_jacobian(X)
+        if not isinstance(J, np.ndarray):
+            J = J.toarray()
+        return J
+
+    def _calc_state_jacobian(self, X):
+        """Return the jacobian of the states with respect to the residuals,
+        as a sparse matrix if provideJ returned one."""
+
+        self._cache_J = self._timed_provideJ()
+        if self._cache_J is not None:
+            return self._state_jacobian(self._cache_J)
+
+        # Matrix-free (apply_deriv), solve for each column.
         n_edge = 2*len(X)
         n_res = n_edge/2
 
@@ -171,8 +329,6 @@ class ImplicitComponent(Component):
                            dtype=float)
         J = np.zeros((n_res, n_res))
 
-        self._cache_J = self.provideJ()
-
         for irhs in np.arange(n_res):
 
             RHS = np.zeros((n_edge, 1))
@@ -194,65 +350,97 @@ class ImplicitComponent(Component):
 
         return J
 
+    def _state_jacobian(self, J):
+        """Extract the residual-by-state blocks from `J`, the Jacobian
+        returned by provideJ. Returns a sparse matrix if `J` is sparse,
+        otherwise a dense array."""
+
+        if self._provideJ_bounds is None:
+            input_keys, output_keys = self.list_deriv_vars()
+            if isinstance(input_keys, basestring):
+                input_keys = (input_keys,)
+            if isinstance(output_keys, basestring):
+                output_keys = (output_keys,)
+            self._provideJ_bounds = get_bounds(self, input_keys, output_keys)
+        ibounds, obounds = self._provideJ_bounds
+
+        state_bounds, resid_bounds = self._get_vec_bounds()
+        n_state = state_bounds[-1][2] if state_bounds else 0
+        n_res = resid_bounds[-1][2] - n_state if resid_bounds else 0
+
+        if not isinstance(J, np.ndarray):
+            from scipy.sparse import bmat, csr_matrix
+            J = csr_matrix(J)
+            blocks = []
+            for rname, r1, r2 in resid_bounds:
+                row = []
+                for sname, s1, s2 in state_bounds:
+                    if rname in obounds and sname in ibounds:
+                        o1, o2, osh = obounds[rname]
+                        i1, i2, ish = ibounds[sname]
+                        row.append(J[o1:o2, i1:i2])
+                    else:
+                        row.append(csr_matrix((r2-r1, s2-s1)))
+                blocks.append(row)
+            if not blocks or not blocks[0]:
+                return csr_matrix((n_res, n_state))
+            return bmat(blocks, format='csr')
+
+        Jrs = np.zeros((n_res, n_state))
+        for rname, r1, r2 in resid_bounds:
+            if rname not in obounds:
+                continue
+            o1, o2, osh = obounds[rname]
+            for sname, s1, s2 in state_bounds:
+                if sname in ibounds:
+                    i1, i2, ish = ibounds[sname]
+                    Jrs[r1-n_state:r2-n_state, s1:s2] = J[o1:o2, i1:i2]
+        return Jrs
+
+    def _get_vec_bounds(self):
+        """Return lists of ``(name, start, end)`` for the states and the
+        residuals in the combined state/residual vector."""
+
+        if self._vec_bounds is None:
+            idx = 0
+            bounds = []
+            for names in (self.list_states(), self.list_residuals()):
+                vbounds = []
+                for varname in names:
+                    val = getattr(self, varname)
+                    size = len(flattened_value(varname, val))
+                    vbounds.append((varname, idx, idx + size))
+                    idx += size
+                bounds.append(vbounds)
+            self._vec_bounds = tuple(bounds)
+        return self._vec_bounds
+
     def _matvecFWD(self, arg):
         '''Callback function for performing the matrix vector product of the
         state-to-residual Jacobian with an incoming vector arg.'''
 
         result = np.zeros(len(arg))
 
-        comp_inputs = self.list_states()
-        comp_outputs = self.list_residuals()
+        state_bounds, resid_bounds = self._get_vec_bounds()
         inputs = {}
         outputs = {}
 
-        idx = 0
-
-        for varname in comp_inputs:
-            val = getattr(self, varname)
-            flatval = flattened_value(varname, val)
-            size = len(flatval)
-
-            i1, i2 = idx, idx + size
+        for varname, i1, i2 in state_bounds:
             inputs[varname] = arg[i1:i2].copy()
 
-            idx += size
-
-        for varname in comp_outputs:
-            val = getattr(self, varname)
-            flatval = flattened_value(varname, val)
-            size = len(flatval)
-
-            i1, i2 = idx, idx + size
+        for varname, i1, i2 in resid_bounds:
             inputs[varname] = arg[i1:i2].copy()
             outputs[varname] = arg[i1:i2].copy()
 
-            idx += size
-
         applyJ(self, inputs, outputs, [], self._shape_cache, J=self._cache_J)
         #print inputs, outputs
 
-        idx = 0
-
         # Each state input adds an equation
-        for varname in comp_inputs:
-            val = getattr(self, varname)
-            flatval = flattened_value(varname, val)
-            size = len(flatval)
-
-            i1, i2 = idx, idx + size
-            result[i1:i2] = arg[i1:i2].copy()
+        for varname, i1, i2 in state_bounds:
+            result[i1:i2] = arg[i1:i2]
 
-            idx += size
-
-        for varname in comp_outputs:
-            val = getattr(self, varname)
-            flatval = flattened_value(varname, val)
-            size = len(flatval)
-
-            i1, i2 = idx, idx + size
+        for varname, i1, i2 in resid_bounds:
             result[i1:i2] = outputs[varname]
 
-            idx += size
-
         #print arg, result
         return result
@@ -17,6 +17,11 @@ is used between the Proxy and Server:
 If `authkey` is not 'PublicKey', then the above session protocol is not used,
 and channel data is in the clear.
 
+When a proxy connects, it offers the message transports it supports and the
+server selects one. With the 'binary' transport large numeric arrays are sent
+as raw frames following a pickled header rather than being pickled (and
+encrypted) along with the rest of the message.
+
 Public methods of an object are determined by a role-based access control
 attribute associated with the method. The server will verify that the current
 role is allowed access. The current role is determined by an
@@ -35,6 +40,7 @@ method.
 # else might bleed in) as our private multiprocessing package.
 # No obvious 'best' alternative.
 
+import cPickle
 import errno
 import glob
 import hashlib
@@ -52,8 +58,8 @@ from Crypto import Random
 from multiprocessing import Process, current_process, connection, util
 from multiprocessing.forking import Popen
 from multiprocessing.managers import BaseManager, BaseProxy, RebuildProxy, \
-                                     Server, State, Token, convert_to_error, \
-                                     dispatch
+                                     RemoteError, Server, State, Token, \
+                                     convert_to_error, dispatch
 
 if sys.platform == 'win32':  #pragma no cover
     from _multiprocessing import win32
@@ -63,7 +69,10 @@ from traits.trait_handlers import TraitDictObject
 from openmdao.main.interfaces import obj_has_interface
 from openmdao.main.mp_util import decrypt, encrypt, is_legal_connection, \
                                   keytype, make_typeid, public_methods, \
-                                  tunnel_address, SPECIALS
+                                  tunnel_address, frames_size, \
+                                  pack_message, recv_frames, recv_message, \
+                                  send_message, unpack_message, SPECIALS, \
+                                  TRANSPORTS, BINARY_MAGIC
 from openmdao.main.rbac import AccessController, RoleError, check_role, \
                                need_proxy, Credentials, \
                                get_credentials, set_credentials
@@ -373,6 +382,31 @@ class OpenMDAO_Server(Server):
 
         conn.close()
 
+    def accept_connection(self, conn, name, transports=()):
+        """
+        Serve a new proxy connection.
+
+        conn: socket or pipe
+            Connection to process.
+
+        name: string
+            Name of the client process/thread.
+
+        transports: list
+            Message transports supported by the client, in order of preference.
+
+        This version replies with the first of `transports` this server
+        supports, or 'pickle'.
+        """
+        threading.current_thread().name = name
+        transport = 'pickle'
+        for candidate in transports:
+            if candidate in TRANSPORTS:
+                transport = candidate
+                break
+        conn.send(('#RETURN', transport))
+        self.serve_client(conn)
+
     def serve_client(self, conn):
         """
         Handle requests from the proxies in a particular process/thread.
@@ -381,10 +415,11 @@ class OpenMDAO_Server(Server):
             Connection to process.
 
         This version supports dynamic proxy generation and credential checking.
+        Each reply uses the same transport as its request.
         """
         self._logger.log(LOG_DEBUG2, 'starting server thread to service %r, %s',
                          threading.current_thread().name, keytype(self._authkey))
-        recv = conn.recv
+        recv_bytes = conn.recv_bytes
         send = conn.send
         id_to_obj = self.id_to_obj
         id_to_controller = self._id_to_controller
@@ -400,15 +435,29 @@ class OpenMDAO_Server(Server):
             try:
                 ident = methodname = args = kwds = credentials = None
                 obj = exposed = gettypeid = None
-                data = recv()
+                binary = framed = False
+                data = recv_bytes()
                 try:
-                    request = decrypt(data, session_key)
+                    if data.startswith(BINARY_MAGIC):
+                        binary = True
+                        frames = recv_frames(conn, session_key, data)
+                        framed = True
+                        request = unpack_message(*frames)
+                    else:
+                        request = decrypt(cPickle.loads(data), session_key)
                 except Exception as exc:
                     trace = traceback.format_exc()
                     msg = "Can't decrypt/unpack request. This could be the" \
                           " result of referring to a dead server."
                     self._logger.error(msg)
                     self._logger.error(trace)
+                    if binary and not framed:
+                        # Any remaining frames of the message can't be
+                        # found, so the connection is no longer usable.
+                        self._logger.error('closing connection serving %r',
+                                           threading.current_thread().name)
+                        conn.close()
+                        sys.exit(1)
                     raise RuntimeError(msg)
 
                 ident, methodname, args, kwds, credentials = request
@@ -520,10 +569,18 @@ class OpenMDAO_Server(Server):
                 msg = ('#TRACEBACK', trace)
 
             try:
-                try:
-                    send(encrypt(msg, session_key))
-                except Exception:
-                    send(encrypt(('#UNSERIALIZABLE', repr(msg)), session_key))
+                if binary:
+                    try:
+                        send_message(conn, msg, session_key)
+                    except Exception:
+                        send_message(conn, ('#UNSERIALIZABLE', repr(msg)),
+                                     session_key)
+                else:
+                    try:
+                        send(encrypt(msg, session_key))
+                    except Exception:
+                        send(encrypt(('#UNSERIALIZABLE', repr(msg)),
+                                     session_key))
             # Just being defensive, this should never happen.
             except Exception as exc: #pragma no cover
                 self._logger.error('exception in thread serving %r',
@@ -1182,6 +1239,82 @@ class ObjectManager(object):
         self._server.serve_forever()
 
 
+# Maximum number of pipelined requests awaiting replies on a connection.
+_PIPELINE_DEPTH = 16
+
+# Maximum bytes of pipelined requests awaiting replies on a connection.
+# This should fit in the connection's buffers, so sending never blocks while
+# the server is blocked sending a reply we aren't yet reading.
+_PIPELINE_BYTES = 1 << 16
+
+
+class _ConnectionPool(object):
+    """
+    Idle proxy connections to a server, shared by all threads of a process.
+    A connection is taken from the pool for the duration of a call and then
+    returned, so new threads don't need to establish (and possibly negotiate
+    an encrypted session for) a connection of their own.
+    """
+
+    _pools = {}
+    _mutex = threading.Lock()
+
+    @staticmethod
+    def get_pool(address):
+        """
+        Return the pool for the server at `address`.
+
+        address: tuple or string
+            A :mod:`multiprocessing` address specifying an Internet address or
+            a pipe.
+        """
+        with _ConnectionPool._mutex:
+            try:
+                return _ConnectionPool._pools[address]
+            except KeyError:
+                pool = _ConnectionPool()
+                _ConnectionPool._pools[address] = pool
+                return pool
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle = []
+        util.register_after_fork(self, _ConnectionPool._after_fork)
+
+    def _after_fork(self):
+        """ Forget connections which belong to the parent process. """
+        self._lock = threading.Lock()
+        self._idle = []
+
+    def get(self):
+        """ Return an idle ``(conn, session_key, transport)``, or None. """
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return None
+
+    def put(self, entry):
+        """
+        Return a connection to the pool.
+
+        entry: tuple
+            ``(conn, session_key, transport)`` as returned by :meth:`get`.
+        """
+        with self._lock:
+            self._idle.append(entry)
+
+    def close(self):
+        """ Close all idle connections. """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, session_key, transport in idle:
+            try:
+                conn.close()
+            # Just being defensive, this should never happen.
+            except Exception:  #pragma no cover
+                pass
+
+
 class OpenMDAO_Proxy(BaseProxy):
     """
     Proxy for a remote object.
@@ -1218,16 +1351,36 @@ class OpenMDAO_Proxy(BaseProxy):
         else:
             self._pubkey = self._manager._pubkey
 
+        self._pool = _ConnectionPool.get_pool(self._token.address)
+
     def _connect(self):
-        """ This version translates tunneled addresses. """
+        """
+        Return ``(conn, session_key, transport)`` for a new connection.
+        This version translates tunneled addresses, negotiates the message
+        transport, and optionally establishes an encrypted session. Servers
+        which don't support negotiation use 'pickle'.
+        """
         util.debug('making connection to manager')
         name = current_process().name
         if threading.current_thread().name != 'MainThread':
             name += '|' + threading.current_thread().name
         address = tunnel_address(self._token.address)
         conn = self._Client(address, authkey=self._authkey)
-        dispatch(conn, None, 'accept_connection', (name,))
-        self._tls.connection = conn
+        try:
+            transport = dispatch(conn, None, 'accept_connection',
+                                 (name, TRANSPORTS))
+        except RemoteError:
+            # Older server, accept_connection() has no transports argument.
+            conn.close()
+            conn = self._Client(address, authkey=self._authkey)
+            dispatch(conn, None, 'accept_connection', (name,))
+            transport = 'pickle'
+
+        if self._authkey == 'PublicKey':
+            session_key = self._init_session(conn)
+        else:
+            session_key = ''
+        return (conn, session_key, transport)
 
     def _callmethod(self, methodname, args=None, kwds=None):
         """
@@ -1235,28 +1388,106 @@ class OpenMDAO_Proxy(BaseProxy):
         This version optionally encrypts the channel and sends the current
         thread's credentials with method arguments.
         """
-        args = args or ()
-        kwds = kwds or {}
+        return self._callmethods([(methodname, args, kwds)])[0]
 
-        try:
-            conn = self._tls.connection
-        except AttributeError:
+    def _callmethods(self, calls):
+        """
+        Call several methods of the referrent and return a list of copies of
+        the results. The requests are pipelined on a single connection, so
+        a batch such as ``[('get', (path,), None) for path in paths]`` costs
+        about one network round-trip rather than one per call.
+        All calls are made; if any fail, the exception for the first failure
+        is raised after all replies have been received.
+
+        calls: list
+            List of ``(methodname, args, kwds)``.
+        """
+        if not calls:
+            return []
+
+        entry = self._pool.get()
+        if entry is None:
             curr_thread = threading.current_thread()
-            util.debug('thread %r does not own a connection', curr_thread.name)
+            util.debug('thread %r has no idle connection',
+                       curr_thread.name)
             try:
-                self._connect()
+                entry = self._connect()
             except Exception as exc:
                 msg = "Can't connect to server at %r for %r: %r" \
-                      % (self._token.address, methodname, exc)
+                      % (self._token.address, calls[0][0], exc)
                 logging.error(msg)
                 raise RuntimeError(msg)
-            conn = self._tls.connection
-            if self._authkey == 'PublicKey':
-                self._init_session(conn)
-            else:
-                self._tls.session_key = ''
 
-        session_key = self._tls.session_key
+        conn, session_key, transport = entry
+        binary = transport == 'binary'
+        replies = []
+        try:
+            # Sizes of requests awaiting replies. Replies are received
+            # before sending another request which would exceed the
+            # pipeline limits, so a request larger than the connection
+            # buffers is only sent when no replies are outstanding.
+            pending = []
+            pending_bytes = 0
+            for methodname, args, kwds in calls:
+                frames = self._pack_request(session_key, binary,
+                                            methodname, args or (),
+                                            kwds or {})
+                size = frames_size(frames)
+                while pending and \
+                      (len(pending) == _PIPELINE_DEPTH or
+                       pending_bytes + size > _PIPELINE_BYTES):
+                    replies.append(self._recv_reply(conn, session_key,
+                                                    binary))
+                    pending_bytes -= pending.pop(0)
+                self._send_request(conn, frames, methodname)
+                pending.append(size)
+                pending_bytes += size
+            for size in pending:
+                replies.append(self._recv_reply(conn, session_key, binary))
+        except Exception:
+            # Connection state is unknown, don't reuse it.
+            conn.close()
+            raise
+        self._pool.put(entry)
+
+        results = []
+        error = None
+        for kind, result in replies:
+            try:
+                results.append(self._convert_reply(kind, result))
+            except Exception:
+                results.append(None)
+                if error is None:
+                    error = sys.exc_info()
+        if error is not None:
+            raise error[0], error[1], error[2]
+        return results
+
+    def get_values(self, paths):
+        """
+        Return a list of the values of the given paths by pipelining a
+        remote ``get(path)`` for each path.  If any fail, the exception for
+        the first failure is raised after all values have been received.
+
+        paths: list
+            Paths of the values to return.
+        """
+        return self._callmethods([('get', (path,), None) for path in paths])
+
+    def set_values(self, items):
+        """
+        Set several values by pipelining a remote ``set(path, value)`` for
+        each ``(path, value)`` in `items`.  If any fail, the exception for
+        the first failure is raised after all the others have been applied.
+
+        items: list
+            List of ``(path, value)``.
+        """
+        self._callmethods([('set', (path, value), None)
+                           for path, value in items])
+
+    def _pack_request(self, session_key, binary, methodname, args, kwds):
+        """ Return list of frames for a request for `methodname`. """
 
 # FIXME: Bizarre problem evidenced by test_extcode.py (Python 2.6.1)
 # For some reason pickling the env_vars dictionary causes:
@@ -1271,17 +1502,34 @@ class OpenMDAO_Proxy(BaseProxy):
             else:
                 new_args.append(arg)
 
+        request = (self._id, methodname, new_args, kwds,
+                   get_credentials().encode())
+        if binary:
+            return pack_message(request, session_key)
+        else:
+            return [cPickle.dumps(encrypt(request, session_key),
+                                  cPickle.HIGHEST_PROTOCOL)]
+
+    def _send_request(self, conn, frames, methodname):
+        """ Send `frames` of a request for `methodname` on `conn`. """
         try:
-            conn.send(encrypt((self._id, methodname, new_args, kwds,
-                               get_credentials().encode()), session_key))
+            for frame in frames:
+                conn.send_bytes(frame)
         except IOError as exc:
             msg = "Can't send to server at %r for %r: %r" \
                   % (self._token.address, methodname, exc)
             logging.error(msg)
             raise RuntimeError(msg)
 
-        kind, result = decrypt(conn.recv(), session_key)
+    def _recv_reply(self, conn, session_key, binary):
+        """ Return ``(kind, result)`` of next reply on `conn`. """
+        if binary:
+            return recv_message(conn, session_key)
+        else:
+            return decrypt(conn.recv(), session_key)
 
+    def _convert_reply(self, kind, result):
+        """ Return result of a reply, raising an exception for errors. """
         if kind == '#RETURN':
             return result
 
@@ -1318,7 +1566,7 @@ class OpenMDAO_Proxy(BaseProxy):
         raise convert_to_error(kind, result)
 
     def _init_session(self, conn):
-        """ Send client public key, receive session key. """
+        """ Send client public key, receive and return session key. """
         key_pair = get_key_pair(Credentials.user_host)
         public_key = key_pair.publickey()
         text = encode_public_key(public_key)
@@ -1341,7 +1589,7 @@ class OpenMDAO_Proxy(BaseProxy):
                     pass
             raise RuntimeError(msg)
 
-        self._tls.session_key = key_pair.decrypt(server_data[1])
+        return key_pair.decrypt(server_data[1])
 
     def _incref(self):
         """
@@ -1393,13 +1641,12 @@ class OpenMDAO_Proxy(BaseProxy):
         else:
             util.debug('DECREF %r -- manager already shutdown', token.id)
 
-        # check whether we can close this thread's connection because
+        # check whether we can close the pooled connections because
         # the process owns no more references to objects for this manager
-        if not idset and hasattr(tls, 'connection'):
-            util.debug('thread %r has no more %r proxies so closing conn',
-                       threading.current_thread().name, token.typeid)
-            tls.connection.close()
-            del tls.connection
+        if not idset:
+            util.debug('no more %r proxies so closing pooled connections',
+                       token.typeid)
+            _ConnectionPool.get_pool(token.address).close()
 
     @staticmethod
     def manager_is_alive(address):
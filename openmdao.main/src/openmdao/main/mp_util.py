@@ -5,6 +5,7 @@ Multiprocessing support utilities.
 import ConfigParser
 import copy
 import cPickle
+import cStringIO
 import errno
 import getpass
 import inspect
@@ -12,11 +13,14 @@ import logging
 import os.path
 import re
 import socket
+import struct
 import sys
 import time
 
 from Crypto.Cipher import AES
 
+from numpy import ndarray, empty, frombuffer
+
 from multiprocessing import current_process, connection
 from multiprocessing.managers import BaseProxy
 
@@ -30,6 +34,17 @@ from openmdao.util.shellproc import ShellProc, STDOUT, PIPE
 SPECIALS = ('__getattribute__', '__getattr__', '__setattr__', '__delattr__')
 
 
+# Transports supported by this version, in order of preference.
+TRANSPORTS = ('binary', 'pickle')
+
+# Prefix identifying the header frame of a binary transport message.
+# (Pickled messages start with the protocol opcode, never '#'.)
+BINARY_MAGIC = '#OMB'
+
+# Arrays smaller than this are pickled in the header rather than being sent
+# as a separate frame.
+BINARY_MIN_BYTES = 1024
+
 # Mapping from remote addresses to local tunnel addresses.
 _TUNNEL_MAP = {}
 # Log files that haven't been cleaned up yet due to Windows issue.
@@ -367,6 +382,30 @@ def tunnel_address(remote):
     return _TUNNEL_MAP.get(remote, remote)
 
 
+def _cipher(session_key):
+    """ Return AES cipher object for `session_key`. """
+    # Just being defensive, this should never happen.
+    if len(session_key) < 16:  #pragma no cover
+        session_key += '!'*16
+    session_key = session_key[:16]
+    return AES.new(session_key, AES.MODE_CBC, '?'*AES.block_size)
+
+
+def _encrypt_text(text, session_key):
+    """ Returns ``(length, data)`` of padded, encrypted `text`. """
+    length = len(text)
+    pad = length % AES.block_size
+    if pad:
+        pad = AES.block_size - pad
+        text += '-'*pad
+    return (length, _cipher(session_key).encrypt(text))
+
+
+def _decrypt_text(length, data, session_key):
+    """ Returns text from `length` and `data` of :meth:`_encrypt_text`. """
+    return _cipher(session_key).decrypt(data)[:length]
+
+
 def encrypt(obj, session_key):
     """
     If `session_key` is specified, returns ``(length, data)`` of encrypted,
@@ -379,19 +418,8 @@ def encrypt(obj, session_key):
         Key used for encryption. Should be at least 16 bytes long.
     """
     if session_key:
-        # Just being defensive, this should never happen.
-        if len(session_key) < 16:  #pragma no cover
-            session_key += '!'*16
-        session_key = session_key[:16]
-        encryptor = AES.new(session_key, AES.MODE_CBC, '?'*AES.block_size)
         text = cPickle.dumps(obj, cPickle.HIGHEST_PROTOCOL)
-        length = len(text)
-        pad = length % AES.block_size
-        if pad:
-            pad = AES.block_size - pad
-            text += '-'*pad
-        data = encryptor.encrypt(text)
-        return (length, data)
+        return _encrypt_text(text, session_key)
     else:
         return obj
 
@@ -410,18 +438,173 @@ def decrypt(msg, session_key):
         # Just being defensive, this should never happen.
         if len(msg) != 2:  #pragma no cover
             raise RuntimeError('_decrypt: msg not encrypted?')
-        # Just being defensive, this should never happen.
-        if len(session_key) < 16:  #pragma no cover
-            session_key += '!'*16
-        session_key = session_key[:16]
-        decryptor = AES.new(session_key, AES.MODE_CBC, '?'*AES.block_size)
         length, data = msg
-        text = decryptor.decrypt(data)
-        return cPickle.loads(text[:length])
+        return cPickle.loads(_decrypt_text(length, data, session_key))
     else:
         return msg
 
 
+def _seal(text, session_key):
+    """ Returns `text`, encrypted and length-prefixed if `session_key`. """
+    if session_key:
+        length, data = _encrypt_text(text, session_key)
+        return struct.pack('!Q', length) + data
+    return text
+
+def _unseal(text, session_key):
+    """ Returns original text of :meth:`_seal` result `text`. """
+    if session_key:
+        length = struct.unpack('!Q', text[:8])[0]
+        return _decrypt_text(length, text[8:], session_key)
+    return text
+
+
+def send_message(conn, obj, session_key):
+    """
+    Send `obj` on `conn` using the binary transport.
+    Large numeric arrays found anywhere within `obj` are sent as raw frames
+    following a header frame containing the pickled remainder of `obj`,
+    avoiding the copies made when pickling them. If `session_key` is
+    specified, each frame is encrypted.
+
+    The message is completely formed before anything is sent, so a pickling
+    error leaves the connection usable.
+
+    conn: :class:`Connection`
+        Connection to send on.
+
+    obj: object
+        Object to be sent.
+
+    session_key: string
+        Key used for encryption. Should be at least 16 bytes long.
+    """
+    for frame in pack_message(obj, session_key):
+        conn.send_bytes(frame)
+
+
+def pack_message(obj, session_key):
+    """
+    Returns the list of frames :meth:`send_message` sends for `obj`.
+    Each frame is a string or a contiguous array.
+
+    obj: object
+        Object to be sent.
+
+    session_key: string
+        Key used for encryption. Should be at least 16 bytes long.
+    """
+    arrays = []
+    index = {}
+
+    def persistent_id(item):
+        """ Return frame index for arrays to be sent separately. """
+        if type(item) is ndarray and item.nbytes >= BINARY_MIN_BYTES and \
+           not item.dtype.hasobject:
+            key = id(item)
+            try:
+                return index[key]
+            except KeyError:
+                index[key] = len(arrays)
+                arrays.append(item)
+                return index[key]
+        return None
+
+    stream = cStringIO.StringIO()
+    pickler = cPickle.Pickler(stream, cPickle.HIGHEST_PROTOCOL)
+    pickler.persistent_id = persistent_id
+    pickler.dump(obj)
+
+    header = cPickle.dumps(([(arr.dtype, arr.shape) for arr in arrays],
+                            stream.getvalue()), cPickle.HIGHEST_PROTOCOL)
+    frames = [BINARY_MAGIC + _seal(header, session_key)]
+    for arr in arrays:
+        if not arr.flags.c_contiguous:
+            arr = arr.copy()
+        if session_key:
+            frames.append(_seal(arr.tostring(), session_key))
+        else:
+            frames.append(arr)
+
+    return frames
+
+
+def frames_size(frames):
+    """ Returns the total number of bytes in `frames`. """
+    return sum(frame.nbytes if isinstance(frame, ndarray) else len(frame)
+               for frame in frames)
+
+def recv_message(conn, session_key, data=None):
+    """
+    Receive object sent by :meth:`send_message` on `conn`.
+    Arrays sent as separate frames are received directly into their storage
+    unless `session_key` is specified.
+
+    conn: :class:`Connection`
+        Connection to receive from.
+
+    session_key: string
+        Key used for encryption. Should be at least 16 bytes long.
+
+    data: string
+        Header frame if it has already been received.
+    """
+    payload, arrays = recv_frames(conn, session_key, data)
+    return unpack_message(payload, arrays)
+
+
+def recv_frames(conn, session_key, data=None):
+    """
+    Receive all frames of a message sent by :meth:`send_message` on `conn`.
+    Returns ``(payload, arrays)`` for :meth:`unpack_message`.
+    If this fails, the position of the next message on `conn` is unknown.
+
+    conn: :class:`Connection`
+        Connection to receive from.
+
+    session_key: string
+        Key used for encryption. Should be at least 16 bytes long.
+
+    data: string
+        Header frame if it has already been received.
+    """
+    if data is None:
+        data = conn.recv_bytes()
+    if not data.startswith(BINARY_MAGIC):
+        raise RuntimeError('recv_message: not a binary transport message')
+    header = _unseal(data[len(BINARY_MAGIC):], session_key)
+    descriptors, payload = cPickle.loads(header)
+
+    arrays = []
+    for dtype, shape in descriptors:
+        if session_key:
+            text = _unseal(conn.recv_bytes(), session_key)
+            arr = frombuffer(text, dtype).reshape(shape).copy()
+        else:
+            arr = empty(shape, dtype)
+            nbytes = conn.recv_bytes_into(arr)
+            if nbytes != arr.nbytes:
+                raise RuntimeError('recv_message: expected %d bytes, got %d'
+                                   % (arr.nbytes, nbytes))
+        arrays.append(arr)
+    return (payload, arrays)
+
+
+def unpack_message(payload, arrays):
+    """
+    Returns the object from `payload` and `arrays` of :meth:`recv_frames`.
+
+    payload: string
+        Pickled object, referring to `arrays` by index.
+
+    arrays: list
+        Arrays received as separate frames.
+    """
+    unpickler = cPickle.Unpickler(cStringIO.StringIO(payload))
+    unpickler.persistent_load = arrays.__getitem__
+    return unpickler.load()
+
+
 def public_methods(obj):
     """
     Returns a list of names of the methods of `obj` to be exposed.
@@ -5,6 +5,7 @@ egg files, remote execution, and remote file access.
 """
 
 import atexit
+import gc
 import logging
 import optparse
 import os.path
@@ -14,7 +15,9 @@ import shutil
 import signal
 import socket
 import sys
+import threading
 import time
+import zipfile
 
 from multiprocessing import current_process
 
@@ -31,7 +34,9 @@ from openmdao.main.rbac import get_credentials, set_credentials, \
                                rbac, RoleError
 from openmdao.main.releaseinfo import __version__
 
-from openmdao.util.filexfer import pack_zipfile, unpack_zipfile
+from openmdao.util.filexfer import pack_zipfile, unpack_zipfile, \
+                                   cache_file, restore_file, trim_cache, \
+                                   ZIP_SYSTEM
 from openmdao.util.log import install_remote_handler, remove_remote_handlers, \
                               logging_port, LOG_DEBUG2
 from openmdao.util.publickey import make_private, read_authorized_keys, \
@@ -66,6 +71,21 @@ class ObjServerFactory(Factory):
 
     The environment variable ``OPENMDAO_KEEPDIRS`` can be used to avoid
     having server directory trees removed when servers are shut down.
+
+    Created servers share a per-owner cache of transferred files in the
+    ``xfer_cache`` subdirectory of the factory's directory. Each owner's
+    cache is limited to `cache_size` bytes (default 16 GiB, so that large
+    grid files are still cached) and files unused for more than `cache_age`
+    seconds (default one day) are removed, least recently used first.
+    Files larger than `cache_size` are never cached. The cache is removed
+    by :meth:`cleanup`. Both limits may be set from the allocator's
+    resource configuration.
+
+    If `pool_size` is greater than zero, released servers are reset and kept
+    for reuse by subsequent :meth:`create` requests from the same owner
+    (with the same `allowed_users`), up to `pool_size` idle servers.
+    Servers idle for more than `idle_timeout` seconds are shut down.
+    :meth:`prestart` may be used to start idle servers in advance.
     """
 
     # These are used to propagate selections from main().
@@ -93,6 +113,14 @@ class ObjServerFactory(Factory):
         self.version = __version__
         self.manager_class = _ServerManager
         self.server_classname = 'openmdao_main_objserverfactory_ObjServer'
+        self._cache_root = os.path.join(os.getcwd(), 'xfer_cache')
+        self.cache_size = 1 << 34
+        self.cache_age = 86400.
+        self.pool_size = 0
+        self.idle_timeout = 60.
+        self._idle = []  # (time released, server), oldest first.
+        self._pool_lock = threading.Lock()
+        self._reaper = None
 
     @rbac('*', proxy_types=[object])  # ResourceAllocationManager import loop.
     def get_ram(self):
@@ -127,7 +155,7 @@ class ObjServerFactory(Factory):
         self._logger.debug('release %r', server)
         self._logger.debug('        at %r', address)
         try:
-            manager, root_dir, owner = self._managers[server]
+            manager, root_dir, owner, allowed_users = self._managers[server]
         except KeyError:
             # Not identical to any of our proxies.
             # Could still be a reference to the same remote object.
@@ -141,7 +169,8 @@ class ObjServerFactory(Factory):
 
             for key in self._managers.keys():
                 if key.host == server_host and key.pid == server_pid:
-                    manager, root_dir, owner = self._managers[key]
+                    manager, root_dir, owner, allowed_users = \
+                        self._managers[key]
                     server = key
                     break
             else:
@@ -154,27 +183,118 @@ class ObjServerFactory(Factory):
         if get_credentials().user != owner.user:
             raise RoleError('only the owner can release')
 
+        if not self._recycle(server):
+            self._shutdown(server)
+
+    def _recycle(self, server):
+        """ Reset `server` and add it to the pool if there's room. """
+        with self._pool_lock:
+            for released, idle in self._idle:
+                if idle is server:  # Already released.
+                    return True
+            if len(self._idle) >= self.pool_size:
+                return False
+        try:
+            server.reset()
+        except Exception as exc:
+            self._logger.warning("can't reset %r: %r", server, exc)
+            return False
+
+        with self._pool_lock:
+            if len(self._idle) >= self.pool_size:
+                return False
+            self._logger.debug('pooling %r', server)
+            self._idle.append((time.time(), server))
+            self._schedule_reap()
+        return True
+
+    def _lease(self, allowed_users):
+        """
+        Return an idle server owned by the current user with `allowed_users`,
+        or None.
+        """
+        user = get_credentials().user
+        with self._pool_lock:
+            for i, (released, server) in enumerate(self._idle):
+                manager, root_dir, owner, users = self._managers[server]
+                if owner.user == user and users == allowed_users:
+                    del self._idle[i]
+                    self._logger.info('reusing server %r', server)
+                    return server
+        return None
+
+    def _schedule_reap(self):
+        """
+        Schedule shutdown of the oldest idle server. Must be called with
+        `_pool_lock` held.
+        """
+        if self._reaper is None and self._idle and self.idle_timeout > 0:
+            delay = self._idle[0][0] + self.idle_timeout - time.time()
+            self._reaper = threading.Timer(max(delay, 0), self._reap)
+            self._reaper.daemon = True
+            self._reaper.start()
+
+    def _reap(self):
+        """ Shut-down servers idle for more than `idle_timeout`. """
+        with self._pool_lock:
+            self._reaper = None
+            expires = time.time() - self.idle_timeout
+            count = 0
+            for released, server in self._idle:
+                if released > expires:
+                    break
+                count += 1
+            expired = [server for released, server in self._idle[:count]]
+            self._idle = self._idle[count:]
+            self._schedule_reap()
+
+        for server in expired:
+            self._logger.debug('idle timeout %r', server)
+            self._shutdown(server)
+
+    def _shutdown(self, server):
+        """ Shut-down `server` and remove its directory. """
+        manager, root_dir, owner, allowed_users = self._managers.pop(server)
         manager.shutdown()
         server._close.cancel()
-        del self._managers[server]
         keep_dirs = int(os.environ.get('OPENMDAO_KEEPDIRS', '0'))
         if not keep_dirs and os.path.exists(root_dir):
             shutil.rmtree(root_dir, onerror=onerror)
 
+    @rbac(('owner', 'user'))
+    def prestart(self, count):
+        """
+        Start `count` servers for the current user and add them to the pool
+        of idle servers, increasing `pool_size` if necessary.
+
+        count: int
+            Number of servers to start.
+        """
+        self._logger.debug('prestart %d', count)
+        credentials = get_credentials()
+        allowed_users = {credentials.user: credentials.public_key}
+        for i in range(count):
+            server = self._start_server('Server_%d' % (len(self._managers) + 1),
+                                        allowed_users)
+            with self._pool_lock:
+                self._idle.append((time.time(), server))
+                self.pool_size = max(self.pool_size, len(self._idle))
+                self._schedule_reap()
+
     @rbac('owner')
     def cleanup(self):
         """ Shut-down all remaining :class:`ObjServers`. """
         self._logger.debug('cleanup')
-        cleanup_creds = get_credentials()
-        servers = self._managers.keys()
-        for server in servers:
-            # Cleanup overrides release() 'owner' protection.
-            set_credentials(self._managers[server][2])
-            try:
-                self.release(server)
-            finally:
-                set_credentials(cleanup_creds)
+        with self._pool_lock:
+            if self._reaper is not None:
+                self._reaper.cancel()
+                self._reaper = None
+            self._idle = []
+        for server in self._managers.keys():
+            self._shutdown(server)
         self._managers = {}
+        if os.path.exists(self._cache_root):
+            shutil.rmtree(self._cache_root, onerror=onerror)
 
     @rbac('*')
     def get_available_types(self, groups=None):
@@ -239,10 +359,6 @@ class ObjServerFactory(Factory):
                           res_desc, ctor_args)
 
         if server is None:
-            name = ctor_args.get('name', '')
-            if not name:
-                name = 'Server_%d' % (len(self._managers) + 1)
-
             allowed_users = ctor_args.get('allowed_users')
             if not allowed_users:
                 credentials = get_credentials()
@@ -250,58 +366,13 @@ class ObjServerFactory(Factory):
             else:
                 del ctor_args['allowed_users']
 
-            if self._address is None or \
-               isinstance(self._address, basestring) or \
-               self._allow_tunneling:
-                # Local access only via pipe if factory accessed by pipe
-                # or factory is accessed via tunnel.
-                address = None
-            else:
-                # Network access via same IP as factory, system-selected port.
-                address = (self._address[0], 0)
-
-            manager = self.manager_class(address, self._authkey, name=name,
-                                         allowed_users=allowed_users)
-            root_dir = name
-            count = 1
-            while os.path.exists(root_dir):
-                count += 1
-                root_dir = '%s_%d' % (name, count)
-            os.mkdir(root_dir)
-
-            # On Windows, when running the full test suite under Nose,
-            # starting the process starts a new Nose test session, which
-            # will eventually get here and start a new Nose session, which...
-            orig_main = None
-            if sys.platform == 'win32':  #pragma no cover
-                scripts = ('openmdao-script.py', 'openmdao_test-script.py')
-                try:
-                    main_file = sys.modules['__main__'].__file__
-                except AttributeError:
-                    pass
-                else:
-                    if main_file.endswith(scripts):
-                        orig_main = main_file
-                        sys.modules['__main__'].__file__ = \
-                            pkg_resources.resource_filename('openmdao.main',
-                                                            'objserverfactory.py')
-            owner = get_credentials()
-            self._logger.log(LOG_DEBUG2, '%s starting server %r in dir %s',
-                             owner, name, root_dir)
-            try:
-                manager.start(cwd=root_dir,
-                              log_level=self._logger.getEffectiveLevel())
-            finally:
-                if orig_main is not None:  #pragma no cover
-                    sys.modules['__main__'].__file__ = orig_main
-
-            self._logger.info('new server %r for %s', name, owner)
-            self._logger.info('    in dir %s', root_dir)
-            self._logger.info('    listening on %s', manager.address)
-            server_class = getattr(manager, self.server_classname)
-            server = server_class(name=name, allow_shell=self._allow_shell,
-                                  allowed_types=self._allowed_types)
-            self._managers[server] = (manager, root_dir, owner)
+            # A reused server retains its original name.
+            server = self._lease(allowed_users)
+            if server is None:
+                name = ctor_args.get('name', '')
+                if not name:
+                    name = 'Server_%d' % (len(self._managers) + 1)
+                server = self._start_server(name, allowed_users)
 
         if typname:
             obj = server.create(typname, version, None, res_desc, **ctor_args)
@@ -312,6 +383,74 @@ class ObjServerFactory(Factory):
                          obj, obj._token.address)
         return obj
 
+    def _start_server(self, name, allowed_users):
+        """
+        Start a new :class:`ObjServer` named `name` in a subdirectory of the
+        current directory and return a proxy for it.
+
+        name: string
+            Name of the server.
+
+        allowed_users: dict
+            Users allowed access to the server.
+        """
+        if self._address is None or \
+           isinstance(self._address, basestring) or \
+           self._allow_tunneling:
+            # Local access only via pipe if factory accessed by pipe
+            # or factory is accessed via tunnel.
+            address = None
+        else:
+            # Network access via same IP as factory, system-selected port.
+            address = (self._address[0], 0)
+
+        manager = self.manager_class(address, self._authkey, name=name,
+                                     allowed_users=allowed_users)
+        root_dir = name
+        count = 1
+        while os.path.exists(root_dir):
+            count += 1
+            root_dir = '%s_%d' % (name, count)
+        os.mkdir(root_dir)
+
+        # On Windows, when running the full test suite under Nose,
+        # starting the process starts a new Nose test session, which
+        # will eventually get here and start a new Nose session, which...
+        orig_main = None
+        if sys.platform == 'win32':  #pragma no cover
+            scripts = ('openmdao-script.py', 'openmdao_test-script.py')
+            try:
+                main_file = sys.modules['__main__'].__file__
+            except AttributeError:
+                pass
+            else:
+                if main_file.endswith(scripts):
+                    orig_main = main_file
+                    sys.modules['__main__'].__file__ = \
+                        pkg_resources.resource_filename('openmdao.main',
+                                                        'objserverfactory.py')
+        owner = get_credentials()
+        self._logger.log(LOG_DEBUG2, '%s starting server %r in dir %s',
+                         owner, name, root_dir)
+        try:
+            manager.start(cwd=root_dir,
+                          log_level=self._logger.getEffectiveLevel())
+        finally:
+            if orig_main is not None:  #pragma no cover
+                sys.modules['__main__'].__file__ = orig_main
+
+        self._logger.info('new server %r for %s', name, owner)
+        self._logger.info('    in dir %s', root_dir)
+        self._logger.info('    listening on %s', manager.address)
+        server_class = getattr(manager, self.server_classname)
+        cache_dir = os.path.join(self._cache_root, owner.user)
+        server = server_class(name=name, allow_shell=self._allow_shell,
+                              allowed_types=self._allowed_types,
+                              cache_dir=cache_dir, cache_size=self.cache_size,
+                              cache_age=self.cache_age)
+        self._managers[server] = (manager, root_dir, owner, allowed_users)
+        return server
+
 
 class _FactoryManager(OpenMDAO_Manager):
     """
@@ -339,10 +478,27 @@ class ObjServer(object):
         Names of types which may be created. If None, then allow types listed
         by :meth:`factorymanager.get_available_types`. If empty, no types are
         allowed.
+
+    cache_dir: string
+        Directory of files cached by content digest, used by
+        :meth:`unpack_zipfile` and :meth:`restore_cached`. If None,
+        no caching is performed.
+
+    cache_size: int
+        Maximum total size of files in `cache_dir`. Larger files are
+        not cached.
+
+    cache_age: float
+        Files in `cache_dir` unused for more than this many seconds are
+        removed.
     """
 
-    def __init__(self, name='', allow_shell=False, allowed_types=None):
+    def __init__(self, name='', allow_shell=False, allowed_types=None,
+                 cache_dir=None, cache_size=1 << 34, cache_age=86400.):
         self._allow_shell = allow_shell
+        self._cache_dir = cache_dir
+        self._cache_size = cache_size
+        self._cache_age = cache_age
         if allowed_types is None:
             allowed_types = [typname for typname, version
                                       in get_available_types()]
@@ -364,6 +520,7 @@ class ObjServer(object):
 
         SimulationRoot.chroot(self._root_dir)
         self.tlo = None
+        self._root_files = set(os.listdir(self._root_dir))
 
         # Ensure Traits Array support is initialized. The code contains
         # globals for numpy symbols that are initialized within
@@ -523,6 +680,28 @@ class ObjServer(object):
         self.tlo = Container.load_from_eggfile(egg_filename, log=self._logger)
         return self.tlo
 
+    @rbac('owner')
+    def reset(self):
+        """
+        Return this server to its initial state so it may be reused:
+        release any loaded model, return to the root directory, and remove
+        any files created since startup.
+        """
+        self._logger.debug('reset')
+        if self.tlo:
+            self.tlo.pre_delete()
+            self.tlo = None
+        os.chdir(self._root_dir)
+        SimulationRoot.chroot(self._root_dir)
+        for name in os.listdir(self._root_dir):
+            if name not in self._root_files:
+                path = os.path.join(self._root_dir, name)
+                if os.path.isdir(path) and not os.path.islink(path):
+                    shutil.rmtree(path, onerror=onerror)
+                else:
+                    os.remove(path)
+        gc.collect()
+
     @rbac('owner')
     def pack_zipfile(self, patterns, filename):
         """
@@ -539,7 +718,7 @@ class ObjServer(object):
         return pack_zipfile(patterns, filename, self._logger)
 
     @rbac('owner')
-    def unpack_zipfile(self, filename, textfiles=None):
+    def unpack_zipfile(self, filename, textfiles=None, cache=False):
         """
         Unpack ZipFile `filename` if `filename` is legal.
 
@@ -551,10 +730,50 @@ class ObjServer(object):
             files are text files possibly needing newline translation. If not
             supplied, the first 4KB of each is scanned for a zero byte. If none
             is found, then the file is assumed to be a text file.
+
+        cache: bool
+            If True, unpacked files are also copied to the content cache
+            for later use by :meth:`restore_cached`. Files from a different
+            type of system are not cached since they may have been translated.
         """
         self._logger.debug('unpack_zipfile %r', filename)
         self._check_path(filename, 'unpack_zipfile')
-        return unpack_zipfile(filename, self._logger, textfiles)
+        result = unpack_zipfile(filename, self._logger, textfiles)
+        if cache and self._cache_dir:
+            with zipfile.ZipFile(filename, 'r') as zipped:
+                for info in zipped.infolist():
+                    if info.create_system == ZIP_SYSTEM and \
+                       info.file_size <= self._cache_size:
+                        cache_file(info.filename, self._cache_dir)
+            trim_cache(self._cache_dir, self._cache_size, self._cache_age)
+        return result
+
+    @rbac('owner')
+    def restore_cached(self, files, client_system=None):
+        """
+        Copy files from the content cache if present.
+        Returns list of the paths restored.
+
+        files: list
+            List of ``(path, digest)`` tuples, where `digest` is the SHA-1
+            hex digest of the desired contents of `path`.
+
+        client_system: int
+            :class:`zipfile.ZipInfo` `create_system` code of the client's
+            system. Nothing is restored unless this matches the server's,
+            since text files may need newline translation.
+        """
+        self._logger.debug('restore_cached %d files', len(files))
+        restored = []
+        if not self._cache_dir or client_system != ZIP_SYSTEM:
+            return restored
+
+        for path, digest in files:
+            self._check_path(path, 'restore_cached')
+            if restore_file(digest, path, self._cache_dir):
+                self._logger.debug('    restored %r', path)
+                restored.append(path)
+        return restored
 
     @rbac('owner')
     def chmod(self, path, mode):
@@ -1,10 +1,6 @@
 import copy
 import logging
 
-# these fail to find pkg_resources when run from pylint
-# pylint: disable-msg=F0401
-from pkg_resources import working_set, Environment
-
 from openmdao.main.factory import Factory
 from openmdao.util.dep import plugin_groups, find_module, \
                               PythonSourceTreeAnalyser
@@ -22,9 +18,21 @@ class PkgResourcesFactory(Factory):
         self._have_new_types = True
         self._groups = copy.copy(groups)
         self._search_path = search_path
-        self.env = Environment(search_path)
+        self._env = None
         self.tree_analyser = PythonSourceTreeAnalyser()
 
+    @property
+    def env(self):
+        """The pkg_resources Environment searched for distributions.
+        Created on first use, since scanning the search path is expensive.
+        """
+        if self._env is None:
+            # these fail to find pkg_resources when run from pylint
+            # pylint: disable-msg=F0401
+            from pkg_resources import Environment
+            self._env = Environment(self._search_path)
+        return self._env
+
     def create(self, typ, version=None, server=None,
                res_desc=None, **ctor_args):
         """Create and return an object of the given type, with
@@ -81,6 +89,8 @@ class PkgResourcesFactory(Factory):
 
     def _get_type_dict(self):
         if self._have_new_types:
+            # pylint: disable-msg=F0401
+            from pkg_resources import working_set
             self._entry_pt_classes = self._entry_map_info(working_set)
         return self._entry_pt_classes
 
@@ -0,0 +1,168 @@
+"""
+Per-component execution profiling.
+
+When enabled, the framework records the number of calls and the wall and
+CPU time spent in each phase of each component's execution:
+
+run
+    :meth:`Component.run`, including input transfer and any children.
+execute
+    The component's *execute* method.
+transfer
+    Setting the component's connected inputs from their sources.
+provideJ
+    The component's *provideJ* method.
+iteration
+    One pass of a driver's iteration loop.
+record
+    Recording the current case to a driver's recorders.
+
+Profiling is off by default, in which case the cost is a single global
+lookup per instrumented call.
+
+::
+
+    from openmdao.main.profiler import enable_profiling, disable_profiling
+
+    enable_profiling()
+    top.run()
+    disable_profiling().report()
+"""
+
+import os
+import sys
+import threading
+import time
+
+__all__ = ['Profiler', 'PROFILER', 'enable_profiling', 'disable_profiling']
+
+# Current Profiler, or None if profiling is disabled.
+PROFILER = None
+
+# time.clock() is processor time on Unix but wall time on Windows.
+if sys.platform == 'win32':
+    def _cpu_time():
+        """ Return user plus system time used by this process. """
+        user, system = os.times()[:2]
+        return user + system
+else:
+    _cpu_time = time.clock
+
+
+class Profiler(object):
+    """
+    Accumulates call counts and wall and CPU times by component pathname
+    and phase.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        """ Return a token to be passed to :meth:`stop`. """
+        return (time.time(), _cpu_time())
+
+    def stop(self, path, phase, start):
+        """
+        Record one call of `phase` for the component with pathname `path`
+        which began when :meth:`start` returned `start`.
+
+        path: string
+            Pathname of the component.
+
+        phase: string
+            Name of the phase being timed.
+
+        start: tuple
+            Value returned by :meth:`start`.
+        """
+        wall = time.time() - start[0]
+        cpu = _cpu_time() - start[1]
+        with self._lock:
+            try:
+                entry = self._stats[(path, phase)]
+            except KeyError:
+                self._stats[(path, phase)] = [1, wall, cpu]
+            else:
+                entry[0] += 1
+                entry[1] += wall
+                entry[2] += cpu
+
+    def reset(self):
+        """ Discard all statistics collected so far. """
+        with self._lock:
+            self._stats = {}
+
+    def get_stats(self):
+        """
+        Return a dictionary mapping ``(pathname, phase)`` to a tuple
+        ``(calls, wall, cpu)``.
+        """
+        with self._lock:
+            return dict([(key, tuple(entry))
+                         for key, entry in self._stats.items()])
+
+    def report(self, stream=None):
+        """
+        Write a report of the statistics collected so far to `stream`
+        (default ``sys.stdout``). Components are listed in a tree
+        following the hierarchy of their pathnames, each followed by the
+        phases recorded for it.
+
+        stream: file
+            Where to write the report.
+        """
+        stream = stream or sys.stdout
+        stats = self.get_stats()
+
+        children = {}
+        phases = {}
+        for (path, phase), entry in stats.items():
+            phases.setdefault(path, []).append((phase, entry))
+            while path:
+                parent = path.rpartition('.')[0]
+                siblings = children.setdefault(parent, set())
+                if path in siblings:
+                    break
+                siblings.add(path)
+                path = parent
+
+        stream.write('%-40s %8s %12s %12s\n'
+                     % ('Component/phase', 'calls', 'wall', 'cpu'))
+
+        def _report(path, depth):
+            indent = '  ' * depth
+            name = path.rpartition('.')[2] or '<top>'
+            stream.write('%s%s\n' % (indent, name))
+            for phase, (calls, wall, cpu) in sorted(phases.get(path, [])):
+                stream.write('%-40s %8d %12.6f %12.6f\n'
+                             % ('%s  %s' % (indent, phase), calls, wall, cpu))
+            for child in sorted(children.get(path, ())):
+                _report(child, depth+1)
+
+        if '' in phases or '' in children:
+            _report('', 0)
+
+
+def enable_profiling():
+    """
+    Start collecting profile statistics, returning the active
+    :class:`Profiler`. If profiling is already enabled, the statistics
+    collected so far are kept.
+    """
+    global PROFILER
+    if PROFILER is None:
+        PROFILER = Profiler()
+    return PROFILER
+
+
+def disable_profiling():
+    """
+    Stop collecting profile statistics, returning the :class:`Profiler`
+    that was active (or None).
+    """
+    global PROFILER
+    profiler = PROFILER
+    PROFILER = None
+    return profiler
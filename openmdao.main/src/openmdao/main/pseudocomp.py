@@ -8,8 +8,10 @@ from openmdao.main.expreval import ConnectedExprEvaluator, _expr_dict
 from openmdao.main.interfaces import implements, IComponent
 from openmdao.main.printexpr import transform_expression, print_node
 from openmdao.main.numpy_fallback import array, ndarray, hstack, zeros
+import openmdao.main.profiler as profiling
 
-from openmdao.units.units import PhysicalQuantity, UnitsOnlyPQ
+from openmdao.units.units import PhysicalQuantity, UnitsOnlyPQ, \
+                                get_conversion_tuple
 
 _namelock = RLock()
 _count = 0
@@ -44,11 +46,11 @@ def unit_xform(node, in_units, out_units):
     """Transforms an ast into expr*scaler+adder where scaler
     and adder are from units conversion.
     """
-    inpq = PhysicalQuantity(1.0, in_units)
-    outpq = PhysicalQuantity(1.0, out_units)
     try:
-        scaler, adder = inpq.unit.conversion_tuple_to(outpq.unit)
+        scaler, adder = get_conversion_tuple(in_units, out_units)
     except TypeError:
+        inpq = PhysicalQuantity(1.0, in_units)
+        outpq = PhysicalQuantity(1.0, out_units)
         raise TypeError("units '%s' are incompatible with assigning units of '%s'" % (inpq.get_unit_name(), outpq.get_unit_name()))
     return scaler_adder_xform(node, scaler, adder)
 
@@ -187,7 +189,10 @@ class PseudoComponent(object):
         """ Return full pathname to this object, relative to scope
         *rel_to_scope*. If *rel_to_scope* is *None*, return the full pathname.
         """
-        return '.'.join([self._parent.get_pathname(rel_to_scope), self.name])
+        parent_path = self._parent.get_pathname(rel_to_scope)
+        if parent_path:
+            return '.'.join([parent_path, self.name])
+        return self.name
 
     def list_connections(self, is_hidden=False, show_expressions=False):
         """list all of the inputs and output connections of this PseudoComponent.
@@ -296,7 +301,13 @@ class PseudoComponent(object):
     def calc_derivatives(self, first=False, second=False, savebase=False,
                          required_inputs=None, required_outputs=None):
         if first:
-            return self.provideJ()
+            profiler = profiling.PROFILER
+            if profiler is None:
+                return self.provideJ()
+            start = profiler.start()
+            J = self.provideJ()
+            profiler.stop(self.get_pathname(), 'provideJ', start)
+            return J
         if second:
             msg = "2nd derivatives not supported in pseudocomponent %s"
             raise RuntimeError(msg % self.name)
@@ -13,7 +13,6 @@ try:
 except ImportError:
     zmq = None
 
-from pkg_resources import working_set
 from openmdao.util.log import logger
 from openmdao.main.variable import json_default
 
@@ -225,6 +224,7 @@ else:
         logger.debug("loading binpubs")
 
         if _binpub_types is None:
+            from pkg_resources import working_set
             _binpub_types = []
 
             # find all of the installed binpubs
@@ -92,6 +92,9 @@ _LEGAL_NAME = re.compile(r'^[a-zA-Z][_a-zA-Z0-9]*$')
 # Checks for IPv4 address.
 _IPV4_HOST = re.compile(r'[0-9]+\.[0-9]+\.[0-9]+\.[0-9]+$')
 
+# Weight of latest sample in running average of server lifetimes.
+_RUNTIME_WEIGHT = 0.3
+
 
 class ResourceAllocationManager(object):
     """
@@ -963,8 +966,23 @@ class FactoryAllocator(ResourceAllocator):
     allow_shell: bool
         If True, :meth:`execute_command` and :meth:`load_model` are allowed
         in created servers. Use with caution!
+
+    pool_size: int
+        Maximum number of released servers kept for reuse.
+        Zero disables reuse.
+
+    idle_timeout: float
+        Seconds a released server is kept for reuse before being shut down.
+
+    cache_size: int
+        Maximum total size in bytes of each owner's cache of transferred
+        files. Larger files are not cached.
+
+    cache_age: float
+        Seconds an unused file is kept in the transfer cache.
     """
-    def __init__(self, name, authkey=None, allow_shell=False):
+    def __init__(self, name, authkey=None, allow_shell=False, pool_size=0,
+                 idle_timeout=60., cache_size=1 << 34, cache_age=86400.):
         super(FactoryAllocator, self).__init__(name)
         self._deployed_servers = []
 
@@ -974,6 +992,10 @@ class FactoryAllocator(ResourceAllocator):
                 authkey = 'PublicKey'
                 multiprocessing.current_process().authkey = authkey
         self.factory = ObjServerFactory(name, authkey, allow_shell)
+        self.factory.pool_size = pool_size
+        self.factory.idle_timeout = idle_timeout
+        self.factory.cache_size = cache_size
+        self.factory.cache_age = cache_age
 
     def configure(self, cfg):
         """
@@ -984,7 +1006,8 @@ class FactoryAllocator(ResourceAllocator):
             Configuration data is located under the section matching
             this allocator's `name`.
 
-        Allows modifying `auth_key` and `allow_shell`.
+        Allows modifying `auth_key`, `allow_shell`, `pool_size`,
+        `idle_timeout`, `cache_size`, and `cache_age`.
         """
         if cfg.has_option(self.name, 'authkey'):
             value = cfg.get(self.name, 'authkey')
@@ -996,6 +1019,26 @@ class FactoryAllocator(ResourceAllocator):
             self._logger.debug('    allow_shell: %s', value)
             self.factory._allow_shell = value
 
+        if cfg.has_option(self.name, 'pool_size'):
+            value = cfg.getint(self.name, 'pool_size')
+            self._logger.debug('    pool_size: %s', value)
+            self.factory.pool_size = value
+
+        if cfg.has_option(self.name, 'idle_timeout'):
+            value = cfg.getfloat(self.name, 'idle_timeout')
+            self._logger.debug('    idle_timeout: %s', value)
+            self.factory.idle_timeout = value
+
+        if cfg.has_option(self.name, 'cache_size'):
+            value = cfg.getint(self.name, 'cache_size')
+            self._logger.debug('    cache_size: %s', value)
+            self.factory.cache_size = value
+
+        if cfg.has_option(self.name, 'cache_age'):
+            value = cfg.getfloat(self.name, 'cache_age')
+            self._logger.debug('    cache_age: %s', value)
+            self.factory.cache_age = value
+
     @rbac('*')
     def deploy(self, name, resource_desc, criteria):
         """
@@ -1060,6 +1103,20 @@ class LocalAllocator(FactoryAllocator):
         If True, :meth:`execute_command` and :meth:`load_model` are allowed
         in created servers. Use with caution!
 
+    pool_size: int
+        Maximum number of released servers kept for reuse.
+        Zero disables reuse.
+
+    idle_timeout: float
+        Seconds a released server is kept for reuse before being shut down.
+
+    cache_size: int
+        Maximum total size in bytes of each owner's cache of transferred
+        files. Larger files are not cached.
+
+    cache_age: float
+        Seconds an unused file is kept in the transfer cache.
+
     Resource configuration file entry equivalent to the default
     `LocalHost` allocator::
 
@@ -1069,12 +1126,19 @@ class LocalAllocator(FactoryAllocator):
         max_load: 1.0
         authkey: PublicKey
         allow_shell: True
+        pool_size: 0
+        idle_timeout: 60
+        cache_size: 17179869184
+        cache_age: 86400
 
     """
 
     def __init__(self, name='LocalAllocator', total_cpus=0, max_load=1.0,
-                 authkey=None, allow_shell=False):
-        super(LocalAllocator, self).__init__(name, authkey, allow_shell)
+                 authkey=None, allow_shell=False, pool_size=0,
+                 idle_timeout=60., cache_size=1 << 34, cache_age=86400.):
+        super(LocalAllocator, self).__init__(name, authkey, allow_shell,
+                                             pool_size, idle_timeout,
+                                             cache_size, cache_age)
         if total_cpus > 0:
             self.total_cpus = total_cpus
         else:
@@ -1212,6 +1276,9 @@ class LocalAllocator(FactoryAllocator):
             'total_cpus' : self.total_cpus,
             'max_load'   : self.max_load
         }
+        free_memory = _free_memory()
+        if free_memory is not None:
+            criteria['free_memory'] = free_memory
         if (loadavgs[0] / self.total_cpus) < self.max_load:
             return (0, criteria)
         elif len(self._deployed_servers) == 0:
@@ -1253,6 +1320,22 @@ register(LocalAllocator, mp_distributing.Cluster)
 register(LocalAllocator, mp_distributing.HostManager)
 
 
+def _free_memory():
+    """
+    Returns available physical memory (KB), or None if that can't be
+    determined.
+    """
+    try:
+        with open('/proc/meminfo', 'r') as inp:
+            info = dict([line.split(':', 1) for line in inp])
+    except (IOError, ValueError):
+        return None
+    for key in ('MemAvailable', 'MemFree'):
+        if key in info:
+            return int(info[key].split()[0])
+    return None
+
+
 class RemoteAllocator(ResourceAllocator):
     """
     Allocator which delegates to a remote allocator.
@@ -1334,13 +1417,27 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
         in created servers. Use with caution!
 
     method: string
-        Must be one of ``load-average``, ``greedy``, or ``round-robin``.
+        Must be one of ``load-average``, ``load-aware``, ``greedy``, or
+        ``round-robin``.
+
+    refresh_interval: float
+        Seconds for which host information obtained from each machine's
+        local allocator is reused by the ``load-aware``, ``greedy``, and
+        ``round-robin`` methods.
 
     ``load-average`` uses the load averages reported by each machine's
     local allocator to determine the least-loaded machine(s) and allocates
     on those. We assume that machines in the cluster are similar enough that
     ranking by load average is reasonable.
 
+    ``load-aware`` uses load averages and free memory reported by each
+    machine's local allocator (refreshed every `refresh_interval` seconds,
+    and adjusted for servers deployed since), along with the average
+    lifetime of servers previously released on each machine, to estimate
+    which machine will complete new work soonest. This allows for machines
+    of differing speed. Machines with less free memory than a requested
+    ``min_phys_memory`` are not used.
+
     ``greedy`` allocates N1 servers from the first machine, then
     N2 from the second machine, etc. where N is the number of cpus on
     a machine.
@@ -1358,7 +1455,7 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
     _methods = {}  # Selection methods.
 
     def __init__(self, name, machines=None, authkey=None, allow_shell=False,
-                 method='load-average'):
+                 method='load-average', refresh_interval=10.):
         if method not in self._methods:
             raise ValueError('method argument %r not one of %s'
                              % (method, self._methods.keys()))
@@ -1375,6 +1472,7 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
         self._authkey = authkey
         self._allow_shell = allow_shell
         self._method = method
+        self.refresh_interval = refresh_interval
         self._lock = threading.Lock()
         self._last_deployed = None
         self._reply_q = Queue.Queue()
@@ -1449,6 +1547,7 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
             authkey: PublicKey
             allow_shell: True
             method: load-average
+            refresh_interval: 10
             tunnel_incoming: False
             tunnel_outgoing: False
             identity_filename: ~/.ssh/example.pem
@@ -1489,6 +1588,11 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
                 self._method = method
             self._logger.debug('    method: %s', self._method)
 
+        if cfg.has_option(self.name, 'refresh_interval'):
+            self.refresh_interval = cfg.getfloat(self.name, 'refresh_interval')
+            self._logger.debug('    refresh_interval: %s',
+                               self.refresh_interval)
+
         # ClusterHost arguments.
 
         if cfg.has_option(self.name, 'python'):
@@ -1851,8 +1955,6 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
 
             return (best_estimate, best_criteria)
 
-    _methods['load-average'] = _load_average
-
     def _get_estimate(self, host, resource_desc, credentials):
         """ Get (estimate, criteria) from an allocator. """
         set_credentials(credentials)
@@ -1877,13 +1979,196 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
 
         return (host, estimate, criteria)
 
+    _methods['load-average'] = _load_average
+
+    def _load_aware(self, rdesc):
+        """ Time estimate using cached load, memory, and runtime history. """
+        min_cpus = rdesc.get('min_cpus', 0)
+        if min_cpus:
+            # Spread across LocalAllocators.
+            rdesc['min_cpus'] = 1
+        min_memory = rdesc.get('min_phys_memory')
+
+        with self._lock:
+            key = self._refresh_estimates(rdesc)
+
+            runtimes = [host.runtime for host in self.cluster
+                                     if host.runtime is not None]
+            if runtimes:
+                default_runtime = sum(runtimes) / len(runtimes)
+            else:
+                default_runtime = None
+
+            # Each candidate is [host, busy, capacity, picks, criteria].
+            candidates = []
+            avail_cpus = 0
+            for host in self.cluster:
+                try:
+                    timestamp, estimate, criteria, allocated = \
+                        host.estimates[key]
+                except KeyError:
+                    continue
+                if estimate is None or estimate < -1:
+                    continue
+
+                total_cpus = criteria['total_cpus']
+                avail_cpus += total_cpus
+
+                free_memory = criteria.get('free_memory')
+                if min_memory and free_memory is not None \
+                   and free_memory < min_memory:
+                    self._logger.debug('%r free memory %s < %s',
+                                       host.allocator.name, free_memory,
+                                       min_memory)
+                    continue
+
+                if 'loadavgs' in criteria:
+                    load = criteria['loadavgs'][0]
+                else:  # Windows
+                    load = 0.
+                # Servers deployed since the load was obtained won't have
+                # had time to affect it.
+                busy = max(load + host.allocated_cpus - allocated,
+                           host.allocated_cpus)
+                capacity = total_cpus * criteria.get('max_load', 1.)
+                candidates.append([host, busy, capacity, 0, criteria])
+
+            if avail_cpus < min_cpus:
+                return (-2, {'min_cpus': 'want %d, available %d' \
+                                         % (min_cpus, avail_cpus)})
+
+            def _completion(candidate):
+                """ Estimated time to complete work on candidate host. """
+                host, busy, capacity, picks, criteria = candidate
+                runtime = host.runtime or default_runtime or 1.
+                return runtime * (1. + busy / float(criteria['total_cpus']))
+
+            # Select hosts one cpu at a time.
+            best = None
+            hostnames = []
+            for i in range(max(min_cpus, 1)):
+                # Ensure progress by always allowing 1 server per host.
+                available = [candidate for candidate in candidates
+                             if candidate[1] < candidate[2] or \
+                                (candidate[0].allocated_cpus == 0 and
+                                 candidate[3] == 0)]
+                if not available:
+                    break
+                candidate = min(available, key=_completion)
+                if best is None:
+                    best = candidate
+                    estimate = _completion(candidate)
+                hostnames.append(candidate[0].netname)
+                candidate[1] += 1
+                candidate[3] += 1
+
+            if best is None:
+                return (-1, {'min_cpus': 'no idle cpus'})
+            if len(hostnames) < min_cpus:
+                return (-1, {'min_cpus': 'want %d, idle %d' \
+                                         % (min_cpus, len(hostnames))})
+
+            criteria = best[4].copy()
+            criteria['host'] = best[0]
+            criteria['hostnames'] = hostnames
+            if best[0].runtime is None and default_runtime is None:
+                estimate = 0  # No history to base an estimate on.
+            return (estimate, criteria)
+
+    _methods['load-aware'] = _load_aware
+
+    def _refresh_estimates(self, rdesc):
+        """
+        Update cached time estimates for `rdesc` which are older than
+        `refresh_interval`. Returns the key for `rdesc` in each host's
+        `estimates`. Must be called with `_lock` held.
+        """
+        key = repr(sorted(rdesc.items()))
+        now = time.time()
+        stale = [host for host in self.cluster
+                      if key not in host.estimates or
+                         now - host.estimates[key][0] >= self.refresh_interval]
+        for host, retval in self._map_hosts(self._get_host_estimate,
+                                            stale, rdesc):
+            estimate, criteria = retval
+            host.estimates[key] = (now, estimate, criteria,
+                                   host.allocated_cpus)
+        return key
+
+    def _get_host_estimate(self, host, resource_desc):
+        """ Get (estimate, criteria) from a host's allocator. """
+        estimate, criteria = host.allocator.time_estimate(resource_desc)
+        self._logger.debug('%r returned %g', host.allocator.name, estimate)
+        return (estimate, criteria)
+
+    def _update_cpus(self):
+        """
+        Get `total_cpus` for hosts which haven't reported any available within
+        `refresh_interval`.
+        """
+        now = time.time()
+        stale = [host for host in self.cluster
+                      if host.total_cpus <= 0 and
+                         now - host.cpus_time >= self.refresh_interval]
+        if stale:
+            with self._lock:
+                for host, count in self._map_hosts(self._get_host_cpus, stale):
+                    host.total_cpus = count
+                    host.cpus_time = now
+
+    def _get_host_cpus(self, host):
+        """ Get `max_servers` from a host's allocator. """
+        count, criteria = host.allocator.max_servers({})
+        return count
+
+    def _map_hosts(self, func, hosts, *args):
+        """
+        Return ``[(host, func(host, *args)), ...]`` for `hosts`, calling
+        `func` via worker threads. Hosts for which `func` raised an exception
+        are omitted. Must be called with `_lock` held.
+        """
+        credentials = get_credentials()
+
+        # Drain _reply_q.
+        while True:
+            try:
+                self._reply_q.get_nowait()
+            except Queue.Empty:
+                break
+
+        todo = list(hosts)
+        max_workers = 10
+        for host in todo[:max_workers]:
+            worker_q = WorkerPool.get()
+            worker_q.put((self._call_host, (func, host, args, credentials),
+                          {}, self._reply_q))
+        todo = todo[max_workers:]
+
+        results = []
+        for i in range(len(hosts)):
+            worker_q, retval, exc, trace = self._reply_q.get()
+            if exc:
+                self._logger.error(trace)
+            else:
+                results.append(retval)
+
+            if todo:
+                worker_q.put((self._call_host,
+                              (func, todo.pop(0), args, credentials),
+                              {}, self._reply_q))
+            else:
+                WorkerPool.release(worker_q)
+        return results
+
+    @staticmethod
+    def _call_host(func, host, args, credentials):
+        """ Worker thread wrapper for :meth:`_map_hosts`. """
+        set_credentials(credentials)
+        return (host, func(host, *args))
+
     def _greedy(self, rdesc):
         """ 'time estimate' using greedy selection. """
-        # Get total_cpus from each allocator.
-        for host in self.cluster:
-            if host.total_cpus <= 0:
-                count, criteria = host.allocator.max_servers({})
-                host.total_cpus = count
+        self._update_cpus()
 
         # Select first machine found with an (assumed) idle cpu.
         for host in self.cluster:
@@ -1916,11 +2201,7 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
 
     def _round_robin(self, rdesc):
         """ 'time estimate' using round-robin selection. """
-        # Get total_cpus from each allocator.
-        for host in self.cluster:
-            if host.total_cpus <= 0:
-                count, criteria = host.allocator.max_servers({})
-                host.total_cpus = count
+        self._update_cpus()
 
         # Select next machine in sequence.
         if self._last_deployed:
@@ -1997,7 +2278,7 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
             self._logger.error('%r deployment failed for %s',
                                host.allocator.name, name)
         else:
-            self._deployed_servers[id(server)] = (host, server)
+            self._deployed_servers[id(server)] = (host, server, time.time())
         return server
 
     def release(self, server):
@@ -2009,12 +2290,19 @@ class ClusterAllocator(ResourceAllocator):  #pragma no cover
         """
         with self._lock:
             try:
-                host = self._deployed_servers[id(server)][0]
+                host, server, deployed = self._deployed_servers[id(server)]
             except KeyError:
                 self._logger.error('server %r not found', server)
                 return
             del self._deployed_servers[id(server)]
 
+            # Update host's running average of server lifetime.
+            runtime = time.time() - deployed
+            if host.runtime is None:
+                host.runtime = runtime
+            else:
+                host.runtime += _RUNTIME_WEIGHT * (runtime - host.runtime)
+
         host.allocated_cpus -= 1
         try:
             host.allocator.release(server)
@@ -2061,4 +2349,7 @@ class ClusterHost(mp_distributing.Host):  #pragma no cover
         self.allocator = None
         self.total_cpus = 0
         self.allocated_cpus = 0
+        self.cpus_time = 0.   # When total_cpus was last obtained.
+        self.estimates = {}   # Cached time estimates (see ClusterAllocator).
+        self.runtime = None   # Running average of server lifetime.
 
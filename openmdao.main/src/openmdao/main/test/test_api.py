@@ -0,0 +1,56 @@
+"""
+Test that the api pseudo packages import lazily.
+"""
+
+import subprocess
+import sys
+import unittest
+
+import openmdao.main.api
+from openmdao.util.lazyimport import LazyModule
+
+
+def _loaded(statement, modules):
+    """ Return which of `modules` are loaded after executing `statement`
+    in a new interpreter.
+    """
+    script = '%s\nimport sys\nprint [m for m in %r if m in sys.modules]' \
+             % (statement, modules)
+    out = subprocess.check_output([sys.executable, '-c', script])
+    return eval(out.strip().split('\n')[-1])
+
+
+class APITestCase(unittest.TestCase):
+
+    def test_lazy(self):
+        self.assertTrue(isinstance(openmdao.main.api, LazyModule))
+        self.assertTrue(openmdao.main.api.Assembly is
+                        sys.modules['openmdao.main.assembly'].Assembly)
+        self.assertTrue('Assembly' in dir(openmdao.main.api))
+        try:
+            openmdao.main.api.NoSuchThing
+        except AttributeError as exc:
+            self.assertEqual(str(exc),
+                    "'module' object has no attribute 'NoSuchThing'")
+        else:
+            self.fail('Expected AttributeError')
+
+        namespace = {}
+        exec 'from openmdao.main.api import *' in namespace
+        for name in openmdao.main.api.__all__:
+            self.assertTrue(name in namespace)
+
+    def test_import_cost(self):
+        heavy = ['openmdao.main.component', 'traits', 'numpy', 'networkx',
+                 'sympy', 'scipy', 'pkg_resources']
+        self.assertEqual(_loaded('import openmdao.main.api', heavy), [])
+
+        # sympy, scipy and pkg_resources are only needed for symbolic
+        # derivatives, solvers and egg handling.
+        self.assertEqual(_loaded('from openmdao.main.api import *', heavy),
+                         ['openmdao.main.component', 'traits', 'numpy',
+                          'networkx'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,8 @@ import shutil
 import unittest
 import logging
 
+import numpy
+
 from openmdao.main.api import Assembly, Component, Driver, SequentialWorkflow, \
                               set_as_top, SimulationRoot
 from openmdao.main.datatypes.api import Float, Instance, Int, Str, Slot, List, Array
@@ -888,6 +890,60 @@ subassy.comp3: ReRun.2-3.2-2.2-1"""
 
         t = set_as_top(TestA())
 
+    def test_array_connect(self):
+        class ArrComp(Component):
+
+            x = Array(numpy.zeros(3), iotype="in")
+            y = Array(numpy.zeros(3), iotype="out")
+            runs = Int(0, iotype="out")
+
+            def execute(self):
+                self.runs += 1
+                self.y = self.x + 1.
+
+        class Watcher(ArrComp):
+
+            changes = Int(0, iotype="out")
+
+            def _x_changed(self, old, new):
+                self.changes += 1
+
+        top = set_as_top(Assembly())
+        top.add('a', ArrComp())
+        top.add('b', ArrComp())
+        top.add('c', Watcher())
+        top.add('d', ArrComp())
+        top.driver.workflow.add(['a', 'b', 'c', 'd'])
+        top.connect('a.y', 'b.x')
+        top.connect('a.y', 'c.x')
+        top.connect('a.y[1:]', 'd.x')
+
+        top.run()
+        self.assertTrue(top.b.x is top.a.y)
+        self.assertEqual(list(top.b.y), [2., 2., 2.])
+        self.assertEqual(top.c.changes, 1)
+        self.assertEqual(list(top.d.x), [1., 1.])
+
+        top.a.x = numpy.array([1., 2., 3.])
+        top.run()
+        self.assertTrue(top.b.x is top.a.y)
+        self.assertEqual(list(top.b.y), [3., 4., 5.])
+        self.assertEqual(top.c.changes, 2)
+        self.assertEqual(list(top.d.x), [3., 4.])
+
+        # unchanged inputs don't rerun downstream components
+        top.run()
+        self.assertEqual(top.b.runs, 2)
+
+        # arrays of a different dtype are set through the trait
+        top.add('f', ArrComp())
+        top.driver.workflow.add('f')
+        top.connect('a.x', 'f.x')
+        top.a.x = numpy.array([1, 2, 3])
+        top.run()
+        self.assertEqual(top.f.x.dtype, numpy.array([1, 2, 3]).dtype)
+        self.assertEqual(list(top.f.y), [2., 3., 4.])
+
     def test_tracing(self):
         # Check tracing of iteration coordinates.
         top = Assembly()
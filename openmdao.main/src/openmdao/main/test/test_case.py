@@ -143,7 +143,23 @@ class CaseTestCase(unittest.TestCase):
         for name, val in expected.items():
             self.assertTrue(name in both)
             self.assertEqual(val, both[name])
-        
+
+    def test_batched(self):
+        self.top.set_values([('comp1.a', 7), ('comp1.b', 1)])
+        self.assertEqual(self.top.get_values(['comp1.a', 'comp1.b']), [7, 1])
+        self.top.run()
+
+        case = Case(outputs=['comp2.d', 'comp2.nosuch', 'comp2.c'])
+        try:
+            case.update_outputs(self.top)
+        except Exception as err:
+            self.assertTrue('nosuch' in str(err))
+        else:
+            self.fail('Expected exception')
+        self.assertEqual(case['comp2.c'], 14)
+        self.assertEqual(case['comp2.d'], 2)
+        self.assertTrue('nosuch' in case.msg)
+
     def test_flatten(self):
         dvt = DumbVT()
         inputs = [('comp1.a_lst', [1,2,3,[7,8,9]]),
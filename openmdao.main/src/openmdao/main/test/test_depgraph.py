@@ -539,6 +539,39 @@ class DepGraphTestCase(unittest.TestCase):
         else:
             self.fail("Exception expected")
 
+    def test_invalidate_snapshot(self):
+        dep, scope = _make_graph(comps=['A','B'],
+                                 connections=[('A.out1','B.in1'),
+                                              ('B.out1','A.in1')],
+                                 inputs=['in1','in2'],
+                                 outputs=['out1','out2'])
+
+        # Repeated invalidation of an unchanged graph uses a snapshot.
+        for i in range(5):
+            _set_all_valid(dep)
+            dep.invalidate_deps(scope, ['A.out1'])
+            self.assertEqual(set(['A.in2','B.in2']),
+                             set(nodes_matching_all(dep, valid=True)))
+            self.assertEqual(dep.list_inputs('A', invalid=True), ['A.in1'])
+        self.assertTrue(dep._adjacency is not None)
+
+        # Severing edges discards it.
+        dep.sever_edges([('B.out1','A.in1')])
+        self.assertTrue(dep._adjacency is None)
+        for i in range(5):
+            _set_all_valid(dep)
+            dep.invalidate_deps(scope, ['A.out1'])
+            self.assertEqual(set(['A','A.in1','A.in2','A.out2','B.in2']),
+                             set(nodes_matching_all(dep, valid=True)))
+            self.assertEqual(dep.list_inputs('A', invalid=True), [])
+
+        dep.unsever_edges(scope)
+        self.assertTrue(dep._adjacency is None)
+        _set_all_valid(dep)
+        dep.invalidate_deps(scope, ['A.out1'])
+        self.assertEqual(set(['A.in2','B.in2']),
+                         set(nodes_matching_all(dep, valid=True)))
+
     def test_invalidate_input_as_output(self):
         dep, scope = _make_graph(comps=['A','B'],
                                  connections=[('A.in1','B.in1')],
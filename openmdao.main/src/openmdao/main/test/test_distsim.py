@@ -7,14 +7,18 @@ import hashlib
 import logging
 from math import pi
 from multiprocessing import AuthenticationError
-from multiprocessing.managers import RemoteError
+from multiprocessing.managers import RemoteError, Server
 import os
 import shutil
 import socket
 import sys
+import threading
 import traceback
+import types
 import unittest
 
+import numpy
+
 from Crypto.Random import get_random_bytes
 
 from traits.api import CTrait
@@ -25,8 +29,9 @@ from openmdao.main.container import get_closest_proxy
 from openmdao.main.hasobjective import HasObjectives
 from openmdao.main.hasparameters import HasParameters
 from openmdao.main.interfaces import IComponent
-from openmdao.main.mp_support import has_interface, is_instance
-from openmdao.main.mp_util import read_server_config
+from openmdao.main.mp_support import has_interface, is_instance, \
+                                     ObjectManager
+from openmdao.main.mp_util import read_server_config, BINARY_MAGIC
 from openmdao.main.objserverfactory import connect, start_server, RemoteFile
 from openmdao.main.rbac import Credentials, get_credentials, set_credentials, \
                                AccessController, RoleError, rbac
@@ -708,6 +713,119 @@ class TestCase(unittest.TestCase):
                       globals(), locals(), RuntimeError,
                       'Server startup failed')
 
+    def test_6_pipeline(self):
+        logging.debug('')
+        logging.debug('test_pipeline')
+
+        factory = self.start_factory()
+        obj = factory.create(_MODULE+'.Box')
+
+        # Batch of sets then gets, pipelined on one connection.
+        names = ('width', 'height', 'depth')
+        obj.set_values([(name, float(i+2)) for i, name in enumerate(names)])
+        obj.run()
+        self.assertEqual(obj.get_values(names + ('volume', 'surface_area')),
+                         [2., 3., 4., 24., 52.])
+        self.assertEqual(obj.get_values([]), [])
+        self.assertEqual(obj._callmethods([]), [])
+
+        # Case inputs and outputs use the batched calls.
+        case = Case(inputs=[('width', 1.), ('height', 2.), ('depth', 3.)],
+                    outputs=['volume', 'surface_area'])
+        case.apply_inputs(obj)
+        obj.run()
+        case.update_outputs(obj)
+        self.assertEqual(case['volume'], 6.)
+        self.assertEqual(case['surface_area'], 22.)
+
+        case = Case(outputs=['volume', 'no_such_var'])
+        try:
+            case.update_outputs(obj)
+        except Exception as exc:
+            self.assertTrue('no_such_var' in str(exc))
+        else:
+            self.fail('Expected exception')
+        self.assertEqual(case['volume'], 6.)
+        self.assertTrue('no_such_var' in case.msg)
+
+        # All calls are made, the first failure is reported.
+        calls = [('get', ('no_such_var',), None),
+                 ('set', ('width', 5.), None)]
+        try:
+            obj._callmethods(calls)
+        except RemoteError as exc:
+            self.assertTrue('no_such_var' in str(exc))
+        else:
+            self.fail('Expected RemoteError')
+        self.assertEqual(obj.get('width'), 5.)
+
+        # The connection used is returned to the pool for reuse.
+        self.assertEqual(len(obj._pool._idle), 1)
+        obj.get('width')
+        self.assertEqual(len(obj._pool._idle), 1)
+
+        # Requests and replies much larger than the connection buffers.
+        big = numpy.arange(250000.)
+        calls = [('echo', (big, i), None) for i in range(20)]
+        for i, result in enumerate(factory._callmethods(calls)):
+            self.assertTrue(numpy.all(result[0] == big))
+            self.assertEqual(result[1], i)
+
+        # Many threads sharing the pool.
+        errors = []
+
+        def worker(value):
+            try:
+                for i in range(20):
+                    calls = [('set', ('width', value), None),
+                             ('get', ('pid',), None)]
+                    self.assertEqual(obj._callmethods(calls)[1], obj.pid)
+                    self.assertEqual(factory.echo(value, i), (value, i))
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker, args=(float(i),))
+                   for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(60)
+        self.assertEqual(errors, [])
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertTrue(1 <= len(obj._pool._idle) <= len(threads))
+        self.assertTrue(obj.width in [float(i) for i in range(8)])
+
+    def test_7_transport(self):
+        logging.debug('')
+        logging.debug('test_transport')
+
+        # A server process negotiates the binary transport.
+        factory = self.start_factory()
+        big = numpy.arange(100000.)
+        result = factory.echo(big, 'text')
+        self.assertTrue(numpy.all(result[0] == big))
+        self.assertEqual(result[1], 'text')
+        self.assertEqual([entry[2] for entry in factory._pool._idle],
+                         ['binary'])
+
+        # Older servers reject the transports argument, so pickle is used.
+        manager = ObjectManager(HollowSphere())
+        server = manager._server
+        server.accept_connection = types.MethodType(Server.accept_connection,
+                                                    server)
+        old = manager.proxy
+        old.set('radius', 2.)
+        self.assertEqual(old.get('radius'), 2.)
+        self.assertEqual([entry[2] for entry in old._pool._idle], ['pickle'])
+
+        # A binary request which can't be decoded closes the connection.
+        manager = ObjectManager(HollowSphere())
+        conn, session_key, transport = manager.proxy._connect()
+        self.assertEqual(transport, 'binary')
+        conn.send_bytes(BINARY_MAGIC + 'garbage')
+        self.assertRaises(EOFError, conn.recv_bytes)
+        self.assertEqual(manager.proxy.get('radius'), 1.)
+
 
 if __name__ == '__main__':
     logging.getLogger().setLevel(logging.DEBUG)
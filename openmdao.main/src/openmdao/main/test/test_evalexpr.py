@@ -308,6 +308,56 @@ class ExprEvalTestCase(unittest.TestCase):
         self.assertEqual(11.1, self.top.comp.y)
         self.assertEqual(new_text(ex), "scope.get('comp.y')")
 
+    def test_direct_accessors(self):
+        self.top.comp.cont = A()
+        self.top.comp.cont.f = 2.5
+        ex = ExprEvaluator('comp.x + comp.cont.f + a.a1d[1] + a.a1d[2]',
+                           self.top)
+        self.assertEqual(ex.evaluate(), 3.14+2.5+2.+3.)
+        code, accessors = ex._direct
+        self.assertEqual(sorted(accessors.values()),
+                         [('a.a1d', True), ('comp.cont.f', False),
+                          ('comp.x', False)])
+        self.assertEqual(new_text(ex),
+            "scope.get('comp.x')+scope.get('comp.cont.f')+"
+            "scope.get('a.a1d',[(0,1)])+scope.get('a.a1d',[(0,2)])")
+
+        # Values are fetched on each evaluation.
+        self.top.comp.x = 1.
+        self.top.a.a1d[1] = 10.
+        self.assertEqual(ex.evaluate(), 1.+2.5+10.+3.)
+
+        # Replacing a container invalidates the accessors.
+        accessors = ex._accessors
+        self.top.comp.cont = A()
+        self.top.comp.cont.f = -1.
+        self.assertEqual(ex.evaluate(), 1.-1.+10.+3.)
+        self.assertFalse(ex._accessors is accessors)
+
+        self.top.add('a', A())
+        self.top.a.a1d = [0., 0., 0.]
+        self.assertEqual(ex.evaluate(), 1.-1.)
+
+        self.top.remove('a')
+        try:
+            ex.evaluate()
+        except AttributeError as err:
+            self.assertEqual(str(err), "can't evaluate expression"
+                             " 'comp.x + comp.cont.f + a.a1d[1] + a.a1d[2]':"
+                             " : 'Assembly' object has no attribute 'a'")
+        else:
+            self.fail("AttributeError expected")
+
+    def test_old_state(self):
+        # State pickled before direct accessors existed.
+        ex = ExprEvaluator('comp.x + a.a1d[1]', self.top)
+        state = ex.__getstate__()
+        del state['_direct']
+        del state['_accessors']
+        old = ExprEvaluator.__new__(ExprEvaluator)
+        old.__setstate__(state)
+        self.assertEqual(old.evaluate(), 3.14+2.)
+
     def test_no_scope(self):
         ex = ExprEvaluator('abs(-3)+int(2.3)+math.floor(5.4)')
         self.assertEqual(ex.evaluate(), 10.0)
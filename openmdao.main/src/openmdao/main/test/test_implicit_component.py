@@ -3,6 +3,7 @@ Unit test for implicit components, and for the implicit behavior of solvers in a
 derivatives solve.
 """
 
+import cPickle
 import unittest
 import numpy as np
 from mock import patch, Mock
@@ -199,6 +200,45 @@ class MyComp_Deriv_ProvideJ(MyComp_No_Deriv):
         return input_keys, output_keys
 
 
+class MyComp_Nonlinear(ImplicitComponent):
+    ''' Nonlinear implicit component, x = sqrt(c), y = x**(1/3).
+    '''
+
+    c = Float(4.0, iotype='in')
+
+    x = Float(1.0, iotype='state')
+    y = Float(1.0, iotype='state')
+
+    res = Array(np.zeros((2)), iotype='residual')
+
+    def __init__(self):
+        super(MyComp_Nonlinear, self).__init__()
+        self.n_evaluate = 0
+        self.n_provideJ = 0
+
+    def evaluate(self):
+        self.n_evaluate += 1
+        self.res[0] = self.x**2 - self.c
+        self.res[1] = self.y**3 - self.x
+
+    def provideJ(self):
+        self.n_provideJ += 1
+        return np.array([[2*self.x, 0., -1.],
+                         [-1., 3*self.y**2, 0.]])
+
+    def list_deriv_vars(self):
+        return ('x', 'y', 'c'), ('res',)
+
+
+class MyComp_Deriv_Sparse(MyComp_Deriv_ProvideJ):
+    ''' Jacobian returned as a sparse matrix.
+    '''
+
+    def provideJ(self):
+        return scipy.sparse.csc_matrix(super(MyComp_Deriv_Sparse,
+                                             self).provideJ())
+
+
 class Coupled1(ImplicitComponent):
     ''' This comp only has the first 2 states (x, y).
 
@@ -426,6 +466,100 @@ class Testcase_implicit(unittest.TestCase):
 
         assert_rel_error(self, model.comp.y_out, -1.5, 1e-5)
 
+    def test_single_comp_self_solve_direct_jacobian(self):
+
+        def no_gmres(*args, **kwargs):
+            self.fail('gmres called')
+
+        orig_gmres = openmdao.main.implicitcomp.gmres
+        openmdao.main.implicitcomp.gmres = no_gmres
+        try:
+            for cls in (MyComp_Deriv_ProvideJ, MyComp_Deriv_Sparse):
+                model = set_as_top(Assembly())
+                model.add('comp', cls())
+                model.driver.workflow.add('comp')
+
+                model.run()
+
+                assert_rel_error(self, model.comp.x, 1.0, 1e-5)
+                assert_rel_error(self, model.comp.y, -2.33333333, 1e-5)
+                assert_rel_error(self, model.comp.z, -2.16666667, 1e-5)
+
+                J = model.comp._jacobian_callback(model.comp.get_state())
+                self.assertTrue(isinstance(J, np.ndarray))
+                assert_rel_error(self, np.linalg.norm(J - np.array([[6., 4., -2.],
+                                                                    [2., -2., 4.],
+                                                                    [-1., .5, -1.]])),
+                                 0.0, 1e-10)
+        finally:
+            openmdao.main.implicitcomp.gmres = orig_gmres
+
+    def test_newton_solve(self):
+
+        for cls in (MyComp_Deriv_ProvideJ, MyComp_Deriv_Sparse,
+                    MyComp_No_Deriv):
+            model = set_as_top(Assembly())
+            model.add('comp', cls())
+            model.comp.solve_method = 'newton'
+            model.driver.workflow.add('comp')
+
+            model.run()
+
+            assert_rel_error(self, model.comp.x, 1.0, 1e-5)
+            assert_rel_error(self, model.comp.y, -2.33333333, 1e-5)
+            assert_rel_error(self, model.comp.z, -2.16666667, 1e-5)
+            assert_rel_error(self, model.comp.y_out, -1.5, 1e-5)
+
+            # A kept factorization doesn't prevent pickling.
+            model.comp.jacobian_reuse = True
+            model.comp.x = 2.
+            model.run()
+            self.assertTrue(model.comp._newton_lu is not None)
+            model = cPickle.loads(cPickle.dumps(model, -1))
+            model.comp.x = 3.
+            model.run()
+            assert_rel_error(self, model.comp.x, 1.0, 1e-5)
+            assert_rel_error(self, model.comp.z, -2.16666667, 1e-5)
+
+    def test_newton_reuse(self):
+
+        model = set_as_top(Assembly())
+        model.add('comp', MyComp_Nonlinear())
+        model.driver.workflow.add('comp')
+        model.run()
+        fsolve_evals = model.comp.n_evaluate
+
+        model = set_as_top(Assembly())
+        model.add('comp', MyComp_Nonlinear())
+        model.comp.solve_method = 'newton'
+        model.driver.workflow.add('comp')
+        model.run()
+
+        comp = model.comp
+        assert_rel_error(self, comp.x, 2.0, 1e-8)
+        assert_rel_error(self, comp.y, 2.0**(1./3.), 1e-8)
+        self.assertTrue(comp.n_evaluate < fsolve_evals)
+
+        # Warm start from the converged state.
+        comp.n_evaluate = comp.n_provideJ = 0
+        comp.c = 4.01
+        model.run()
+        assert_rel_error(self, comp.x, 4.01**.5, 1e-8)
+        assert_rel_error(self, comp.y, 4.01**(1./6.), 1e-8)
+        self.assertEqual(comp.n_provideJ, comp.n_evaluate - 1)
+        self.assertTrue(comp.n_evaluate <= 4)
+
+        # With reuse, the last Jacobian is kept while it converges well.
+        comp.jacobian_reuse = True
+        comp.c = 4.
+        model.run()
+        comp.n_evaluate = comp.n_provideJ = 0
+        comp.c = 4.01
+        model.run()
+        assert_rel_error(self, comp.x, 4.01**.5, 1e-8)
+        assert_rel_error(self, comp.y, 4.01**(1./6.), 1e-8)
+        self.assertEqual(comp.n_provideJ, 0)
+
     def test_single_comp_self_solve_no_deriv(self):
 
         model = set_as_top(Assembly())
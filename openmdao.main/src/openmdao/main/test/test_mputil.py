@@ -9,8 +9,13 @@ import sys
 import unittest
 import nose
 
+from multiprocessing import Pipe
+
+import numpy
+
 from openmdao.main.mp_util import read_server_config, read_allowed_hosts, \
-                                  is_legal_connection
+                                  is_legal_connection, send_message, \
+                                  recv_message
 
 from openmdao.util.publickey import make_private, HAVE_PYWIN32
 from openmdao.util.testutil import assert_raises
@@ -125,6 +130,45 @@ class TestCase(unittest.TestCase):
             finally:
                 os.remove('hosts.allow')
 
+    def test_binary_transport(self):
+        logging.debug('')
+        logging.debug('test_binary_transport')
+
+        big = numpy.arange(1000.).reshape((100, 10))
+        small = numpy.arange(3)
+        msg = ('#RETURN', {'big': big, 'again': big, 'small': small,
+                           'column': big[:, 1], 'objects': numpy.array([None]),
+                           'text': 'hello'})
+
+        for session_key in ('', 'a secret session key'):
+            sender, receiver = Pipe()
+            send_message(sender, msg, session_key)
+            # Header plus two array frames ('again' is sent by reference,
+            # 'small' and 'objects' are pickled in the header).
+            self.assertTrue(receiver.poll())
+            kind, result = recv_message(receiver, session_key)
+            self.assertFalse(receiver.poll())
+
+            self.assertEqual(kind, '#RETURN')
+            self.assertEqual(result['text'], 'hello')
+            self.assertTrue(result['again'] is result['big'])
+            self.assertTrue(numpy.all(result['big'] == big))
+            self.assertEqual(result['big'].shape, (100, 10))
+            self.assertTrue(numpy.all(result['column'] == big[:, 1]))
+            self.assertTrue(numpy.all(result['small'] == small))
+            self.assertEqual(result['objects'][0], None)
+
+            # Received arrays are writable.
+            result['big'][0, 0] = 42.
+            self.assertEqual(big[0, 0], 0.)
+
+        # Pickled messages are rejected.
+        sender, receiver = Pipe()
+        sender.send(msg)
+        assert_raises(self, "recv_message(receiver, '')",
+                      globals(), locals(), RuntimeError,
+                      'recv_message: not a binary transport message')
+
 
 if __name__ == '__main__':
     sys.argv.append('--cover-package=openmdao.main')
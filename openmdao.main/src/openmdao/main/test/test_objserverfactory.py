@@ -18,8 +18,11 @@ from openmdao.main.objserverfactory import ObjServerFactory, ObjServer, \
                                            start_server, stop_server, \
                                            connect_to_server, _PROXIES
 from openmdao.main.resource import ResourceAllocationManager as RAM
+from openmdao.main.rbac import get_credentials
 from openmdao.util.testutil import assert_raises
 from openmdao.util.fileutil import onerror
+from openmdao.util.filexfer import pack_zipfile, file_digest, cache_file, \
+                                   ZIP_SYSTEM
 
 
 class TestCase(unittest.TestCase):
@@ -275,6 +278,198 @@ class TestCase(unittest.TestCase):
             SimulationRoot.chroot('..')
             shutil.rmtree(testdir, onerror=onerror)
 
+    def test_cache(self):
+        logging.debug('')
+        logging.debug('test_cache')
+
+        testdir = 'test_cache'
+        if os.path.exists(testdir):
+            shutil.rmtree(testdir, onerror=onerror)
+        os.mkdir(testdir)
+        os.chdir(testdir)
+
+        try:
+            server = ObjServer(cache_dir=os.path.abspath('cache'))
+            with open('input.dat', 'w') as out:
+                out.write('some input\n')
+            digest = file_digest('input.dat')
+            files = [('input.dat', digest)]
+
+            # Nothing cached yet.
+            self.assertEqual(server.restore_cached(files, ZIP_SYSTEM), [])
+
+            pack_zipfile(['input.dat'], 'inputs.zip')
+            os.remove('input.dat')
+            self.assertEqual(server.unpack_zipfile('inputs.zip', cache=True),
+                             (1, 11))
+            self.assertEqual(os.listdir('cache'), [digest])
+
+            os.remove('input.dat')
+            self.assertEqual(server.restore_cached(files, ZIP_SYSTEM),
+                             ['input.dat'])
+            with open('input.dat', 'r') as inp:
+                self.assertEqual(inp.read(), 'some input\n')
+
+            # Other systems may need newline translation.
+            self.assertEqual(server.restore_cached(files, ZIP_SYSTEM+1), [])
+
+            # Files larger than the cache limit aren't cached.
+            server = ObjServer(cache_dir=os.path.abspath('cache'),
+                               cache_size=100)
+            with open('big.dat', 'w') as out:
+                out.write('x' * 200)
+            pack_zipfile(['big.dat'], 'big.zip')
+            self.assertEqual(server.unpack_zipfile('big.zip', cache=True),
+                             (1, 200))
+            self.assertEqual(os.listdir('cache'), [digest])
+
+            # The factory's cache is removed on cleanup.
+            factory = ObjServerFactory()
+            cache_file('input.dat', os.path.join('xfer_cache', 'someone'))
+            factory.cleanup()
+            self.assertFalse(os.path.exists('xfer_cache'))
+
+            assert_raises(self, "server.restore_cached([('/illegal', digest)],"
+                                " ZIP_SYSTEM)",
+                          globals(), locals(), RuntimeError,
+                          "Can't restore_cached '/illegal', not within root")
+        finally:
+            SimulationRoot.chroot('..')
+            shutil.rmtree(testdir, onerror=onerror)
+
+    def test_reset(self):
+        logging.debug('')
+        logging.debug('test_reset')
+
+        testdir = 'test_reset'
+        if os.path.exists(testdir):
+            shutil.rmtree(testdir, onerror=onerror)
+        os.mkdir(testdir)
+        os.chdir(testdir)
+
+        try:
+            with open('keep.dat', 'w') as out:
+                out.write('keep\n')
+            root = os.getcwd()
+            server = ObjServer()
+
+            with open('output.dat', 'w') as out:
+                out.write('output\n')
+            os.mkdir('subdir')
+            os.chdir('subdir')
+            with open('scratch.dat', 'w') as out:
+                out.write('scratch\n')
+
+            server.reset()
+            self.assertEqual(os.getcwd(), root)
+            self.assertEqual(os.listdir('.'), ['keep.dat'])
+            self.assertEqual(server.tlo, None)
+        finally:
+            os.chdir(root)
+            SimulationRoot.chroot('..')
+            shutil.rmtree(testdir, onerror=onerror)
+
+    def test_pool(self):
+        logging.debug('')
+        logging.debug('test_pool')
+
+        factory = ObjServerFactory()
+        factory.pool_size = 1
+        factory.idle_timeout = 0.2
+        started = []
+
+        def start_server(name, allowed_users):
+            server = _Server(name)
+            factory._managers[server] = (_Manager(), name, get_credentials(),
+                                         allowed_users)
+            started.append(server)
+            return server
+
+        factory._start_server = start_server
+
+        server1 = factory.create('', name='first')
+        server2 = factory.create('')
+        self.assertEqual(started, [server1, server2])
+
+        # Released servers are reset and kept up to pool_size.
+        factory.release(server1)
+        self.assertTrue(server1.was_reset)
+        self.assertFalse(server1._close.cancelled)
+        factory.release(server2)
+        self.assertFalse(server2.was_reset)
+        self.assertTrue(server2._close.cancelled)
+        self.assertFalse(server2 in factory._managers)
+
+        # A pooled server is reused, retaining its name.
+        server3 = factory.create('', name='third')
+        self.assertTrue(server3 is server1)
+        self.assertEqual(server3.name, 'first')
+
+        # Other users' servers are not reused.
+        other = {'someone@else': None}
+        server4 = factory.create('', allowed_users=other)
+        self.assertEqual(len(started), 3)
+        factory.release(server3)
+        server5 = factory.create('', allowed_users=other)
+        self.assertEqual(len(started), 4)
+        factory.release(server5)
+
+        # Idle servers are shut down after idle_timeout.
+        self.assertFalse(server1._close.cancelled)
+        time.sleep(0.5)
+        self.assertTrue(server1._close.cancelled)
+        self.assertEqual(factory._idle, [])
+
+        # Pre-started servers are also pooled.
+        factory.idle_timeout = 60.
+        factory.prestart(2)
+        self.assertEqual(factory.pool_size, 2)
+        self.assertEqual(len(factory._idle), 2)
+        server6 = factory.create('')
+        self.assertTrue(server6 is started[-2])
+
+        factory.cleanup()
+        self.assertEqual(factory._managers, {})
+        self.assertEqual(factory._idle, [])
+        self.assertEqual(factory._reaper, None)
+        for server in started:
+            self.assertTrue(server._close.cancelled)
+
+
+class _Server(object):
+    """ Stands in for a :class:`ObjServer` proxy. """
+
+    def __init__(self, name):
+        self.name = name
+        self.was_reset = False
+        self._close = _Close()
+        self._token = _Token()
+
+    def reset(self):
+        self.was_reset = True
+
+
+class _Token(object):
+    """ Stands in for a proxy's token. """
+
+    address = None
+
+
+class _Close(object):
+    """ Stands in for a proxy's finalizer. """
+
+    cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class _Manager(object):
+    """ Stands in for a :class:`_ServerManager`. """
+
+    def shutdown(self):
+        pass
+
 
 if __name__ == '__main__':
     sys.argv.append('--cover-package=openmdao.main')
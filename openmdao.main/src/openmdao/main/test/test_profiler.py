@@ -0,0 +1,117 @@
+"""
+Test component execution profiling.
+"""
+
+import cStringIO
+import unittest
+
+from openmdao.main.api import Assembly, Component, set_as_top
+from openmdao.main.datatypes.api import Float
+from openmdao.main.profiler import enable_profiling, disable_profiling
+import openmdao.main.profiler as profiling
+
+
+class Adder(Component):
+
+    x = Float(iotype='in')
+    y = Float(iotype='out')
+
+    def execute(self):
+        self.y = self.x + 1.
+
+    def list_deriv_vars(self):
+        return ('x',), ('y',)
+
+    def provideJ(self):
+        return [[1.]]
+
+
+class Delegating(Adder):
+    """ Defines its own `_provideJ`, as GeomComponent does. """
+
+    def _provideJ(self):
+        return [[2.]]
+
+
+class Model(Assembly):
+
+    def configure(self):
+        self.add('sub', Assembly())
+        self.sub.add('comp', Adder())
+        self.sub.driver.workflow.add('comp')
+        self.sub.create_passthrough('comp.x')
+        self.sub.create_passthrough('comp.y')
+        self.add('comp', Adder())
+        self.driver.workflow.add(['comp', 'sub'])
+        self.connect('comp.y', 'sub.x')
+
+
+class TestCase(unittest.TestCase):
+
+    def tearDown(self):
+        disable_profiling()
+
+    def test_profile(self):
+        top = set_as_top(Model())
+        top.run()  # Not profiled.
+        self.assertEqual(profiling.PROFILER, None)
+
+        profiler = enable_profiling()
+        self.assertTrue(enable_profiling() is profiler)
+        for i in range(3):
+            top.comp.x = i + 1
+            top.run()
+        top.comp.calc_derivatives(first=True)
+        self.assertTrue(disable_profiling() is profiler)
+        self.assertEqual(disable_profiling(), None)
+        self.assertEqual(top.sub.y, 5.)
+
+        stats = profiler.get_stats()
+        for key in (('', 'run'), ('', 'execute'),
+                    ('driver', 'run'), ('driver', 'iteration'),
+                    ('comp', 'run'), ('comp', 'execute'),
+                    ('sub', 'run'), ('sub', 'transfer'),
+                    ('sub.comp', 'run'), ('sub.comp', 'execute'),
+                    ('sub.comp', 'transfer')):
+            self.assertEqual(stats[key][0], 3)
+        self.assertEqual(stats[('comp', 'provideJ')][0], 1)
+        for calls, wall, cpu in stats.values():
+            self.assertTrue(wall >= 0.)
+            self.assertTrue(cpu >= 0.)
+        self.assertTrue(stats[('', 'run')][1] >= stats[('comp', 'run')][1])
+
+        stream = cStringIO.StringIO()
+        profiler.report(stream)
+        lines = [line.split()[0] for line in stream.getvalue().splitlines()]
+        self.assertEqual(lines,
+                         ['Component/phase',
+                          '<top>', 'execute', 'run',
+                          'comp', 'execute', 'provideJ', 'run',
+                          'driver', 'execute', 'iteration', 'run',
+                          'sub', 'execute', 'run', 'transfer',
+                          'comp', 'execute', 'run', 'transfer',
+                          'driver', 'execute', 'iteration', 'run'])
+
+        profiler.reset()
+        self.assertEqual(profiler.get_stats(), {})
+
+    def test_provideJ(self):
+        top = set_as_top(Assembly())
+        top.add('comp', Delegating())
+        top.add('dest', Adder())
+        top.driver.workflow.add(['comp', 'dest'])
+        top.connect('comp.y*2.', 'dest.x')
+        top.run()
+        pseudo = [name for name in top._depgraph.all_comps()
+                       if name.startswith('_pseudo')][0]
+
+        profiler = enable_profiling()
+        self.assertEqual(top.comp.calc_derivatives(first=True), [[1.]])
+        getattr(top, pseudo).calc_derivatives(first=True)
+        stats = profiler.get_stats()
+        self.assertEqual(stats[('comp', 'provideJ')][0], 1)
+        self.assertEqual(stats[(pseudo, 'provideJ')][0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
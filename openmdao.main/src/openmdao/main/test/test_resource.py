@@ -21,7 +21,8 @@ from openmdao.main.mp_util import read_server_config
 from openmdao.main.objserverfactory import connect, start_server
 from openmdao.main.resource import ResourceAllocationManager as RAM
 from openmdao.main.resource import ResourceAllocator, LocalAllocator, \
-                                   ClusterAllocator, RESOURCE_LIMITS
+                                   ClusterAllocator, ClusterHost, \
+                                   RESOURCE_LIMITS
 from openmdao.main.datatypes.api import Dict
 from openmdao.util.testutil import assert_raises, find_python
 from openmdao.util.fileutil import onerror
@@ -36,6 +37,40 @@ class ExtCode(Component):
                      desc='Resources required to run this component.')
 
 
+class HostAllocator(object):
+    """ Stands in for a cluster host's LocalAllocator. """
+
+    def __init__(self, name, total_cpus, load, free_memory):
+        self.name = name
+        self.total_cpus = total_cpus
+        self.load = load
+        self.free_memory = free_memory
+        self.estimates = 0
+
+    def time_estimate(self, resource_desc):
+        self.estimates += 1
+        return (0, {'hostnames': [self.name],
+                    'loadavgs': (self.load, self.load, self.load),
+                    'total_cpus': self.total_cpus, 'max_load': 1.0,
+                    'free_memory': self.free_memory})
+
+    def deploy(self, name, resource_desc, criteria):
+        return HostServer()
+
+    def release(self, server):
+        pass
+
+
+class HostServer(object):
+    """ Stands in for a deployed server proxy. """
+
+    def __init__(self):
+        self._close = self
+
+    def cancel(self):
+        pass
+
+
 class TestCase(unittest.TestCase):
     """ Test resource allocation. """
 
@@ -111,6 +146,58 @@ class TestCase(unittest.TestCase):
             self.cluster.max_servers({'python_version': '2.999'})
         self.assertEqual(n_servers, 0)
 
+    def test_load_aware(self):
+        logging.debug('')
+        logging.debug('test_load_aware')
+
+        # Exercise selection logic without requiring ssh to cluster hosts.
+        cluster = ClusterAllocator('LoadAware', method='load-aware')
+        cluster.cluster = []
+        for name, cpus, load, memory in (('slow', 4, 0., 1000000),
+                                         ('fast', 4, 1., 1000)):
+            host = ClusterHost(name)
+            host.allocator = HostAllocator(name, cpus, load, memory)
+            cluster.cluster.append(host)
+        slow, fast = cluster.cluster
+
+        # No history: least loaded host, no estimate.
+        estimate, criteria = cluster.time_estimate({})
+        self.assertEqual(estimate, 0)
+        self.assertTrue(criteria['host'] is slow)
+
+        # History shows 'fast' completes work sooner despite its load.
+        slow.runtime = 10.
+        fast.runtime = 2.
+        estimate, criteria = cluster.time_estimate({'min_cpus': 6})
+        self.assertEqual(estimate, 2.5)
+        self.assertTrue(criteria['host'] is fast)
+        self.assertEqual(criteria['hostnames'], ['fast']*3 + ['slow']*3)
+
+        # Servers deployed since estimates were obtained count as load.
+        for i in range(3):
+            server = cluster.deploy('server%d' % i, {}, criteria.copy())
+        self.assertEqual(fast.allocated_cpus, 3)
+        estimate, criteria = cluster.time_estimate({})
+        self.assertTrue(criteria['host'] is slow)
+        self.assertEqual(fast.allocator.estimates, 2)
+
+        # Memory requirement.
+        estimate, criteria = cluster.time_estimate({'min_phys_memory': 2000})
+        self.assertTrue(criteria['host'] is slow)
+        estimate, criteria = cluster.time_estimate({'min_phys_memory': 10**7})
+        self.assertEqual(estimate, -1)
+
+        # Release updates runtime history.
+        cluster.release(server)
+        self.assertEqual(fast.allocated_cpus, 2)
+        self.assertTrue(fast.runtime < 2.)
+
+        # Estimates are refreshed after refresh_interval.
+        self.assertEqual(fast.allocator.estimates, 4)
+        cluster.refresh_interval = 0.
+        cluster.time_estimate({})
+        self.assertEqual(fast.allocator.estimates, 5)
+
     def test_max_servers(self):
         logging.debug('')
         logging.debug('test_max_servers')
@@ -419,12 +506,16 @@ authkey: PublicKey
 allow_shell: False
 total_cpus: 42
 max_load: 200
+cache_size: 34359738368
+cache_age: 3600
 """)
         try:
             RAM.configure('resources.cfg')
             local2 = RAM.get_allocator('Local2')
             self.assertEqual(local2.factory._authkey, 'PublicKey')
             self.assertEqual(local2.factory._allow_shell, False)
+            self.assertEqual(local2.factory.cache_size, 1 << 35)
+            self.assertEqual(local2.factory.cache_age, 3600.)
             self.assertEqual(local2.total_cpus, 42)
             self.assertEqual(local2.max_load, 200)
             self.assertEqual(local2.host, socket.gethostname())
@@ -0,0 +1,61 @@
+"""
+Test uncertain distributions.
+"""
+
+import unittest
+
+from numpy import array, random
+
+from openmdao.main.uncertain_distributions import NormalDistribution, \
+                                                 NormalDistributionArray
+
+
+class NormalDistributionArrayTestCase(unittest.TestCase):
+
+    def test_construction(self):
+        dist = NormalDistributionArray([1., 2., 3.], 0.5)
+        self.assertTrue(isinstance(dist, NormalDistribution))
+        self.assertEqual(list(dist.mu), [1., 2., 3.])
+        self.assertEqual(list(dist.sigma), [.5, .5, .5])
+        self.assertEqual(list(dist.getvalue()), [1., 2., 3.])
+
+        # Not a sequence, numpy keeps it as a single object.
+        values = array([dist, dist], dtype=object)
+        self.assertEqual(values.shape, (2,))
+
+    def test_sample(self):
+        random.seed(10)
+        dist = NormalDistributionArray([1., -2.], [0.5, 2.])
+        self.assertEqual(dist.sample().shape, (2,))
+        samples = dist.sample(20000)
+        self.assertEqual(samples.shape, (20000, 2))
+        for mean, std, mu, sigma in zip(samples.mean(axis=0),
+                                        samples.std(axis=0),
+                                        dist.mu, dist.sigma):
+            self.assertAlmostEqual(mean, mu, 1)
+            self.assertAlmostEqual(std, sigma, 1)
+
+    def test_arithmetic(self):
+        dist = NormalDistributionArray([1., 2.], [0.3, 0.4])
+
+        for result, mu, sigma in ((dist + 1, [2., 3.], [.3, .4]),
+                                  (1 + dist, [2., 3.], [.3, .4]),
+                                  (dist - [1., 1.], [0., 1.], [.3, .4]),
+                                  (3 - dist, [2., 1.], [.3, .4]),
+                                  (-dist, [-1., -2.], [.3, .4]),
+                                  (dist * -2, [-2., -4.], [.6, .8]),
+                                  (2 * dist, [2., 4.], [.6, .8]),
+                                  (dist / 2, [.5, 1.], [.15, .2]),
+                                  (dist + NormalDistribution(1., 0.4),
+                                   [2., 3.], [.5, 0.4*2**0.5]),
+                                  (dist - dist, [0., 0.],
+                                   [0.3*2**0.5, 0.4*2**0.5])):
+            self.assertTrue(isinstance(result, NormalDistributionArray))
+            for value, expected in zip(result.mu, mu):
+                self.assertAlmostEqual(value, expected)
+            for value, expected in zip(result.sigma, sigma):
+                self.assertAlmostEqual(value, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,11 +2,15 @@
 Test run/step/stop aspects of a simple workflow.
 """
 
+import threading
+import time
 import unittest
 
 from openmdao.main.api import Assembly, Component, set_as_top, Driver
+from openmdao.main.assembly import _NO_LOCK
 from openmdao.main.exceptions import RunStopped
-from openmdao.main.datatypes.api import Int, Bool
+from openmdao.main.rbac import get_credentials
+from openmdao.main.datatypes.api import Int, Bool, Float
 
 # pylint: disable-msg=E1101,E1103
 # "Instance of <class> has no <attr> member"
@@ -53,6 +57,38 @@ class Model(Assembly):
         self.run()
 
 
+class SlowComponent(Component):
+    """ Sleeps for `delay` seconds, then copies `x` to `y`. """
+
+    x = Float(iotype='in')
+    delay = Float(0., iotype='in')
+    fail = Bool(False, iotype='in')
+    y = Float(iotype='out')
+
+    def execute(self):
+        self.credentials = get_credentials()
+        self.graph_lock = self.parent._graph_lock
+        time.sleep(self.delay)
+        if self.fail:
+            self.raise_exception('failed', RuntimeError)
+        self.y = self.x
+
+
+class Diamond(Assembly):
+    """ comp_a feeds comp_b and comp_c, which both feed comp_d. """
+
+    def configure(self):
+        for name in ('comp_a', 'comp_b', 'comp_c', 'comp_d'):
+            self.add(name, SlowComponent())
+        self.comp_b.delay = self.comp_c.delay = 0.5
+
+        self.driver.workflow.add(['comp_a', 'comp_b', 'comp_c', 'comp_d'])
+
+        self.connect('comp_a.y', 'comp_b.x')
+        self.connect('comp_a.y', 'comp_c.x')
+        self.connect('comp_b.y+comp_c.y', 'comp_d.x')
+
+
 class TestCase(unittest.TestCase):
     """ Test run/step/stop aspects of a simple workflow. """
 
@@ -223,6 +259,124 @@ class TestCase(unittest.TestCase):
         else:
             self.fail('Expected AttributeError')
 
+    def test_unconnected_order(self):
+        # Unconnected components keep their sequence position.
+        model = set_as_top(Assembly())
+        names = ['comp%d' % i for i in range(6)]
+        for name in names:
+            model.add(name, TestComponent())
+        model.driver.workflow.add(names)
+        model.connect('comp4.total_executions', 'comp1.dummy_input')
+        model.connect('comp5.total_executions', 'comp4.dummy_input')
+        self.assertEqual([comp.name for comp in model.driver.workflow],
+                         ['comp0', 'comp2', 'comp3', 'comp5', 'comp4',
+                          'comp1'])
+
+        # Pseudo-components run as soon as their inputs are ready.
+        model = set_as_top(Assembly())
+        for name in names[:3]:
+            model.add(name, TestComponent())
+        model.driver.workflow.add(names[:3])
+        model.connect('comp0.total_executions+1', 'comp1.dummy_input')
+        model.add('comp3', TestComponent())
+        model.driver.workflow.add('comp3')
+        self.assertEqual([comp.name.split('_')[1] if comp.name[0] == '_'
+                                                  else comp.name
+                          for comp in model.driver.workflow],
+                         ['comp0', 'pseudo', 'comp1', 'comp2', 'comp3'])
+
+    def test_concurrent(self):
+        # Tests running independent branches concurrently.
+        model = set_as_top(Diamond())
+        model.set('driver.max_workers', 2)
+        model.comp_a.x = 1.5
+
+        start = time.time()
+        model.run()
+        self.assertTrue(time.time() - start < 0.9)
+        self.assertEqual(model.comp_d.y, 3.)
+        self.assertEqual([comp.get_itername() for comp in model.driver.workflow
+                                  if isinstance(comp, SlowComponent)],
+                         ['1-1', '1-2', '1-3', '1-4'])
+
+        # Components run with the caller's credentials.
+        for name in ('comp_a', 'comp_b', 'comp_c', 'comp_d'):
+            self.assertTrue(getattr(model, name).credentials
+                            is get_credentials())
+
+        # Components with a directory are run on their own.
+        model.comp_b.directory = '.'
+        model.comp_a.x = 2.
+        start = time.time()
+        model.run()
+        self.assertTrue(time.time() - start > 1.)
+        self.assertEqual(model.comp_d.y, 4.)
+
+        # Unless they don't change to it.
+        model.comp_b.run_in_directory = False
+        model.comp_a.x = 2.5
+        start = time.time()
+        model.run()
+        self.assertTrue(time.time() - start < 0.9)
+        self.assertEqual(model.comp_d.y, 5.)
+
+        # An error stops the run after running components complete.
+        model.comp_b.directory = ''
+        model.comp_c.fail = True
+        model.comp_a.x = 3.
+        try:
+            model.run()
+        except RuntimeError as err:
+            self.assertEqual(str(err), 'comp_c (%s): failed'
+                             % model.comp_c.get_itername())
+        else:
+            self.fail('Expected RuntimeError')
+        self.assertEqual(model.comp_b.y, 3.)
+        self.assertEqual(model.comp_d.y, 5.)
+
+        # Many siblings updating the parent's graph at once.
+        model = set_as_top(Assembly())
+        model.add('source', SlowComponent())
+        names = ['comp%d' % i for i in range(20)]
+        for name in names:
+            model.add(name, SlowComponent())
+            model.connect('source.y', name + '.x')
+        model.driver.workflow.add(['source'] + names)
+        model.driver.max_workers = 8
+        for i in range(5):
+            model.source.x = i
+            model.run()
+            self.assertEqual([getattr(model, name).y for name in names],
+                             [i] * len(names))
+            self.assertTrue(all(model.get_valid([name + '.y'
+                                                 for name in names])))
+
+    def test_graph_lock(self):
+        # Graph updates are only serialized during a concurrent run.
+        model = set_as_top(Diamond())
+        model.run()
+        self.assertTrue(model.comp_b.graph_lock is _NO_LOCK)
+
+        model.driver.max_workers = 2
+        model.comp_a.x = 1.
+        model.run()
+        self.assertTrue(model.comp_b.graph_lock is not _NO_LOCK)
+        self.assertTrue(model.comp_c.graph_lock is model.comp_b.graph_lock)
+        self.assertTrue(model._graph_lock is _NO_LOCK)
+
+        # Nested concurrent runs share the lock.
+        top = set_as_top(Assembly())
+        top.add('sub', Diamond())
+        top.add('comp', SlowComponent())
+        top.driver.workflow.add(['sub', 'comp'])
+        top.driver.max_workers = 2
+        top.sub.driver.max_workers = 2
+        top.run()
+        self.assertTrue(top.comp.graph_lock is not _NO_LOCK)
+        self.assertTrue(top.sub.comp_b.graph_lock is top.comp.graph_lock)
+        self.assertTrue(top._graph_lock is _NO_LOCK)
+        self.assertTrue(top.sub._graph_lock is _NO_LOCK)
+
 
 if __name__ == '__main__':
     import nose
@@ -1,6 +1,12 @@
 
 from random import gauss, weibullvariate, uniform
 
+try:
+    from numpy import asarray, broadcast_arrays, random, sqrt
+except ImportError as err:
+    import logging
+    logging.warn("In %s: %r" % (__file__, err))
+
 from openmdao.main.interfaces import IUncertainVariable, implements
 
 try:
@@ -70,6 +76,75 @@ class NormalDistribution(UncertainDistribution):
     def __str__(self): 
         return "NormalDistribution(mu=%s,sigma=%s)"%(self.mu,self.sigma)
     
+
+@stub_if_missing_deps('numpy')
+class NormalDistributionArray(NormalDistribution):
+    """A NormalDistribution holding arrays of independent normal
+    distributions, such as a surrogate's predictions at a batch of points.
+    Sampling and arithmetic operate on all the distributions at once.
+    (It is deliberately not a sequence, so that numpy treats it as a single
+    value rather than creating an object per point.)
+
+    mu: array
+       mean values
+
+    sigma: array
+       standard deviations, broadcast to the shape of `mu`
+    """
+
+    def __init__(self, mu=(), sigma=1.):
+        mu, sigma = broadcast_arrays(asarray(mu, dtype=float),
+                                     asarray(sigma, dtype=float))
+        super(NormalDistributionArray, self).__init__(mu.copy(), sigma.copy())
+
+    def sample(self, size=None):
+        """Returns a sample from each distribution. If `size` is specified,
+        returns `size` samples from each, with shape ``(size,) + mu.shape``.
+        """
+        if size is None:
+            return random.normal(self.mu, self.sigma)
+        shape = (size,) + self.mu.shape
+        return self.mu + self.sigma*random.standard_normal(shape)
+
+    def _combine(self, other, sign):
+        """Sum (`sign` 1) or difference (`sign` -1) with `other`, which may
+        be another independent normal distribution."""
+        if isinstance(other, NormalDistribution):
+            return NormalDistributionArray(self.mu + sign*asarray(other.mu),
+                                           sqrt(self.sigma**2 +
+                                                asarray(other.sigma)**2))
+        return NormalDistributionArray(self.mu + sign*asarray(other),
+                                       self.sigma)
+
+    def __add__(self, other):
+        return self._combine(other, 1.)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self._combine(other, -1.)
+
+    def __rsub__(self, other):
+        return -self._combine(other, -1.)
+
+    def __neg__(self):
+        return NormalDistributionArray(-self.mu, self.sigma)
+
+    def __mul__(self, other):
+        other = asarray(other)
+        return NormalDistributionArray(self.mu*other, self.sigma*abs(other))
+
+    __rmul__ = __mul__
+
+    def __div__(self, other):
+        other = asarray(other, dtype=float)
+        return NormalDistributionArray(self.mu/other, self.sigma/abs(other))
+
+    __truediv__ = __div__
+
+    def __str__(self):
+        return "NormalDistributionArray(mu=%s,sigma=%s)"%(self.mu,self.sigma)
+
 #def _adapt_norm_dist(nd): 
     #return "%f;%f"%(nd.mu,nd.sigma)
 
@@ -806,5 +806,24 @@ class test__moduleFunctions(unittest.TestCase):
         else:
             self.fail("Expecting Key Error")            
 
+    def test_get_conversion_tuple(self):
+        self.assertEqual(units.get_conversion_tuple('cm', 'm'), (1/100.0, 0))
+        self.assertTrue(('cm', 'm') in units.units._CONVERSIONS)
+        self.assertEqual(units.get_conversion_tuple('cm', 'm'), (1/100.0, 0))
+
+        factor, offset = units.get_conversion_tuple('degF', 'degC')
+        self.assertAlmostEqual(factor, 0.556, 3)
+        self.assertAlmostEqual(offset, -32.0, 3)
+        self.assertAlmostEqual(units.convert_units(212., 'degF', 'degC'),
+                               100., 10)
+
+        try:
+            units.get_conversion_tuple('m', 'degC')
+        except TypeError, err:
+            self.assertEqual(str(err), 'Incompatible units')
+        else:
+            self.fail("Expecting TypeError")
+        self.assertFalse(('m', 'degC') in units.units._CONVERSIONS)
+
 if __name__ == "__main__":
     unittest.main()
@@ -21,12 +21,6 @@ import os.path
 
 from math import sin, cos, tan, floor, pi
 
-# pylint: disable-msg=E0611,F0401, E1101
-try:
-    from pkg_resources import resource_stream
-except ImportError:
-    pass
-
 #Class definitions
 
 class NumberDict(dict):
@@ -577,6 +571,9 @@ class PhysicalUnit(object):
 
 _UNIT_CACHE = {}
 
+# Maps from (src_units, target_units) names to (factor, offset).
+_CONVERSIONS = {}
+
 def _find_unit(unit):
     """Find unit helper function."""
     if isinstance(unit, str):
@@ -685,6 +682,7 @@ def import_library(libfilepointer):
     global _UNIT_LIB
     global _UNIT_CACHE
     _UNIT_CACHE = {}
+    _CONVERSIONS.clear()
     _UNIT_LIB = ConfigParser.ConfigParser()
     _UNIT_LIB.optionxform = _do_nothing
     _UNIT_LIB.readfp(libfilepointer)
@@ -794,19 +792,43 @@ def _update_library(cfg):
                          ' defined units:%s' % [x[0] for x in retry1])
 
 
+def get_conversion_tuple(src_units, target_units):
+    """Return ``(factor, offset)`` such that ``(value + offset) * factor``
+    converts `value` from `src_units` to `target_units`. Results are
+    remembered, so repeated conversions between the same units don't
+    re-parse them. Raises TypeError if the units are incompatible.
+
+    src_units: str or PhysicalUnit
+        Units being converted from.
+
+    target_units: str or PhysicalUnit
+        Units being converted to.
+    """
+    key = (src_units, target_units)
+    try:
+        return _CONVERSIONS[key]
+    except (KeyError, TypeError):
+        conversion = _find_unit(src_units).conversion_tuple_to(
+                                                    _find_unit(target_units))
+        if isinstance(src_units, str) and isinstance(target_units, str):
+            _CONVERSIONS[key] = conversion
+        return conversion
+
+
 def convert_units(value, units, convunits):
     """Return the given value (given in units) converted
     to convunits.
     """
-    pq = PhysicalQuantity(value, units)
-    pq.convert_to_unit(convunits)
-    return pq.value
+    factor, offset = get_conversion_tuple(units, convunits)
+    return (value + offset) * factor
 
 
-try:
+_default_path = os.path.join(os.path.dirname(__file__), 'unitLibdefault.ini')
+if os.path.exists(_default_path):
+    default_lib = open(_default_path)
+else:  # Zipped egg.
+    # pylint: disable-msg=E0611,F0401
+    from pkg_resources import resource_stream
     default_lib = resource_stream(__name__, 'unitLibdefault.ini')
-except NameError: #pck_resources was not imported, try __file__
-    default_lib = open(os.path.join(os.path.dirname(__file__),
-                                   'unitLibDefault.ini'))
 import_library(default_lib)
 
@@ -225,6 +225,17 @@ class PythonSourceFileAnalyser(ast.NodeVisitor):
             else:
                 self.localnames[al.asname] = '.'.join([module, al.name])
 
+    def visit_Call(self, node):
+        """This executes for every call. A call of the form
+        ``lazy_module(__name__, {name: module, ...})`` is treated like
+        the equivalent "from module import name" statements.
+        """
+        if isinstance(node.func, ast.Name) and node.func.id == 'lazy_module' \
+           and len(node.args) == 2 and isinstance(node.args[1], ast.Dict):
+            for key, value in zip(node.args[1].keys, node.args[1].values):
+                if isinstance(key, ast.Str) and isinstance(value, ast.Str):
+                    self.localnames[key.s] = '.'.join([value.s, key.s])
+
     def update_graph(self, graph):
         """Update the inheritance/implements graph."""
         for classname, classinfo in self.classes.items():
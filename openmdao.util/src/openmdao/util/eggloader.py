@@ -6,7 +6,6 @@ import pickle
 import cPickle
 
 import os.path
-import pkg_resources
 import sys
 import zipfile
 
@@ -83,6 +82,8 @@ def load_from_eggpkg(package, entry_group, entry_name, instance_name=None,
     observer: callable
         Called via an :class:`EggObserver`.
     """
+    import pkg_resources
+
     logger = logger or NullLogger()
     observer = EggObserver(observer, logger)
     logger.debug('Loading %s from %s in %s...',
@@ -99,6 +100,8 @@ def load_from_eggpkg(package, entry_group, entry_name, instance_name=None,
 def _load_from_distribution(dist, entry_group, entry_name, instance_name,
                             logger, observer):
     """ Invoke entry point in distribution and return result. """
+    import pkg_resources
+
     logger.log(LOG_DEBUG2, '    entry points:')
     maps = dist.get_entry_map()
     for group in sorted(maps.keys()):
@@ -139,6 +142,8 @@ def _load_from_distribution(dist, entry_group, entry_name, instance_name,
 
 def _dist_from_eggfile(filename, logger, observer):
     """ Create distribution by unpacking egg file. """
+    import pkg_resources
+
     if not os.path.exists(filename):
         msg = "'%s' not found." % filename
         observer.exception(msg)
@@ -254,6 +259,8 @@ def check_requirements(required, logger=None, indent_level=0):
     indent_level: int
         Used to improve readability of log messages.
     """
+    import pkg_resources
+
     def _recursive_check(required, logger, level, visited, working_set,
                          not_avail):
         indent  = '    ' * level
@@ -308,6 +315,8 @@ def load(instream, fmt=SAVE_CPICKLE, package=None, logger=None):
     logger: Logger
         Used for recording progress, etc.
     """
+    import pkg_resources
+
     logger = logger or NullLogger()
 
     new_stream = False
@@ -27,7 +27,6 @@ import fnmatch
 import inspect
 import modulefinder
 import os.path
-import pkg_resources
 import shutil
 import sys
 import tempfile
@@ -559,6 +558,8 @@ def _get_standard_modules():
 
 def _process_egg(path, distributions, prefixes, logger):
     """ Update distributions and prefixes based on egg data. """
+    import pkg_resources
+
     logger.log(LOG_DEBUG2, "    processing '%s'", path)
     dist = pkg_resources.Distribution.from_filename(path)
     distributions.add(dist)
@@ -576,6 +577,8 @@ def _process_egg(path, distributions, prefixes, logger):
 def _process_found_modules(py_dir, finder_info, modules, distributions,
                            prefixes, local_modules, orphans, not_found, logger):
     """ Use ModuleFinder data to update distributions and local_modules. """
+    import pkg_resources
+
     working_set = pkg_resources.WorkingSet()
     py_version = 'python%s' % sys.version[:3]
 
@@ -689,6 +692,8 @@ if __name__ == '__main__':
 
 def _create_entry_map(entry_pts):
     """ Create entry point map from (group, name, loader) tuples. """
+    import pkg_resources
+
     pkg_name = entry_pts[0][1]
     pkg_loader = entry_pts[0][2]
     ldattr = ['load']
@@ -5,7 +5,6 @@ Supports what's needed for saving and loading components/simulations.
 
 import copy
 import os.path
-import pkg_resources
 import re
 import sys
 import time
@@ -31,6 +30,8 @@ def egg_filename(name, version):
     version: string
         Must be alphanumeric.
     """
+    import pkg_resources
+
     assert name and isinstance(name, basestring)
     match = _EGG_NAME_RE.search(name)
     if match is None or match.group() != name:
@@ -91,6 +92,8 @@ def write(name, version, doc, entry_map, src_files, distributions, modules,
 
     Returns the egg's filename.
     """
+    import pkg_resources
+
     observer = eggobserver.EggObserver(observer, logger)
 
     egg_name = egg_filename(name, version)
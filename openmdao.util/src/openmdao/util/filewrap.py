@@ -4,7 +4,10 @@ A collection of utilities for file wrapping.
 Note: This is a work in progress.
 """
 
+import os
 import re
+import mmap
+import string
 import logging
 
 from pyparsing import CaselessLiteral, Combine, OneOrMore, Optional, \
@@ -15,10 +18,28 @@ from openmdao.util.decorators import stub_if_missing_deps
 
 # pylint: disable-msg=E0611,F0401
 try:
-    from numpy import append, array, zeros
+    from numpy import append, array, zeros, bincount, concatenate, \
+                      flatnonzero, frombuffer, fromstring, searchsorted, uint8
 except ImportError as err:
     logging.warn("In %s: %r" % (__file__, err))
 
+# Files at least this large are memory-mapped rather than read into memory.
+_MMAP_THRESHOLD = 1 << 20
+
+# Newline scans over a mapped file are done in chunks of this many bytes so
+# that the temporary arrays stay small.
+_SCAN_CHUNK = 1 << 24
+
+# Characters allowed in a block handed to the bulk numeric conversion,
+# after delimiters have been translated to blanks.
+_NUMERIC_CHARS = '0123456789.+-eE \r\n'
+
+# A single int or float field, as understood by the FileParser grammar.
+_NUMBER = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\Z')
+
+_BLANKS = [ord(char) for char in ' \r\n']
+
+
 def _getformat(val):
     # Returns the output format for a floating point number.
     # The general format is used with 16 places of accuracy, except for when
@@ -388,6 +409,128 @@ class InputFileGenerator(object):
         infile.close()
 
 
+def _line_ends(buf):
+    """Returns an array holding the offset just past the end of each line
+    in `buf`. The newline search is done with NumPy, a chunk at a time."""
+    
+    size = len(buf)
+    ends = []
+    for offset in xrange(0, size, _SCAN_CHUNK):
+        chunk = frombuffer(buf, dtype=uint8, offset=offset,
+                           count=min(_SCAN_CHUNK, size-offset))
+        ends.append(flatnonzero(chunk == 10) + (offset + 1))
+        
+    # The last line may not be terminated.
+    if size and (not ends[-1].size or ends[-1][-1] != size):
+        ends.append(array([size]))
+        
+    return concatenate(ends) if ends else zeros(0, dtype=int)
+
+
+class _LineBuffer(object):
+    """Read-only, list-like view of the lines of a block of text, which is
+    usually a memory-mapped file. Lines are only sliced out of the buffer
+    when they are asked for, and anchor searches run over the raw buffer
+    instead of line by line."""
+    
+    def __init__(self, buf):
+        
+        self._buf = buf
+        self._ends = _line_ends(buf)
+        
+    def __len__(self):
+        return len(self._ends)
+    
+    def __iter__(self):
+        for index in xrange(len(self)):
+            yield self[index]
+            
+    def __getitem__(self, index):
+        
+        if isinstance(index, slice):
+            return [self[i] for i in xrange(*index.indices(len(self)))]
+        
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('line index out of range')
+        
+        return self._buf[self._start(index):int(self._ends[index])]
+    
+    def _start(self, index):
+        # Offset of the first character of line index.
+        
+        return int(self._ends[index-1]) if index > 0 else 0
+    
+    def _row(self, pos):
+        # Index of the line that contains offset pos.
+        
+        return int(searchsorted(self._ends, pos, side='right'))
+    
+    def text(self, first, last):
+        """Returns lines `first` through `last`-1 as a single string. The
+        indices follow the usual slicing rules."""
+        
+        first, last, _ = slice(first, last).indices(len(self))
+        if first >= last:
+            return ''
+        return self._buf[self._start(first):int(self._ends[last-1])]
+    
+    def find(self, sub, first=0, last=None):
+        """Returns the index of the first line in the range [first, last)
+        that contains `sub`, or -1 if there is none."""
+        
+        first, last, _ = slice(first, last).indices(len(self))
+        if first >= last:
+            return -1
+        if not sub:
+            return first
+        
+        pos = self._start(first)
+        stop = int(self._ends[last-1])
+        while True:
+            pos = self._buf.find(sub, pos, stop)
+            if pos < 0:
+                return -1
+            
+            # Matches that run across a line break don't count.
+            row = self._row(pos)
+            if pos + len(sub) <= self._ends[row]:
+                return row
+            pos += 1
+    
+    def rfind(self, sub, first=0, last=None):
+        """Returns the index of the last line in the range [first, last)
+        that contains `sub`, or -1 if there is none."""
+        
+        first, last, _ = slice(first, last).indices(len(self))
+        if first >= last:
+            return -1
+        if not sub:
+            return last - 1
+        
+        start = self._start(first)
+        stop = int(self._ends[last-1])
+        while True:
+            pos = self._buf.rfind(sub, start, stop)
+            if pos < 0:
+                return -1
+            
+            # Matches that run across a line break don't count.
+            row = self._row(pos)
+            if pos + len(sub) <= self._ends[row]:
+                return row
+            stop = pos + len(sub) - 1
+    
+    def close(self):
+        """Releases the underlying buffer."""
+        
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+        self._buf = ''
+        self._ends = zeros(0, dtype=int)
+        
+
 @stub_if_missing_deps('numpy')
 class FileParser(object):
     """Utility to locate and read data from a file."""
@@ -395,7 +538,7 @@ class FileParser(object):
     def __init__(self, end_of_line_comment_char=None, full_line_comment_char=None):
         
         self.filename = []
-        self.data = []
+        self.data = _LineBuffer('')
         
         self.delimiter = " \t"
         self.end_of_line_comment_char = end_of_line_comment_char
@@ -406,23 +549,53 @@ class FileParser(object):
         self._reset_tokens()
         
     def set_file(self, filename):
-        """Set the name of the file that will be generated.
+        """Set the name of the file that will be parsed. Large files are
+        memory-mapped rather than read into memory, and lines are only
+        extracted from the file as they are needed. A mapped file stays
+        open until :meth:`close` is called or another file is set. Windows
+        line endings are converted to newlines.
         
         filename: str
-            Name of the input file to be generated."""
+            Name of the output file to be parsed."""
         
         self.filename = filename
+        self.data.close()
+        
+        inputfile = open(filename, 'rb')
+        try:
+            if self.end_of_line_comment_char or self.full_line_comment_char:
+                lines = []
+                for line in inputfile:
+                    if line[0] == self.full_line_comment_char: 
+                        continue
+                    line = line.replace('\r\n', '\n')
+                    line = line.split(self.end_of_line_comment_char)[0]
+                    if not line.endswith('\n'):
+                        line += '\n'
+                    lines.append(line)
+                buf = ''.join(lines)
+            elif os.fstat(inputfile.fileno()).st_size >= _MMAP_THRESHOLD:
+                buf = mmap.mmap(inputfile.fileno(), 0, access=mmap.ACCESS_READ)
+                
+                # The mapping is read-only, so a file with Windows line
+                # endings is converted in memory instead.
+                if buf.find('\r\n') >= 0:
+                    text = buf[:]
+                    buf.close()
+                    buf = text.replace('\r\n', '\n')
+            else:
+                buf = inputfile.read().replace('\r\n', '\n')
+        finally:
+            inputfile.close()
+            
+        self.data = _LineBuffer(buf)
+
+    def close(self):
+        """Releases the contents of the current file. If the file was
+        memory-mapped, this unmaps it, so that it can be rewritten or
+        removed."""
         
-        inputfile = open(filename, 'r')
-        if not self.end_of_line_comment_char and not self.full_line_comment_char:
-            self.data = inputfile.readlines()
-        else:
-            self.data = []
-            for line in inputfile :
-                if line[0] == self.full_line_comment_char: 
-                    continue
-                self.data.append( line.split( self.end_of_line_comment_char )[0] )
-        inputfile.close()
+        self.data.close()
 
     def set_delimiters(self, delimiter):
         """Lets you change the delimiter that is used to identify field
@@ -457,52 +630,34 @@ class FileParser(object):
         if not isinstance(occurrence, int):
             raise ValueError("The value for occurrence must be an integer")
         
-        instance = 0
         if occurrence > 0:
-            count = 0
-            max_lines = len(self.data)
-            for index in xrange(self.current_row, max_lines):
-                line = self.data[index]
-            
-                # If we are marking a new anchor from an existing anchor, and
-                # the anchor is mid-line, then we still search the line, but
-                # only after the anchor.
-                if count == 0 and self.anchored:
-                    line = line.split(anchor)[-1]
-                
-                if anchor in line:
-                    
-                    instance += 1
-                    if instance == occurrence:
-                        self.current_row += count
-                        self.anchored = True
-                        return
-            
-                count += 1
+            # A search that starts from an existing anchor skips the anchor
+            # line itself.
+            row = self.current_row
+            if not self.anchored:
+                row -= 1
+            for _ in xrange(occurrence):
+                row = self.data.find(anchor, row+1)
+                if row < 0:
+                    break
                 
         elif occurrence < 0:
-            max_lines = len(self.data)-1
-            count = max_lines
-            for index in xrange(max_lines, -1, -1):
-                line = self.data[index]
-                
-                # If we are marking a new anchor from an existing anchor, and
-                # the anchor is mid-line, then we still search the line, but
-                # only before the anchor.
-                if count == max_lines and self.anchored:
-                    line = line.split(anchor)[0]
-
-                if anchor in line:
-                    instance += -1
-                    if instance == occurrence:
-                        self.current_row = count
-                        self.anchored = True
-                        return
-            
-                count -= 1
+            # Reverse searches always start at the end of the file.
+            row = len(self.data)
+            if self.anchored:
+                row -= 1
+            for _ in xrange(-occurrence):
+                row = self.data.rfind(anchor, 0, row)
+                if row < 0:
+                    break
         else:
             raise ValueError("0 is not valid for an anchor occurrence.")
             
+        if row >= 0:
+            self.current_row = row
+            self.anchored = True
+            return
+            
         raise RuntimeError("Could not find pattern %s in output file %s" % \
                            (anchor, self.filename))
         
@@ -595,29 +750,25 @@ class FileParser(object):
             msg = "The value for occurrence must be a nonzero integer"
             raise ValueError(msg)
         
-        instance = 0
         if occurrence > 0:
-            row = 0
-            for line in self.data[self.current_row:]:
-                if line.find(key) > -1:
-                    instance += 1
-                    if instance == occurrence:
-                        break
-            
-                row += 1
+            row = self.current_row - 1
+            for _ in xrange(occurrence):
+                row = self.data.find(key, row+1)
+                if row < 0:
+                    break
                 
         elif occurrence < 0:
-            row = -1
-            for line in reversed(self.data[self.current_row:]):
-                if line.find(key) > -1:
-                    instance += -1
-                    if instance == occurrence:
-                        break
-            
-                row -= 1
+            row = len(self.data)
+            for _ in xrange(-occurrence):
+                row = self.data.rfind(key, self.current_row, row)
+                if row < 0:
+                    break
         
-        j = self.current_row + row + rowoffset
-        line = self.data[j]
+        if row < 0:
+            raise RuntimeError("Could not find pattern %s in output file %s" % \
+                               (key, self.filename))
+        
+        line = self.data[row + rowoffset]
         
         fields = self._parse_line().parseString(line.replace(key,"KeyField"))
         
@@ -654,6 +805,23 @@ class FileParser(object):
         if not fieldend:
             raise ValueError("fieldend is missing, currently required")
             
+        if self.delimiter == "columns":
+            lines = self.data[j1:j2]
+            block = '\n'.join([line[(fieldstart-1):fieldend].strip()
+                               for line in lines])
+            values, _ = self._parse_numeric(block, len(lines))
+            if values is not None:
+                return values
+        else:
+            values, counts = self._parse_numeric(self.data.text(j1, j2))
+            if values is not None:
+                # Fields start at fieldstart on the first line and stop at
+                # fieldend on the last one.
+                first = slice(fieldstart-1, None).indices(counts[0])[0]
+                last = len(values) - counts[-1] + \
+                       slice(None, fieldend).indices(counts[-1])[1]
+                return values[first:max(first, last)]
+                
         lines = self.data[j1:j2]
 
         data = zeros(shape=(0, 0))
@@ -719,7 +887,24 @@ class FileParser(object):
             
         j1 = self.current_row + rowstart
         j2 = self.current_row + rowend + 1
-        lines = list(self.data[j1:j2])
+        
+        if self.delimiter == "columns":
+            lines = self.data[j1:j2]
+            block = '\n'.join([line[(fieldstart-1):fieldend].strip()
+                               for line in lines])
+            values, counts = self._parse_numeric(block, len(lines))
+        else:
+            values, counts = self._parse_numeric(self.data.text(j1, j2))
+            
+        # Rows of equal length can be taken straight from the bulk
+        # conversion.
+        if values is not None and (counts == counts[0]).all():
+            data = values.reshape(len(counts), counts[0])
+            if self.delimiter != "columns":
+                data = data[:, (fieldstart-1):fieldend].copy()
+            return data
+            
+        lines = self.data[j1:j2]
         
         if self.delimiter == "columns":
             
@@ -765,6 +950,57 @@ class FileParser(object):
         
         return data
     
+    def _parse_numeric(self, block, nlines=None):
+        """Converts a block of lines that hold nothing but int and float
+        fields into a flat float array in a single pass, bypassing
+        pyparsing. The number of fields found on each line is returned
+        along with the values. If the block contains anything else, or
+        a line without fields, (None, None) is returned, and the caller
+        should fall back to pyparsing.
+        
+        block: str
+            Text to convert, with lines separated by newlines.
+            
+        nlines: integer (optional)
+            Number of lines in `block`. If not given, it is taken from
+            the newlines in the block."""
+        
+        if self._numeric_table is None or not block:
+            return None, None
+        
+        block = block.translate(self._numeric_table)
+        if block.translate(None, _NUMERIC_CHARS):
+            return None, None
+        
+        buf = frombuffer(block, dtype=uint8)
+        blank = self._blank_mask[buf]
+        newlines = flatnonzero(buf == 10)
+        if nlines is None:
+            nlines = len(newlines)
+            if buf[-1] != 10:
+                nlines += 1
+        
+        # A field starts at any non-blank character that follows a blank.
+        starts = flatnonzero(~blank[1:] & blank[:-1]) + 1
+        if not blank[0]:
+            starts = concatenate(([0], starts))
+        counts = bincount(searchsorted(newlines, starts), minlength=nlines)
+        
+        if len(counts) != nlines or not counts.all():
+            return None, None
+        
+        # The bulk conversion stops at the first malformed field, which
+        # shows up as a short count. A malformed last field may still be
+        # partially converted, so it is checked on its own.
+        if _NUMBER.match(block.rsplit(None, 1)[-1]) is None:
+            return None, None
+        
+        values = fromstring(block, dtype=float, sep=' ')
+        if len(values) != counts.sum():
+            return None, None
+        
+        return values, counts
+    
     def _parse_line(self):
         """Parse a single data line that may contain string or numerical data.
         Float and Int 'words' are converted to their appropriate type. 
@@ -806,14 +1042,31 @@ class FileParser(object):
                              Optional(ee + Optional(sign) + digits)
                             ))
         
-        # special case for a float written like "3e5"
-        mixed_exp = ToFloat(Combine( digits + ee + Optional(sign) + digits ))
+        # special case for a float written like "3e5" or "-3e5"
+        mixed_exp = ToFloat(Combine( Optional(sign) + digits + ee + 
+                                     Optional(sign) + digits ))
         
         nan = ToInf(oneOf("Inf -Inf")) | \
               ToNan(oneOf("NaN nan NaN%  NaNQ NaNS qNaN sNaN " + \
                             "1.#SNAN 1.#QNAN -1.#IND"))
     
         string_text = Word(textchars)
+        
+        # Translation table for the bulk numeric conversion in
+        # _parse_numeric. Delimiters become blanks and Fortran 'D' exponents
+        # become 'E'. Delimiters that can appear in a number disable it.
+        if self.delimiter == "columns":
+            delimiter = " \t"
+        else:
+            delimiter = self.delimiter
+            
+        if set(delimiter) & set(nums + '.+-eEdD'):
+            self._numeric_table = None
+        else:
+            self._numeric_table = string.maketrans(delimiter + 'dD',
+                                                   ' '*len(delimiter) + 'eE')
+        self._blank_mask = zeros(256, dtype=bool)
+        self._blank_mask[_BLANKS] = True
             
         self.line_parse_token = ( OneOrMore( (nan | num_float | mixed_exp | num_int |
                                               string_text) ) )
@@ -1,11 +1,28 @@
 import fnmatch
 import glob
+import hashlib
 import os
+import Queue
+import re
+import shutil
 import sys
+import threading
+import time
 import zipfile
 
 from openmdao.util.log import NullLogger
 
+# ZipInfo.create_system code for local system.
+ZIP_SYSTEM = 0 if sys.platform == 'win32' else 3
+
+# Chunk size and number of chunks in flight for network transfers.
+_NET_CHUNK = 1 << 22
+_NET_DEPTH = 4
+
+# Maps from absolute path to ``(size, mtime, digest)``.
+_DIGESTS = {}
+_DIGEST_RE = re.compile('^[0-9a-f]{40}$')
+
 
 def filexfer(src_server, src_path, dst_server, dst_path, mode=''):
     """
@@ -19,6 +36,9 @@ def filexfer(src_server, src_path, dst_server, dst_path, mode=''):
     After the copy has completed, permission bits from :meth:`stat` are set
     via :meth:`chmod`.
 
+    If either end is remote, data is read ahead in a separate thread so that
+    reading the next chunk overlaps writing the current one.
+
     src_server: Proxy
         Host to get file from.
 
@@ -45,16 +65,15 @@ def filexfer(src_server, src_path, dst_server, dst_path, mode=''):
         else:
             dst_file = dst_server.open(dst_path, 'w'+mode)
 
-        if src_server is None and dst_server is None:
-            chunk = 1 << 20  # 1MB locally.
-        else:
-            chunk = 1 << 17  # 128KB over network.
-
         try:
-            data = src_file.read(chunk)
-            while data:
-                dst_file.write(data)
+            if src_server is None and dst_server is None:
+                chunk = 1 << 20  # 1MB locally.
                 data = src_file.read(chunk)
+                while data:
+                    dst_file.write(data)
+                    data = src_file.read(chunk)
+            else:
+                _pipelined_copy(src_file, dst_file, _NET_CHUNK, _NET_DEPTH)
         finally:
             dst_file.close()
     finally:
@@ -70,7 +89,198 @@ def filexfer(src_server, src_path, dst_server, dst_path, mode=''):
         dst_server.chmod(dst_path, mode)
 
 
-def pack_zipfile(patterns, filename, logger=None):
+def _pipelined_copy(src_file, dst_file, chunk, depth):
+    """
+    Copy `src_file` to `dst_file` in `chunk` sized pieces, with up to
+    `depth` chunks read ahead by a separate thread.
+    """
+    from openmdao.main.rbac import get_credentials, set_credentials
+
+    chunks = Queue.Queue(depth)
+    stop = threading.Event()
+    credentials = get_credentials()
+
+    def _reader():
+        """ Read chunks until EOF, error, or stopped. """
+        set_credentials(credentials)
+        try:
+            while not stop.is_set():
+                data = src_file.read(chunk)
+                chunks.put(data)
+                if not data:
+                    break
+        except Exception as exc:
+            chunks.put(exc)
+
+    reader = threading.Thread(target=_reader, name='filexfer-reader')
+    reader.daemon = True
+    reader.start()
+    try:
+        while True:
+            data = chunks.get()
+            if isinstance(data, Exception):
+                raise data
+            if not data:
+                break
+            dst_file.write(data)
+    finally:
+        stop.set()
+        # Unblock reader if it's waiting on a full queue.
+        while reader.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except Queue.Empty:
+                pass
+        reader.join()
+
+
+def file_digest(path):
+    """
+    Return SHA-1 hex digest of the contents of `path`.
+    Digests are remembered and reused while the file's size and
+    modification time are unchanged.
+
+    path: string
+        Path to file to digest.
+    """
+    path = os.path.abspath(path)
+    info = os.stat(path)
+    try:
+        size, mtime, digest = _DIGESTS[path]
+    except KeyError:
+        pass
+    else:
+        if size == info.st_size and mtime == info.st_mtime:
+            return digest
+
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as inp:
+        data = inp.read(1 << 20)
+        while data:
+            sha1.update(data)
+            data = inp.read(1 << 20)
+    digest = sha1.hexdigest()
+    _DIGESTS[path] = (info.st_size, info.st_mtime, digest)
+    return digest
+
+
+def cache_file(path, cache_dir):
+    """
+    Copy `path` into the content-addressed `cache_dir` if it isn't already
+    there. Returns the file's digest.
+
+    path: string
+        Path to file to be cached.
+
+    cache_dir: string
+        Directory containing files named by content digest.
+    """
+    digest = file_digest(path)
+    cached = os.path.join(cache_dir, digest)
+    if not os.path.exists(cached):
+        if not os.path.exists(cache_dir):
+            try:
+                os.makedirs(cache_dir)
+            except OSError:
+                if not os.path.isdir(cache_dir):  # Not just a creation race.
+                    raise
+        # Copy then rename so a partial file is never visible.
+        tmp = '%s.%d.%d' % (cached, os.getpid(),
+                            threading.current_thread().ident)
+        shutil.copy(path, tmp)
+        os.rename(tmp, cached)
+    else:
+        try:
+            os.utime(cached, None)  # Mark as recently used.
+        except OSError:
+            pass  # Evicted by another process.
+    return digest
+
+
+def restore_file(digest, path, cache_dir):
+    """
+    Copy the file with `digest` from `cache_dir` to `path`.
+    Returns True if the file was in the cache.
+
+    digest: string
+        Content digest as returned by :meth:`file_digest`.
+
+    path: string
+        Path to file to be written.
+
+    cache_dir: string
+        Directory containing files named by content digest.
+    """
+    if not _DIGEST_RE.match(digest):
+        raise ValueError('invalid digest %r' % digest)
+    cached = os.path.join(cache_dir, digest)
+    if not os.path.exists(cached):
+        return False
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    try:
+        shutil.copy(cached, path)
+        os.utime(cached, None)  # Mark as recently used.
+    except (IOError, OSError):
+        if os.path.exists(cached):
+            raise
+        return False  # Evicted by another process.
+    return True
+
+
+def trim_cache(cache_dir, max_bytes=None, max_age=None):
+    """
+    Remove files from `cache_dir` until it holds at most `max_bytes`,
+    least recently used first, and remove any not used for more than
+    `max_age` seconds. Returns the number of bytes removed.
+
+    cache_dir: string
+        Directory containing files named by content digest.
+
+    max_bytes: int
+        Maximum total size of cached files. If None, size is not limited.
+
+    max_age: float
+        Maximum time in seconds since a file was cached or restored.
+        If None, age is not limited.
+    """
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return 0
+
+    entries = []
+    total = 0
+    for name in names:
+        if not _DIGEST_RE.match(name):
+            continue  # Skip partial copies.
+        path = os.path.join(cache_dir, name)
+        try:
+            info = os.stat(path)
+        except OSError:
+            continue
+        entries.append((info.st_mtime, info.st_size, path))
+        total += info.st_size
+    entries.sort()
+
+    now = time.time()
+    removed = 0
+    for mtime, size, path in entries:
+        expired = max_age is not None and now - mtime > max_age
+        if not expired and (max_bytes is None or total <= max_bytes):
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # Already removed by another process.
+        total -= size
+        removed += size
+    return removed
+
+
+def pack_zipfile(patterns, filename, logger=None, exclude=None,
+                 directory=None):
     """
     Create 'zip' file `filename` of files in `patterns`.
     Returns ``(nfiles, nbytes)``.
@@ -84,36 +294,52 @@ def pack_zipfile(patterns, filename, logger=None):
     logger: Logger
         Used for recording progress.
 
+    exclude: list
+        Paths matched by `patterns` which are not to be packed.
+
+    directory: string
+        If specified, relative `patterns` and `filename` are relative to
+        this directory rather than the current directory.
+
     .. note::
         The code uses :meth:`glob.glob` to process `patterns`.
         It does not check for the existence of any matches.
 
     """
     logger = logger or NullLogger()
+    exclude = set(exclude or ())
+    directory = directory or ''
+
+    paths = []
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(directory, pattern)):
+            if directory and not os.path.isabs(pattern):
+                path = os.path.relpath(path, directory)
+            if path not in exclude:
+                paths.append(path)
 
     # Scan to see if we have to use zip64 flag.
     nbytes = 0
-    for pattern in patterns:
-        for path in glob.glob(pattern):
-            nbytes += os.path.getsize(path)
+    for path in paths:
+        nbytes += os.path.getsize(os.path.join(directory, path))
     zip64 = nbytes > zipfile.ZIP64_LIMIT
     compression = zipfile.ZIP_DEFLATED
 
     nfiles = 0
     nbytes = 0
-    with zipfile.ZipFile(filename, 'w', compression, zip64) as zipped:
-        for pattern in patterns:
-            for path in glob.glob(pattern):
-                size = os.path.getsize(path)
-                logger.debug("packing '%s' (%d)...", path, size)
-                zipped.write(path)
-                nfiles += 1
-                nbytes += size
+    with zipfile.ZipFile(os.path.join(directory, filename), 'w',
+                         compression, zip64) as zipped:
+        for path in paths:
+            size = os.path.getsize(os.path.join(directory, path))
+            logger.debug("packing '%s' (%d)...", path, size)
+            zipped.write(os.path.join(directory, path), path)
+            nfiles += 1
+            nbytes += size
 
     return (nfiles, nbytes)
 
 
-def unpack_zipfile(filename, logger=None, textfiles=None):
+def unpack_zipfile(filename, logger=None, textfiles=None, directory=None):
     """
     Unpack 'zip' file `filename`.
     Returns ``(nfiles, nbytes)``.
@@ -129,39 +355,42 @@ def unpack_zipfile(filename, logger=None, textfiles=None):
         are text files possibly needing newline translation. If not supplied,
         the first 4KB of each is scanned for a zero byte. If none is found, then the
         file is assumed to be a text file.
+
+    directory: string
+        If specified, `filename` (if relative) is read from and files are
+        unpacked into this directory rather than the current directory.
     """
     logger = logger or NullLogger()
-
-    # ZipInfo.create_system code for local system.
-    local_system = 0 if sys.platform == 'win32' else 3
+    directory = directory or ''
 
     nfiles = 0
     nbytes = 0
-    with zipfile.ZipFile(filename, 'r') as zipped:
+    with zipfile.ZipFile(os.path.join(directory, filename), 'r') as zipped:
         for info in zipped.infolist():
             filename, size = info.filename, info.file_size
+            path = os.path.join(directory, filename)
             logger.debug('unpacking %r (%d)...', filename, size)
-            zipped.extract(info)
+            zipped.extract(info, directory or None)
 
             if sys.platform != 'win32':
                 # Set permissions, extract() doesn't.
                 rwx = (info.external_attr >> 16) & 0777
                 if rwx:
-                    os.chmod(filename, rwx)  # Only if something valid.
+                    os.chmod(path, rwx)  # Only if something valid.
 
             # Requires mismatched systems.
-            if info.create_system != local_system:  # pragma no cover
+            if info.create_system != ZIP_SYSTEM:  # pragma no cover
                 if textfiles is None:
-                    with open(filename, 'rb') as inp:
+                    with open(path, 'rb') as inp:
                         data = inp.read(1 << 12)
                     if '\0' not in data:
                         logger.debug('translating %r...', filename)
-                        translate_newlines(filename)
+                        translate_newlines(path)
                 else:
                     for pattern in textfiles:
                         if fnmatch.fnmatch(filename, pattern):
                             logger.debug('translating %r...', filename)
-                            translate_newlines(filename)
+                            translate_newlines(path)
             nfiles += 1
             nbytes += size
 
@@ -176,10 +405,11 @@ def translate_newlines(filename):
         Name of the file to be translated.
         The translated file will replace this file.
     """
+    translated = os.path.join(os.path.dirname(filename), '__translated__')
     with open(filename, 'rU') as inp:
-        with open('__translated__', 'w') as out:
+        with open(translated, 'w') as out:
             for line in inp:
                 out.write(line)
     os.remove(filename)
-    os.rename('__translated__', filename)
+    os.rename(translated, filename)
 
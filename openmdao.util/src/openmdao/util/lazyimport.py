@@ -0,0 +1,65 @@
+"""
+Support for modules whose attributes are imported on first access.
+
+A pseudo package such as ``openmdao.main.api`` re-exports names from many
+modules, most of which any given program never uses. Replacing it with a
+:class:`LazyModule` defers importing each of those modules (and their
+dependencies) until one of its names is actually referenced.
+"""
+
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Module whose public attributes are imported from other modules when
+    first referenced. ``from module import *`` imports everything in
+    `attributes`.
+
+    module: module
+        The module being replaced. Its existing attributes are retained.
+
+    attributes: dict
+        Maps attribute name to the name of the module it is imported from.
+    """
+
+    def __init__(self, module, attributes):
+        super(LazyModule, self).__init__(module.__name__, module.__doc__)
+        self.__dict__.update(module.__dict__)
+        # Keep the original module alive, otherwise Python 2 clears its
+        # globals when it is garbage collected.
+        self._lazy_module = module
+        self._lazy_attributes = attributes
+        self.__all__ = sorted(attributes)
+
+    def __getattr__(self, name):
+        try:
+            modname = self.__dict__['_lazy_attributes'][name]
+        except KeyError:
+            raise AttributeError("'module' object has no attribute '%s'"
+                                 % name)
+        __import__(modname)
+        value = getattr(sys.modules[modname], name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(self._lazy_attributes))
+
+
+def lazy_module(name, attributes):
+    """
+    Replace module `name` in :data:`sys.modules` with a :class:`LazyModule`.
+    Typically called at the end of the module being replaced, as
+    ``lazy_module(__name__, {...})``.
+
+    name: string
+        Name of the module to replace.
+
+    attributes: dict
+        Maps attribute name to the name of the module it is imported from.
+    """
+    module = LazyModule(sys.modules[name], attributes)
+    sys.modules[name] = module
+    return module
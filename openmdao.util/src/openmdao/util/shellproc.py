@@ -21,6 +21,13 @@ class CalledProcessError(subprocess.CalledProcessError):
                 % (self.cmd, self.returncode, self.errormsg)
 
 
+def _open(path, mode, cwd):
+    """ Open stream file `path`, relative to `cwd` if specified. """
+    if cwd and path != DEV_NULL:
+        path = os.path.join(cwd, path)
+    return open(path, mode)
+
+
 class ShellProc(subprocess.Popen):
     """
     A slight modification to :class:`subprocess.Popen`.
@@ -36,15 +43,19 @@ class ShellProc(subprocess.Popen):
 
     stdin, stdout, stderr: string, file, or int
         Specify handling of corresponding stream. If a string, a file
-        of that name is opened. Otherwise, see the :mod:`subprocess`
-        documentation.
+        of that name is opened (relative to `cwd` if specified). Otherwise,
+        see the :mod:`subprocess` documentation.
 
     env: dict
         Environment variables for the command.
+
+    cwd: string
+        If specified, the directory to run the command in. Unlike
+        :func:`os.chdir`, this doesn't affect other threads.
     """
 
     def __init__(self, args, stdin=None, stdout=None, stderr=None, env=None,
-                 universal_newlines=False):
+                 universal_newlines=False, cwd=None):
         environ = os.environ.copy()
         if env:
             environ.update(env)
@@ -54,17 +65,17 @@ class ShellProc(subprocess.Popen):
         self._stderr_arg = stderr
 
         if isinstance(stdin, basestring):
-            self._inp = open(stdin, 'r')
+            self._inp = _open(stdin, 'r', cwd)
         else:
             self._inp = stdin
     
         if isinstance(stdout, basestring):
-            self._out = open(stdout, 'w')
+            self._out = _open(stdout, 'w', cwd)
         else:
             self._out = stdout
 
         if isinstance(stderr, basestring):
-            self._err = open(stderr, 'w')
+            self._err = _open(stderr, 'w', cwd)
         else:
             self._err = stderr
 
@@ -74,7 +85,8 @@ class ShellProc(subprocess.Popen):
             subprocess.Popen.__init__(self, args, stdin=self._inp,
                                       stdout=self._out, stderr=self._err,
                                       shell=shell, env=environ,
-                                      universal_newlines=universal_newlines)
+                                      universal_newlines=universal_newlines,
+                                      cwd=cwd)
         except Exception:
             self.close_files()
             raise
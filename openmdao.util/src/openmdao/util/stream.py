@@ -1,3 +1,5 @@
+import mmap
+import os
 import struct
 import sys
 import logging
@@ -12,6 +14,10 @@ _SZ_LONG = 8
 _SZ_FLOAT = 4
 _SZ_DOUBLE = 8
 
+# Binary arrays are written in slabs of about this many bytes, so converting
+# precision or byte order never requires a copy of the whole array.
+_SLAB_SIZE = 1 << 22
+
 from openmdao.util.decorators import stub_if_missing_deps
 
 @stub_if_missing_deps('numpy')
@@ -72,11 +78,29 @@ class Stream(object):
             self.unformatted = False
             self.recordmark_8 = False
             self.need_byteswap = False
+        self._map = None
 
     def close(self):
         """ Close underlying file. """
         return self.file.close()
 
+    @property
+    def int_dtype(self):
+        """ :mod:`numpy` dtype of integer data, including byte order. """
+        if self.binary:
+            return numpy.dtype(('>' if self.big_endian else '<') +
+                               ('i8' if self.integer_8 else 'i4'))
+        return numpy.dtype(numpy.int64 if self.integer_8 else numpy.int32)
+
+    @property
+    def float_dtype(self):
+        """ :mod:`numpy` dtype of floating-point data, including byte order. """
+        if self.binary:
+            return numpy.dtype(('>' if self.big_endian else '<') +
+                               ('f4' if self.single_precision else 'f8'))
+        return numpy.dtype(numpy.float32 if self.single_precision
+                                         else numpy.float64)
+
     def reclen_ints(self, count):
         """
         Returns record length for `count` ints.
@@ -235,6 +259,67 @@ class Stream(object):
 
         return data.reshape(shape, order=order) if reshape else data
 
+    def map_floats(self, shape, order='C', full_record=False):
+        """
+        Returns floats as a :mod:`numpy` array of `shape` which is backed
+        by a memory map of the underlying file rather than read into memory.
+        Data is only paged in from the file as it is accessed. The array
+        is copy-on-write: changes to it are not written back to the file.
+        The stream is positioned after the data, as with
+        :meth:`read_floats`. Text data, or a stream that can't be mapped,
+        is simply read.
+
+        shape: tuple(int)
+            Dimensions of returned array.
+
+        order: string
+            If 'C', the data is in row-major order.
+            If 'Fortran', the data is in column-major order.
+
+        full_record: bool
+            If True, then read surrounding recordmarks.
+            Only meaningful if `unformatted`.
+        """
+        if not self.binary:
+            return self.read_floats(shape, order, full_record)
+
+        if self._map is None:
+            try:
+                self.file.flush()
+                self._map = mmap.mmap(self.file.fileno(), 0,
+                                      access=mmap.ACCESS_COPY)
+            except (AttributeError, IOError, ValueError):
+                return self.read_floats(shape, order, full_record)
+
+        count = 1
+        try:
+            for size in shape:
+                count *= size
+        except TypeError:
+            count = shape
+            shape = (shape,)
+
+        if full_record and self.unformatted:
+            reclen = self.read_recordmark()
+            if reclen != self.reclen_floats(count):
+                raise RuntimeError('unexpected recordlength %d' % reclen)
+
+        offset = self.file.tell()
+        nbytes = self.reclen_floats(count)
+        if offset + nbytes > len(self._map):
+            raise RuntimeError('%d floats at offset %d exceed file size %d'
+                               % (count, offset, len(self._map)))
+        data = numpy.ndarray(shape, dtype=self.float_dtype, buffer=self._map,
+                             offset=offset, order=order[0])
+        self.file.seek(nbytes, os.SEEK_CUR)
+
+        if full_record and self.unformatted:
+            reclen2 = self.read_recordmark()
+            if reclen2 != reclen:
+                raise RuntimeError('mismatched recordlength %d vs. %d'
+                                   %  (reclen2, reclen))
+        return data
+
     def read_recordmark(self):
         """ Returns value of next recordmark. """
         fmt = '>' if self.big_endian else '<'
@@ -312,20 +397,7 @@ class Stream(object):
             if full_record and self.unformatted:
                 self.write_recordmark(self.reclen_ints(data.size))
 
-            arr = data
-            if self.integer_8:
-                if data.itemsize != _SZ_LONG:
-                    arr = numpy.array(data, dtype=numpy.int64)
-            elif data.itemsize != _SZ_INT:
-                arr = numpy.array(data, dtype=numpy.int32)
-
-            if self.need_byteswap:
-                arr.byteswap(True)
-            try:
-                self.file.write(arr.tostring(order=order))
-            finally:
-                if self.need_byteswap:
-                    arr.byteswap(True)
+            self._write_slabs(data, self.int_dtype, order)
 
             if full_record and self.unformatted:
                 self.write_recordmark(self.reclen_ints(data.size))
@@ -398,26 +470,34 @@ class Stream(object):
             if full_record and self.unformatted:
                 self.write_recordmark(self.reclen_floats(data.size))
 
-            arr = data
-            if self.single_precision:
-                if data.itemsize != _SZ_FLOAT:
-                    arr = numpy.array(data, dtype=numpy.float32)
-            elif data.itemsize != _SZ_DOUBLE:
-                arr = numpy.array(data, dtype=numpy.float64)
-
-            if self.need_byteswap:
-                arr.byteswap(True)
-            try:
-                self.file.write(arr.tostring(order=order))
-            finally:
-                if self.need_byteswap:
-                    arr.byteswap(True)
+            self._write_slabs(data, self.float_dtype, order)
 
             if full_record and self.unformatted:
                 self.write_recordmark(self.reclen_floats(data.size))
         else:
             self.write_array(data, order, fmt, sep, linecount)
 
+    def _write_slabs(self, data, dtype, order):
+        """
+        Writes `data` as binary `dtype` a slab at a time, so that large (or
+        memory-mapped) arrays are streamed to the file rather than copied
+        whole for precision or byte order conversion.
+        """
+        if order == 'Fortran':
+            # Column-major order of data is row-major order of its transpose.
+            data = data.T
+        elif order != 'C':
+            raise ValueError("order must be 'C' or 'Fortran'")
+
+        if data.ndim < 1 or data.size * dtype.itemsize <= _SLAB_SIZE:
+            self.file.write(numpy.asarray(data, dtype=dtype).tostring())
+            return
+
+        step = max(1, _SLAB_SIZE // (data[0].size * dtype.itemsize or 1))
+        for start in range(0, len(data), step):
+            slab = data[start:start+step]
+            self.file.write(numpy.asarray(slab, dtype=dtype).tostring())
+
     def write_array(self, data, order='C', fmt='%s', sep=' ', linecount=0):
         """
         Writes array as text.
@@ -6,6 +6,7 @@ import unittest, os
 
 from numpy import array, isnan, isinf
 
+from openmdao.util import filewrap
 from openmdao.util.filewrap import InputFileGenerator, FileParser
 
 
@@ -586,6 +587,102 @@ class TestCase(unittest.TestCase):
         self.assertEqual(val, '#$%')
         
 
+    def test_line_endings(self):
+        
+        data = "Anchor\r\n" + \
+               " 1 2 3\r\n" + \
+               " Word 4 5 $ comment\r\n"
+        
+        outfile = open(self.filename, 'wb')
+        outfile.write(data)
+        outfile.close()
+        
+        old_threshold = filewrap._MMAP_THRESHOLD
+        for threshold in (old_threshold, 0):
+            for comment in (None, '$'):
+                filewrap._MMAP_THRESHOLD = threshold
+                try:
+                    gen = FileParser(end_of_line_comment_char=comment)
+                    gen.set_file(self.filename)
+                finally:
+                    filewrap._MMAP_THRESHOLD = old_threshold
+                
+                self.assertTrue('\r' not in gen.data.text(0, None))
+                gen.set_delimiters(' ')
+                gen.mark_anchor('Anchor')
+                self.assertEqual(list(gen.transfer_array(1, 1, 1, 3)),
+                                 [1.0, 2.0, 3.0])
+                self.assertEqual(gen.transfer_var(2, 3), 5)
+                gen.close()
+        
+    def test_output_parse_mapped(self):
+        
+        data = "Header\n" + \
+               "Anchor\n" + \
+               " 1.5D+02 -2.0d-1 3 -1e+06\n" + \
+               " 4.0 5. .6 7E2\n" + \
+               " 8 9 10 11 12\n" + \
+               "Anch\n" + \
+               "or\n" + \
+               " 1 2 3e\n" + \
+               "Anchor\n" + \
+               " Key 12 13"
+        
+        outfile = open(self.filename, 'w')
+        outfile.write(data)
+        outfile.close()
+        
+        # Force the file to be memory-mapped.
+        old_threshold = filewrap._MMAP_THRESHOLD
+        filewrap._MMAP_THRESHOLD = 0
+        try:
+            gen = FileParser()
+            gen.set_file(self.filename)
+        finally:
+            filewrap._MMAP_THRESHOLD = old_threshold
+            
+        gen.set_delimiters(' ')
+        self.assertEqual(len(gen.data), 10)
+        self.assertEqual(gen.transfer_line(9), ' Key 12 13')
+        
+        gen.mark_anchor('Anchor')
+        val = gen.transfer_2Darray(1, 1, 2)
+        self.assertEqual(val.shape, (2, 4))
+        self.assertEqual(val[0, 0], 150.0)
+        self.assertEqual(val[0, 1], -0.2)
+        self.assertEqual(val[0, 3], -1e6)
+        self.assertEqual(val[1, 3], 700.0)
+        
+        val = gen.transfer_array(1, 3, 3, 2)
+        self.assertEqual(list(val), [3.0, -1e6, 4.0, 5.0, 0.6, 700.0, 8.0, 9.0])
+        
+        # Rows of different length fall back to the line by line parse.
+        val = gen.transfer_2Darray(1, 2, 3, 2)
+        self.assertEqual(list(val[:, 0]), [-0.2, 5.0, 9.0])
+        
+        # So does a malformed last field.
+        val = gen.transfer_array(6, 1, 6, 4)
+        self.assertEqual(list(val), ['1', '2', '3', 'e'])
+        
+        # Anchors don't match across line breaks.
+        gen.mark_anchor('Anchor')
+        self.assertEqual(gen.transfer_line(0), 'Anchor')
+        self.assertEqual(gen.transfer_keyvar('Key', 2), 13)
+        gen.mark_anchor('Anchor', -2)
+        self.assertEqual(gen.transfer_var(1, 1), 150.0)
+
+        try:
+            gen.transfer_keyvar('ZZZ', 1)
+        except RuntimeError, err:
+            msg = "Could not find pattern ZZZ in output file filename.dat"
+            self.assertEqual(str(err), msg)
+        else:
+            self.fail('RuntimeError expected')
+            
+        # Closing the parser unmaps the file.
+        gen.close()
+        self.assertEqual(len(gen.data), 0)
+        
             
 if __name__ == '__main__':
     import nose
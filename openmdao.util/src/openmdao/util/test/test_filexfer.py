@@ -0,0 +1,165 @@
+"""
+Test file transfer and caching functions.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from StringIO import StringIO
+
+from openmdao.util.fileutil import onerror
+from openmdao.util.filexfer import filexfer, file_digest, cache_file, \
+                                   restore_file, trim_cache, pack_zipfile, \
+                                   unpack_zipfile, _pipelined_copy
+
+
+class _FailingFile(object):
+    """ Raises IOError after returning some data. """
+
+    def __init__(self):
+        self.count = 0
+
+    def read(self, size):
+        self.count += 1
+        if self.count > 2:
+            raise IOError('read failed')
+        return 'x' * size
+
+
+class _CredentialsFile(object):
+    """ Records the credentials of the thread reading it. """
+
+    def __init__(self):
+        self.credentials = None
+
+    def read(self, size):
+        from openmdao.main.rbac import get_credentials
+        self.credentials = get_credentials()
+        return ''
+
+
+class TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.startdir = os.getcwd()
+        self.tempdir = tempfile.mkdtemp()
+        os.chdir(self.tempdir)
+        with open('data.bin', 'wb') as out:
+            out.write(''.join(chr(i % 256) for i in range(100000)))
+        with open('data.txt', 'w') as out:
+            out.write('Hello world!\n')
+
+    def tearDown(self):
+        os.chdir(self.startdir)
+        shutil.rmtree(self.tempdir, onerror=onerror)
+
+    def test_pipelined(self):
+        src = StringIO(open('data.bin', 'rb').read())
+        dst = StringIO()
+        _pipelined_copy(src, dst, 1000, 3)
+        self.assertEqual(dst.getvalue(), src.getvalue())
+
+        dst = StringIO()
+        try:
+            _pipelined_copy(_FailingFile(), dst, 10, 1)
+        except IOError as exc:
+            self.assertEqual(str(exc), 'read failed')
+        else:
+            self.fail('Expected IOError')
+        self.assertEqual(dst.getvalue(), 'x' * 20)
+
+        # Reads are done with the caller's credentials.
+        from openmdao.main.rbac import get_credentials
+        src = _CredentialsFile()
+        _pipelined_copy(src, StringIO(), 10, 1)
+        self.assertTrue(src.credentials is get_credentials())
+
+    def test_filexfer(self):
+        filexfer(None, 'data.bin', None, 'copy.bin', 'b')
+        self.assertEqual(open('copy.bin', 'rb').read(),
+                         open('data.bin', 'rb').read())
+
+    def test_digest(self):
+        digest = file_digest('data.txt')
+        self.assertEqual(digest, '47a013e660d408619d894b20806b1d5086aab03b')
+        self.assertEqual(file_digest(os.path.abspath('data.txt')), digest)
+
+        # Changed file is re-read.
+        with open('data.txt', 'w') as out:
+            out.write('Goodbye world!\n')
+        os.utime('data.txt', (0, 0))
+        self.assertNotEqual(file_digest('data.txt'), digest)
+
+    def test_cache(self):
+        cache_dir = os.path.join(self.tempdir, 'cache', 'user')
+        digest = cache_file('data.bin', cache_dir)
+        self.assertEqual(os.listdir(cache_dir), [digest])
+        self.assertEqual(cache_file('data.bin', cache_dir), digest)
+
+        self.assertTrue(restore_file(digest, os.path.join('sub', 'restored'),
+                                     cache_dir))
+        self.assertEqual(open(os.path.join('sub', 'restored'), 'rb').read(),
+                         open('data.bin', 'rb').read())
+        self.assertFalse(restore_file('0'*40, 'missing', cache_dir))
+        self.assertFalse(os.path.exists('missing'))
+
+        try:
+            restore_file('../data.txt', 'bad', cache_dir)
+        except ValueError as exc:
+            self.assertEqual(str(exc), "invalid digest '../data.txt'")
+        else:
+            self.fail('Expected ValueError')
+
+    def test_trim_cache(self):
+        cache_dir = os.path.join(self.tempdir, 'cache')
+        digests = []
+        for i in range(3):
+            with open('data%d' % i, 'w') as out:
+                out.write(str(i) * 1000)
+            digest = cache_file('data%d' % i, cache_dir)
+            os.utime(os.path.join(cache_dir, digest), (1000+i, 1000+i))
+            digests.append(digest)
+
+        # Restoring makes a file most recently used.
+        restore_file(digests[0], 'restored', cache_dir)
+        self.assertEqual(trim_cache(cache_dir, max_bytes=2000), 1000)
+        self.assertEqual(sorted(os.listdir(cache_dir)),
+                         sorted([digests[0], digests[2]]))
+
+        self.assertEqual(trim_cache(cache_dir), 0)
+        self.assertEqual(trim_cache(cache_dir, max_age=3600), 1000)
+        self.assertEqual(os.listdir(cache_dir), [digests[0]])
+        self.assertEqual(trim_cache(os.path.join(cache_dir, 'missing'), 0), 0)
+
+    def test_zipfile(self):
+        self.assertEqual(pack_zipfile(['data.*'], 'all.zip'), (2, 100013))
+        self.assertEqual(pack_zipfile(['data.*'], 'some.zip',
+                                      exclude=['data.bin']), (1, 13))
+        with zipfile.ZipFile('some.zip') as zipped:
+            self.assertEqual(zipped.namelist(), ['data.txt'])
+
+        os.mkdir('unpacked')
+        os.chdir('unpacked')
+        self.assertEqual(unpack_zipfile(os.path.join('..', 'all.zip')),
+                         (2, 100013))
+        self.assertEqual(sorted(os.listdir('.')), ['data.bin', 'data.txt'])
+
+        # Relative to a directory other than the current directory.
+        os.chdir(self.startdir)
+        self.assertEqual(pack_zipfile(['data.*'], 'dir.zip',
+                                      exclude=['data.bin'],
+                                      directory=self.tempdir), (1, 13))
+        path = os.path.join(self.tempdir, 'dir.zip')
+        with zipfile.ZipFile(path) as zipped:
+            self.assertEqual(zipped.namelist(), ['data.txt'])
+        unpacked = os.path.join(self.tempdir, 'unpacked2')
+        os.mkdir(unpacked)
+        self.assertEqual(unpack_zipfile(path, directory=unpacked), (1, 13))
+        self.assertEqual(os.listdir(unpacked), ['data.txt'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,8 +4,10 @@ Test ShellProc functions.
 
 import logging
 import os.path
+import shutil
 import signal
 import sys
+import tempfile
 import unittest
 
 from openmdao.util.shellproc import call, check_call, CalledProcessError, \
@@ -80,6 +82,25 @@ class TestCase(unittest.TestCase):
         else:
             self.assertEqual(msg, ': SIGTERM')
 
+    def test_cwd(self):
+        logging.debug('')
+        logging.debug('test_cwd')
+
+        cmd = 'dir' if sys.platform == 'win32' else 'ls'
+        directory = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(directory, 'marker'), 'w') as out:
+                out.write('marker\n')
+            proc = ShellProc(cmd, stdout='stdout', stderr='stderr',
+                             cwd=directory)
+            proc.wait()
+            proc.close_files()
+            self.assertFalse(os.path.exists('stdout'))
+            with open(os.path.join(directory, 'stdout'), 'r') as inp:
+                self.assertTrue('marker' in inp.read())
+        finally:
+            shutil.rmtree(directory)
+
 
 if __name__ == '__main__':
     import nose
@@ -9,6 +9,7 @@ import unittest
 
 import numpy.testing
 
+from openmdao.util import stream as stream_module
 from openmdao.util.stream import Stream
 from openmdao.util.testutil import assert_raises
 
@@ -560,6 +561,84 @@ class TestCase(unittest.TestCase):
             new_data = stream.read_floats((5, 2), order='Fortran')
         numpy.testing.assert_array_equal(new_data, arr2d)
 
+    def test_map_floats(self):
+        logging.debug('')
+        logging.debug('test_map_floats')
+
+        # Big-endian single precision, column-major, between recordmarks.
+        data = numpy.arange(0, 24, dtype=numpy.float64).reshape((2, 3, 4))
+        with open(self.filename, 'wb') as out:
+            stream = Stream(out, binary=True, big_endian=True,
+                            single_precision=True, unformatted=True)
+            stream.write_int(42, full_record=True)
+            stream.write_floats(data, order='Fortran', full_record=True)
+            stream.write_int(7, full_record=True)
+        with open(self.filename, 'rb') as inp:
+            stream = Stream(inp, binary=True, big_endian=True,
+                            single_precision=True, unformatted=True)
+            self.assertEqual(stream.read_int(full_record=True), 42)
+            new_data = stream.map_floats((2, 3, 4), order='Fortran',
+                                         full_record=True)
+            self.assertEqual(stream.read_int(full_record=True), 7)
+        self.assertEqual(new_data.dtype, numpy.dtype('>f4'))
+        numpy.testing.assert_array_equal(new_data, data)
+
+        # Copy-on-write, the file is not changed.
+        new_data[0, 0, 0] = 99.
+        with open(self.filename, 'rb') as inp:
+            stream = Stream(inp, binary=True, big_endian=True,
+                            single_precision=True, unformatted=True)
+            stream.read_int(full_record=True)
+            old_data = stream.read_floats((2, 3, 4), order='Fortran',
+                                          full_record=True)
+        numpy.testing.assert_array_equal(old_data, data)
+        del new_data
+
+        # Text is just read.
+        with open(self.filename, 'w') as out:
+            stream = Stream(out)
+            stream.write_floats(data)
+        with open(self.filename, 'r') as inp:
+            stream = Stream(inp)
+            new_data = stream.map_floats((2, 3, 4))
+        numpy.testing.assert_array_equal(new_data, data)
+
+        # Data past end of file.
+        with open(self.filename, 'wb') as out:
+            stream = Stream(out, binary=True)
+            stream.write_floats(data)
+        with open(self.filename, 'rb') as inp:
+            stream = Stream(inp, binary=True)
+            assert_raises(self, 'stream.map_floats(25)',
+                          globals(), locals(), RuntimeError,
+                          '25 floats at offset 0 exceed file size 192')
+
+    def test_slabs(self):
+        logging.debug('')
+        logging.debug('test_slabs')
+
+        # Force writes to be done in several slabs.
+        data = numpy.arange(0, 1000, dtype=numpy.float64).reshape((10, 10, 10))
+        saved = stream_module._SLAB_SIZE
+        stream_module._SLAB_SIZE = 64
+        try:
+            with open(self.filename, 'wb') as out:
+                stream = Stream(out, binary=True, big_endian=True,
+                                single_precision=True)
+                stream.write_floats(data, order='Fortran')
+                stream.write_ints(numpy.arange(100).reshape((20, 5)))
+        finally:
+            stream_module._SLAB_SIZE = saved
+        self.assertEqual(os.path.getsize(self.filename), 4400)
+        with open(self.filename, 'rb') as inp:
+            stream = Stream(inp, binary=True, big_endian=True,
+                            single_precision=True)
+            new_data = stream.read_floats((10, 10, 10), order='Fortran')
+            new_ints = stream.read_ints((20, 5))
+        numpy.testing.assert_array_equal(new_data, data)
+        numpy.testing.assert_array_equal(new_ints,
+                                         numpy.arange(100).reshape((20, 5)))
+
     def test_misc(self):
         logging.debug('')
         logging.debug('test_misc')